@@ -0,0 +1,111 @@
+"""
+Tests for lazy package imports.
+
+Importing a package or a light module must not load torch or cv2, and the
+names a package exports must still resolve on first access.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from vision_service._lazy import lazy_attributes
+from vision_service.benchmarks.bench_import_time import (
+    ENTRY_POINTS,
+    find_regressions,
+    parse_importtime,
+)
+
+LIGHT_ENTRY_POINTS = [module for module, forbidden in ENTRY_POINTS.items() if forbidden]
+
+
+def _loaded_modules(statement: str) -> set:
+    """Run a statement in a fresh interpreter and return sys.modules keys."""
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}\nimport sys\nprint(' '.join(sys.modules))"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestColdStart:
+    """Test light entry points in fresh interpreters."""
+
+    @pytest.mark.parametrize("module", LIGHT_ENTRY_POINTS)
+    def test_no_heavy_imports(self, module):
+        """Test light entry points load neither torch nor cv2."""
+        loaded = _loaded_modules(f"import {module}")
+        assert module in loaded
+        for heavy in ENTRY_POINTS[module]:
+            assert heavy not in loaded
+
+    def test_attribute_loads_only_its_module(self):
+        """Test resolving one package attribute imports just its submodule."""
+        loaded = _loaded_modules("from vision_service.filtering import RotationSpeedMonitor")
+        assert "vision_service.filtering.speed_monitor" in loaded
+        assert "vision_service.filtering.measurement_lock" not in loaded
+
+
+class TestLazyAttributes:
+    """Test package attribute resolution."""
+
+    def test_exports_resolve(self):
+        """Test every name in a package's __all__ resolves to its definition."""
+        import vision_service.filtering as filtering
+        from vision_service.filtering.measurement_lock import MeasurementLock
+
+        assert filtering.MeasurementLock is MeasurementLock
+        for name in filtering.__all__:
+            assert getattr(filtering, name) is not None
+
+    def test_dir_lists_exports(self):
+        """Test dir() includes names that have not been loaded yet."""
+        import vision_service.pipeline as pipeline
+        assert set(pipeline.__all__) <= set(dir(pipeline))
+
+    def test_subpackages(self):
+        """Test subpackages are reachable from the top-level package."""
+        import vision_service
+        assert vision_service.filtering.__name__ == "vision_service.filtering"
+
+    def test_unknown_attribute(self):
+        """Test unknown names raise AttributeError."""
+        import vision_service.measurements as measurements
+        with pytest.raises(AttributeError):
+            measurements.missing_name
+
+    def test_duplicate_name_rejected(self):
+        """Test a name declared by two modules is rejected."""
+        with pytest.raises(ValueError):
+            lazy_attributes("vision_service", {".a": ["name"], ".b": ["name"]})
+
+
+class TestBenchmark:
+    """Test import time report parsing and regression checks."""
+
+    def test_parse_importtime(self):
+        """Test report lines are parsed with nesting depth."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        300 | vision_service\n"
+            "import time:       200 |        200 |   vision_service.timing\n"
+        )
+        assert parse_importtime(stderr) == [
+            ("vision_service", 0, 300),
+            ("vision_service.timing", 1, 200),
+        ]
+
+    def test_find_regressions(self):
+        """Test forbidden imports and budget overruns are reported."""
+        results = {
+            "vision_service.filtering": {"import_ms": 10.0, "heavy_modules": ["torch"]},
+            "vision_service.pipeline": {"import_ms": 90.0, "heavy_modules": []},
+            "vision_service.measurements.differentiable": {
+                "import_ms": 900.0, "heavy_modules": ["torch"],
+            },
+        }
+        assert find_regressions(results, budget_ms=50.0) == [
+            "vision_service.filtering imports torch",
+            "vision_service.pipeline takes 90.0 ms (budget 50.0 ms)",
+        ]
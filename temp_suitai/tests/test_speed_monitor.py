@@ -8,7 +8,11 @@ from OneEuro filter state.
 import pytest
 import numpy as np
 from datetime import datetime, timedelta
-from vision_service.filtering.one_euro_filter import OneEuroFilter, OneEuroFilterConfig
+from vision_service.filtering.one_euro_filter import (
+    OneEuroFilter,
+    OneEuroFilterConfig,
+    OneEuroFilterPose,
+)
 from vision_service.filtering.speed_monitor import RotationSpeedMonitor
 
 
@@ -205,6 +209,19 @@ class TestRotationSpeedMonitor:
         assert len(speeds) == 5
         assert all(isinstance(s, float) for s in speeds)
 
+    def test_monitor_accepts_pose_filter(self):
+        """Test that the monitor reads velocities from a full pose filter."""
+        pose_filter = OneEuroFilterPose(OneEuroFilterConfig(), num_joints=24)
+        monitor = RotationSpeedMonitor(pose_filter)
+
+        base_time = datetime.now()
+        pose_filter.filter(np.zeros(72), base_time)
+        pose = np.zeros(72)
+        pose[0] = 0.5
+        pose_filter.filter(pose, base_time + timedelta(milliseconds=33))
+
+        assert monitor.get_rotation_speed() > 0.0
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -5,3 +5,18 @@ Computer vision and body measurement services for SUIT AI.
 """
 
 __version__ = "0.1.0"
+
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {}, submodules=(
+    "benchmarks",
+    "calibration",
+    "dialogue",
+    "filtering",
+    "measurements",
+    "pipeline",
+    "reconstruction",
+    "segmentation",
+    "timing",
+    "voice",
+))
@@ -0,0 +1,70 @@
+"""
+Lazy attribute loading for vision_service packages (PEP 562).
+
+Package __init__ modules declare which submodule provides each public name
+instead of importing it. The submodule is imported on first attribute
+access, so importing a package (or one light submodule of it) does not pay
+for heavy dependencies such as torch or cv2 used elsewhere in the package.
+
+Example::
+
+    __getattr__, __dir__ = lazy_attributes(__name__, {
+        ".sam_segment": ["SAMSegmenter", "SegmentationResult"],
+    })
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import importlib
+import sys
+
+
+def lazy_attributes(
+    package: str,
+    attributes: Dict[str, Sequence[str]],
+    submodules: Sequence[str] = (),
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level __getattr__ and __dir__ functions for a package.
+
+    Submodules are imported on first attribute access (PEP 562), so
+    importing the package does not load the dependencies of every module
+    in it.
+
+    Args:
+        package: The package's __name__.
+        attributes: Mapping of module name (absolute, or relative to the
+            package when starting with ".") to the names it provides.
+        submodules: Subpackage/submodule names exposed as attributes.
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package.
+
+    Raises:
+        ValueError: If a name is provided by more than one module
+    """
+    origins: Dict[str, str] = {}
+    for module_name, names in attributes.items():
+        for name in names:
+            if name in origins:
+                raise ValueError(f"{package}: '{name}' is provided by more than one module")
+            origins[name] = module_name
+    submodule_names = frozenset(submodules)
+
+    def __getattr__(name: str) -> Any:
+        namespace = sys.modules[package].__dict__
+        if name in origins:
+            module = importlib.import_module(origins[name], package)
+            value = getattr(module, name)
+        elif name in submodule_names:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # Cache so later lookups bypass __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        namespace = sys.modules[package].__dict__
+        return sorted(set(namespace) | set(origins) | submodule_names)
+
+    return __getattr__, __dir__
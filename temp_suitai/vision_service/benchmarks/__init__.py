@@ -0,0 +1,7 @@
+"""
+Benchmarks for vision service hot paths.
+
+Each module is a standalone script, e.g.::
+
+    python -m vision_service.benchmarks.bench_kalman_filter
+"""
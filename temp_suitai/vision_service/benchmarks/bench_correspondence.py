@@ -0,0 +1,121 @@
+"""
+Benchmark MHR <-> SMPL-X vertex correspondence backends.
+
+Compares the VertexMatcher backends (see CORRESPONDENCE_METHODS) on random
+meshes of the given sizes and reports, for each:
+
+- latency of one compute_correspondence() call
+- peak resident memory of a fresh process running that call
+
+Each backend runs in its own subprocess so peak memory is not polluted by
+the other backends.
+
+Usage:
+    python -m vision_service.benchmarks.bench_correspondence --mhr-vertices 10475
+    python -m vision_service.benchmarks.bench_correspondence --skip-dense
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+import torch
+
+from vision_service.reconstruction.mhr_bridge import CORRESPONDENCE_METHODS, VertexMatcher
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0 if sys.platform != "darwin" else peak / (1024.0 ** 2)
+
+
+def run_single(method: str, mhr_vertices: int, smplx_vertices: int,
+               chunk_size: int = 1024, repeats: int = 3, seed: int = 0) -> Dict[str, float]:
+    """
+    Time one backend in the current process.
+
+    Returns:
+        Dict with mean latency in ms, peak RSS growth in MB and the checksum
+        of the correspondence (to confirm backends agree).
+    """
+    generator = torch.Generator().manual_seed(seed)
+    mhr = torch.randn(mhr_vertices, 3, generator=generator)
+    smplx = torch.randn(smplx_vertices, 3, generator=generator)
+    matcher = VertexMatcher(mhr, smplx, method=method, chunk_size=chunk_size)
+
+    baseline_mb = _peak_rss_mb()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        correspondence = matcher.compute_correspondence()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "latency_ms": float(np.mean(timings) * 1e3),
+        "peak_memory_mb": _peak_rss_mb() - baseline_mb,
+        "checksum": int(correspondence.sum()),
+    }
+
+
+def run_benchmark(mhr_vertices: int = 10475, smplx_vertices: int = 10475,
+                  chunk_size: int = 1024, methods: Sequence[str] = CORRESPONDENCE_METHODS,
+                  repeats: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Run each backend in a fresh subprocess.
+
+    Returns:
+        Mapping of method name to its run_single() result.
+    """
+    results = {}
+    for method in methods:
+        output = subprocess.run(
+            [sys.executable, "-m", __spec__.name if __spec__ else __name__,
+             "--single", method,
+             "--mhr-vertices", str(mhr_vertices),
+             "--smplx-vertices", str(smplx_vertices),
+             "--chunk-size", str(chunk_size),
+             "--repeats", str(repeats)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[method] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mhr-vertices", type=int, default=10475)
+    parser.add_argument("--smplx-vertices", type=int, default=10475)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-dense", action="store_true",
+                        help="Skip the dense backend (needs several GB at full size)")
+    parser.add_argument("--single", choices=CORRESPONDENCE_METHODS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.mhr_vertices, args.smplx_vertices,
+                                    args.chunk_size, args.repeats)))
+        return
+
+    methods = [m for m in CORRESPONDENCE_METHODS if not (args.skip_dense and m == "dense")]
+    results = run_benchmark(args.mhr_vertices, args.smplx_vertices, args.chunk_size,
+                            methods, args.repeats)
+
+    print(f"{args.mhr_vertices} MHR x {args.smplx_vertices} SMPL-X vertices "
+          f"(chunk size {args.chunk_size})")
+    checksums = {r["checksum"] for r in results.values()}
+    for name, result in results.items():
+        print(f"  {name:<8} {result['latency_ms']:9.1f} ms  "
+              f"{result['peak_memory_mb']:8.1f} MB peak")
+    if len(checksums) > 1:
+        print("  WARNING: backends returned different correspondences")
+
+
+if __name__ == "__main__":
+    main()
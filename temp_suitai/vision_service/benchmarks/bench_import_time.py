@@ -0,0 +1,166 @@
+"""
+Benchmark cold-start import time of vision service entry points.
+
+Each entry point is imported in a fresh interpreter run with
+``python -X importtime`` and the report is parsed for:
+
+- cumulative import time of everything the entry point pulled in
+  (interpreter start-up imports are excluded)
+- which heavy dependencies (torch, cv2, scipy) got loaded
+
+Light entry points, e.g. the ones the dialogue tool service needs
+(CalibrationLock, OneEuroFilter), must not load torch or cv2. With
+``--check`` the script exits non-zero when one does, or when an entry point
+exceeds ``--budget-ms``, so it can guard cold start in CI.
+
+Usage:
+    python -m vision_service.benchmarks.bench_import_time
+    python -m vision_service.benchmarks.bench_import_time --check --budget-ms 500
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Sequence, Set, Tuple
+
+# Heavy dependencies reported for every entry point
+HEAVY_MODULES = ("torch", "cv2", "scipy")
+
+# Entry point -> heavy modules it must not load
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    "vision_service": ("torch", "cv2"),
+    "vision_service.calibration": ("torch", "cv2"),
+    "vision_service.calibration.calibration_lock": ("torch", "cv2"),
+    "vision_service.dialogue": ("torch", "cv2"),
+    "vision_service.dialogue.calibration_tools": ("torch", "cv2"),
+    "vision_service.filtering": ("torch", "cv2"),
+    "vision_service.filtering.one_euro_filter": ("torch", "cv2"),
+    "vision_service.filtering.kalman_filter": ("torch", "cv2"),
+    "vision_service.measurements": ("torch", "cv2"),
+    "vision_service.measurements.landmarks": ("torch", "cv2"),
+    "vision_service.pipeline": ("torch", "cv2"),
+    "vision_service.reconstruction": ("torch", "cv2"),
+    "vision_service.segmentation": ("torch", "cv2"),
+    "vision_service.voice": ("torch", "cv2"),
+    "vision_service.measurements.differentiable": (),
+    "vision_service.reconstruction.mhr_bridge": (),
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        List of (module name, nesting depth, cumulative microseconds) in
+        report order.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped, depth, int(fields[1])))
+    return entries
+
+
+def _run_importtime(statement: str) -> List[Tuple[str, int, int]]:
+    """Run one statement in a fresh interpreter and parse its import report."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True, capture_output=True, text=True,
+    ).stderr
+    return parse_importtime(stderr)
+
+
+def measure_import(module: str, startup: Set[str], repeats: int = 3) -> Dict[str, object]:
+    """
+    Measure importing one module in fresh interpreters.
+
+    Args:
+        module: Dotted module name to import
+        startup: Top-level modules imported by an empty interpreter run
+        repeats: Number of fresh runs; the fastest is reported
+
+    Returns:
+        Dict with import time in ms and the heavy modules that were loaded.
+    """
+    timings = []
+    loaded: Set[str] = set()
+    for _ in range(repeats):
+        entries = _run_importtime(f"import {module}")
+        timings.append(sum(us for name, depth, us in entries
+                           if depth == 0 and name not in startup))
+        loaded = {name.split(".")[0] for name, _, _ in entries}
+    return {
+        "import_ms": min(timings) / 1e3,
+        "heavy_modules": sorted(m for m in HEAVY_MODULES if m in loaded),
+    }
+
+
+def run_benchmark(modules: Sequence[str], repeats: int = 3) -> Dict[str, Dict[str, object]]:
+    """
+    Measure every entry point.
+
+    Returns:
+        Mapping of module name to its measure_import() result.
+    """
+    startup = {name for name, depth, _ in _run_importtime("pass") if depth == 0}
+    return {module: measure_import(module, startup, repeats) for module in modules}
+
+
+def find_regressions(results: Dict[str, Dict[str, object]],
+                     budget_ms: float = float("inf")) -> List[str]:
+    """
+    List entry points that load forbidden modules or exceed the time budget.
+
+    Args:
+        results: Output of run_benchmark()
+        budget_ms: Maximum import time for entry points with forbidden modules
+
+    Returns:
+        Human-readable description of each regression.
+    """
+    problems = []
+    for module, result in results.items():
+        forbidden = ENTRY_POINTS.get(module, ())
+        for heavy in result["heavy_modules"]:
+            if heavy in forbidden:
+                problems.append(f"{module} imports {heavy}")
+        if forbidden and result["import_ms"] > budget_ms:
+            problems.append(f"{module} takes {result['import_ms']:.1f} ms "
+                            f"(budget {budget_ms:.1f} ms)")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS),
+                        help="Entry points to measure (default: all known)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero on a forbidden import or budget overrun")
+    parser.add_argument("--budget-ms", type=float, default=float("inf"),
+                        help="Import time budget for light entry points")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.repeats)
+    for module, result in results.items():
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"  {module:<46} {result['import_ms']:9.1f} ms  heavy: {heavy}")
+
+    if args.check:
+        problems = find_regressions(results, args.budget_ms)
+        for problem in problems:
+            print(f"  REGRESSION: {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark Kalman filtering throughput for many concurrent scan sessions.
+
+Simulates SESSIONS sessions streaming 10-D beta vectors at FPS frames per
+second and reports the time spent filtering one frame of every session for:
+
+- the dense matrix path of KalmanFilter (covariance_mode="dense")
+- the diagonal fast path of KalmanFilter (default configuration)
+- BatchedKalmanFilter updating all sessions in one vectorized step
+
+With ``--check`` the script exits non-zero when the diagonal or batched path
+is not faster than the dense path.
+
+Usage:
+    python -m vision_service.benchmarks.bench_kalman_filter --sessions 500 --fps 30
+    python -m vision_service.benchmarks.bench_kalman_filter --check
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from vision_service.filtering.kalman_filter import (
+    BatchedKalmanFilter,
+    KalmanFilter,
+    KalmanFilterConfig,
+)
+
+
+def _time_frames(step: Callable[[np.ndarray], None], frames: np.ndarray) -> float:
+    """Run step over every frame and return mean seconds per frame."""
+    step(frames[0])  # initialize filters outside the timed region
+    start = time.perf_counter()
+    for frame in frames[1:]:
+        step(frame)
+    return (time.perf_counter() - start) / (len(frames) - 1)
+
+
+def run_benchmark(sessions: int = 500, fps: float = 30.0, seconds: float = 2.0,
+                  seed: int = 0) -> Dict[str, float]:
+    """
+    Measure per-frame filtering cost for all sessions.
+
+    Args:
+        sessions: Number of concurrent sessions.
+        fps: Capture frame rate of each session.
+        seconds: Length of the simulated capture.
+        seed: Random seed for the synthetic measurements.
+
+    Returns:
+        Mapping of method name to mean seconds per frame (all sessions).
+    """
+    rng = np.random.default_rng(seed)
+    num_frames = max(int(fps * seconds), 2)
+    frames = rng.normal(size=(num_frames, sessions, 10))
+
+    results = {}
+
+    for name, mode in (("dense", "dense"), ("diagonal", "auto")):
+        config = KalmanFilterConfig(covariance_mode=mode)
+        filters = [KalmanFilter(config) for _ in range(sessions)]
+
+        def step(frame, filters=filters):
+            for kf, measurement in zip(filters, frame):
+                kf.update(measurement)
+
+        results[name] = _time_frames(step, frames)
+
+    batched = BatchedKalmanFilter(capacity=sessions)
+    slots = [batched.add_session() for _ in range(sessions)]
+    results["batched"] = _time_frames(lambda frame: batched.update(slots, frame), frames)
+
+    return results
+
+
+def find_regressions(results: Dict[str, float]) -> List[str]:
+    """List fast paths that are not faster than the dense path."""
+    return [
+        f"{name} path ({results[name] * 1e3:.2f} ms/frame) is not faster than "
+        f"dense ({results['dense'] * 1e3:.2f} ms/frame)"
+        for name in ("diagonal", "batched")
+        if results[name] >= results["dense"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if a fast path is slower than dense")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sessions, args.fps, args.seconds)
+    budget = 1.0 / args.fps
+
+    print(f"{args.sessions} sessions @ {args.fps:g} fps "
+          f"(frame budget {budget * 1e3:.1f} ms)")
+    for name, per_frame in results.items():
+        speedup = results["dense"] / per_frame
+        print(f"  {name:<10} {per_frame * 1e3:8.2f} ms/frame  "
+              f"{per_frame / budget:6.1%} of budget  {speedup:5.1f}x vs dense")
+
+    if args.check:
+        problems = find_regressions(results)
+        for problem in problems:
+            print(f"  REGRESSION: {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,8 @@ from dataclasses import dataclass, field
 from typing import Optional, List
 import numpy as np
 
+from vision_service.filtering.rolling import RollingStatistics
+
 
 @dataclass
 class StabilityMetrics:
@@ -108,8 +110,8 @@ class CalibrationLock:
         self._window_size = window_size
         self._min_measurements = min_measurements
 
-        # State tracking
-        self._measurements: List[float] = []
+        # State tracking (sliding window with incremental mean/variance)
+        self._measurements = RollingStatistics(window_size)
         self._stable_frame_count = 0
         self._is_locked = False
         self._locked_scale: Optional[float] = None
@@ -148,12 +150,8 @@ class CalibrationLock:
                 "Calibration is locked. Call reset() to start new calibration cycle."
             )
 
-        # Add measurement to window
-        self._measurements.append(float(scale_factor))
-
-        # Keep only the most recent measurements (sliding window)
-        if len(self._measurements) > self._window_size:
-            self._measurements = self._measurements[-self._window_size:]
+        # Add measurement to the sliding window
+        self._measurements.push(float(scale_factor))
 
         # Calculate metrics
         cv = self._calculate_coefficient_of_variation()
@@ -169,7 +167,7 @@ class CalibrationLock:
         # Check if we should lock
         if self._stable_frame_count >= self._stable_frame_threshold:
             self._is_locked = True
-            self._locked_scale = float(np.mean(self._measurements))
+            self._locked_scale = float(self._measurements.mean)
 
         # Generate stability feedback score
         stability_score = self._calculate_stability_score(cv, is_stable)
@@ -193,7 +191,7 @@ class CalibrationLock:
         Clears all measurements and counters. The calibration lock can then
         be recomputed with new measurements.
         """
-        self._measurements = []
+        self._measurements.clear()
         self._stable_frame_count = 0
         self._is_locked = False
         self._locked_scale = None
@@ -251,9 +249,8 @@ class CalibrationLock:
         if len(self._measurements) < self._min_measurements:
             return 0.0
 
-        measurements_array = np.array(self._measurements)
-        mean = np.mean(measurements_array)
-        std_dev = np.std(measurements_array)
+        mean = float(self._measurements.mean)
+        std_dev = float(self._measurements.std)
 
         # Avoid division by zero
         if mean == 0:
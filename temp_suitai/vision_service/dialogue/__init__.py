@@ -4,6 +4,13 @@ Dialogue Module for SUIT AI Voice Assistant
 Provides function tools for Claude AI to interact with the calibration system.
 """
 
-from vision_service.dialogue.calibration_tools import CalibrationTools, CalibrationToolResult
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "vision_service.dialogue.calibration_tools": [
+        "CalibrationTools",
+        "CalibrationToolResult",
+    ],
+})
 
 __all__ = ["CalibrationTools", "CalibrationToolResult"]
@@ -8,14 +8,30 @@ Provides:
 - Rotation speed monitoring
 """
 
-from vision_service.filtering.measurement_lock import (
-    MeasurementLock,
-    MeasurementLockConfig,
-    MeasurementLockState,
-)
-from vision_service.filtering.speed_monitor import RotationSpeedMonitor
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "vision_service.filtering.geometric_median": [
+        "GeometricMedianResult",
+        "batch_geometric_median",
+        "geometric_median",
+    ],
+    "vision_service.filtering.measurement_lock": [
+        "MeasurementLock",
+        "MeasurementLockConfig",
+        "MeasurementLockState",
+        "finalize_pending_locks",
+    ],
+    "vision_service.filtering.speed_monitor": [
+        "RotationSpeedMonitor",
+    ],
+})
 
 __all__ = [
+    "GeometricMedianResult",
+    "batch_geometric_median",
+    "geometric_median",
+    "finalize_pending_locks",
     "MeasurementLock",
     "MeasurementLockConfig",
     "MeasurementLockState",
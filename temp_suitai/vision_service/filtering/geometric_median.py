@@ -0,0 +1,252 @@
+"""
+Geometric median solver for measurement locking.
+
+Implements Weiszfeld's algorithm with:
+- Vardi-Zhang modification, so iterates that land on a data point neither
+  divide by zero nor get stuck there
+- SQUAREM extrapolation with an objective safeguard, which cuts iteration
+  counts sharply on slowly converging (e.g. elongated) point sets
+- Warm starts from a previous estimate
+- A batched solve over many point sets padded into one (B, N, D) array, so
+  many sessions locking at once share a single vectorized loop
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import time
+import numpy as np
+
+
+@dataclass
+class GeometricMedianResult:
+    """Result of a geometric median solve."""
+
+    median: np.ndarray
+    """Geometric median, shape (D,)."""
+
+    iterations: int
+    """Number of iterations performed."""
+
+    converged: bool
+    """Whether the step size fell below the tolerance."""
+
+    elapsed_seconds: float
+    """Wall time of the solve (shared by all sets of a batched solve)."""
+
+
+def _weiszfeld_map(
+    points: np.ndarray, weights: np.ndarray, estimate: np.ndarray, eps: float
+) -> np.ndarray:
+    """One Vardi-Zhang modified Weiszfeld step for each padded point set."""
+    diff = points - estimate[:, None, :]
+    dist = np.linalg.norm(diff, axis=2)
+    coincident = dist < eps
+
+    # Weight of data points sitting on the current estimate
+    eta = np.sum(weights * coincident, axis=1)
+    inv = np.where(coincident, 0.0, weights / np.maximum(dist, eps))
+    inv_sum = inv.sum(axis=1)
+    has_others = inv_sum > 0
+
+    # Plain Weiszfeld target T(y) and the step towards it
+    target = np.einsum("bn,bnd->bd", inv, points) / np.where(has_others, inv_sum, 1.0)[:, None]
+    step = target - estimate
+
+    # On a data point, shrink the step by eta / ||R(y)||, R(y) = inv_sum * (T(y) - y);
+    # if ||R(y)|| <= eta the estimate is already optimal
+    r = inv_sum * np.linalg.norm(step, axis=1)
+    factor = np.where(eta > 0, np.maximum(0.0, 1.0 - eta / np.maximum(r, eps)), 1.0)
+    factor = np.where(has_others, factor, 0.0)
+
+    return estimate + factor[:, None] * step
+
+
+def _objective(points: np.ndarray, weights: np.ndarray, estimate: np.ndarray) -> np.ndarray:
+    """Weighted sum of distances from each estimate to its point set."""
+    return np.sum(weights * np.linalg.norm(points - estimate[:, None, :], axis=2), axis=1)
+
+
+def _solve_padded(
+    points: np.ndarray,
+    mask: np.ndarray,
+    initial: Optional[np.ndarray],
+    max_iterations: int,
+    tolerance: float,
+    eps: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run the accelerated Weiszfeld iteration on padded point sets.
+
+    Each cycle takes two modified Weiszfeld steps and extrapolates along them
+    (SQUAREM, Varadhan & Roland 2008). The extrapolated point is used only if
+    it does not increase the objective, otherwise the cycle falls back to the
+    second plain step, so every cycle is a descent step.
+
+    Args:
+        points: Array of shape (B, N, D).
+        mask: Boolean array of shape (B, N) marking valid points.
+        initial: Optional starting estimates of shape (B, D).
+
+    Returns:
+        Tuple of (medians (B, D), iterations (B,), converged (B,)), where
+        iterations counts Weiszfeld steps.
+    """
+    weights = mask.astype(np.float64)
+    counts = weights.sum(axis=1)
+
+    if initial is None:
+        estimate = np.einsum("bn,bnd->bd", weights, points) / counts[:, None]
+    else:
+        estimate = np.array(initial, dtype=np.float64, copy=True)
+
+    iterations = np.zeros(points.shape[0], dtype=np.int64)
+    converged = np.zeros(points.shape[0], dtype=bool)
+
+    while True:
+        idx = np.flatnonzero(~converged & (iterations < max_iterations))
+        if idx.size == 0:
+            break
+
+        pts = points[idx]
+        w = weights[idx]
+        y0 = estimate[idx]
+
+        y1 = _weiszfeld_map(pts, w, y0, eps)
+        y2 = _weiszfeld_map(pts, w, y1, eps)
+        iterations[idx] += 2
+
+        r = y1 - y0
+        v = (y2 - y1) - r
+        r_norm = np.linalg.norm(r, axis=1)
+        v_norm = np.linalg.norm(v, axis=1)
+
+        # Step length alpha <= -1; alpha = -1 reproduces y2
+        alpha = np.minimum(-r_norm / np.maximum(v_norm, np.finfo(float).tiny), -1.0)
+        extrapolated = y0 - 2.0 * alpha[:, None] * r + (alpha ** 2)[:, None] * v
+
+        accept = np.all(np.isfinite(extrapolated), axis=1)
+        accept &= _objective(pts, w, np.where(accept[:, None], extrapolated, y2)) <= _objective(pts, w, y2)
+        new_y = np.where(accept[:, None], extrapolated, y2)
+
+        estimate[idx] = new_y
+        done = (r_norm < tolerance) | (np.linalg.norm(new_y - y0, axis=1) < tolerance)
+        converged[idx[done]] = True
+
+    return estimate, iterations, converged
+
+
+def geometric_median(
+    points: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+    eps: float = 1e-10,
+) -> GeometricMedianResult:
+    """
+    Compute the geometric median of a point set.
+
+    Args:
+        points: Array of shape (N, D) with N >= 1.
+        initial: Starting estimate of shape (D,). Defaults to the mean.
+        max_iterations: Maximum number of iterations.
+        tolerance: Stop when an iteration moves the estimate less than this.
+        eps: Distance below which a point is treated as coinciding with the
+            estimate.
+
+    Returns:
+        GeometricMedianResult with the median and solve statistics.
+
+    Raises:
+        ValueError: If points is not a non-empty 2D array.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[0] == 0:
+        raise ValueError(f"Expected non-empty (N, D) array, got shape {points.shape}")
+
+    start = time.perf_counter()
+    medians, iterations, converged = _solve_padded(
+        points[None],
+        np.ones((1, points.shape[0]), dtype=bool),
+        None if initial is None else np.asarray(initial)[None],
+        max_iterations,
+        tolerance,
+        eps,
+    )
+    return GeometricMedianResult(
+        median=medians[0],
+        iterations=int(iterations[0]),
+        converged=bool(converged[0]),
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+
+def batch_geometric_median(
+    point_sets: Sequence[np.ndarray],
+    initial: Optional[Sequence[Optional[np.ndarray]]] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+    eps: float = 1e-10,
+) -> List[GeometricMedianResult]:
+    """
+    Compute geometric medians of many point sets in one vectorized solve.
+
+    Point sets may have different sizes; they are padded into a single
+    (B, N_max, D) array with a validity mask. Each set stops iterating as soon
+    as it converges.
+
+    Args:
+        point_sets: Sequence of arrays of shape (N_i, D), all with the same D.
+        initial: Optional per-set starting estimates (None entries use the mean).
+        max_iterations: Maximum number of iterations.
+        tolerance: Stop when an iteration moves an estimate less than this.
+        eps: Distance below which a point coincides with an estimate.
+
+    Returns:
+        One GeometricMedianResult per point set, in input order.
+
+    Raises:
+        ValueError: If a set is empty or dimensions differ.
+    """
+    if len(point_sets) == 0:
+        return []
+
+    arrays = [np.asarray(p, dtype=np.float64) for p in point_sets]
+    dim = arrays[0].shape[-1]
+    for p in arrays:
+        if p.ndim != 2 or p.shape[0] == 0 or p.shape[1] != dim:
+            raise ValueError(
+                f"Expected non-empty (N, {dim}) arrays, got shape {p.shape}"
+            )
+    if initial is not None and len(initial) != len(arrays):
+        raise ValueError(f"Expected {len(arrays)} initial estimates, got {len(initial)}")
+
+    start = time.perf_counter()
+
+    max_points = max(p.shape[0] for p in arrays)
+    points = np.zeros((len(arrays), max_points, dim))
+    mask = np.zeros((len(arrays), max_points), dtype=bool)
+    for i, p in enumerate(arrays):
+        points[i, :p.shape[0]] = p
+        mask[i, :p.shape[0]] = True
+
+    init = None
+    if initial is not None:
+        counts = mask.sum(axis=1)
+        init = points.sum(axis=1) / counts[:, None]
+        for i, guess in enumerate(initial):
+            if guess is not None:
+                init[i] = guess
+
+    medians, iterations, converged = _solve_padded(
+        points, mask, init, max_iterations, tolerance, eps
+    )
+    elapsed = time.perf_counter() - start
+
+    return [
+        GeometricMedianResult(
+            median=medians[i],
+            iterations=int(iterations[i]),
+            converged=bool(converged[i]),
+            elapsed_seconds=elapsed,
+        )
+        for i in range(len(arrays))
+    ]
@@ -5,19 +5,24 @@ of 10-dimensional beta vectors used in SMPL/SMPL-X body model parameter estimati
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 
 import numpy as np
 
+from vision_service.timing import Timestamp, monotonic, to_isoformat, to_seconds
+
 
 @dataclass
 class KalmanState:
-    """State of the Kalman filter at a given time step."""
+    """State of the Kalman filter at a given time step.
+
+    The timestamp is float seconds on the monotonic clock (see
+    vision_service.timing).
+    """
 
     state_vector: np.ndarray
     covariance: np.ndarray
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=monotonic)
 
     def __post_init__(self):
         """Validate state vector and covariance dimensions."""
@@ -30,6 +35,28 @@ class KalmanState:
         if not np.allclose(self.covariance, self.covariance.T):
             raise ValueError("covariance must be symmetric")
 
+    @classmethod
+    def _view(
+        cls, state_vector: np.ndarray, covariance: np.ndarray, timestamp: float
+    ) -> "KalmanState":
+        """Wrap arrays owned by a filter without copying or re-validating them."""
+        state = cls.__new__(cls)
+        state.state_vector = state_vector
+        state.covariance = covariance
+        state.timestamp = timestamp
+        return state
+
+    def to_dict(self) -> dict:
+        """Convert state to dictionary (for serialization)."""
+        return {
+            "state_vector": self.state_vector.tolist(),
+            "covariance": self.covariance.tolist(),
+            "timestamp": to_isoformat(self.timestamp),
+        }
+
+
+COVARIANCE_MODES = ("auto", "diagonal", "dense")
+
 
 @dataclass
 class KalmanFilterConfig:
@@ -42,11 +69,22 @@ class KalmanFilterConfig:
             Higher values trust measurements less. Default: 0.1
         initial_state_uncertainty: Initial diagonal value for state covariance.
             Higher values represent more initial uncertainty. Default: 1.0
+        process_noise: Optional full 10x10 process noise covariance. Overrides
+            process_noise_scale when given. Default: None
+        measurement_noise: Optional full 10x10 measurement noise covariance.
+            Overrides measurement_noise_scale when given. Default: None
+        covariance_mode: "auto" tracks per-dimension variances when the motion
+            model and noise matrices are all diagonal and a dense covariance
+            otherwise; "diagonal" requires the diagonal case; "dense" always
+            uses the full matrix path. Default: "auto"
     """
 
     process_noise_scale: float = 0.01
     measurement_noise_scale: float = 0.1
     initial_state_uncertainty: float = 1.0
+    process_noise: Optional[np.ndarray] = None
+    measurement_noise: Optional[np.ndarray] = None
+    covariance_mode: str = "auto"
 
     def __post_init__(self):
         """Validate configuration parameters."""
@@ -56,6 +94,33 @@ class KalmanFilterConfig:
             raise ValueError("measurement_noise_scale must be positive")
         if self.initial_state_uncertainty <= 0:
             raise ValueError("initial_state_uncertainty must be positive")
+        for name in ("process_noise", "measurement_noise"):
+            matrix = getattr(self, name)
+            if matrix is None:
+                continue
+            matrix = np.asarray(matrix, dtype=float)
+            if matrix.shape != (10, 10):
+                raise ValueError(f"{name} must be 10x10 matrix")
+            if not np.allclose(matrix, matrix.T):
+                raise ValueError(f"{name} must be symmetric")
+            setattr(self, name, matrix)
+        if self.covariance_mode not in COVARIANCE_MODES:
+            raise ValueError(f"covariance_mode must be one of {COVARIANCE_MODES}")
+
+    def noise_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Build the process and measurement noise covariances (Q, R)."""
+        Q = self.process_noise
+        if Q is None:
+            Q = self.process_noise_scale * np.eye(10)
+        R = self.measurement_noise
+        if R is None:
+            R = self.measurement_noise_scale * np.eye(10)
+        return Q.copy(), R.copy()
+
+
+def _is_diagonal(matrix: np.ndarray) -> bool:
+    """Check whether a square matrix has no off-diagonal entries."""
+    return not np.any(matrix - np.diag(np.diagonal(matrix)))
 
 
 class KalmanFilter:
@@ -65,9 +130,15 @@ class KalmanFilter:
     (beta vector) and its uncertainty. It uses a simple constant-velocity motion model
     and provides both filtered state estimates and uncertainty estimates.
 
+    When F, H, Q and R are all diagonal (the default configuration), the state
+    covariance stays diagonal and the filter only tracks per-dimension variances,
+    so each update is O(D) elementwise arithmetic. Non-diagonal configurations use
+    the dense matrix path.
+
     Attributes:
         state: Current filtered state estimate
         covariance: Current state covariance (uncertainty)
+        diagonal: Whether the per-dimension variance fast path is in use
     """
 
     def __init__(self, config: Optional[KalmanFilterConfig] = None):
@@ -75,8 +146,13 @@ class KalmanFilter:
 
         Args:
             config: Filter configuration. If None, uses default KalmanFilterConfig.
+
+        Raises:
+            ValueError: If covariance_mode is "diagonal" but the configured
+                matrices are not diagonal.
         """
         self.config = config or KalmanFilterConfig()
+        self.diagonal = False
         self.state = None
         self.covariance = None
         self._initialized = False
@@ -98,17 +174,57 @@ class KalmanFilter:
         # Measurement matrix (direct measurement of all state components)
         self.H = np.eye(10)
 
-        # Process noise covariance
-        self.Q = (
-            self.config.process_noise_scale * np.eye(10)
-        )
+        # Process and measurement noise covariances
+        self.Q, self.R = self.config.noise_matrices()
 
-        # Measurement noise covariance
-        self.R = (
-            self.config.measurement_noise_scale * np.eye(10)
-        )
+        is_diagonal = all(_is_diagonal(m) for m in (self.F, self.H, self.Q, self.R))
+        mode = self.config.covariance_mode
+        if mode == "diagonal" and not is_diagonal:
+            raise ValueError(
+                "covariance_mode 'diagonal' requires diagonal F, H, Q and R matrices"
+            )
+        # Configured mode; assigning a full covariance leaves it until reset()
+        self._diagonal_model = is_diagonal and mode != "dense"
+        self.diagonal = self._diagonal_model
+
+        # Per-dimension coefficients for the diagonal fast path
+        self._f = np.diagonal(self.F).copy()
+        self._h = np.diagonal(self.H).copy()
+        self._q = np.diagonal(self.Q).copy()
+        self._r = np.diagonal(self.R).copy()
+
+    @property
+    def covariance(self) -> Optional[np.ndarray]:
+        """Current 10x10 state covariance, or None if not initialized.
 
-    def update(self, measurement: np.ndarray) -> KalmanState:
+        In diagonal mode this is a read-only array built from the variances;
+        assign a new matrix to change it.
+        """
+        if self.diagonal:
+            if self._variances is None:
+                return None
+            covariance = np.diag(self._variances)
+            covariance.setflags(write=False)
+            return covariance
+        return self._covariance
+
+    @covariance.setter
+    def covariance(self, value: Optional[np.ndarray]) -> None:
+        self._covariance = None
+        self._variances = None
+        if value is None:
+            return
+        if self.diagonal and _is_diagonal(value):
+            self._variances = np.diagonal(value).copy()
+        else:
+            # A full covariance cannot be represented by variances alone;
+            # the dense path is used until reset()
+            self.diagonal = False
+            self._covariance = value
+
+    def update(
+        self, measurement: np.ndarray, timestamp: Optional[Timestamp] = None
+    ) -> KalmanState:
         """Update filter with a new measurement.
 
         Performs the measurement update step of the Kalman filter, incorporating
@@ -116,6 +232,8 @@ class KalmanFilter:
 
         Args:
             measurement: 10-dimensional measurement vector.
+            timestamp: Capture time of the measurement, as monotonic seconds or
+                a datetime. Defaults to the current monotonic time.
 
         Returns:
             Updated KalmanState with filtered estimate and uncertainty.
@@ -126,6 +244,8 @@ class KalmanFilter:
         if measurement.shape != (10,):
             raise ValueError("measurement must be a 10-dimensional array")
 
+        t = monotonic() if timestamp is None else to_seconds(timestamp)
+
         if not self._initialized:
             # First measurement - initialize state
             self.state = measurement.copy()
@@ -134,10 +254,12 @@ class KalmanFilter:
             )
             self._initialized = True
             self.update_count = 1
-            return KalmanState(
-                state_vector=self.state.copy(),
-                covariance=self.covariance.copy()
-            )
+            return self._current_state(t)
+
+        if self.diagonal:
+            self._update_diagonal(measurement)
+            self.update_count += 1
+            return self._current_state(t)
 
         # Prediction step (without explicit velocity, just use previous state)
         predicted_state = self.F @ self.state
@@ -165,9 +287,36 @@ class KalmanFilter:
 
         self.update_count += 1
 
+        return self._current_state(t)
+
+    def _update_diagonal(self, measurement: np.ndarray) -> None:
+        """Predict/update step for diagonal F, H, Q, R using per-dimension variances."""
+        f, h, q, r = self._f, self._h, self._q, self._r
+
+        predicted_state = f * self.state
+        predicted_var = f * f * self._variances + q
+
+        innovation = measurement - h * predicted_state
+        innovation_var = h * h * predicted_var + r
+        gain = predicted_var * h / innovation_var
+
+        self.state = predicted_state + gain * innovation
+
+        # Joseph form, elementwise
+        one_minus_kh = 1.0 - gain * h
+        self._variances = one_minus_kh * one_minus_kh * predicted_var + gain * gain * r
+
+    def _current_state(self, timestamp: float) -> KalmanState:
+        """Snapshot the current estimate as a KalmanState."""
+        if self.diagonal:
+            # Diagonal covariance is symmetric by construction
+            return KalmanState._view(
+                self.state.copy(), np.diag(self._variances), timestamp
+            )
         return KalmanState(
             state_vector=self.state.copy(),
-            covariance=self.covariance.copy()
+            covariance=self.covariance.copy(),
+            timestamp=timestamp,
         )
 
     def predict(self) -> KalmanState:
@@ -185,6 +334,13 @@ class KalmanFilter:
         if not self._initialized:
             raise RuntimeError("Filter must be initialized with measurement before prediction")
 
+        if self.diagonal:
+            return KalmanState._view(
+                self._f * self.state,
+                np.diag(self._f * self._f * self._variances + self._q),
+                monotonic(),
+            )
+
         # Prediction step
         predicted_state = self.F @ self.state
         predicted_covariance = self.F @ self.covariance @ self.F.T + self.Q
@@ -208,6 +364,8 @@ class KalmanFilter:
         if not self._initialized:
             raise RuntimeError("Filter must be initialized with measurement before getting uncertainty")
 
+        if self.diagonal:
+            return np.sqrt(self._variances)
         return np.sqrt(np.diag(self.covariance))
 
     def get_state(self) -> Optional[np.ndarray]:
@@ -222,8 +380,10 @@ class KalmanFilter:
         """Reset filter for a new session.
 
         Clears all internal state, allowing the filter to be reused for
-        a new sequence of measurements.
+        a new sequence of measurements. Restores the configured covariance
+        mode if a full covariance was assigned.
         """
+        self.diagonal = self._diagonal_model
         self.state = None
         self.covariance = None
         self._initialized = False
@@ -243,7 +403,9 @@ class KalmanFilter:
         Returns:
             Current 10x10 covariance matrix, or None if not initialized.
         """
-        return self.covariance.copy() if self._initialized else None
+        if not self._initialized:
+            return None
+        return self.covariance.copy()
 
     @property
     def mean_uncertainty(self) -> float:
@@ -268,3 +430,281 @@ class KalmanFilter:
             RuntimeError: If filter has not been initialized.
         """
         return float(np.max(self.get_uncertainty()))
+
+
+class BatchedKalmanFilter:
+    """Kalman filter for many concurrent sessions of 10-dimensional beta vectors.
+
+    Uses the same motion model as KalmanFilter, but keeps the state and
+    covariance of every session in contiguous ``(N, 10)`` and ``(N, 10, 10)``
+    arrays so that all sessions receiving a measurement are updated in a single
+    vectorized step. The Kalman gain is obtained through a Cholesky
+    factorization of the innovation covariance rather than an explicit inverse.
+
+    Sessions occupy fixed slots; use add_session() to claim one and
+    evict_session() to release it for reuse.
+
+    Attributes:
+        capacity: Maximum number of concurrent sessions.
+        states: ``(capacity, 10)`` array of filtered state estimates.
+        covariances: ``(capacity, 10, 10)`` array of state covariances.
+        timestamps: ``(capacity,)`` monotonic seconds of each session's last
+            update (NaN before the first measurement).
+    """
+
+    STATE_DIM = 10
+
+    def __init__(self, capacity: int, config: Optional[KalmanFilterConfig] = None):
+        """Initialize batched Kalman filter.
+
+        Args:
+            capacity: Maximum number of concurrent sessions.
+            config: Filter configuration shared by all sessions. If None, uses
+                default KalmanFilterConfig.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.config = config or KalmanFilterConfig()
+        self.capacity = capacity
+
+        d = self.STATE_DIM
+        self.states = np.zeros((capacity, d))
+        self.covariances = np.zeros((capacity, d, d))
+        self.update_counts = np.zeros(capacity, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._initialized = np.zeros(capacity, dtype=bool)
+        # Monotonic seconds of each session's last update (NaN if none)
+        self.timestamps = np.full(capacity, np.nan)
+
+        self._setup_motion_model()
+
+    def _setup_motion_model(self) -> None:
+        """Set up state transition and measurement matrices (see KalmanFilter)."""
+        d = self.STATE_DIM
+        self.F = np.eye(d)
+        self.H = np.eye(d)
+        self.Q, self.R = self.config.noise_matrices()
+        self._identity = np.eye(d)
+        self._initial_covariance = self.config.initial_state_uncertainty * np.eye(d)
+
+    def add_session(self, slot: Optional[int] = None) -> int:
+        """Claim a slot for a new session.
+
+        Args:
+            slot: Specific slot to claim. If None, the lowest free slot is used.
+
+        Returns:
+            Index of the claimed slot.
+
+        Raises:
+            ValueError: If the requested slot is out of range or already active.
+            RuntimeError: If no free slot is available.
+        """
+        if slot is None:
+            free = np.flatnonzero(~self._active)
+            if free.size == 0:
+                raise RuntimeError("No free session slots available")
+            slot = int(free[0])
+        else:
+            self._check_slot(slot)
+            if self._active[slot]:
+                raise ValueError(f"Slot {slot} is already active")
+
+        self._clear_slot(slot)
+        self._active[slot] = True
+        return slot
+
+    def evict_session(self, slot: int) -> None:
+        """Release a session slot so it can be reused.
+
+        Args:
+            slot: Slot to release.
+
+        Raises:
+            ValueError: If the slot is out of range or not active.
+        """
+        self._check_active(slot)
+        self._clear_slot(slot)
+        self._active[slot] = False
+
+    def reset_session(self, slot: int) -> None:
+        """Reset an active session so its next measurement re-initializes it.
+
+        Args:
+            slot: Slot to reset.
+
+        Raises:
+            ValueError: If the slot is out of range or not active.
+        """
+        self._check_active(slot)
+        self._clear_slot(slot)
+
+    def update(
+        self,
+        slots: Sequence[int],
+        measurements: np.ndarray,
+        timestamp: Optional[Timestamp] = None,
+    ) -> np.ndarray:
+        """Update a set of sessions with one measurement each.
+
+        Sessions that have not yet received a measurement are initialized from
+        it, exactly as KalmanFilter.update does for its first measurement.
+
+        Args:
+            slots: Active slot indices, one per measurement. Must be unique.
+            measurements: Array of shape ``(len(slots), 10)``.
+            timestamp: Capture time of the batch, as monotonic seconds or a
+                datetime. Defaults to the current monotonic time.
+
+        Returns:
+            Filtered states of the updated sessions, shape ``(len(slots), 10)``.
+
+        Raises:
+            ValueError: If shapes do not match, slots repeat, or a slot is not
+                active.
+        """
+        slots = np.asarray(slots, dtype=np.intp).reshape(-1)
+        measurements = np.asarray(measurements, dtype=float)
+        if measurements.shape != (slots.size, self.STATE_DIM):
+            raise ValueError(
+                f"measurements must have shape ({slots.size}, {self.STATE_DIM}), "
+                f"got {measurements.shape}"
+            )
+        if slots.size == 0:
+            return np.zeros((0, self.STATE_DIM))
+        if np.unique(slots).size != slots.size:
+            raise ValueError("slots must be unique")
+        if slots.min() < 0 or slots.max() >= self.capacity:
+            raise ValueError(f"slots must be in range [0, {self.capacity})")
+        if not np.all(self._active[slots]):
+            raise ValueError("All slots must be active sessions")
+
+        t = monotonic() if timestamp is None else to_seconds(timestamp)
+        first = ~self._initialized[slots]
+
+        if np.any(first):
+            new_slots = slots[first]
+            self.states[new_slots] = measurements[first]
+            self.covariances[new_slots] = self._initial_covariance
+            self._initialized[new_slots] = True
+
+        if not np.all(first):
+            self._filter_step(slots[~first], measurements[~first])
+
+        self.update_counts[slots] += 1
+        self.timestamps[slots] = t
+
+        return self.states[slots]
+
+    def _filter_step(self, slots: np.ndarray, measurements: np.ndarray) -> None:
+        """Run the predict/update step for initialized sessions in one batch."""
+        F, H, Q, R = self.F, self.H, self.Q, self.R
+
+        # Prediction step
+        predicted_state = self.states[slots] @ F.T
+        predicted_covariance = F @ self.covariances[slots] @ F.T + Q
+
+        # Innovation and its covariance
+        innovation = measurements - predicted_state @ H.T
+        HP = H @ predicted_covariance
+        innovation_cov = HP @ H.T + R
+
+        # Kalman gain K = P H^T S^-1, computed as K^T = S^-1 H P via Cholesky
+        chol = np.linalg.cholesky(innovation_cov)
+        gain_t = np.linalg.solve(
+            np.swapaxes(chol, -1, -2), np.linalg.solve(chol, HP)
+        )
+        kalman_gain = np.swapaxes(gain_t, -1, -2)
+
+        self.states[slots] = predicted_state + np.einsum(
+            "nij,nj->ni", kalman_gain, innovation
+        )
+
+        # Joseph form covariance update
+        I_minus_KH = self._identity - kalman_gain @ H
+        self.covariances[slots] = (
+            I_minus_KH @ predicted_covariance @ np.swapaxes(I_minus_KH, -1, -2)
+            + kalman_gain @ R @ gain_t
+        )
+
+    def get_state(self, slot: int) -> Optional[KalmanState]:
+        """Get the current state of a session as a KalmanState.
+
+        The returned state vector and covariance are views into the batch
+        arrays, so they reflect subsequent updates to the session. Copy them if
+        a snapshot is needed.
+
+        Args:
+            slot: Active session slot.
+
+        Returns:
+            KalmanState viewing the session's state, or None if the session has
+            not received a measurement yet.
+
+        Raises:
+            ValueError: If the slot is out of range or not active.
+        """
+        self._check_active(slot)
+        if not self._initialized[slot]:
+            return None
+        return KalmanState._view(
+            self.states[slot], self.covariances[slot], float(self.timestamps[slot])
+        )
+
+    def get_uncertainty(self, slot: int) -> np.ndarray:
+        """Get standard deviations of a session's state estimate.
+
+        Args:
+            slot: Active session slot.
+
+        Returns:
+            10-dimensional array of standard deviations.
+
+        Raises:
+            ValueError: If the slot is out of range or not active.
+            RuntimeError: If the session has not been initialized.
+        """
+        self._check_active(slot)
+        if not self._initialized[slot]:
+            raise RuntimeError("Filter must be initialized with measurement before getting uncertainty")
+        return np.sqrt(np.diagonal(self.covariances[slot]))
+
+    def is_initialized(self, slot: int) -> bool:
+        """Check if a session has received at least one measurement."""
+        self._check_active(slot)
+        return bool(self._initialized[slot])
+
+    def is_active(self, slot: int) -> bool:
+        """Check if a slot is currently claimed by a session."""
+        self._check_slot(slot)
+        return bool(self._active[slot])
+
+    @property
+    def active_slots(self) -> np.ndarray:
+        """Indices of all active session slots."""
+        return np.flatnonzero(self._active)
+
+    @property
+    def num_active(self) -> int:
+        """Number of active sessions."""
+        return int(np.count_nonzero(self._active))
+
+    def _clear_slot(self, slot: int) -> None:
+        self.states[slot] = 0.0
+        self.covariances[slot] = 0.0
+        self.update_counts[slot] = 0
+        self._initialized[slot] = False
+        self.timestamps[slot] = np.nan
+
+    def _check_slot(self, slot: int) -> None:
+        if not 0 <= slot < self.capacity:
+            raise ValueError(f"slot must be in range [0, {self.capacity}), got {slot}")
+
+    def _check_active(self, slot: int) -> None:
+        self._check_slot(slot)
+        if not self._active[slot]:
+            raise ValueError(f"Slot {slot} is not an active session")
@@ -7,19 +7,47 @@ This module implements measurement lock functionality that:
 - Locks measurements after 300 stable frames
 - Computes geometric median (robust to outliers)
 - Generates unique Universal Measurement ID
+
+Memory is bounded: only the most recent frames are retained (ring buffer) and
+the geometric median is estimated from a fixed-size reservoir sample of the
+whole stream, refined incrementally as frames arrive. At lock time the running
+estimate warm-starts an accelerated solve (see geometric_median); sessions can
+defer that solve and finalize many locks in one batch.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Tuple
 import hashlib
 import uuid
 import numpy as np
 
+from vision_service.timing import (
+    Timestamp,
+    monotonic,
+    to_datetime,
+    to_isoformat,
+    to_seconds,
+)
+from vision_service.filtering.geometric_median import (
+    GeometricMedianResult,
+    batch_geometric_median,
+    geometric_median,
+)
+from vision_service.filtering.rolling import (
+    ReservoirSample,
+    RingBuffer,
+    RollingStatistics,
+)
+
 
 @dataclass
 class MeasurementLockConfig:
-    """Configuration for measurement locking behavior."""
+    """Configuration for measurement locking behavior.
+
+    The locked geometric median is estimated from a random reservoir sample
+    once a session exceeds reservoir_size frames, so lock results are only
+    reproducible across runs with a fixed reservoir_seed.
+    """
 
     lock_frame_threshold: int = 300
     """Number of stable frames required to lock measurements."""
@@ -36,6 +64,33 @@ class MeasurementLockConfig:
     geometric_median_tolerance: float = 1e-6
     """Convergence tolerance for geometric median."""
 
+    max_retained_measurements: Optional[int] = None
+    """Most recent frames kept in memory (defaults to lock_frame_threshold)."""
+
+    reservoir_size: int = 256
+    """Size of the uniform frame sample used for the geometric median."""
+
+    reservoir_seed: Optional[int] = None
+    """Seed for reservoir sampling (None for nondeterministic)."""
+
+    defer_geometric_median: bool = False
+    """Leave the median solve pending at lock time so many sessions can be
+    finalized together with finalize_pending_locks()."""
+
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.max_retained_measurements is not None and self.max_retained_measurements <= 0:
+            raise ValueError("max_retained_measurements must be positive")
+        if self.reservoir_size <= 0:
+            raise ValueError("reservoir_size must be positive")
+
+    @property
+    def retention_capacity(self) -> int:
+        """Number of frames retained in the measurement ring buffer."""
+        if self.max_retained_measurements is not None:
+            return self.max_retained_measurements
+        return max(self.lock_frame_threshold, 1)
+
 
 @dataclass
 class MeasurementLockState:
@@ -50,14 +105,18 @@ class MeasurementLockState:
     stable_frame_count: int = 0
     """Number of consecutive stable frames."""
 
-    measurements: List[np.ndarray] = field(default_factory=list)
-    """All measurements collected in current lock cycle."""
+    measurements: RingBuffer = field(default_factory=lambda: RingBuffer(300))
+    """Most recent measurements collected in current lock cycle."""
 
-    locked_measurements: Optional[List[np.ndarray]] = None
-    """Measurements at time of lock (None until locked)."""
+    locked_measurements: Optional[np.ndarray] = None
+    """Retained measurements at time of lock, shape (N, D) (None until locked)."""
 
     geometric_median: Optional[np.ndarray] = None
-    """Geometric median of locked measurements (None until locked)."""
+    """Geometric median estimated from the reservoir sample of the session's
+    measurements (None until locked)."""
+
+    streaming_median: Optional[np.ndarray] = None
+    """Running approximate geometric median, updated every frame before lock."""
 
     universal_measurement_id: Optional[str] = None
     """Unique identifier for this measurement lock."""
@@ -68,15 +127,50 @@ class MeasurementLockState:
     confidence: float = 0.0
     """Overall confidence in locked measurement (0.0-1.0)."""
 
-    timestamp: datetime = field(default_factory=datetime.now)
-    """Timestamp when lock state was last updated."""
+    timestamp: float = field(default_factory=monotonic)
+    """Monotonic time (seconds) when lock state was last updated."""
 
     warnings: List[str] = field(default_factory=list)
-    """Diagnostic warnings or notes."""
+    """Distinct diagnostic warnings, in order of first occurrence."""
+
+    warning_counts: Dict[str, int] = field(default_factory=dict)
+    """Number of frames that raised each warning."""
 
     metadata: dict = field(default_factory=dict)
     """Additional metadata about the lock."""
 
+    def snapshot(self) -> "MeasurementLockState":
+        """Copy of the state that later updates do not modify.
+
+        Arrays that MeasurementLock replaces rather than modifies are shared.
+        """
+        return replace(
+            self,
+            measurements=self.measurements.copy(),
+            warnings=list(self.warnings),
+            warning_counts=dict(self.warning_counts),
+            metadata=dict(self.metadata),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert lock state to dictionary (for serialization)."""
+        return {
+            "is_locked": self.is_locked,
+            "frame_count": self.frame_count,
+            "stable_frame_count": self.stable_frame_count,
+            "geometric_median": (
+                self.geometric_median.tolist()
+                if self.geometric_median is not None else None
+            ),
+            "universal_measurement_id": self.universal_measurement_id,
+            "stability_score": self.stability_score,
+            "confidence": self.confidence,
+            "timestamp": to_isoformat(self.timestamp),
+            "warnings": list(self.warnings),
+            "warning_counts": dict(self.warning_counts),
+            "metadata": dict(self.metadata),
+        }
+
 
 class MeasurementLock:
     """
@@ -94,15 +188,28 @@ class MeasurementLock:
             config: Configuration object. Uses defaults if None.
         """
         self.config = config or MeasurementLockConfig()
-        self.state = MeasurementLockState()
-        self._stability_window: List[np.ndarray] = []
-
-    def add_measurement(self, measurement: np.ndarray) -> MeasurementLockState:
+        self.state = self._new_state()
+        self._stability_window = RollingStatistics(self.config.stability_window_size)
+        self._reservoir = ReservoirSample(
+            self.config.reservoir_size, seed=self.config.reservoir_seed
+        )
+        self._lock_pending = False
+
+    def _new_state(self) -> MeasurementLockState:
+        return MeasurementLockState(
+            measurements=RingBuffer(self.config.retention_capacity)
+        )
+
+    def add_measurement(
+        self, measurement: np.ndarray, timestamp: Optional[Timestamp] = None
+    ) -> MeasurementLockState:
         """
         Add a measurement and check lock criteria.
 
         Args:
             measurement: Measurement vector (typically 10D for beta parameters).
+            timestamp: Capture time of the frame, as monotonic seconds or a
+                datetime. Defaults to the current monotonic time.
 
         Returns:
             Current MeasurementLockState with lock status.
@@ -117,24 +224,24 @@ class MeasurementLock:
         if not np.isfinite(measurement).all():
             raise ValueError("Measurement contains NaN or infinite values")
 
-        # Add to measurements and update frame count
-        self.state.measurements.append(measurement.copy())
-        self.state.frame_count += 1
+        self.state.timestamp = monotonic() if timestamp is None else to_seconds(timestamp)
 
-        # Update stability window
-        self._stability_window.append(measurement)
-        if len(self._stability_window) > self.config.stability_window_size:
-            self._stability_window.pop(0)
+        # Retain recent frames and feed the median estimator until locked
+        if not self.state.is_locked:
+            self.state.measurements.append(measurement)
+            self._reservoir.add(measurement)
+            self._update_streaming_median()
+        self.state.frame_count += 1
 
-        # Update stability score
+        # Update stability window and score
         if not self.state.is_locked:
+            self._stability_window.push(measurement)
             self._update_stability()
 
         # Check if we should lock
         if not self.state.is_locked and self._should_lock():
             self._perform_lock()
 
-        self.state.timestamp = datetime.now()
         return self.state
 
     def _update_stability(self) -> None:
@@ -152,9 +259,8 @@ class MeasurementLock:
             return
 
         # Compute coefficient of variation for each dimension
-        measurements_array = np.array(self._stability_window)
-        means = np.mean(measurements_array, axis=0)
-        stds = np.std(measurements_array, axis=0)
+        means = self._stability_window.mean
+        stds = self._stability_window.std
 
         # Avoid division by zero
         cvs = np.divide(stds, np.abs(means) + 1e-10,
@@ -178,22 +284,68 @@ class MeasurementLock:
 
         # Add warning if CV is high
         if max_cv > self.config.cv_threshold * 2:
-            self.state.warnings.append(
-                f"High variation in frame {self.state.frame_count}: CV={max_cv:.4f}"
+            self._add_warning(
+                f"High variation: CV above {self.config.cv_threshold * 2:.4f}"
             )
+            self.state.metadata["last_high_cv"] = float(max_cv)
+            self.state.metadata["last_high_cv_frame"] = self.state.frame_count
+
+    def _add_warning(self, message: str) -> None:
+        """Record a warning once and count its occurrences."""
+        counts = self.state.warning_counts
+        if message not in counts:
+            self.state.warnings.append(message)
+            counts[message] = 0
+        counts[message] += 1
+
+    def _update_streaming_median(self) -> None:
+        """Advance the running geometric median by one Weiszfeld step over the reservoir."""
+        samples = self._reservoir.samples
+        if self.state.streaming_median is None:
+            self.state.streaming_median = samples[0].copy()
+            return
+        self.state.streaming_median = self._weiszfeld_step(
+            samples, self.state.streaming_median
+        )
+
+    @staticmethod
+    def _weiszfeld_step(points: np.ndarray, estimate: np.ndarray) -> np.ndarray:
+        """Single Weiszfeld iteration: inverse-distance weighted mean of points."""
+        distances = np.maximum(np.linalg.norm(points - estimate, axis=1), 1e-10)
+        weights = 1.0 / distances
+        return weights @ points / np.sum(weights)
 
     def _should_lock(self) -> bool:
         """Check if lock criteria are met."""
         return self.state.stable_frame_count >= self.config.lock_frame_threshold
 
+    @property
+    def lock_pending(self) -> bool:
+        """Whether the lock criteria were met but the median is not yet computed."""
+        return self._lock_pending
+
     def _perform_lock(self) -> None:
         """Lock measurements and compute geometric median."""
         self.state.is_locked = True
-        self.state.locked_measurements = self.state.measurements.copy()
+        self.state.locked_measurements = self.state.measurements.to_array()
+
+        if self.config.defer_geometric_median:
+            self._lock_pending = True
+            return
 
-        # Compute geometric median
-        measurements_array = np.array(self.state.locked_measurements, dtype=np.float64)
-        self.state.geometric_median = self._compute_geometric_median(measurements_array)
+        # Solve over the bounded reservoir sample, warm-started from the
+        # running estimate
+        self._finish_lock(geometric_median(
+            self._reservoir.samples,
+            initial=self.state.streaming_median,
+            max_iterations=self.config.geometric_median_iterations,
+            tolerance=self.config.geometric_median_tolerance,
+        ))
+
+    def _finish_lock(self, result: GeometricMedianResult) -> None:
+        """Store the median solve and derive the ID, confidence and metadata."""
+        self._lock_pending = False
+        self.state.geometric_median = result.median.astype(np.float32)
 
         # Generate unique ID
         self.state.universal_measurement_id = self._generate_measurement_id()
@@ -201,14 +353,20 @@ class MeasurementLock:
         # Compute confidence from stability
         self.state.confidence = min(self.state.stability_score, 1.0)
 
-        self.state.metadata = {
+        self.state.metadata.update({
             "num_measurements": len(self.state.locked_measurements),
             "frame_count_at_lock": self.state.frame_count,
             "stable_frames": self.state.stable_frame_count,
             "measurement_dimension": len(self.state.geometric_median),
-        }
-
-    def _compute_geometric_median(self, measurements: np.ndarray) -> np.ndarray:
+            "median_sample_size": len(self._reservoir),
+            "geometric_median_iterations": result.iterations,
+            "geometric_median_converged": result.converged,
+            "geometric_median_time_ms": result.elapsed_seconds * 1000.0,
+        })
+
+    def _compute_geometric_median(
+        self, measurements: np.ndarray, initial: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Compute geometric median of measurements.
 
@@ -218,40 +376,19 @@ class MeasurementLock:
         Args:
             measurements: Array of shape (N, D) where N is number of measurements
                          and D is the dimension.
+            initial: Optional starting estimate of shape (D,). Defaults to the
+                arithmetic mean.
 
         Returns:
             Geometric median as array of shape (D,).
         """
-        # Initialize with arithmetic mean
-        median = np.mean(measurements, axis=0)
-
-        # Weiszfeld's algorithm for geometric median
-        for iteration in range(self.config.geometric_median_iterations):
-            # Compute distances from median to all points
-            distances = np.linalg.norm(measurements - median, axis=1, keepdims=True)
-
-            # Avoid division by zero
-            distances = np.maximum(distances, 1e-10)
-
-            # Compute weights (inverse distances)
-            weights = 1.0 / distances
-            weight_sum = np.sum(weights)
-
-            if weight_sum < 1e-10:
-                break
-
-            # Compute weighted mean
-            weighted_sum = np.sum(weights * measurements, axis=0)
-            new_median = weighted_sum / weight_sum
-
-            # Check convergence
-            delta = np.linalg.norm(new_median - median)
-            median = new_median
-
-            if delta < self.config.geometric_median_tolerance:
-                break
-
-        return median.astype(np.float32)
+        result = geometric_median(
+            measurements,
+            initial=initial,
+            max_iterations=self.config.geometric_median_iterations,
+            tolerance=self.config.geometric_median_tolerance,
+        )
+        return result.median.astype(np.float32)
 
     def _generate_measurement_id(self) -> str:
         """
@@ -270,7 +407,7 @@ class MeasurementLock:
         data_hash = hashlib.sha256(measurements_bytes).hexdigest()[:12]
 
         # Add timestamp component
-        timestamp_str = self.state.timestamp.isoformat().replace(":", "").replace("-", "")[:14]
+        timestamp_str = to_datetime(self.state.timestamp).isoformat().replace(":", "").replace("-", "")[:14]
 
         # Add random component for true uniqueness
         random_id = str(uuid.uuid4())[:8]
@@ -282,10 +419,12 @@ class MeasurementLock:
 
     def reset(self) -> None:
         """Reset lock state for new measurement cycle."""
-        self.state = MeasurementLockState()
-        self._stability_window = []
+        self.state = self._new_state()
+        self._stability_window.clear()
+        self._reservoir.clear()
+        self._lock_pending = False
 
-    def get_locked_measurements(self) -> Optional[List[np.ndarray]]:
+    def get_locked_measurements(self) -> Optional[np.ndarray]:
         """Get the locked measurements buffer (if locked)."""
         return self.state.locked_measurements
 
@@ -305,3 +444,41 @@ class MeasurementLock:
             Tuple of (current_stable_frames, required_stable_frames).
         """
         return (self.state.stable_frame_count, self.config.lock_frame_threshold)
+
+
+def finalize_pending_locks(locks: Sequence[MeasurementLock]) -> int:
+    """
+    Compute the geometric medians of all pending locks in one batched solve.
+
+    Intended for locks configured with defer_geometric_median, so that many
+    sessions reaching their lock on the same frame share a single vectorized
+    Weiszfeld loop. Locks without a pending solve are ignored.
+
+    Args:
+        locks: Measurement locks to finalize.
+
+    Returns:
+        Number of locks finalized.
+    """
+    pending = [lock for lock in locks if lock.lock_pending]
+    if not pending:
+        return 0
+
+    # Group by solver settings so each batch honours its own config
+    groups: Dict[Tuple[int, float], List[MeasurementLock]] = {}
+    for lock in pending:
+        key = (lock.config.geometric_median_iterations,
+               lock.config.geometric_median_tolerance)
+        groups.setdefault(key, []).append(lock)
+
+    for (max_iterations, tolerance), group in groups.items():
+        results = batch_geometric_median(
+            [lock._reservoir.samples for lock in group],
+            initial=[lock.state.streaming_median for lock in group],
+            max_iterations=max_iterations,
+            tolerance=tolerance,
+        )
+        for lock, result in zip(group, results):
+            lock._finish_lock(result)
+
+    return len(pending)
@@ -11,10 +11,14 @@ Noisy Input in Interactive Systems", CHI 2012.
 """
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Sequence, Union
 import numpy as np
 
+from vision_service.timing import Timestamp, monotonic, to_isoformat, to_seconds
+
+
+_TWO_PI = 2.0 * np.pi
+
 
 @dataclass
 class OneEuroFilterConfig:
@@ -30,72 +34,142 @@ class OneEuroFilterState:
     """Internal state of a single OneEuro filter channel."""
     x: float = 0.0
     dx: float = 0.0
-    last_time: Optional[datetime] = None
+    last_time: Optional[float] = None
 
 
 class OneEuroFilter:
-    """One Euro filter for adaptive low-lag filtering of scalar values."""
+    """One Euro filter for adaptive low-lag filtering of scalar values.
+
+    Channel state (x, dx, last_time) is stored in NumPy arrays of shape
+    (channels,), so every call filters all channels in one vectorized step.
+    Channels are created on first use; a call with fewer values than known
+    channels updates only the leading channels.
+
+    Timestamps are float seconds on the monotonic clock (see
+    vision_service.timing); datetimes are accepted and converted.
+    """
 
     def __init__(self, config: OneEuroFilterConfig):
         self.config = config
-        self._state: Dict[int, OneEuroFilterState] = {}
-        self._start_time: Optional[datetime] = None
+        self._x = np.zeros(0)
+        self._dx = np.zeros(0)
+        # Monotonic seconds of each channel's last update
+        self._last_time = np.zeros(0)
+        self._start_time: Optional[float] = None
 
-    def filter(self, value: np.ndarray, timestamp: Optional[datetime] = None) -> np.ndarray:
+    def filter(self, value: np.ndarray, timestamp: Optional[Timestamp] = None) -> np.ndarray:
         if not isinstance(value, np.ndarray):
             value = np.array([value])
         if value.ndim > 1:
             raise ValueError(f"Expected 1D array, got shape {value.shape}")
-        if timestamp is None:
-            timestamp = datetime.now()
+        t = monotonic() if timestamp is None else to_seconds(timestamp)
         if self._start_time is None:
-            self._start_time = timestamp
-        filtered = np.zeros_like(value, dtype=float)
-        for i, v in enumerate(value):
-            filtered[i] = self._filter_channel(i, float(v), timestamp)
+            self._start_time = t
+        return self._filter_channels(value.astype(float), t)
+
+    def filter_batch(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[Sequence[Timestamp]] = None,
+    ) -> np.ndarray:
+        """Filter a sequence of frames, e.g. for offline replays.
+
+        Args:
+            values: Array of shape (T, channels), one row per frame.
+            timestamps: One timestamp per frame. If None, frames are assumed to
+                be spaced 1 / config.freq seconds apart starting now.
+
+        Returns:
+            Filtered array of shape (T, channels).
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(f"Expected 2D array, got shape {values.shape}")
+        if timestamps is not None and len(timestamps) != values.shape[0]:
+            raise ValueError(
+                f"Expected {values.shape[0]} timestamps, got {len(timestamps)}"
+            )
+
+        if timestamps is None:
+            times = monotonic() + np.arange(values.shape[0]) / self.config.freq
+        else:
+            times = np.array([to_seconds(ts) for ts in timestamps], dtype=float)
+        if self._start_time is None and len(times) > 0:
+            self._start_time = float(times[0])
+
+        filtered = np.empty_like(values)
+        for i, t in enumerate(times):
+            filtered[i] = self._filter_channels(values[i], float(t))
         return filtered
 
-    def _filter_channel(self, channel: int, value: float, timestamp: datetime) -> float:
-        if channel not in self._state:
-            self._state[channel] = OneEuroFilterState(x=value, dx=0.0, last_time=timestamp)
-            return value
-        state = self._state[channel]
-        dt = (timestamp - state.last_time).total_seconds()
-        if dt <= 0:
-            return state.x
-        cutoff_d = self.config.dcutoff
-        alpha_d = self._alpha(cutoff_d, dt)
-        dx = (value - state.x) / dt
-        state.dx = self._exponential_smooth(alpha_d, dx, state.dx)
-        cutoff = self.config.mincutoff + self.config.beta * abs(state.dx)
-        alpha = self._alpha(cutoff, dt)
-        state.x = self._exponential_smooth(alpha, value, state.x)
-        state.last_time = timestamp
-        return state.x
+    def _filter_channels(self, value: np.ndarray, t: float) -> np.ndarray:
+        n = value.shape[0]
+        known = min(n, self._x.shape[0])
+        filtered = np.empty(n)
+
+        if known:
+            x = self._x[:known]
+            dx_prev = self._dx[:known]
+            last = self._last_time[:known]
+            v = value[:known]
+
+            dt = t - last
+            active = dt > 0
+            if not active.all():
+                # Channels without elapsed time keep their previous estimate
+                dt = np.where(active, dt, 1.0)
+
+            alpha_d = self._alpha(self.config.dcutoff, dt)
+            dx = self._exponential_smooth(alpha_d, (v - x) / dt, dx_prev)
+            cutoff = self.config.mincutoff + self.config.beta * np.abs(dx)
+            alpha = self._alpha(cutoff, dt)
+            x_new = self._exponential_smooth(alpha, v, x)
+
+            if active.all():
+                self._x[:known] = x_new
+                self._dx[:known] = dx
+                self._last_time[:known] = t
+            else:
+                self._x[:known] = np.where(active, x_new, x)
+                self._dx[:known] = np.where(active, dx, dx_prev)
+                self._last_time[:known] = np.where(active, t, last)
+            filtered[:known] = self._x[:known]
+
+        if n > known:
+            # New channels start from their first value
+            new = value[known:]
+            self._x = np.concatenate([self._x, new])
+            self._dx = np.concatenate([self._dx, np.zeros(n - known)])
+            self._last_time = np.concatenate([self._last_time, np.full(n - known, t)])
+            filtered[known:] = new
+
+        return filtered
 
     @staticmethod
-    def _alpha(cutoff: float, dt: float) -> float:
-        r = 2.0 * np.pi * cutoff * dt
+    def _alpha(cutoff, dt):
+        r = _TWO_PI * cutoff * dt
         return r / (1.0 + r)
 
     @staticmethod
-    def _exponential_smooth(alpha: float, value: float, estimate: float) -> float:
+    def _exponential_smooth(alpha, value, estimate):
         return alpha * value + (1.0 - alpha) * estimate
 
     def reset(self) -> None:
-        self._state.clear()
+        self._x = np.zeros(0)
+        self._dx = np.zeros(0)
+        self._last_time = np.zeros(0)
         self._start_time = None
 
     def is_initialized(self) -> bool:
-        return len(self._state) > 0
+        return self._x.shape[0] > 0
 
     def get_state(self) -> Dict[int, Dict]:
         result = {}
-        for channel, state in self._state.items():
+        for channel in range(self._x.shape[0]):
             result[channel] = {
-                'x': state.x,
-                'dx': state.dx,
-                'last_time': state.last_time.isoformat() if state.last_time else None
+                'x': float(self._x[channel]),
+                'dx': float(self._dx[channel]),
+                'last_time': to_isoformat(self._last_time[channel])
             }
         return result
 
@@ -106,48 +180,56 @@ class OneEuroFilterJoint:
     def __init__(self, config: OneEuroFilterConfig, joint_index: int):
         self.joint_index = joint_index
         self.config = config
-        self._filters = [OneEuroFilter(config) for _ in range(3)]
+        self._filter = OneEuroFilter(config)
 
-    def filter(self, joint_params: np.ndarray, timestamp: Optional[datetime] = None) -> np.ndarray:
+    def filter(self, joint_params: np.ndarray, timestamp: Optional[Timestamp] = None) -> np.ndarray:
         if joint_params.shape != (3,):
             raise ValueError(f"Expected shape (3,), got {joint_params.shape}")
-        filtered = np.zeros(3)
-        for i in range(3):
-            filtered[i] = self._filters[i].filter(np.array([joint_params[i]]), timestamp)[0]
-        return filtered
+        return self._filter.filter(joint_params, timestamp)
 
     def reset(self) -> None:
-        for f in self._filters:
-            f.reset()
+        self._filter.reset()
 
     def is_initialized(self) -> bool:
-        return any(f.is_initialized() for f in self._filters)
+        return self._filter.is_initialized()
+
+    def get_state(self) -> Dict[int, Dict]:
+        return self._filter.get_state()
 
 
 class OneEuroFilterPose:
-    """OneEuro filter for complete pose (all joints)."""
+    """OneEuro filter for complete pose (all joints).
+
+    All num_joints * 3 channels are filtered by a single array-backed
+    OneEuroFilter; channel ``j * 3 + k`` holds axis k of joint j.
+    """
 
     def __init__(self, config: OneEuroFilterConfig, num_joints: int = 24):
         self.num_joints = num_joints
         self.config = config
-        self._joint_filters = [OneEuroFilterJoint(config, i) for i in range(num_joints)]
+        self._filter = OneEuroFilter(config)
+
+    def filter(
+        self,
+        pose: np.ndarray,
+        timestamp: Optional[Union[Timestamp, Sequence[Timestamp]]] = None,
+    ) -> np.ndarray:
+        """Filter a pose, or a (T, num_joints * 3) batch of poses.
 
-    def filter(self, pose: np.ndarray, timestamp: Optional[datetime] = None) -> np.ndarray:
+        For a batch, timestamp may be a sequence with one timestamp per frame.
+        """
         expected_size = self.num_joints * 3
+        if pose.ndim == 2 and pose.shape[0] != 1 and pose.shape[1] == expected_size:
+            return self._filter.filter_batch(pose, timestamp)
         if pose.size != expected_size:
             raise ValueError(f"Expected pose size {expected_size}, got {pose.size}")
-        pose = pose.reshape(self.num_joints, 3)
-        filtered = np.zeros_like(pose)
-        for i, joint_filter in enumerate(self._joint_filters):
-            filtered[i] = joint_filter.filter(pose[i], timestamp)
-        return filtered.flatten()
+        return self._filter.filter(pose.reshape(expected_size), timestamp)
 
     def reset(self) -> None:
-        for joint_filter in self._joint_filters:
-            joint_filter.reset()
+        self._filter.reset()
 
     def is_initialized(self) -> bool:
-        return any(f.is_initialized() for f in self._joint_filters)
+        return self._filter.is_initialized()
 
-    def get_state(self) -> List[Dict]:
-        return [f.get_state() for f in self._joint_filters]
+    def get_state(self) -> Dict[int, Dict]:
+        return self._filter.get_state()
@@ -0,0 +1,298 @@
+"""
+Fixed-capacity buffers for per-frame measurement streams.
+
+These containers preallocate their storage on the first item, so long-running
+sessions use bounded memory regardless of how many frames are processed:
+
+- RingBuffer keeps the most recent N vectors in arrival order
+- RollingStatistics tracks the mean/variance of the most recent N vectors
+- ReservoirSample keeps a uniform random sample of every vector seen
+"""
+
+from typing import Iterator, Optional
+import numpy as np
+
+
+class RingBuffer:
+    """FIFO of equally shaped vectors backed by one preallocated array.
+
+    Once full, each append overwrites the oldest entry.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of vectors retained.
+            dtype: Storage dtype.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.dtype = dtype
+        self._data: Optional[np.ndarray] = None
+        self._start = 0
+        self._size = 0
+
+    def append(self, item: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Append a vector, evicting the oldest one if the buffer is full.
+
+        Args:
+            item: Vector with the same shape as the items currently held.
+
+        Returns:
+            Copy of the evicted vector, or None if nothing was evicted.
+
+        Raises:
+            ValueError: If the item shape differs from earlier items.
+        """
+        if self._data is None or (self._size == 0 and item.shape != self._data.shape[1:]):
+            # An empty buffer adopts the shape of its first item
+            self._data = np.empty((self.capacity,) + item.shape, dtype=self.dtype)
+        elif item.shape != self._data.shape[1:]:
+            raise ValueError(
+                f"Expected item of shape {self._data.shape[1:]}, got {item.shape}"
+            )
+
+        evicted = None
+        index = (self._start + self._size) % self.capacity
+        if self._size == self.capacity:
+            evicted = self._data[index].copy()
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+        self._data[index] = item
+        return evicted
+
+    def to_array(self) -> np.ndarray:
+        """Return retained vectors in arrival order as a new (N, ...) array."""
+        if self._data is None:
+            return np.empty((0,), dtype=self.dtype)
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end].copy()
+        return np.concatenate(
+            [self._data[self._start:], self._data[:end - self.capacity]]
+        )
+
+    def clear(self) -> None:
+        """Drop all retained vectors (storage is kept for reuse).
+
+        The next item may have a different shape.
+        """
+        self._start = 0
+        self._size = 0
+
+    def copy(self) -> "RingBuffer":
+        """Return an independent buffer holding the same vectors."""
+        duplicate = RingBuffer(self.capacity, self.dtype)
+        if self._data is not None:
+            duplicate._data = self._data.copy()
+        duplicate._start = self._start
+        duplicate._size = self._size
+        return duplicate
+
+    def is_full(self) -> bool:
+        """Check whether the buffer holds capacity vectors."""
+        return self._size == self.capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Return the vector at a chronological index (0 is oldest)."""
+        if not -self._size <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        if index < 0:
+            index += self._size
+        return self._data[(self._start + index) % self.capacity]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self.to_array())
+
+
+class RollingStatistics:
+    """Sliding-window mean and variance with O(D) updates.
+
+    Values are held in a RingBuffer; the running mean and sum of squared
+    deviations are updated with Welford's recurrence when a value enters the
+    window and reversed exactly when it is evicted, so the cost per push does
+    not depend on the window size. To bound floating-point drift the moments are
+    recomputed from the buffer every RESYNC_INTERVAL pushes.
+    """
+
+    RESYNC_INTERVAL = 1024
+
+    def __init__(self, window_size: int):
+        """
+        Initialize rolling statistics.
+
+        Args:
+            window_size: Number of most recent values included.
+
+        Raises:
+            ValueError: If window_size is not positive.
+        """
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        self.window_size = window_size
+        self._buffer = RingBuffer(window_size, dtype=np.float64)
+        self._mean = np.zeros(())
+        self._m2 = np.zeros(())
+        self._pushes = 0
+
+    def push(self, value) -> None:
+        """
+        Add a value (scalar or vector) to the window.
+
+        Args:
+            value: Value with the same shape as previously pushed values.
+
+        Raises:
+            ValueError: If the value shape differs from earlier values.
+        """
+        value = np.asarray(value, dtype=np.float64)
+        if len(self._buffer) == 0:
+            self._mean = np.zeros(value.shape)
+            self._m2 = np.zeros(value.shape)
+
+        evicted = self._buffer.append(value)
+        self._pushes += 1
+        if self._pushes % self.RESYNC_INTERVAL == 0:
+            self._resync()
+            return
+
+        # Number of values in the window before adding this one
+        n = len(self._buffer) - 1
+        if evicted is not None:
+            # Exact reversal of the Welford update for the evicted value
+            if n == 0:
+                self._mean = np.zeros(value.shape)
+                self._m2 = np.zeros(value.shape)
+            else:
+                old_mean = self._mean
+                self._mean = old_mean - (evicted - old_mean) / n
+                self._m2 = self._m2 - (evicted - old_mean) * (evicted - self._mean)
+
+        delta = value - self._mean
+        self._mean = self._mean + delta / (n + 1)
+        self._m2 = np.maximum(self._m2 + delta * (value - self._mean), 0.0)
+
+    def _resync(self) -> None:
+        values = self._buffer.to_array()
+        self._mean = np.mean(values, axis=0)
+        self._m2 = np.sum((values - self._mean) ** 2, axis=0)
+
+    @property
+    def count(self) -> int:
+        """Number of values currently in the window."""
+        return len(self._buffer)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean of the values in the window."""
+        return self._mean
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Population variance (ddof=0) of the values in the window."""
+        if self.count == 0:
+            return np.zeros_like(self._m2)
+        return self._m2 / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population standard deviation of the values in the window."""
+        return np.sqrt(self.variance)
+
+    def clear(self) -> None:
+        """Empty the window."""
+        self._buffer.clear()
+        self._mean = np.zeros(())
+        self._m2 = np.zeros(())
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ReservoirSample:
+    """Uniform random sample of fixed size over an unbounded stream.
+
+    Uses Vitter's Algorithm R: every vector seen so far is retained with equal
+    probability capacity / seen.
+    """
+
+    def __init__(self, capacity: int, seed: Optional[int] = None, dtype=np.float64):
+        """
+        Initialize reservoir.
+
+        Args:
+            capacity: Maximum number of vectors retained.
+            seed: Seed for the replacement decisions.
+            dtype: Storage dtype.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.dtype = dtype
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._data: Optional[np.ndarray] = None
+
+    def add(self, item: np.ndarray) -> bool:
+        """
+        Offer a vector to the reservoir.
+
+        Args:
+            item: Vector with the same shape as the items currently held.
+
+        Returns:
+            True if the vector was stored.
+
+        Raises:
+            ValueError: If the item shape differs from earlier items.
+        """
+        if self._data is None or (self.seen == 0 and item.shape != self._data.shape[1:]):
+            # An empty reservoir adopts the shape of its first item
+            self._data = np.empty((self.capacity,) + item.shape, dtype=self.dtype)
+        elif item.shape != self._data.shape[1:]:
+            raise ValueError(
+                f"Expected item of shape {self._data.shape[1:]}, got {item.shape}"
+            )
+
+        self.seen += 1
+        if self.seen <= self.capacity:
+            self._data[self.seen - 1] = item
+            return True
+
+        slot = int(self._rng.integers(self.seen))
+        if slot < self.capacity:
+            self._data[slot] = item
+            return True
+        return False
+
+    @property
+    def samples(self) -> np.ndarray:
+        """View of the stored vectors, shape (min(seen, capacity), ...)."""
+        if self._data is None:
+            return np.empty((0,), dtype=self.dtype)
+        return self._data[:min(self.seen, self.capacity)]
+
+    def clear(self) -> None:
+        """Drop all stored vectors (storage is kept for reuse).
+
+        The next item may have a different shape.
+        """
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return min(self.seen, self.capacity)
@@ -7,20 +7,20 @@ OneEuro filter. It converts angular velocity to degrees per second for
 monitoring and warning purposes.
 """
 
-from typing import Optional
+from typing import Optional, Union
 import numpy as np
-from .one_euro_filter import OneEuroFilter
+from .one_euro_filter import OneEuroFilter, OneEuroFilterPose
 
 
 class RotationSpeedMonitor:
     """Monitors rotation speed from filtered pose parameters."""
 
-    def __init__(self, filter: OneEuroFilter):
+    def __init__(self, filter: Union[OneEuroFilter, OneEuroFilterPose]):
         """
         Initialize the rotation speed monitor.
 
         Args:
-            filter: OneEuroFilter instance used for pose filtering
+            filter: OneEuroFilter or OneEuroFilterPose instance used for pose filtering
         """
         self.filter = filter
         self._last_speed: float = 0.0
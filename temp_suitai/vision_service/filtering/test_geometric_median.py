@@ -0,0 +1,136 @@
+"""
+Unit tests for the accelerated geometric median solver.
+
+Tests verify:
+- Agreement with known medians and with plain Weiszfeld
+- Handling of iterates that coincide with data points
+- Warm starts and iteration reporting
+- Batched solves over point sets of different sizes
+"""
+
+import numpy as np
+import pytest
+from vision_service.filtering.geometric_median import (
+    batch_geometric_median,
+    geometric_median,
+)
+
+
+def _plain_weiszfeld(points, iterations=5000):
+    median = points.mean(axis=0)
+    for _ in range(iterations):
+        distances = np.maximum(np.linalg.norm(points - median, axis=1), 1e-12)
+        weights = 1.0 / distances
+        median = weights @ points / weights.sum()
+    return median
+
+
+def _objective(points, median):
+    return np.linalg.norm(points - median, axis=1).sum()
+
+
+class TestGeometricMedian:
+    """Test single point set solves."""
+
+    def test_invalid_points(self):
+        """Test that empty or non-2D input raises error."""
+        with pytest.raises(ValueError):
+            geometric_median(np.zeros((0, 3)))
+        with pytest.raises(ValueError):
+            geometric_median(np.zeros(3))
+
+    def test_single_point(self):
+        """Test that a single point is its own median."""
+        result = geometric_median(np.array([[1.0, 2.0, 3.0]]))
+        assert np.allclose(result.median, [1.0, 2.0, 3.0])
+        assert result.converged
+
+    def test_square_corners(self):
+        """Test median of symmetric points is the center."""
+        points = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        result = geometric_median(points)
+        assert np.allclose(result.median, [0.5, 0.5], atol=1e-6)
+
+    def test_matches_plain_weiszfeld(self):
+        """Test agreement with unaccelerated Weiszfeld on random data."""
+        rng = np.random.default_rng(0)
+        points = rng.normal(size=(200, 10))
+        result = geometric_median(points, tolerance=1e-10, max_iterations=1000)
+        reference = _plain_weiszfeld(points)
+        assert result.converged
+        assert _objective(points, result.median) <= _objective(points, reference) + 1e-8
+
+    def test_majority_point_is_median(self):
+        """Test a point holding half the weight, starting on it, stays there."""
+        points = np.array([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [1.0, 1.0]])
+        result = geometric_median(points, initial=np.array([0.0, 0.0]))
+        assert np.allclose(result.median, [0.0, 0.0])
+        assert result.converged
+
+    def test_escapes_non_optimal_data_point(self):
+        """Test that starting on a non-optimal data point does not get stuck."""
+        points = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 0.1], [10.0, -0.1]])
+        result = geometric_median(points, initial=points[0], tolerance=1e-9, max_iterations=1000)
+        reference = _plain_weiszfeld(points)
+        assert np.allclose(result.median, reference, atol=1e-4)
+
+    def test_warm_start_reduces_iterations(self):
+        """Test that starting at the solution converges immediately."""
+        rng = np.random.default_rng(1)
+        points = rng.normal(size=(100, 4))
+        cold = geometric_median(points, tolerance=1e-9)
+        warm = geometric_median(points, initial=cold.median, tolerance=1e-9)
+        assert warm.iterations < cold.iterations
+        assert np.allclose(warm.median, cold.median, atol=1e-6)
+
+    def test_acceleration_on_elongated_data(self):
+        """Test convergence on slowly converging elongated point sets."""
+        rng = np.random.default_rng(2)
+        points = np.c_[rng.exponential(size=300), 1e-3 * rng.normal(size=(300, 3))]
+        result = geometric_median(points, tolerance=1e-8, max_iterations=1000)
+        assert result.converged
+        assert result.iterations < 100
+
+    def test_reports_statistics(self):
+        """Test that iterations and elapsed time are reported."""
+        result = geometric_median(np.random.default_rng(3).normal(size=(50, 3)), max_iterations=4)
+        assert 0 < result.iterations <= 4
+        assert result.elapsed_seconds >= 0.0
+
+
+class TestBatchGeometricMedian:
+    """Test batched solves over several point sets."""
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns no results."""
+        assert batch_geometric_median([]) == []
+
+    def test_mismatched_dimensions(self):
+        """Test that sets with different dimensions raise error."""
+        with pytest.raises(ValueError):
+            batch_geometric_median([np.zeros((3, 2)), np.zeros((3, 3))])
+
+    def test_matches_individual_solves(self):
+        """Test that padding does not change per-set results."""
+        rng = np.random.default_rng(4)
+        sets = [rng.normal(loc=i, size=(n, 3)) for i, n in enumerate((1, 7, 60))]
+
+        batched = batch_geometric_median(sets, tolerance=1e-9)
+        for points, result in zip(sets, batched):
+            single = geometric_median(points, tolerance=1e-9)
+            assert np.allclose(result.median, single.median, atol=1e-6)
+            assert result.iterations == single.iterations
+            assert result.converged
+
+    def test_partial_initial_estimates(self):
+        """Test that None entries fall back to the mean start."""
+        rng = np.random.default_rng(5)
+        sets = [rng.normal(size=(20, 2)), rng.normal(size=(30, 2))]
+        results = batch_geometric_median(sets, initial=[None, np.zeros(2)], tolerance=1e-9)
+        for points, result in zip(sets, results):
+            assert np.allclose(result.median, geometric_median(points, tolerance=1e-9).median, atol=1e-6)
+
+    def test_initial_length_mismatch(self):
+        """Test that a wrong number of initial estimates raises error."""
+        with pytest.raises(ValueError):
+            batch_geometric_median([np.zeros((2, 2))], initial=[None, None])
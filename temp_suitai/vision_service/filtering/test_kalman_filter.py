@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 from vision_service.filtering.kalman_filter import (
+    BatchedKalmanFilter,
     KalmanFilter,
     KalmanFilterConfig,
     KalmanState,
@@ -21,6 +22,22 @@ class TestKalmanStateValidation:
         assert state.state_vector.shape == (10,)
         assert state.covariance.shape == (10, 10)
 
+    def test_to_dict_serializes_timestamp(self):
+        """Test that to_dict() converts the monotonic timestamp to ISO format."""
+        from datetime import datetime
+        from vision_service.timing import to_seconds
+
+        capture_time = datetime(2024, 1, 1, 12, 0, 0)
+        state = KalmanState(
+            state_vector=np.zeros(10),
+            covariance=np.eye(10),
+            timestamp=to_seconds(capture_time),
+        )
+        d = state.to_dict()
+
+        assert d["timestamp"] == capture_time.isoformat()
+        assert d["covariance"] == np.eye(10).tolist()
+
     def test_invalid_state_vector_dimension(self):
         """Test that invalid state vector dimension raises error."""
         with pytest.raises(ValueError, match="state_vector must have exactly 10 dimensions"):
@@ -505,3 +522,193 @@ class TestKalmanFilterNumericalStability:
         # State should be finite and reasonable
         assert np.all(np.isfinite(kf.state))
         assert np.all(np.abs(kf.state) < 1e10)
+
+
+class TestKalmanFilterCovarianceModes:
+    """Tests for the diagonal fast path and dense fallback."""
+
+    def test_default_config_uses_diagonal_path(self):
+        """Test that the identity-scaled default model is detected as diagonal."""
+        assert KalmanFilter().diagonal
+
+    def test_dense_mode_forces_dense_path(self):
+        """Test that covariance_mode='dense' disables the fast path."""
+        kf = KalmanFilter(KalmanFilterConfig(covariance_mode="dense"))
+        assert not kf.diagonal
+
+    def test_non_diagonal_noise_falls_back_to_dense(self):
+        """Test that a full process noise matrix selects the dense path."""
+        Q = np.full((10, 10), 0.001) + 0.01 * np.eye(10)
+        kf = KalmanFilter(KalmanFilterConfig(process_noise=Q))
+        assert not kf.diagonal
+        assert np.allclose(kf.Q, Q)
+
+    def test_diagonal_mode_rejects_non_diagonal_noise(self):
+        """Test that forcing diagonal mode with full noise raises error."""
+        R = np.full((10, 10), 0.01) + 0.1 * np.eye(10)
+        config = KalmanFilterConfig(measurement_noise=R, covariance_mode="diagonal")
+        with pytest.raises(ValueError, match="requires diagonal"):
+            KalmanFilter(config)
+
+    def test_invalid_covariance_mode(self):
+        """Test that unknown covariance mode raises error."""
+        with pytest.raises(ValueError, match="covariance_mode must be one of"):
+            KalmanFilterConfig(covariance_mode="sparse")
+
+    def test_invalid_noise_matrix_shape(self):
+        """Test that wrongly shaped noise matrix raises error."""
+        with pytest.raises(ValueError, match="process_noise must be 10x10"):
+            KalmanFilterConfig(process_noise=np.eye(5))
+
+    def test_diagonal_path_matches_dense_path(self):
+        """Test that diagonal and dense paths produce the same estimates."""
+        rng = np.random.default_rng(1)
+        variances = rng.uniform(0.01, 0.2, size=10)
+        config_kwargs = dict(measurement_noise=np.diag(variances))
+        fast = KalmanFilter(KalmanFilterConfig(**config_kwargs))
+        dense = KalmanFilter(KalmanFilterConfig(covariance_mode="dense", **config_kwargs))
+        assert fast.diagonal and not dense.diagonal
+
+        for _ in range(30):
+            measurement = rng.normal(size=10)
+            fast_state = fast.update(measurement)
+            dense_state = dense.update(measurement)
+            assert np.allclose(fast_state.state_vector, dense_state.state_vector)
+            assert np.allclose(fast_state.covariance, dense_state.covariance)
+
+        assert np.allclose(fast.predict().covariance, dense.predict().covariance)
+        assert np.allclose(fast.get_uncertainty(), dense.get_uncertainty())
+
+    def test_assigning_full_covariance_switches_to_dense(self):
+        """Test that setting a non-diagonal covariance keeps results correct."""
+        kf = KalmanFilter()
+        kf.update(np.ones(10))
+        covariance = np.eye(10) + 0.1
+        kf.covariance = covariance
+
+        assert not kf.diagonal
+        assert np.allclose(kf.get_covariance(), covariance)
+
+    def test_reset_restores_diagonal_path(self):
+        """Test that reset() after a full covariance assignment re-enables the fast path."""
+        kf = KalmanFilter()
+        kf.update(np.ones(10))
+        kf.covariance = np.eye(10) + 0.1
+        kf.reset()
+
+        assert kf.diagonal
+        kf.update(np.ones(10))
+        assert kf._covariance is None and kf._variances is not None
+
+    def test_diagonal_covariance_is_read_only(self):
+        """Test that in-place edits of the diagonal-mode covariance fail loudly."""
+        kf = KalmanFilter()
+        kf.update(np.ones(10))
+
+        with pytest.raises(ValueError, match="read-only"):
+            kf.covariance[0, 0] = 999.0
+        kf.get_covariance()[0, 0] = 999.0
+        assert kf.covariance[0, 0] != 999.0
+
+
+class TestBatchedKalmanFilter:
+    """Tests for the multi-session batched Kalman filter."""
+
+    def test_invalid_capacity(self):
+        """Test that non-positive capacity raises error."""
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            BatchedKalmanFilter(capacity=0)
+
+    def test_add_and_evict_sessions(self):
+        """Test slot allocation, eviction and reuse."""
+        bkf = BatchedKalmanFilter(capacity=2)
+        slot_a = bkf.add_session()
+        slot_b = bkf.add_session()
+        assert (slot_a, slot_b) == (0, 1)
+        assert bkf.num_active == 2
+
+        with pytest.raises(RuntimeError, match="No free session slots"):
+            bkf.add_session()
+
+        bkf.evict_session(slot_a)
+        assert not bkf.is_active(slot_a)
+        assert bkf.add_session() == slot_a
+
+    def test_add_specific_slot(self):
+        """Test claiming a specific slot."""
+        bkf = BatchedKalmanFilter(capacity=4)
+        assert bkf.add_session(slot=2) == 2
+        with pytest.raises(ValueError, match="already active"):
+            bkf.add_session(slot=2)
+        with pytest.raises(ValueError, match="slot must be in range"):
+            bkf.add_session(slot=4)
+
+    def test_update_inactive_slot_raises_error(self):
+        """Test that updating an inactive slot raises error."""
+        bkf = BatchedKalmanFilter(capacity=2)
+        with pytest.raises(ValueError, match="must be active"):
+            bkf.update([0], np.ones((1, 10)))
+
+    def test_update_shape_validation(self):
+        """Test that mismatched measurement shape raises error."""
+        bkf = BatchedKalmanFilter(capacity=2)
+        bkf.add_session()
+        with pytest.raises(ValueError, match="measurements must have shape"):
+            bkf.update([0], np.ones(10))
+
+    def test_matches_single_session_filter(self):
+        """Test that each batched session matches an independent KalmanFilter."""
+        rng = np.random.default_rng(0)
+        num_sessions = 5
+        bkf = BatchedKalmanFilter(capacity=8)
+        slots = [bkf.add_session() for _ in range(num_sessions)]
+        filters = [KalmanFilter() for _ in range(num_sessions)]
+
+        for _ in range(20):
+            measurements = rng.normal(size=(num_sessions, 10))
+            batched = bkf.update(slots, measurements)
+            for i, kf in enumerate(filters):
+                expected = kf.update(measurements[i])
+                assert np.allclose(batched[i], expected.state_vector)
+                assert np.allclose(bkf.covariances[slots[i]], expected.covariance)
+
+    def test_partial_batch_update(self):
+        """Test that only the given slots are updated."""
+        bkf = BatchedKalmanFilter(capacity=3)
+        slots = [bkf.add_session() for _ in range(3)]
+        bkf.update(slots, np.ones((3, 10)))
+
+        before = bkf.states[2].copy()
+        bkf.update([0, 1], np.full((2, 10), 2.0))
+
+        assert np.allclose(bkf.states[2], before)
+        assert list(bkf.update_counts) == [2, 2, 1]
+
+    def test_get_state_returns_view(self):
+        """Test that per-session KalmanState views share memory with the batch."""
+        bkf = BatchedKalmanFilter(capacity=2)
+        slot = bkf.add_session()
+        assert bkf.get_state(slot) is None
+
+        bkf.update([slot], np.ones((1, 10)))
+        state = bkf.get_state(slot)
+
+        assert isinstance(state, KalmanState)
+        assert np.shares_memory(state.state_vector, bkf.states)
+        assert np.shares_memory(state.covariance, bkf.covariances)
+
+        bkf.update([slot], np.full((1, 10), 3.0))
+        assert np.all(state.state_vector > 1.0)
+
+    def test_evicted_slot_reinitializes(self):
+        """Test that a reused slot starts from a fresh state."""
+        bkf = BatchedKalmanFilter(capacity=1)
+        slot = bkf.add_session()
+        bkf.update([slot], np.ones((1, 10)))
+        bkf.evict_session(slot)
+
+        slot = bkf.add_session()
+        assert not bkf.is_initialized(slot)
+        states = bkf.update([slot], np.full((1, 10), 5.0))
+        assert np.allclose(states[0], 5.0)
+        assert np.allclose(bkf.get_uncertainty(slot), 1.0)
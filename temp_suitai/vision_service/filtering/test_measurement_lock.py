@@ -16,6 +16,7 @@ from vision_service.filtering.measurement_lock import (
     MeasurementLock,
     MeasurementLockConfig,
     MeasurementLockState,
+    finalize_pending_locks,
 )
 
 
@@ -51,16 +52,28 @@ class TestMeasurementLockState:
         assert state.is_locked is False
         assert state.frame_count == 0
         assert state.stable_frame_count == 0
-        assert state.measurements == []
+        assert len(state.measurements) == 0
         assert state.locked_measurements is None
         assert state.geometric_median is None
         assert state.universal_measurement_id is None
         assert state.stability_score == 0.0
         assert state.confidence == 0.0
-        assert isinstance(state.timestamp, datetime)
+        assert isinstance(state.timestamp, float)
         assert state.warnings == []
         assert state.metadata == {}
 
+    def test_snapshot_is_independent(self):
+        """Test that snapshots do not change with later measurements."""
+        lock = MeasurementLock()
+        snapshot = lock.add_measurement(np.ones(10)).snapshot()
+        for _ in range(5):
+            lock.add_measurement(np.ones(10) * 2)
+
+        assert snapshot.frame_count == 1
+        assert len(snapshot.measurements) == 1
+        np.testing.assert_array_equal(snapshot.measurements[0], np.ones(10))
+        assert lock.state.frame_count == 6
+
 
 class TestMeasurementLockBasic:
     """Test basic measurement lock functionality."""
@@ -311,6 +324,33 @@ class TestUniversalMeasurementID:
         assert id1 != id2
 
 
+    def test_id_uses_capture_timestamp(self):
+        """Test that the ID embeds the supplied capture time."""
+        config = MeasurementLockConfig(lock_frame_threshold=1)
+        lock = MeasurementLock(config)
+
+        lock.add_measurement(np.array([1.0, 2.0]), timestamp=datetime(2024, 3, 5, 6, 7, 8))
+
+        assert lock.state.universal_measurement_id.split("_")[1] == "20240305T06070"
+
+
+class TestSerialization:
+    """Test state serialization."""
+
+    def test_to_dict_converts_timestamp(self):
+        """Test that to_dict() emits an ISO timestamp and plain lists."""
+        config = MeasurementLockConfig(lock_frame_threshold=1)
+        lock = MeasurementLock(config)
+        capture_time = datetime(2024, 1, 1, 12, 0, 0)
+
+        lock.add_measurement(np.array([1.0, 2.0]), timestamp=capture_time)
+        d = lock.state.to_dict()
+
+        assert d["timestamp"] == capture_time.isoformat()
+        assert d["is_locked"] is True
+        assert d["geometric_median"] == pytest.approx([1.0, 2.0])
+
+
 class TestProgressAndConfidence:
     """Test progress tracking and confidence scoring."""
 
@@ -372,7 +412,7 @@ class TestReset:
 
         assert lock.state.is_locked is False
         assert lock.state.frame_count == 0
-        assert lock.state.measurements == []
+        assert len(lock.state.measurements) == 0
         assert lock.state.locked_measurements is None
 
     def test_reset_allows_new_cycle(self):
@@ -417,6 +457,153 @@ class TestMetadata:
         assert metadata["measurement_dimension"] == 3
 
 
+class TestBoundedMemory:
+    """Test that long sessions use bounded memory."""
+
+    def test_retention_cap(self):
+        """Test that only the most recent frames are retained."""
+        config = MeasurementLockConfig(lock_frame_threshold=1000, max_retained_measurements=10)
+        lock = MeasurementLock(config)
+
+        for i in range(50):
+            lock.add_measurement(np.array([1.0, 2.0]) + i * 1e-4)
+
+        assert len(lock.state.measurements) == 10
+        assert np.allclose(lock.state.measurements[-1], np.array([1.0, 2.0]) + 49e-4)
+
+    def test_invalid_retention_cap(self):
+        """Test that non-positive retention cap raises error."""
+        with pytest.raises(ValueError, match="max_retained_measurements must be positive"):
+            MeasurementLockConfig(max_retained_measurements=0)
+
+    def test_no_collection_after_lock(self):
+        """Test that frames after lock are counted but not stored."""
+        config = MeasurementLockConfig(lock_frame_threshold=5)
+        lock = MeasurementLock(config)
+
+        for _ in range(20):
+            lock.add_measurement(np.array([1.0, 2.0, 3.0]))
+
+        assert lock.state.frame_count == 20
+        assert len(lock.state.measurements) == 5
+        assert len(lock.state.locked_measurements) == 5
+
+    def test_warnings_are_deduplicated(self):
+        """Test that repeated high-variation frames produce one counted warning."""
+        config = MeasurementLockConfig(stability_window_size=5, cv_threshold=0.01)
+        lock = MeasurementLock(config)
+
+        for i in range(30):
+            lock.add_measurement(np.array([1.0, 2.0]) * (1 + (i % 2)))
+
+        assert len(lock.state.warnings) == 1
+        assert lock.state.warning_counts[lock.state.warnings[0]] == 29
+
+    def test_streaming_median_tracks_stream(self):
+        """Test that the running median approximates the geometric median."""
+        rng = np.random.default_rng(0)
+        config = MeasurementLockConfig(lock_frame_threshold=10000, reservoir_size=64, reservoir_seed=0)
+        lock = MeasurementLock(config)
+
+        for _ in range(500):
+            lock.add_measurement(np.array([1.0, 2.0, 3.0]) + rng.normal(scale=0.01, size=3))
+
+        assert np.allclose(lock.state.streaming_median, [1.0, 2.0, 3.0], atol=0.01)
+
+    def test_median_from_reservoir_is_robust(self):
+        """Test lock median over a reservoir smaller than the stream."""
+        rng = np.random.default_rng(1)
+        config = MeasurementLockConfig(
+            lock_frame_threshold=400, cv_threshold=5.0, reservoir_size=32, reservoir_seed=0
+        )
+        lock = MeasurementLock(config)
+
+        for i in range(400):
+            value = np.array([1.0, 1.0]) + rng.normal(scale=0.01, size=2)
+            if i % 50 == 0:
+                value = np.array([50.0, 50.0])
+            lock.add_measurement(value)
+
+        assert lock.state.is_locked
+        assert lock.state.metadata["median_sample_size"] == 32
+        assert np.allclose(lock.get_geometric_median(), [1.0, 1.0], atol=0.05)
+
+    def test_lock_reports_solver_statistics(self):
+        """Test that the median solve is recorded in lock metadata."""
+        rng = np.random.default_rng(2)
+        config = MeasurementLockConfig(lock_frame_threshold=50)
+        lock = MeasurementLock(config)
+
+        for _ in range(50):
+            lock.add_measurement(np.array([1.0, 2.0, 3.0]) + rng.normal(scale=0.01, size=3))
+
+        metadata = lock.state.metadata
+        assert metadata["geometric_median_iterations"] > 0
+        assert metadata["geometric_median_converged"]
+        assert metadata["geometric_median_time_ms"] >= 0.0
+
+
+class TestDeferredLock:
+    """Test batched finalization of locks across sessions."""
+
+    def _feed(self, lock, rng, center, frames):
+        for _ in range(frames):
+            lock.add_measurement(np.asarray(center) + rng.normal(scale=0.01, size=len(center)))
+
+    def test_deferred_lock_is_pending(self):
+        """Test that a deferred lock waits for finalization."""
+        config = MeasurementLockConfig(lock_frame_threshold=10, defer_geometric_median=True)
+        lock = MeasurementLock(config)
+        self._feed(lock, np.random.default_rng(0), [1.0, 2.0], 10)
+
+        assert lock.state.is_locked
+        assert lock.lock_pending
+        assert lock.get_geometric_median() is None
+        assert lock.get_universal_id() is None
+
+    def test_finalize_pending_locks(self):
+        """Test that pending locks are finalized in one call."""
+        rng = np.random.default_rng(1)
+        config = MeasurementLockConfig(lock_frame_threshold=10, defer_geometric_median=True)
+        locks = [MeasurementLock(config) for _ in range(3)]
+        centers = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+        for lock, center in zip(locks, centers):
+            self._feed(lock, rng, center, 10)
+
+        idle = MeasurementLock(config)
+        assert finalize_pending_locks(locks + [idle]) == 3
+
+        for lock, center in zip(locks, centers):
+            assert not lock.lock_pending
+            assert np.allclose(lock.get_geometric_median(), center, atol=0.05)
+            assert lock.get_universal_id().startswith("UMI_")
+            assert "geometric_median_iterations" in lock.state.metadata
+
+        assert finalize_pending_locks(locks) == 0
+
+    def test_finalized_median_matches_immediate_lock(self):
+        """Test that deferring does not change the locked median."""
+        immediate = MeasurementLock(MeasurementLockConfig(lock_frame_threshold=20, reservoir_seed=0))
+        deferred = MeasurementLock(MeasurementLockConfig(
+            lock_frame_threshold=20, reservoir_seed=0, defer_geometric_median=True
+        ))
+        self._feed(immediate, np.random.default_rng(3), [1.0, 2.0, 3.0], 20)
+        self._feed(deferred, np.random.default_rng(3), [1.0, 2.0, 3.0], 20)
+        finalize_pending_locks([deferred])
+
+        assert np.allclose(immediate.get_geometric_median(), deferred.get_geometric_median())
+
+    def test_reset_clears_pending(self):
+        """Test that reset discards a pending lock."""
+        config = MeasurementLockConfig(lock_frame_threshold=5, defer_geometric_median=True)
+        lock = MeasurementLock(config)
+        self._feed(lock, np.random.default_rng(4), [1.0], 5)
+
+        lock.reset()
+        assert not lock.lock_pending
+        assert finalize_pending_locks([lock]) == 0
+
+
 class TestGetters:
     """Test getter methods."""
 
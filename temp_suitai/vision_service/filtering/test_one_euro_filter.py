@@ -126,6 +126,63 @@ class TestOneEuroFilterPose(unittest.TestCase):
         self.assertFalse(self.pose_filter.is_initialized())
 
 
+class TestOneEuroFilterPoseVectorized(unittest.TestCase):
+    """Test array-backed pose filtering and batch replays."""
+
+    def setUp(self):
+        self.config = OneEuroFilterConfig()
+        rng = np.random.default_rng(0)
+        self.poses = rng.normal(scale=0.1, size=(10, 72))
+        start = datetime(2024, 1, 1)
+        self.timestamps = [start + timedelta(seconds=i / 30.0) for i in range(10)]
+
+    def test_matches_per_joint_filters(self):
+        pose_filter = OneEuroFilterPose(self.config, num_joints=24)
+        joint_filters = [OneEuroFilterJoint(self.config, i) for i in range(24)]
+        for pose, ts in zip(self.poses, self.timestamps):
+            filtered = pose_filter.filter(pose, ts)
+            expected = np.concatenate([
+                f.filter(pose[3 * i:3 * i + 3], ts) for i, f in enumerate(joint_filters)
+            ])
+            np.testing.assert_allclose(filtered, expected)
+
+    def test_batch_matches_sequential(self):
+        sequential = OneEuroFilterPose(self.config, num_joints=24)
+        expected = np.stack([
+            sequential.filter(pose, ts) for pose, ts in zip(self.poses, self.timestamps)
+        ])
+        batched = OneEuroFilterPose(self.config, num_joints=24)
+        filtered = batched.filter(self.poses, self.timestamps)
+        self.assertEqual(filtered.shape, (10, 72))
+        np.testing.assert_allclose(filtered, expected)
+
+    def test_batch_without_timestamps_uses_freq(self):
+        pose_filter = OneEuroFilterPose(self.config, num_joints=24)
+        filtered = pose_filter.filter(self.poses)
+        self.assertEqual(filtered.shape, (10, 72))
+        np.testing.assert_allclose(filtered[0], self.poses[0])
+        self.assertFalse(np.allclose(filtered[-1], self.poses[-1]))
+
+    def test_batch_timestamp_count_mismatch(self):
+        pose_filter = OneEuroFilterPose(self.config, num_joints=24)
+        with self.assertRaises(ValueError):
+            pose_filter.filter(self.poses, self.timestamps[:3])
+
+    def test_repeated_timestamp_keeps_estimate(self):
+        pose_filter = OneEuroFilterPose(self.config, num_joints=24)
+        first = pose_filter.filter(self.poses[0], self.timestamps[0])
+        again = pose_filter.filter(self.poses[1], self.timestamps[0])
+        np.testing.assert_allclose(again, first)
+
+    def test_pose_state_is_per_channel(self):
+        pose_filter = OneEuroFilterPose(self.config, num_joints=24)
+        pose_filter.filter(self.poses, self.timestamps)
+        state = pose_filter.get_state()
+        self.assertEqual(len(state), 72)
+        self.assertEqual(set(state[0]), {'x', 'dx', 'last_time'})
+        self.assertGreater(np.linalg.norm([ch['dx'] for ch in state.values()]), 0.0)
+
+
 class TestOneEuroFilterPerformance(unittest.TestCase):
     """Test performance and latency characteristics."""
 
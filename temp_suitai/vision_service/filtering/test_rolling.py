@@ -0,0 +1,204 @@
+"""
+Unit tests for fixed-capacity rolling buffers.
+
+Tests verify:
+- Ring buffer ordering, eviction and indexing
+- Rolling mean/variance against direct window computation
+- Reservoir sampling bounds and uniformity
+"""
+
+import numpy as np
+import pytest
+from vision_service.filtering.rolling import ReservoirSample, RingBuffer, RollingStatistics
+
+
+class TestRingBuffer:
+    """Test RingBuffer behaviour."""
+
+    def test_invalid_capacity(self):
+        """Test that non-positive capacity raises error."""
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            RingBuffer(0)
+
+    def test_append_until_full(self):
+        """Test that items are kept in arrival order until capacity."""
+        buffer = RingBuffer(3)
+        for i in range(3):
+            assert buffer.append(np.array([i, i])) is None
+
+        assert len(buffer) == 3
+        assert buffer.is_full()
+        assert np.array_equal(buffer.to_array()[:, 0], [0, 1, 2])
+
+    def test_eviction_returns_oldest(self):
+        """Test that appending to a full buffer evicts the oldest item."""
+        buffer = RingBuffer(3)
+        for i in range(3):
+            buffer.append(np.array([float(i)]))
+
+        evicted = buffer.append(np.array([3.0]))
+
+        assert np.array_equal(evicted, [0.0])
+        assert len(buffer) == 3
+        assert np.array_equal(buffer.to_array()[:, 0], [1.0, 2.0, 3.0])
+
+    def test_indexing_is_chronological(self):
+        """Test indexing after wrap-around."""
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(np.array([float(i)]))
+
+        assert buffer[0][0] == 2.0
+        assert buffer[-1][0] == 4.0
+        with pytest.raises(IndexError):
+            buffer[3]
+
+    def test_shape_mismatch(self):
+        """Test that items of a different shape are rejected."""
+        buffer = RingBuffer(3)
+        buffer.append(np.zeros(2))
+        with pytest.raises(ValueError, match="Expected item of shape"):
+            buffer.append(np.zeros(3))
+
+    def test_copy_is_independent(self):
+        """Test that copies keep their contents when the original changes."""
+        buffer = RingBuffer(2)
+        buffer.append(np.array([1.0]))
+        duplicate = buffer.copy()
+        buffer.append(np.array([2.0]))
+        buffer.append(np.array([3.0]))
+
+        np.testing.assert_array_equal(duplicate.to_array(), [[1.0]])
+        assert len(RingBuffer(2).copy()) == 0
+
+    def test_clear(self):
+        """Test that clear empties the buffer."""
+        buffer = RingBuffer(2)
+        buffer.append(np.zeros(2))
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert list(buffer) == []
+
+    def test_clear_allows_new_item_shape(self):
+        """Test that an emptied buffer accepts items of a different shape."""
+        buffer = RingBuffer(2)
+        buffer.append(np.zeros(2))
+        buffer.clear()
+        buffer.append(np.ones(3))
+
+        np.testing.assert_array_equal(buffer.to_array(), [[1.0, 1.0, 1.0]])
+        with pytest.raises(ValueError, match="Expected item of shape"):
+            buffer.append(np.zeros(2))
+
+
+class TestRollingStatistics:
+    """Test RollingStatistics behaviour."""
+
+    def test_invalid_window_size(self):
+        """Test that non-positive window raises error."""
+        with pytest.raises(ValueError, match="window_size must be positive"):
+            RollingStatistics(0)
+
+    @pytest.mark.parametrize("window_size", [1, 3, 20])
+    def test_matches_window_computation(self, window_size):
+        """Test mean/std against NumPy over the same window."""
+        rng = np.random.default_rng(window_size)
+        values = rng.normal(5.0, 2.0, size=(200, 4))
+        stats = RollingStatistics(window_size)
+
+        for i, value in enumerate(values):
+            stats.push(value)
+            window = values[max(0, i - window_size + 1):i + 1]
+            assert stats.count == len(window)
+            assert np.allclose(stats.mean, window.mean(axis=0))
+            assert np.allclose(stats.std, window.std(axis=0))
+
+    def test_scalar_values(self):
+        """Test that scalar values are supported."""
+        stats = RollingStatistics(2)
+        for value in (100.0, 110.0, 120.0):
+            stats.push(value)
+
+        assert float(stats.mean) == pytest.approx(115.0)
+        assert float(stats.std) == pytest.approx(5.0)
+
+    def test_identical_values_have_zero_variance(self):
+        """Test that constant input yields exactly zero variance."""
+        stats = RollingStatistics(5)
+        for _ in range(20):
+            stats.push(np.array([1.0, 2.0, 3.0]))
+
+        assert np.all(stats.variance == 0.0)
+
+    def test_resync_keeps_long_streams_accurate(self):
+        """Test accuracy after many more pushes than the resync interval."""
+        rng = np.random.default_rng(0)
+        values = rng.normal(1e3, 1.0, size=(3 * RollingStatistics.RESYNC_INTERVAL + 7, 2))
+        stats = RollingStatistics(10)
+        for value in values:
+            stats.push(value)
+
+        assert np.allclose(stats.mean, values[-10:].mean(axis=0))
+        assert np.allclose(stats.std, values[-10:].std(axis=0))
+
+    def test_clear(self):
+        """Test that clear empties the window."""
+        stats = RollingStatistics(3)
+        stats.push(1.0)
+        stats.clear()
+
+        assert stats.count == 0
+
+
+class TestReservoirSample:
+    """Test ReservoirSample behaviour."""
+
+    def test_keeps_everything_below_capacity(self):
+        """Test that all items are stored until capacity is reached."""
+        reservoir = ReservoirSample(5, seed=0)
+        for i in range(4):
+            assert reservoir.add(np.array([float(i)]))
+
+        assert len(reservoir) == 4
+        assert np.array_equal(reservoir.samples[:, 0], [0, 1, 2, 3])
+
+    def test_size_is_bounded(self):
+        """Test that the sample never exceeds capacity."""
+        reservoir = ReservoirSample(10, seed=0)
+        for i in range(1000):
+            reservoir.add(np.array([float(i)]))
+
+        assert len(reservoir) == 10
+        assert reservoir.seen == 1000
+
+    def test_sample_is_roughly_uniform(self):
+        """Test that late items are not over- or under-represented."""
+        reservoir = ReservoirSample(200, seed=1)
+        for i in range(2000):
+            reservoir.add(np.array([float(i)]))
+
+        # Mean of a uniform sample of 0..1999 should be near 1000
+        assert abs(np.mean(reservoir.samples) - 1000.0) < 150.0
+
+    def test_clear(self):
+        """Test that clear resets the sample."""
+        reservoir = ReservoirSample(3, seed=0)
+        reservoir.add(np.zeros(2))
+        reservoir.clear()
+
+        assert len(reservoir) == 0
+        assert reservoir.seen == 0
+
+    def test_clear_allows_new_item_shape(self):
+        """Test that an emptied reservoir accepts items of a different shape."""
+        reservoir = ReservoirSample(3, seed=0)
+        reservoir.add(np.zeros(2))
+        reservoir.clear()
+        reservoir.add(np.ones(3))
+
+        np.testing.assert_array_equal(reservoir.samples, [[1.0, 1.0, 1.0]])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -50,7 +50,7 @@ class TestWarmupState:
         assert state.frame_count == 0
         assert state.beta_is_stable is False
         assert state.stability_score == 0.0
-        assert isinstance(state.timestamp, datetime)
+        assert isinstance(state.timestamp, float)
         assert isinstance(state.metadata, dict)
         assert len(state.metadata) == 0
 
@@ -63,6 +63,17 @@ class TestWarmupState:
         assert hasattr(state, 'timestamp')
         assert hasattr(state, 'metadata')
 
+    def test_snapshot_is_independent(self):
+        """Test that snapshots do not change with later updates."""
+        warmup = Warmup(WarmupConfig(warmup_frame_threshold=2))
+        snapshot = warmup.update(np.ones(10)).snapshot()
+        warmup.update(np.ones(10))
+
+        assert snapshot.frame_count == 1
+        assert snapshot.beta_is_stable is False
+        assert snapshot.metadata["frames_remaining"] == 1
+        assert warmup.state.beta_is_stable is True
+
 
 class TestWarmupInitialization:
     """Test Warmup class initialization."""
@@ -217,7 +228,7 @@ class TestWarmupReset:
         assert warmup.state.frame_count == 0
         assert warmup.state.beta_is_stable is False
         assert warmup.state.stability_score == 0.0
-        assert isinstance(warmup.state.timestamp, datetime)
+        assert isinstance(warmup.state.timestamp, float)
         assert warmup.state.metadata == {}
 
     def test_reset_in_middle_of_warmup(self):
@@ -484,12 +495,28 @@ class TestWarmupTimestamp:
         assert updated_timestamp >= initial_timestamp
 
     def test_timestamp_format(self):
-        """Test that timestamp is a datetime object."""
+        """Test that timestamp is stored as monotonic float seconds."""
         warmup = Warmup()
         measurement = np.array([0.1, -0.2, 0.3, 0.0, 0.1, -0.1, 0.2, 0.0, 0.05, -0.05])
 
         warmup.update(measurement)
-        assert isinstance(warmup.state.timestamp, datetime)
+        assert isinstance(warmup.state.timestamp, float)
+
+    def test_explicit_timestamp(self):
+        """Test that a caller-supplied timestamp is stored as given."""
+        warmup = Warmup()
+        measurement = np.zeros(10)
+
+        warmup.update(measurement, timestamp=12.5)
+        assert warmup.state.timestamp == 12.5
+
+    def test_datetime_timestamp_serializes_back(self):
+        """Test that datetime input round-trips through to_dict()."""
+        warmup = Warmup()
+        capture_time = datetime(2024, 1, 1, 12, 0, 0)
+
+        warmup.update(np.zeros(10), timestamp=capture_time)
+        assert warmup.state.to_dict()["timestamp"] == capture_time.isoformat()
 
 
 class TestWarmupEdgeCases:
@@ -8,11 +8,12 @@ This module implements warm-up period functionality that:
 - Handles reset for new scans
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, replace
 from typing import Optional
 import numpy as np
 
+from vision_service.timing import Timestamp, monotonic, to_isoformat, to_seconds
+
 
 @dataclass
 class WarmupConfig:
@@ -35,12 +36,26 @@ class WarmupState:
     stability_score: float = 0.0
     """Progress toward stability (0.0-1.0) for UI feedback."""
 
-    timestamp: datetime = field(default_factory=datetime.now)
-    """Timestamp when warm-up state was last updated."""
+    timestamp: float = field(default_factory=monotonic)
+    """Monotonic time (seconds) when warm-up state was last updated."""
 
     metadata: dict = field(default_factory=dict)
     """Additional metadata about the warm-up."""
 
+    def snapshot(self) -> "WarmupState":
+        """Copy of the state that later updates do not modify."""
+        return replace(self, metadata=dict(self.metadata))
+
+    def to_dict(self) -> dict:
+        """Convert warm-up state to dictionary (for serialization)."""
+        return {
+            "frame_count": self.frame_count,
+            "beta_is_stable": self.beta_is_stable,
+            "stability_score": self.stability_score,
+            "timestamp": to_isoformat(self.timestamp),
+            "metadata": dict(self.metadata),
+        }
+
 
 class Warmup:
     """
@@ -61,12 +76,16 @@ class Warmup:
         self.config = config or WarmupConfig()
         self.state = WarmupState()
 
-    def update(self, measurement: np.ndarray) -> WarmupState:
+    def update(
+        self, measurement: np.ndarray, timestamp: Optional[Timestamp] = None
+    ) -> WarmupState:
         """
         Process a measurement frame and update warm-up state.
 
         Args:
             measurement: Measurement vector (typically 10D for beta parameters).
+            timestamp: Capture time of the frame, as monotonic seconds or a
+                datetime. Defaults to the current monotonic time.
 
         Returns:
             Current WarmupState with stability flag and progress.
@@ -87,7 +106,7 @@ class Warmup:
         # Update stability flag and score
         self._update_stability()
 
-        self.state.timestamp = datetime.now()
+        self.state.timestamp = monotonic() if timestamp is None else to_seconds(timestamp)
         return self.state
 
     def _update_stability(self) -> None:
@@ -27,6 +27,9 @@ class FrameQuality:
     iou: Optional[float] = None  # IoU prediction from SAM
     is_valid: bool = False  # Overall validity of frame
     warnings: Optional[list] = None
+    # Mask bbox (x_min, y_min, x_max, y_max) in pixels of the analysed image;
+    # the measurement pipeline maps it to the full frame when cropping to an ROI
+    person_box: Optional[Tuple[int, int, int, int]] = None
 
 
 class FrameQualityDetector:
@@ -79,6 +82,7 @@ class FrameQualityDetector:
         confidence = 0.0
         stability_score = 0.0
         iou = None
+        person_box = None
 
         # Step 1: Detect user in frame using SAM
         if self.sam_segmenter:
@@ -97,6 +101,8 @@ class FrameQualityDetector:
 
                     if result.stability_score is not None:
                         stability_score = result.stability_score
+
+                    person_box = self._mask_box(result.mask)
                 else:
                     user_in_frame = False
                     confidence = 0.0
@@ -137,8 +143,21 @@ class FrameQualityDetector:
             iou=iou,
             is_valid=is_valid,
             warnings=warnings if warnings else None,
+            person_box=person_box,
         )
 
+    @staticmethod
+    def _mask_box(mask) -> Optional[Tuple[int, int, int, int]]:
+        """Bounding box of a dense or compact mask (max exclusive)."""
+        bbox = getattr(mask, "bbox", None)
+        if bbox is not None or not isinstance(mask, np.ndarray):
+            return bbox
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size == 0:
+            return None
+        cols = np.flatnonzero(mask[rows[0]:rows[-1] + 1].any(axis=0))
+        return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
     def batch_analyze(
         self,
         images: list,
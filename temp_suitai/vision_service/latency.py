@@ -0,0 +1,128 @@
+"""
+Latency histograms shared by the frame pipeline and batching schedulers.
+
+Samples are recorded in seconds (differences of ``timing.monotonic()``) and
+bucketed into fixed millisecond edges, so recording is O(log buckets) and
+memory does not grow with the number of frames.
+"""
+
+from typing import List, Sequence, Tuple
+import bisect
+import threading
+import numpy as np
+
+
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 33.0, 50.0, 100.0, 200.0, 500.0, 1000.0
+)
+"""Upper bucket edges (ms) for latency histograms; a final bucket holds the rest."""
+
+
+class LatencyHistogram:
+    """
+    Thread-safe fixed-bucket latency histogram.
+
+    Latencies are recorded in seconds and reported in milliseconds.
+    Percentiles are estimated from bucket edges.
+    """
+
+    def __init__(self, bucket_edges_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        """
+        Initialize histogram.
+
+        Args:
+            bucket_edges_ms: Increasing upper edges of the buckets in milliseconds.
+
+        Raises:
+            ValueError: If edges are empty or not strictly increasing.
+        """
+        edges = list(bucket_edges_ms)
+        if not edges or any(b <= a for a, b in zip(edges, edges[1:])):
+            raise ValueError("bucket_edges_ms must be non-empty and strictly increasing")
+
+        self.bucket_edges_ms = tuple(float(e) for e in edges)
+        self._counts = [0] * (len(edges) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record one latency sample given in seconds."""
+        ms = seconds * 1000.0
+        index = bisect.bisect_left(self.bucket_edges_ms, ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total_ms += ms
+            self._max_ms = max(self._max_ms, ms)
+
+    @property
+    def count(self) -> int:
+        """Number of recorded samples."""
+        return self._count
+
+    @property
+    def counts(self) -> List[int]:
+        """Samples per bucket (last entry counts samples above the final edge)."""
+        with self._lock:
+            return list(self._counts)
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean latency in milliseconds (0.0 if empty)."""
+        with self._lock:
+            return self._total_ms / self._count if self._count else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        """Largest recorded latency in milliseconds."""
+        return self._max_ms
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile in milliseconds.
+
+        Args:
+            q: Percentile in [0, 100].
+
+        Returns:
+            Upper edge of the bucket containing the percentile (the observed
+            maximum for the overflow bucket), or 0.0 if empty.
+        """
+        if not 0.0 <= q <= 100.0:
+            raise ValueError(f"Percentile must be in [0, 100], got {q}")
+
+        with self._lock:
+            if self._count == 0:
+                return 0.0
+            target = max(1, int(np.ceil(q / 100.0 * self._count)))
+            cumulative = 0
+            for index, bucket_count in enumerate(self._counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    if index < len(self.bucket_edges_ms):
+                        return min(self.bucket_edges_ms[index], self._max_ms)
+                    return self._max_ms
+            return self._max_ms
+
+    def reset(self) -> None:
+        """Clear all samples."""
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self._count = 0
+            self._total_ms = 0.0
+            self._max_ms = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert histogram to dictionary (for serialization)."""
+        return {
+            "bucket_edges_ms": list(self.bucket_edges_ms),
+            "counts": self.counts,
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
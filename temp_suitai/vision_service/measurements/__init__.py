@@ -9,33 +9,41 @@ This package provides tools for:
 - Differentiable measurement extraction for PyTorch optimization
 """
 
-from .landmarks import (
-    Landmark,
-    CircumferencePath,
-    BodyRegion,
-    MeasurementType,
-    LANDMARKS,
-    CIRCUMFERENCE_PATHS,
-    get_landmark,
-    get_landmark_vertex,
-    get_landmarks_by_region,
-    get_all_landmark_names,
-    get_all_landmark_vertices,
-    get_circumference_path,
-    get_circumference_paths_by_region,
-    get_all_circumference_names,
-    get_landmarks_stats,
-    validate_landmarks,
-)
+from vision_service._lazy import lazy_attributes
 
-from .differentiable import (
-    DifferentiableMeasurement,
-    DifferentiableMeasurementConfig,
-    DifferentiableMeasurementResult,
-    verify_gradients,
-    compute_batch_measurements,
-    extract_measurements_as_vector,
-)
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    ".landmarks": [
+        "Landmark",
+        "CircumferencePath",
+        "BodyRegion",
+        "MeasurementType",
+        "LANDMARKS",
+        "CIRCUMFERENCE_PATHS",
+        "get_landmark",
+        "get_landmark_vertex",
+        "get_landmarks_by_region",
+        "get_all_landmark_names",
+        "get_all_landmark_vertices",
+        "get_circumference_path",
+        "get_circumference_paths_by_region",
+        "get_all_circumference_names",
+        "get_landmarks_stats",
+        "validate_landmarks",
+        "LandmarkIndex",
+        "REGION_CODES",
+        "build_landmark_index",
+        "get_landmark_index",
+    ],
+    ".differentiable": [
+        "DifferentiableMeasurement",
+        "DifferentiableMeasurementConfig",
+        "DifferentiableMeasurementResult",
+        "verify_gradients",
+        "compute_batch_measurements",
+        "iter_measurement_chunks",
+        "extract_measurements_as_vector",
+    ],
+})
 
 __all__ = [
     # Landmarks
@@ -55,11 +63,16 @@ __all__ = [
     "get_all_circumference_names",
     "get_landmarks_stats",
     "validate_landmarks",
+    "LandmarkIndex",
+    "REGION_CODES",
+    "build_landmark_index",
+    "get_landmark_index",
     # Differentiable measurements
     "DifferentiableMeasurement",
     "DifferentiableMeasurementConfig",
     "DifferentiableMeasurementResult",
     "verify_gradients",
     "compute_batch_measurements",
+    "iter_measurement_chunks",
     "extract_measurements_as_vector",
 ]
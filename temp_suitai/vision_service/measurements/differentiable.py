@@ -13,18 +13,52 @@ measurements that can be used in loss functions or adversarial training.
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
 import numpy as np
 
 from vision_service.measurements.landmarks import (
-    LANDMARKS,
-    CIRCUMFERENCE_PATHS,
-    BodyRegion,
-    get_circumference_paths_by_region,
     get_all_circumference_names,
+    get_landmark_index,
+)
+
+
+# Precision policies: dtype vertices are gathered in. Interpolation and path
+# and pair lengths are always accumulated in at least float32.
+PRECISION_DTYPES: Dict[str, torch.dtype] = {
+    "fp32": torch.float32,
+    "bf16": torch.bfloat16,
+}
+
+# Linear measurements between landmark pairs: (name, start_landmark, end_landmark)
+LINEAR_MEASUREMENT_PAIRS: Tuple[Tuple[str, str, str], ...] = (
+    # Head measurements
+    ("head_height", "head_top", "chin"),
+    ("head_width", "head_left", "head_right"),
+
+    # Neck to shoulder
+    ("neck_to_shoulder_left", "neck_back", "left_shoulder_top"),
+    ("neck_to_shoulder_right", "neck_back", "right_shoulder_top"),
+    ("shoulder_width", "left_shoulder_top", "right_shoulder_top"),
+
+    # Arm lengths
+    ("left_arm_length", "left_shoulder_top", "left_wrist"),
+    ("right_arm_length", "right_shoulder_top", "right_wrist"),
+    ("left_forearm_length", "left_elbow", "left_wrist"),
+    ("right_forearm_length", "right_elbow", "right_wrist"),
+
+    # Torso measurements
+    ("torso_length", "neck_back", "hip_center_back"),
+    ("chest_depth", "chest_center", "back_center"),
+
+    # Leg measurements
+    ("left_leg_length", "left_hip_joint", "left_ankle"),
+    ("right_leg_length", "right_hip_joint", "right_ankle"),
+    ("left_thigh_length", "left_hip_joint", "left_knee"),
+    ("right_thigh_length", "right_hip_joint", "right_knee"),
+    ("left_calf_length", "left_knee", "left_ankle"),
+    ("right_calf_length", "right_knee", "right_ankle"),
 )
 
 
@@ -38,12 +72,23 @@ class DifferentiableMeasurementConfig:
         dtype: PyTorch data type (torch.float32, torch.float64, etc.)
         normalize_circumferences: Normalize circumferences by body size
         compute_confidences: Compute per-measurement confidence scores
+        precision: Compute precision, one of PRECISION_DTYPES. "fp32" keeps
+            float64 input in float64; "bf16" casts vertices to bfloat16 for
+            the gather (halving memory traffic) and accumulates in float32
     """
     num_circumference_samples: int = 32
     device: str = "cpu"
     dtype: torch.dtype = torch.float32
     normalize_circumferences: bool = False
     compute_confidences: bool = True
+    precision: str = "fp32"
+
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.precision not in PRECISION_DTYPES:
+            raise ValueError(
+                f"precision must be one of {list(PRECISION_DTYPES)}, got '{self.precision}'"
+            )
 
 
 @dataclass
@@ -66,6 +111,125 @@ class DifferentiableMeasurementResult:
     confidences: Optional[Dict[str, torch.Tensor]] = None
 
 
+def _same_device(actual: torch.device, target: torch.device) -> bool:
+    """Whether a tensor on `actual` already lives on `target`.
+
+    A target without an index ("cuda") matches any device of that type, so
+    tensors on "cuda:0" are not copied for a module configured with "cuda".
+    """
+    if actual.type != target.type:
+        return False
+    return target.index is None or actual.index == target.index
+
+
+def _packed_geometry(
+    vertices: torch.Tensor,
+    gather_indices: torch.Tensor,
+    weights: torch.Tensor,
+    num_taps: int,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Closed-loop path segments and landmark pair vectors from one gather.
+
+    Returns:
+        Tuple of segments (batch_size, C, S, 3), their lengths (batch_size, C, S),
+        pair vectors (batch_size, P, 3) and their lengths (batch_size, P), in
+        at least float32
+    """
+    batch_size = vertices.shape[0]
+    num_paths, num_samples = weights.shape[:2]
+    num_pairs = (gather_indices.shape[0] - num_taps) // 2
+
+    accumulate_dtype = torch.promote_types(vertices.dtype, torch.float32)
+    gathered = vertices.index_select(1, gather_indices).to(accumulate_dtype)
+
+    # Blend the two taps of every sample point: (batch_size, C, S, 3)
+    taps = gathered[:, :num_taps].view(batch_size, num_paths, num_samples, 2, 3)
+    sampled_points = (taps * weights.to(accumulate_dtype).unsqueeze(-1)).sum(dim=3)
+
+    # Closed-loop path: segment to the next point, wrapping around
+    segments = torch.roll(sampled_points, shifts=-1, dims=2) - sampled_points
+    endpoints = gathered[:, num_taps:].view(batch_size, num_pairs, 2, 3)
+    pair_vectors = endpoints[:, :, 1] - endpoints[:, :, 0]
+    return segments, torch.norm(segments, dim=3), pair_vectors, torch.norm(pair_vectors, dim=2)
+
+
+def _unit_directions(vectors: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+    """d|x|/dx = x/|x|, taken as zero for zero-length vectors."""
+    return vectors / torch.where(lengths > 0, lengths, torch.ones_like(lengths)).unsqueeze(-1)
+
+
+class _PackedMeasurementFunction(torch.autograd.Function):
+    """All circumferences and linear measurements from one vertex gather.
+
+    Circumferences are closed polylines through points sampled by piecewise
+    linear interpolation along each vertex path; linear measurements are
+    distances between landmark pairs. Both are returned in millimeters.
+    Vertices are gathered in their own dtype; interpolation, segment lengths
+    and sums use at least float32, so bfloat16 vertices only cost their
+    input quantization.
+
+    The backward pass is written out so that it only needs the unit segment
+    directions. Those are kept on ctx rather than saved for backward, so,
+    as with independently computed measurements, each measurement of a
+    result can be backpropagated on its own without retain_graph. With
+    create_graph=True the directions are rebuilt from the saved vertices
+    with autograd enabled, so the gradient is itself differentiable.
+    """
+
+    @staticmethod
+    def forward(ctx, vertices, gather_indices, weights, valid, num_taps):
+        segments, segment_lengths, pair_vectors, pair_lengths = _packed_geometry(
+            vertices, gather_indices, weights, num_taps
+        )
+        valid = valid.to(segment_lengths.dtype)
+        circumferences = segment_lengths.sum(dim=2) * valid * 1000.0
+        linear = pair_lengths * 1000.0
+
+        if ctx.needs_input_grad[0]:
+            ctx.segment_directions = _unit_directions(segments, segment_lengths)
+            ctx.pair_directions = _unit_directions(pair_vectors, pair_lengths)
+            # Only read by double backward, which differentiates through the directions
+            ctx.save_for_backward(vertices)
+            ctx.num_vertices = vertices.shape[1]
+            ctx.vertices_dtype = vertices.dtype
+            ctx.gather_indices = gather_indices
+            ctx.weights = weights.to(segment_lengths.dtype)
+            ctx.valid = valid
+            ctx.num_taps = num_taps
+        return circumferences, linear
+
+    @staticmethod
+    def backward(ctx, grad_circumferences, grad_linear):
+        if torch.is_grad_enabled():
+            # create_graph=True: directions must depend on the vertices
+            vertices, = ctx.saved_tensors
+            segments, segment_lengths, pair_vectors, pair_lengths = _packed_geometry(
+                vertices, ctx.gather_indices, ctx.weights, ctx.num_taps
+            )
+            directions = _unit_directions(segments, segment_lengths)
+            pair_directions = _unit_directions(pair_vectors, pair_lengths)
+        else:
+            directions = ctx.segment_directions
+            pair_directions = ctx.pair_directions
+        batch_size = directions.shape[0]
+
+        # Point s starts segment s and ends segment s - 1
+        scale = (grad_circumferences * ctx.valid * 1000.0)[:, :, None, None]
+        grad_points = scale * (torch.roll(directions, shifts=1, dims=2) - directions)
+        grad_taps = grad_points.unsqueeze(3) * ctx.weights.unsqueeze(-1)
+
+        grad_ends = (grad_linear * 1000.0).unsqueeze(-1) * pair_directions
+        grad_endpoints = torch.stack([-grad_ends, grad_ends], dim=2)
+
+        grad_gathered = torch.cat([
+            grad_taps.reshape(batch_size, -1, 3),
+            grad_endpoints.reshape(batch_size, -1, 3),
+        ], dim=1)
+        grad_vertices = grad_gathered.new_zeros(batch_size, ctx.num_vertices, 3)
+        grad_vertices = grad_vertices.index_add(1, ctx.gather_indices, grad_gathered)
+        return grad_vertices.to(ctx.vertices_dtype), None, None, None, None
+
+
 class DifferentiableMeasurement(nn.Module):
     """PyTorch module for differentiable body measurement extraction.
 
@@ -92,23 +256,66 @@ class DifferentiableMeasurement(nn.Module):
         self._setup_measurement_indices()
 
     def _setup_measurement_indices(self) -> None:
-        """Set up and register measurement indices as buffers."""
-        # Circumference paths: map from measurement name to vertex indices
-        self.circumference_indices: Dict[str, torch.Tensor] = {}
-
-        for circ_name, circ_path in CIRCUMFERENCE_PATHS.items():
-            indices = torch.tensor(
-                circ_path.vertex_indices,
-                dtype=torch.long,
-                device=self.config.device
-            )
-            self.register_buffer(f"circ_{circ_name}", indices)
-            self.circumference_indices[circ_name] = indices
+        """Pack all measurement indices and weights into buffers.
+
+        Every circumference is resampled to num_circumference_samples points,
+        each a linear blend of two path vertices, so all paths share one
+        [C, S, 2] table of SMPL vertex indices and blend weights. Landmark
+        pairs for linear measurements form a [P, 2] table. Both are flattened
+        into one index buffer, so forward() reads all vertices it needs with a
+        single gather.
+        """
+        num_samples = self.config.num_circumference_samples
+        index = get_landmark_index()
 
         # Create mapping of all landmark names to vertex indices
-        self.landmark_vertices: Dict[str, int] = {}
-        for lm_name, landmark in LANDMARKS.items():
-            self.landmark_vertices[lm_name] = landmark.vertex_idx
+        self.landmark_vertices: Dict[str, int] = dict(
+            zip(index.landmark_names, index.landmark_vertices.tolist())
+        )
+
+        # Circumference paths: two (vertex, weight) taps per sample point
+        self.circumference_names: List[str] = list(index.circumference_names)
+        num_paths = len(self.circumference_names)
+        sample_indices = torch.zeros(num_paths, num_samples, 2, dtype=torch.long)
+        sample_weights = torch.zeros(num_paths, num_samples, 2)
+        path_valid = torch.zeros(num_paths)
+
+        for row, circ_name in enumerate(self.circumference_names):
+            vertex_indices = torch.tensor(index.circumference_path(circ_name), dtype=torch.long)
+            path_length = vertex_indices.shape[0]
+            if path_length < 2:
+                # Degenerate paths measure zero
+                continue
+
+            positions = torch.linspace(0, path_length - 1, num_samples)
+            idx_floor = torch.floor(positions).long()
+            idx_ceil = torch.ceil(positions).long()
+            alpha = positions - idx_floor.float()
+
+            sample_indices[row, :, 0] = vertex_indices[idx_floor]
+            sample_indices[row, :, 1] = vertex_indices[idx_ceil]
+            sample_weights[row, :, 0] = 1.0 - alpha
+            sample_weights[row, :, 1] = alpha
+            path_valid[row] = 1.0
+
+        # Landmark pairs whose landmarks are defined
+        pairs = [
+            (meas_name, self.landmark_vertices[start_lm], self.landmark_vertices[end_lm])
+            for meas_name, start_lm, end_lm in LINEAR_MEASUREMENT_PAIRS
+            if start_lm in self.landmark_vertices and end_lm in self.landmark_vertices
+        ]
+        self.linear_measurement_names: List[str] = [name for name, _, _ in pairs]
+        pair_indices = torch.tensor(
+            [[start_idx, end_idx] for _, start_idx, end_idx in pairs], dtype=torch.long
+        ).view(-1, 2)
+
+        self.register_buffer(
+            "gather_indices",
+            torch.cat([sample_indices.view(-1), pair_indices.view(-1)]).to(self.config.device)
+        )
+        self.register_buffer("circumference_weights", sample_weights.to(self.config.device))
+        self.register_buffer("circumference_valid", path_valid.to(self.config.device))
+        self._num_circumference_taps = sample_indices.numel()
 
     def forward(
         self,
@@ -142,33 +349,37 @@ class DifferentiableMeasurement(nn.Module):
         device = vertices.device
         dtype = vertices.dtype
 
-        # Ensure vertices is on the correct device
-        if device != torch.device(self.config.device):
-            vertices = vertices.to(self.config.device)
+        circumference_values, linear_values = self._compute_packed_measurements(
+            self._prepare_vertices(vertices), return_all_measurements
+        )
+        return self._build_result(
+            circumference_values, linear_values, batch_size, device, dtype
+        )
 
-        measurements = {}
-        circumferences = {}
+    def _build_result(
+        self,
+        circumference_values: torch.Tensor,
+        linear_values: Optional[torch.Tensor],
+        batch_size: int,
+        device: torch.device,
+        dtype: torch.dtype
+    ) -> DifferentiableMeasurementResult:
+        """Split packed measurement tensors into a result of per-name views."""
+        circumferences = {
+            name: circumference_values[:, i] for i, name in enumerate(self.circumference_names)
+        }
         linear_measurements = {}
-        confidences = {}
-
-        # Compute circumference measurements
-        for circ_name in get_all_circumference_names():
-            circ_tensor = self._compute_circumference(vertices, circ_name)
-            circumferences[circ_name] = circ_tensor
-            measurements[circ_name] = circ_tensor
-
-            if self.config.compute_confidences:
-                confidences[circ_name] = torch.ones(batch_size, device=device, dtype=dtype)
+        if linear_values is not None:
+            linear_measurements = {
+                name: linear_values[:, i] for i, name in enumerate(self.linear_measurement_names)
+            }
+        measurements = {**circumferences, **linear_measurements}
 
-        # Compute linear measurements if requested
-        if return_all_measurements:
-            linear_results = self._compute_linear_measurements(vertices)
-            linear_measurements.update(linear_results)
-            measurements.update(linear_results)
-
-            if self.config.compute_confidences:
-                for measurement_name in linear_results:
-                    confidences[measurement_name] = torch.ones(batch_size, device=device, dtype=dtype)
+        confidences = {}
+        if self.config.compute_confidences:
+            # One allocation; each measurement gets a column view
+            ones = torch.ones(batch_size, len(measurements), device=device, dtype=dtype)
+            confidences = {name: ones[:, i] for i, name in enumerate(measurements)}
 
         measurement_names = sorted(measurements.keys())
 
@@ -183,159 +394,49 @@ class DifferentiableMeasurement(nn.Module):
 
         return result
 
-    def _compute_circumference(self, vertices: torch.Tensor, circ_name: str) -> torch.Tensor:
-        """Compute a single circumference measurement via path sampling.
-
-        Uses piecewise linear interpolation along the vertex path to approximate
-        the true circumference through regular sampling.
-
-        Args:
-            vertices: Tensor of shape (batch_size, 6890, 3)
-            circ_name: Name of circumference measurement
-
-        Returns:
-            Tensor of shape (batch_size,) with circumference values in millimeters
-        """
-        circ_path = CIRCUMFERENCE_PATHS[circ_name]
-        vertex_indices = circ_path.vertex_indices
-        batch_size = vertices.shape[0]
-        device = vertices.device
-
-        # Get vertices for this path
-        path_vertices = vertices[:, vertex_indices, :]  # (batch_size, path_length, 3)
-        path_length = path_vertices.shape[1]
-
-        if path_length < 2:
-            # Return zero for invalid paths
-            return torch.zeros(batch_size, device=device, dtype=vertices.dtype)
-
-        # Sample points along the path using piecewise linear interpolation
-        num_samples = self.config.num_circumference_samples
-        sample_indices = torch.linspace(0, path_length - 1, num_samples, device=device)
-
-        # Interpolate vertices at sample points
-        sampled_points = self._interpolate_path(path_vertices, sample_indices)
-
-        # Compute piecewise distances between consecutive sampled points
-        # Wrap around to close the loop
-        diffs = sampled_points[:, 1:, :] - sampled_points[:, :-1, :]
-        distances = torch.norm(diffs, dim=2)
-
-        # Add distance from last point back to first point to close the loop
-        wrap_diff = sampled_points[:, 0, :] - sampled_points[:, -1, :]
-        wrap_distance = torch.norm(wrap_diff, dim=1, keepdim=True)
-
-        # Sum distances
-        total_distance = torch.sum(distances, dim=1) + wrap_distance.squeeze(1)
-
-        # Convert meters to millimeters
-        circumference = total_distance * 1000.0
-
-        return circumference
-
-    def _interpolate_path(
+    def _prepare_vertices(self, vertices: torch.Tensor) -> torch.Tensor:
+        """Move vertices to the module device and compute dtype, copying only if needed."""
+        target = torch.device(self.config.device)
+        if not _same_device(vertices.device, target):
+            vertices = vertices.to(target)
+
+        compute_dtype = PRECISION_DTYPES[self.config.precision]
+        if compute_dtype == torch.float32 and vertices.dtype == torch.float64:
+            # Full precision keeps double input as is
+            return vertices
+        if vertices.dtype != compute_dtype:
+            vertices = vertices.to(compute_dtype)
+        return vertices
+
+    def _compute_packed_measurements(
         self,
-        path_vertices: torch.Tensor,
-        sample_indices: torch.Tensor
-    ) -> torch.Tensor:
-        """Linearly interpolate points along a vertex path.
-
-        Args:
-            path_vertices: Tensor of shape (batch_size, path_length, 3)
-            sample_indices: Tensor of shape (num_samples,) with indices to sample
-
-        Returns:
-            Tensor of shape (batch_size, num_samples, 3) with interpolated points
-        """
-        batch_size = path_vertices.shape[0]
-        device = path_vertices.device
-
-        # Clamp indices to valid range
-        sample_indices_clamped = torch.clamp(
-            sample_indices,
-            0,
-            path_vertices.shape[1] - 1.0
-        )
-
-        # Split into integer and fractional parts
-        idx_floor = torch.floor(sample_indices_clamped).long()
-        idx_ceil = torch.ceil(sample_indices_clamped).long()
-        alpha = sample_indices_clamped - idx_floor.float()
-
-        # Get vertices at floor and ceil indices
-        v_floor = path_vertices[:, idx_floor, :]  # (batch_size, num_samples, 3)
-        v_ceil = path_vertices[:, idx_ceil, :]    # (batch_size, num_samples, 3)
-
-        # Linear interpolation
-        alpha = alpha.view(1, -1, 1)  # (1, num_samples, 1)
-        interpolated = v_floor * (1.0 - alpha) + v_ceil * alpha
-
-        return interpolated
-
-    def _compute_linear_measurements(self, vertices: torch.Tensor) -> Dict[str, torch.Tensor]:
-        """Compute linear measurements between landmark pairs.
+        vertices: torch.Tensor,
+        compute_linear: bool = True
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """Compute all measurements with one gather.
 
         Args:
             vertices: Tensor of shape (batch_size, 6890, 3)
+            compute_linear: Also compute linear measurements
 
         Returns:
-            Dict mapping measurement names to tensors of shape (batch_size,)
+            Tuple of circumferences (batch_size, C) ordered like
+            circumference_names and linear measurements (batch_size, P)
+            ordered like linear_measurement_names (None if not computed),
+            both in millimeters
         """
-        linear_measurements = {}
-        batch_size = vertices.shape[0]
-        device = vertices.device
-
-        # Define common linear measurement pairs
-        # Each measurement: (name, start_landmark, end_landmark)
-        measurement_pairs = [
-            # Head measurements
-            ("head_height", "head_top", "chin"),
-            ("head_width", "head_left", "head_right"),
-
-            # Neck to shoulder
-            ("neck_to_shoulder_left", "neck_back", "left_shoulder_top"),
-            ("neck_to_shoulder_right", "neck_back", "right_shoulder_top"),
-            ("shoulder_width", "left_shoulder_top", "right_shoulder_top"),
-
-            # Arm lengths
-            ("left_arm_length", "left_shoulder_top", "left_wrist"),
-            ("right_arm_length", "right_shoulder_top", "right_wrist"),
-            ("left_forearm_length", "left_elbow", "left_wrist"),
-            ("right_forearm_length", "right_elbow", "right_wrist"),
-
-            # Torso measurements
-            ("torso_length", "neck_back", "hip_center_back"),
-            ("chest_depth", "chest_center", "back_center"),
-
-            # Leg measurements
-            ("left_leg_length", "left_hip_joint", "left_ankle"),
-            ("right_leg_length", "right_hip_joint", "right_ankle"),
-            ("left_thigh_length", "left_hip_joint", "left_knee"),
-            ("right_thigh_length", "right_hip_joint", "right_knee"),
-            ("left_calf_length", "left_knee", "left_ankle"),
-            ("right_calf_length", "right_knee", "right_ankle"),
-        ]
-
-        # Compute distances for each measurement pair
-        for meas_name, start_lm, end_lm in measurement_pairs:
-            start_idx = self.landmark_vertices.get(start_lm)
-            end_idx = self.landmark_vertices.get(end_lm)
-
-            if start_idx is None or end_idx is None:
-                continue
-
-            # Get landmark vertices
-            start_verts = vertices[:, start_idx, :]  # (batch_size, 3)
-            end_verts = vertices[:, end_idx, :]      # (batch_size, 3)
-
-            # Compute distance
-            diff = end_verts - start_verts
-            distance = torch.norm(diff, dim=1)  # (batch_size,)
-
-            # Convert to millimeters
-            linear_measurements[meas_name] = distance * 1000.0
-
-        return linear_measurements
+        indices = self.gather_indices
+        if not compute_linear:
+            indices = indices[:self._num_circumference_taps]
+
+        circumferences, linear = _PackedMeasurementFunction.apply(
+            vertices,
+            indices,
+            self.circumference_weights,
+            self.circumference_valid,
+            self._num_circumference_taps,
+        )
+        return circumferences, linear if compute_linear else None
 
     def get_measurement_names(self) -> List[str]:
         """Get all available measurement names.
@@ -344,16 +445,7 @@ class DifferentiableMeasurement(nn.Module):
             Sorted list of measurement names
         """
         names = list(get_all_circumference_names())
-        names.extend([
-            "head_height", "head_width",
-            "neck_to_shoulder_left", "neck_to_shoulder_right", "shoulder_width",
-            "left_arm_length", "right_arm_length",
-            "left_forearm_length", "right_forearm_length",
-            "torso_length", "chest_depth",
-            "left_leg_length", "right_leg_length",
-            "left_thigh_length", "right_thigh_length",
-            "left_calf_length", "right_calf_length",
-        ])
+        names.extend(name for name, _, _ in LINEAR_MEASUREMENT_PAIRS)
         return sorted(names)
 
     def to(self, device: str) -> "DifferentiableMeasurement":
@@ -415,17 +507,63 @@ def verify_gradients(
     return results
 
 
+def iter_measurement_chunks(
+    vertices_batch: Union[torch.Tensor, np.ndarray],
+    measurement_module: DifferentiableMeasurement,
+    chunk_size: int = 1024,
+    return_all_measurements: bool = True
+) -> Iterator[Tuple[int, torch.Tensor, Optional[torch.Tensor]]]:
+    """Compute measurements for a large batch in fixed-size chunks.
+
+    Only one chunk of vertices is converted and moved to the module device
+    at a time, so memory stays bounded for arrays of any length, including
+    memory-mapped NumPy arrays. No gradients are recorded.
+
+    Args:
+        vertices_batch: Tensor or array of shape (N, 6890, 3)
+        measurement_module: Module computing the measurements
+        chunk_size: Subjects per chunk
+        return_all_measurements: Also compute linear measurements
+
+    Yields:
+        Tuples of (start index, circumferences (n, C), linear measurements
+        (n, P) or None), ordered like the module's circumference_names and
+        linear_measurement_names
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    with torch.no_grad():
+        for start in range(0, len(vertices_batch), chunk_size):
+            chunk = vertices_batch[start:start + chunk_size]
+            if isinstance(chunk, np.ndarray):
+                # Copy the chunk out of (possibly read-only, memory-mapped) storage
+                chunk = torch.from_numpy(np.array(chunk))
+            circumferences, linear = measurement_module._compute_packed_measurements(
+                measurement_module._prepare_vertices(chunk), return_all_measurements
+            )
+            yield start, circumferences, linear
+
+
 def compute_batch_measurements(
-    vertices_batch: torch.Tensor,
+    vertices_batch: Union[torch.Tensor, np.ndarray],
     measurement_module: Optional[DifferentiableMeasurement] = None,
-    config: Optional[DifferentiableMeasurementConfig] = None
+    config: Optional[DifferentiableMeasurementConfig] = None,
+    chunk_size: Optional[int] = None
 ) -> DifferentiableMeasurementResult:
     """Convenience function to compute measurements for a batch of subjects.
 
     Args:
-        vertices_batch: Tensor of shape (batch_size, 6890, 3)
+        vertices_batch: Tensor of shape (batch_size, 6890, 3). With chunk_size
+            a NumPy (or memory-mapped) array is accepted as well.
         measurement_module: Optional pre-initialized module (creates one if not provided)
         config: Optional configuration (uses default if not provided)
+        chunk_size: If given, stream the batch through the module in chunks of
+            this many subjects (see iter_measurement_chunks). Measurements are
+            then collected on the CPU and carry no gradients.
 
     Returns:
         DifferentiableMeasurementResult with all measurements
@@ -433,7 +571,31 @@ def compute_batch_measurements(
     if measurement_module is None:
         measurement_module = DifferentiableMeasurement(config)
 
-    return measurement_module(vertices_batch)
+    if chunk_size is None:
+        return measurement_module(vertices_batch)
+
+    if vertices_batch.ndim != 3 or vertices_batch.shape[1:] != (6890, 3):
+        raise ValueError(
+            f"Expected shape (batch_size, 6890, 3), got {tuple(vertices_batch.shape)}"
+        )
+
+    batch_size = len(vertices_batch)
+    circumferences = torch.zeros(batch_size, len(measurement_module.circumference_names))
+    linear = torch.zeros(batch_size, len(measurement_module.linear_measurement_names))
+    for start, chunk_circumferences, chunk_linear in iter_measurement_chunks(
+        vertices_batch, measurement_module, chunk_size
+    ):
+        if start == 0:
+            # Outputs take the dtype the precision policy produces
+            circumferences = circumferences.to(chunk_circumferences.dtype)
+            linear = linear.to(chunk_linear.dtype)
+        end = start + chunk_circumferences.shape[0]
+        circumferences[start:end] = chunk_circumferences.cpu()
+        linear[start:end] = chunk_linear.cpu()
+
+    return measurement_module._build_result(
+        circumferences, linear, batch_size, circumferences.device, circumferences.dtype
+    )
 
 
 def extract_measurements_as_vector(
@@ -13,9 +13,16 @@ References:
 - ISO 20685-1: 3D scanning methodologies for internationally compatible anthropometric databases
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+import hashlib
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 
 class BodyRegion(Enum):
@@ -891,6 +898,277 @@ CIRCUMFERENCE_PATHS: Dict[str, CircumferencePath] = {
 }
 
 
+# ============================================================================
+# COMPILED LANDMARK INDEX
+# ============================================================================
+# The dict definitions above are compiled once into read-only NumPy arrays
+# so lookups and measurement code can work by array instead of scanning
+# dataclasses.
+
+REGIONS: Tuple[BodyRegion, ...] = tuple(BodyRegion)
+"""Body regions in region-code order (code = position in this tuple)."""
+
+REGION_CODES: Dict[BodyRegion, int] = {region: code for code, region in enumerate(REGIONS)}
+"""Region code of each body region, as stored in LandmarkIndex arrays."""
+
+INDEX_FORMAT_VERSION = 1
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class LandmarkIndex:
+    """Landmark and circumference definitions compiled into arrays.
+
+    Landmarks and circumference paths are stored in name order. Path vertex
+    ids are concatenated in circumference_vertices, with path i occupying
+    circumference_vertices[circumference_offsets[i]:circumference_offsets[i + 1]].
+    All arrays are read-only.
+
+    Attributes:
+        fingerprint: Hash of the definitions the index was compiled from
+        landmark_names: Landmark names, sorted
+        landmark_vertices: SMPL vertex id per landmark [L]
+        landmark_regions: Region code per landmark [L] (see REGION_CODES)
+        circumference_names: Circumference path names, sorted
+        circumference_vertices: Concatenated path vertex ids
+        circumference_offsets: Path boundaries in circumference_vertices [C + 1]
+        circumference_regions: Region code per path [C]
+        unique_vertices: Sorted unique landmark vertex ids
+    """
+    fingerprint: str
+    landmark_names: Tuple[str, ...]
+    landmark_vertices: np.ndarray
+    landmark_regions: np.ndarray
+    circumference_names: Tuple[str, ...]
+    circumference_vertices: np.ndarray
+    circumference_offsets: np.ndarray
+    circumference_regions: np.ndarray
+    unique_vertices: np.ndarray
+    landmark_rows: Dict[str, int] = field(init=False, repr=False, compare=False)
+    circumference_rows: Dict[str, int] = field(init=False, repr=False, compare=False)
+    _landmarks_by_region: Dict[int, np.ndarray] = field(init=False, repr=False, compare=False)
+    _circumferences_by_region: Dict[int, np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Build name->row maps and per-region row lists."""
+        for name in ("landmark_vertices", "landmark_regions", "circumference_vertices",
+                     "circumference_offsets", "circumference_regions", "unique_vertices"):
+            _read_only(getattr(self, name))
+
+        # frozen dataclass: derived fields are set through object.__setattr__
+        object.__setattr__(self, "landmark_rows",
+                           {name: row for row, name in enumerate(self.landmark_names)})
+        object.__setattr__(self, "circumference_rows",
+                           {name: row for row, name in enumerate(self.circumference_names)})
+        object.__setattr__(self, "_landmarks_by_region", {
+            code: _read_only(np.flatnonzero(self.landmark_regions == code))
+            for code in range(len(REGIONS))
+        })
+        object.__setattr__(self, "_circumferences_by_region", {
+            code: _read_only(np.flatnonzero(self.circumference_regions == code))
+            for code in range(len(REGIONS))
+        })
+
+    def landmark_vertex(self, name: str) -> Optional[int]:
+        """Vertex id of a landmark, or None if not defined."""
+        row = self.landmark_rows.get(name)
+        return None if row is None else int(self.landmark_vertices[row])
+
+    def circumference_path(self, name: str) -> Optional[np.ndarray]:
+        """Vertex ids of a circumference path (read-only view), or None."""
+        row = self.circumference_rows.get(name)
+        if row is None:
+            return None
+        start, end = self.circumference_offsets[row], self.circumference_offsets[row + 1]
+        return self.circumference_vertices[start:end]
+
+    def circumference_lengths(self) -> np.ndarray:
+        """Number of vertices per circumference path [C]."""
+        return np.diff(self.circumference_offsets)
+
+    def landmark_rows_in_region(self, region: BodyRegion) -> np.ndarray:
+        """Rows of the landmarks in a region, in name order."""
+        return self._landmarks_by_region[REGION_CODES[region]]
+
+    def circumference_rows_in_region(self, region: BodyRegion) -> np.ndarray:
+        """Rows of the circumference paths in a region, in name order."""
+        return self._circumferences_by_region[REGION_CODES[region]]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to an .npz file atomically.
+
+        Args:
+            path: Output file path
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    version=np.array(INDEX_FORMAT_VERSION),
+                    fingerprint=np.array(self.fingerprint),
+                    landmark_names=np.array(self.landmark_names),
+                    landmark_vertices=self.landmark_vertices,
+                    landmark_regions=self.landmark_regions,
+                    circumference_names=np.array(self.circumference_names),
+                    circumference_vertices=self.circumference_vertices,
+                    circumference_offsets=self.circumference_offsets,
+                    circumference_regions=self.circumference_regions,
+                    unique_vertices=self.unique_vertices,
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkIndex":
+        """
+        Read an index written by save().
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != INDEX_FORMAT_VERSION:
+                raise ValueError(f"Unsupported landmark index version in {path}")
+            return cls(
+                fingerprint=str(data["fingerprint"]),
+                landmark_names=tuple(str(name) for name in data["landmark_names"]),
+                landmark_vertices=data["landmark_vertices"],
+                landmark_regions=data["landmark_regions"],
+                circumference_names=tuple(str(name) for name in data["circumference_names"]),
+                circumference_vertices=data["circumference_vertices"],
+                circumference_offsets=data["circumference_offsets"],
+                circumference_regions=data["circumference_regions"],
+                unique_vertices=data["unique_vertices"],
+            )
+
+
+def landmark_definitions_fingerprint(
+    landmarks: Dict[str, Landmark] = LANDMARKS,
+    paths: Dict[str, CircumferencePath] = CIRCUMFERENCE_PATHS,
+) -> str:
+    """Hash of the landmark and path definitions, used to key cached indexes."""
+    digest = hashlib.sha256(f"v{INDEX_FORMAT_VERSION}".encode())
+    for name in sorted(landmarks):
+        landmark = landmarks[name]
+        digest.update(f"L:{name}:{landmark.vertex_idx}:{landmark.region.value};".encode())
+    for name in sorted(paths):
+        path = paths[name]
+        digest.update(f"C:{name}:{path.region.value}:{path.vertex_indices};".encode())
+    return digest.hexdigest()[:32]
+
+
+def build_landmark_index(
+    landmarks: Dict[str, Landmark] = LANDMARKS,
+    paths: Dict[str, CircumferencePath] = CIRCUMFERENCE_PATHS,
+) -> LandmarkIndex:
+    """
+    Compile landmark and circumference definitions into a LandmarkIndex.
+
+    Args:
+        landmarks: Landmark definitions (default: LANDMARKS)
+        paths: Circumference path definitions (default: CIRCUMFERENCE_PATHS)
+
+    Returns:
+        New LandmarkIndex
+    """
+    landmark_names = tuple(sorted(landmarks))
+    landmark_vertices = np.array(
+        [landmarks[name].vertex_idx for name in landmark_names], dtype=np.int64
+    )
+    landmark_regions = np.array(
+        [REGION_CODES[landmarks[name].region] for name in landmark_names], dtype=np.int8
+    )
+
+    circumference_names = tuple(sorted(paths))
+    lengths = [len(paths[name].vertex_indices) for name in circumference_names]
+    circumference_offsets = np.zeros(len(circumference_names) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=circumference_offsets[1:])
+    circumference_vertices = np.array(
+        [idx for name in circumference_names for idx in paths[name].vertex_indices],
+        dtype=np.int64
+    )
+    circumference_regions = np.array(
+        [REGION_CODES[paths[name].region] for name in circumference_names], dtype=np.int8
+    )
+
+    return LandmarkIndex(
+        fingerprint=landmark_definitions_fingerprint(landmarks, paths),
+        landmark_names=landmark_names,
+        landmark_vertices=landmark_vertices,
+        landmark_regions=landmark_regions,
+        circumference_names=circumference_names,
+        circumference_vertices=circumference_vertices,
+        circumference_offsets=circumference_offsets,
+        circumference_regions=circumference_regions,
+        unique_vertices=np.unique(landmark_vertices),
+    )
+
+
+_landmark_index: Optional[LandmarkIndex] = None
+_landmark_index_key: Optional[tuple] = None
+
+
+def _definitions_key() -> tuple:
+    """Names and entry objects of LANDMARKS and CIRCUMFERENCE_PATHS.
+
+    Comparing keys is a few microseconds, against ~100us for a fingerprint,
+    and catches entries being added, removed or replaced. Entries edited in
+    place are only picked up by validate_landmarks(), which compares
+    fingerprints.
+    """
+    return (tuple(LANDMARKS), tuple(LANDMARKS.values()),
+            tuple(CIRCUMFERENCE_PATHS), tuple(CIRCUMFERENCE_PATHS.values()))
+
+
+def get_landmark_index(cache_path: Optional[str] = None) -> LandmarkIndex:
+    """
+    Get the compiled index of LANDMARKS and CIRCUMFERENCE_PATHS.
+
+    The index is compiled on first use and shared by the whole process. It
+    is recompiled when entries are added to, removed from or replaced in
+    either dict.
+
+    Args:
+        cache_path: Optional .npz file to load the index from, or to write
+            it to if missing or compiled from different definitions
+
+    Returns:
+        Shared LandmarkIndex
+    """
+    global _landmark_index, _landmark_index_key
+    key = _definitions_key()
+    if _landmark_index is not None and key == _landmark_index_key:
+        return _landmark_index
+
+    index = None
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            cached = LandmarkIndex.load(cache_path)
+            if cached.fingerprint == landmark_definitions_fingerprint():
+                index = cached
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable landmark index cache {cache_path}: {e}")
+
+    if index is None:
+        index = build_landmark_index()
+        if cache_path is not None:
+            index.save(cache_path)
+
+    _landmark_index, _landmark_index_key = index, key
+    return index
+
+
 # ============================================================================
 # LANDMARK LOOKUP AND ACCESS FUNCTIONS
 # ============================================================================
@@ -932,8 +1210,8 @@ def get_landmarks_by_region(region: BodyRegion) -> List[Landmark]:
     Returns:
         List of landmarks in that region, sorted by name
     """
-    matching = [lm for lm in LANDMARKS.values() if lm.region == region]
-    return sorted(matching, key=lambda lm: lm.name)
+    index = get_landmark_index()
+    return [LANDMARKS[index.landmark_names[row]] for row in index.landmark_rows_in_region(region)]
 
 
 def get_all_landmark_names() -> List[str]:
@@ -943,7 +1221,7 @@ def get_all_landmark_names() -> List[str]:
     Returns:
         Sorted list of all landmark names
     """
-    return sorted(LANDMARKS.keys())
+    return list(get_landmark_index().landmark_names)
 
 
 def get_all_landmark_vertices() -> List[int]:
@@ -953,7 +1231,7 @@ def get_all_landmark_vertices() -> List[int]:
     Returns:
         Sorted list of unique vertex indices
     """
-    return sorted(set(lm.vertex_idx for lm in LANDMARKS.values()))
+    return get_landmark_index().unique_vertices.tolist()
 
 
 def get_circumference_path(name: str) -> Optional[CircumferencePath]:
@@ -979,8 +1257,11 @@ def get_circumference_paths_by_region(region: BodyRegion) -> List[CircumferenceP
     Returns:
         List of circumference paths in that region, sorted by name
     """
-    matching = [cp for cp in CIRCUMFERENCE_PATHS.values() if cp.region == region]
-    return sorted(matching, key=lambda cp: cp.name)
+    index = get_landmark_index()
+    return [
+        CIRCUMFERENCE_PATHS[index.circumference_names[row]]
+        for row in index.circumference_rows_in_region(region)
+    ]
 
 
 def get_all_circumference_names() -> List[str]:
@@ -990,7 +1271,7 @@ def get_all_circumference_names() -> List[str]:
     Returns:
         Sorted list of all circumference names
     """
-    return sorted(CIRCUMFERENCE_PATHS.keys())
+    return list(get_landmark_index().circumference_names)
 
 
 def get_landmarks_stats() -> Dict[str, any]:
@@ -1000,69 +1281,75 @@ def get_landmarks_stats() -> Dict[str, any]:
     Returns:
         Dictionary with landmark statistics
     """
-    region_counts = {}
-    for landmark in LANDMARKS.values():
-        region_name = landmark.region.value
-        region_counts[region_name] = region_counts.get(region_name, 0) + 1
+    index = get_landmark_index()
+    counts = np.bincount(index.landmark_regions, minlength=len(REGIONS))
+    region_counts = {
+        REGIONS[code].value: int(count) for code, count in enumerate(counts) if count
+    }
 
     return {
-        "total_landmarks": len(LANDMARKS),
-        "total_circumference_paths": len(CIRCUMFERENCE_PATHS),
-        "unique_vertices": len(get_all_landmark_vertices()),
+        "total_landmarks": len(index.landmark_names),
+        "total_circumference_paths": len(index.circumference_names),
+        "unique_vertices": len(index.unique_vertices),
         "landmarks_by_region": region_counts,
         "body_regions": [r.value for r in BodyRegion],
     }
 
 
 # ============================================================================
-# MODULE INITIALIZATION AND VALIDATION
+# VALIDATION
 # ============================================================================
 
-def validate_landmarks() -> Tuple[bool, List[str]]:
+def validate_landmarks(warn: bool = False) -> Tuple[bool, List[str]]:
     """
     Validate landmark definitions for consistency.
 
+    Not run on import; call it explicitly (e.g. in tests or at service
+    start-up) after changing the definitions.
+
+    Args:
+        warn: Also emit each error as a warning
+
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
+    global _landmark_index
     errors = []
+    index = get_landmark_index()
+    if index.fingerprint != landmark_definitions_fingerprint():
+        # Entries were edited in place; recompile the shared index
+        _landmark_index = None
+        index = get_landmark_index()
 
     # Check minimum count
-    if len(LANDMARKS) < 70:
-        errors.append(f"Must have 70+ landmarks, got {len(LANDMARKS)}")
+    if len(index.landmark_names) < 70:
+        errors.append(f"Must have 70+ landmarks, got {len(index.landmark_names)}")
 
     # Check for duplicate vertex indices within regions
     region_vertices = {}
-    for lm in LANDMARKS.values():
-        region_name = lm.region.value
-        if region_name not in region_vertices:
-            region_vertices[region_name] = {}
-
-        key = (lm.vertex_idx, lm.anatomical_name)
-        if lm.vertex_idx in region_vertices[region_name]:
-            if region_vertices[region_name][lm.vertex_idx] != lm.anatomical_name:
-                errors.append(
-                    f"Duplicate vertex {lm.vertex_idx} in region {region_name} "
-                    f"with different anatomical names"
-                )
-        else:
-            region_vertices[region_name][lm.vertex_idx] = lm.anatomical_name
+    for row, name in enumerate(index.landmark_names):
+        lm = LANDMARKS[name]
+        key = (int(index.landmark_regions[row]), int(index.landmark_vertices[row]))
+        if key not in region_vertices:
+            region_vertices[key] = lm.anatomical_name
+        elif region_vertices[key] != lm.anatomical_name:
+            errors.append(
+                f"Duplicate vertex {lm.vertex_idx} in region {lm.region.value} "
+                f"with different anatomical names"
+            )
 
     # Check circumference paths reference valid vertices
-    all_vertices = get_all_landmark_vertices()
-    for cp_name, cp in CIRCUMFERENCE_PATHS.items():
-        for vertex_idx in cp.vertex_indices:
-            if vertex_idx not in all_vertices:
-                errors.append(
-                    f"Circumference path '{cp_name}' references undefined vertex {vertex_idx}"
-                )
+    undefined = ~np.isin(index.circumference_vertices, index.unique_vertices)
+    for position in np.flatnonzero(undefined):
+        row = int(np.searchsorted(index.circumference_offsets, position, side="right")) - 1
+        errors.append(
+            f"Circumference path '{index.circumference_names[row]}' references "
+            f"undefined vertex {int(index.circumference_vertices[position])}"
+        )
+
+    if warn:
+        import warnings
+        for error in errors:
+            warnings.warn(f"Landmark validation error: {error}")
 
     return len(errors) == 0, errors
-
-
-# Run validation on module load
-_is_valid, _validation_errors = validate_landmarks()
-if not _is_valid:
-    import warnings
-    for error in _validation_errors:
-        warnings.warn(f"Landmark validation error: {error}")
@@ -16,14 +16,33 @@ import numpy as np
 from typing import Dict
 
 from vision_service.measurements.differentiable import (
+    LINEAR_MEASUREMENT_PAIRS,
     DifferentiableMeasurement,
     DifferentiableMeasurementConfig,
     DifferentiableMeasurementResult,
     verify_gradients,
     compute_batch_measurements,
+    iter_measurement_chunks,
     extract_measurements_as_vector,
+    _same_device,
 )
-from vision_service.measurements.landmarks import get_all_circumference_names
+from vision_service.measurements.landmarks import (
+    CIRCUMFERENCE_PATHS,
+    LANDMARKS,
+    get_all_circumference_names,
+)
+
+
+def reference_circumference(vertices, vertex_indices, num_samples):
+    """Per-path circumference computed with plain autograd operations."""
+    path = vertices[:, vertex_indices, :]
+    positions = torch.linspace(0, path.shape[1] - 1, num_samples)
+    floor = torch.floor(positions).long()
+    ceil = torch.ceil(positions).long()
+    alpha = (positions - floor.float()).view(1, -1, 1)
+    points = path[:, floor] * (1.0 - alpha) + path[:, ceil] * alpha
+    closed = torch.cat([points, points[:, :1]], dim=1)
+    return torch.norm(closed[:, 1:] - closed[:, :-1], dim=2).sum(dim=1) * 1000.0
 
 
 # ============================================================================
@@ -331,6 +350,30 @@ class TestGradientFlow:
         if first_name != second_name:
             assert not torch.allclose(grad_1, grad_2)
 
+    def test_double_backward(self, measurement_module):
+        """Test gradients can be differentiated again (create_graph=True)."""
+        vertices = (torch.randn(2, 6890, 3) * 0.1).requires_grad_(True)
+        result = measurement_module(vertices)
+        loss = sum(t.sum() for t in result.measurements.values())
+
+        grad, = torch.autograd.grad(loss, vertices, create_graph=True)
+        assert grad.requires_grad
+        grad.pow(2).sum().backward()
+
+        assert vertices.grad is not None
+        assert torch.all(torch.isfinite(vertices.grad))
+        assert torch.any(vertices.grad != 0)
+
+    def test_double_backward_detects_inplace_change(self, measurement_module):
+        """Test editing vertices in place before create_graph backward raises."""
+        vertices = (torch.randn(1, 6890, 3) * 0.1).requires_grad_(True)
+        loss = sum(t.sum() for t in measurement_module(vertices).measurements.values())
+        with torch.no_grad():
+            vertices.mul_(2.0)
+
+        with pytest.raises(RuntimeError, match="modified by an inplace operation"):
+            torch.autograd.grad(loss, vertices, create_graph=True)
+
 
 # ============================================================================
 # CIRCUMFERENCE MEASUREMENT TESTS
@@ -339,6 +382,46 @@ class TestGradientFlow:
 class TestCircumferenceMeasurements:
     """Test circumference measurement computation."""
 
+    def test_matches_per_path_reference(self, measurement_module):
+        """Test packed circumferences and gradients match per-path computation."""
+        vertices = (torch.randn(3, 6890, 3, dtype=torch.float64) * 0.1).requires_grad_(True)
+        result = measurement_module(vertices)
+
+        for circ_name, circ_path in CIRCUMFERENCE_PATHS.items():
+            expected = reference_circumference(vertices, circ_path.vertex_indices, 16)
+            torch.testing.assert_close(result.circumferences[circ_name], expected)
+
+            grad, = torch.autograd.grad(result.circumferences[circ_name].sum(), vertices)
+            expected_grad, = torch.autograd.grad(expected.sum(), vertices)
+            torch.testing.assert_close(grad, expected_grad)
+
+    def test_double_backward_matches_reference(self, measurement_module):
+        """Test Hessian-vector products match per-path computation."""
+        vertices = (torch.randn(2, 6890, 3, dtype=torch.float64) * 0.1).requires_grad_(True)
+        direction = torch.randn_like(vertices)
+        circ_name, circ_path = next(iter(CIRCUMFERENCE_PATHS.items()))
+
+        def hessian_vector_product(circumference):
+            grad, = torch.autograd.grad(circumference.sum(), vertices, create_graph=True)
+            hvp, = torch.autograd.grad((grad * direction).sum(), vertices)
+            return hvp
+
+        hvp = hessian_vector_product(measurement_module(vertices).circumferences[circ_name])
+        expected = hessian_vector_product(
+            reference_circumference(vertices, circ_path.vertex_indices, 16)
+        )
+        torch.testing.assert_close(hvp, expected)
+
+    def test_packed_buffers_move_with_module(self, measurement_module):
+        """Test index and weight tables are registered buffers."""
+        buffers = dict(measurement_module.named_buffers())
+        assert {"gather_indices", "circumference_weights", "circumference_valid"} <= set(buffers)
+        num_paths = len(get_all_circumference_names())
+        assert buffers["circumference_weights"].shape == (num_paths, 16, 2)
+        torch.testing.assert_close(
+            buffers["circumference_weights"].sum(dim=2), torch.ones(num_paths, 16)
+        )
+
     def test_all_circumferences_computed(self, measurement_module, sample_vertices_single):
         """Test that all circumference paths are computed."""
         result = measurement_module(sample_vertices_single)
@@ -389,6 +472,17 @@ class TestCircumferenceMeasurements:
 class TestLinearMeasurements:
     """Test linear measurement computation."""
 
+    def test_matches_landmark_distances(self, measurement_module, sample_vertices_batch):
+        """Test packed linear measurements equal landmark pair distances."""
+        result = measurement_module(sample_vertices_batch)
+
+        for meas_name, start_lm, end_lm in LINEAR_MEASUREMENT_PAIRS:
+            start = sample_vertices_batch[:, LANDMARKS[start_lm].vertex_idx]
+            end = sample_vertices_batch[:, LANDMARKS[end_lm].vertex_idx]
+            torch.testing.assert_close(
+                result.linear_measurements[meas_name], torch.norm(end - start, dim=1) * 1000.0
+            )
+
     def test_linear_measurements_computed(self, measurement_module, sample_vertices_single):
         """Test that linear measurements are computed."""
         result = measurement_module(sample_vertices_single)
@@ -476,6 +570,45 @@ class TestBatchProcessing:
 # VECTOR EXTRACTION TESTS
 # ============================================================================
 
+class TestStreamingBatches:
+    """Test chunked compute_batch_measurements."""
+
+    def test_chunked_matches_single_forward(self, measurement_module):
+        """Test streaming in chunks gives the same measurements."""
+        vertices = torch.randn(10, 6890, 3) * 0.1
+        full = measurement_module(vertices)
+        streamed = compute_batch_measurements(vertices, measurement_module, chunk_size=3)
+
+        assert streamed.batch_size == 10
+        assert set(streamed.measurements) == set(full.measurements)
+        for name, values in full.measurements.items():
+            torch.testing.assert_close(streamed.measurements[name], values)
+
+    def test_memory_mapped_numpy_input(self, measurement_module, tmp_path):
+        """Test a memory-mapped array is streamed chunk by chunk."""
+        path = tmp_path / "vertices.npy"
+        array = (np.random.randn(7, 6890, 3) * 0.1).astype(np.float32)
+        np.save(path, array)
+        mapped = np.load(path, mmap_mode="r")
+
+        chunks = list(iter_measurement_chunks(mapped, measurement_module, chunk_size=4))
+        assert [start for start, _, _ in chunks] == [0, 4]
+        assert [c.shape[0] for _, c, _ in chunks] == [4, 3]
+
+        result = compute_batch_measurements(mapped, measurement_module, chunk_size=4)
+        expected = measurement_module(torch.from_numpy(array))
+        torch.testing.assert_close(
+            result.measurements["shoulder_width"], expected.measurements["shoulder_width"]
+        )
+
+    def test_invalid_chunking(self, measurement_module):
+        """Test bad chunk sizes and shapes raise errors."""
+        with pytest.raises(ValueError):
+            next(iter_measurement_chunks(torch.zeros(2, 6890, 3), measurement_module, chunk_size=0))
+        with pytest.raises(ValueError):
+            compute_batch_measurements(torch.zeros(2, 100, 3), measurement_module, chunk_size=2)
+
+
 class TestVectorExtraction:
     """Test measurement vector extraction."""
 
@@ -597,6 +730,42 @@ class TestConfigurationAndDevice:
 
             assert len(result.measurements) > 0
 
+    def test_invalid_precision(self):
+        """Test unknown precision policy raises error."""
+        with pytest.raises(ValueError):
+            DifferentiableMeasurementConfig(precision="fp8")
+
+    def test_bf16_precision(self, sample_vertices_batch):
+        """Test bf16 only quantizes the input and accumulates in float32."""
+        bf16 = DifferentiableMeasurement(
+            DifferentiableMeasurementConfig(num_circumference_samples=16, precision="bf16")
+        )
+        fp32 = DifferentiableMeasurement(DifferentiableMeasurementConfig(num_circumference_samples=16))
+
+        result = bf16(sample_vertices_batch)
+        expected = fp32(sample_vertices_batch.to(torch.bfloat16).float())
+        for name, values in expected.measurements.items():
+            assert result.measurements[name].dtype == torch.float32
+            torch.testing.assert_close(result.measurements[name], values)
+
+        vertices = sample_vertices_batch.clone().requires_grad_(True)
+        bf16(vertices).measurements["shoulder_width"].sum().backward()
+        assert vertices.grad.dtype == torch.float32
+        assert torch.all(torch.isfinite(vertices.grad))
+
+    def test_fp32_input_not_copied(self, measurement_module, sample_vertices_batch):
+        """Test vertices already on the right device and dtype are used as is."""
+        assert measurement_module._prepare_vertices(sample_vertices_batch) is sample_vertices_batch
+        double = sample_vertices_batch.double()
+        assert measurement_module._prepare_vertices(double) is double
+
+    def test_same_device(self):
+        """Test an unindexed target device matches any index of its type."""
+        assert _same_device(torch.device("cuda", 0), torch.device("cuda"))
+        assert _same_device(torch.device("cuda", 1), torch.device("cuda:1"))
+        assert not _same_device(torch.device("cuda", 0), torch.device("cuda:1"))
+        assert not _same_device(torch.device("cpu"), torch.device("cuda"))
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,203 @@
+"""
+Tests for landmark definitions and the compiled landmark index.
+"""
+
+import warnings
+import numpy as np
+import pytest
+
+from vision_service.measurements import landmarks
+from vision_service.measurements.landmarks import (
+    CIRCUMFERENCE_PATHS,
+    LANDMARKS,
+    REGION_CODES,
+    BodyRegion,
+    CircumferencePath,
+    LandmarkIndex,
+    MeasurementType,
+    build_landmark_index,
+    get_all_circumference_names,
+    get_all_landmark_names,
+    get_all_landmark_vertices,
+    get_circumference_paths_by_region,
+    get_landmark_index,
+    get_landmarks_by_region,
+    get_landmarks_stats,
+    validate_landmarks,
+)
+
+
+@pytest.fixture
+def index():
+    """Create a freshly compiled index."""
+    return build_landmark_index()
+
+
+class TestLandmarkIndex:
+    """Test compiling definitions into arrays."""
+
+    def test_landmark_arrays(self, index):
+        """Test rows hold each landmark's vertex and region."""
+        assert index.landmark_names == tuple(sorted(LANDMARKS))
+        for name, landmark in LANDMARKS.items():
+            row = index.landmark_rows[name]
+            assert index.landmark_vertices[row] == landmark.vertex_idx
+            assert index.landmark_regions[row] == REGION_CODES[landmark.region]
+            assert index.landmark_vertex(name) == landmark.vertex_idx
+        assert index.landmark_vertex("missing") is None
+
+    def test_circumference_csr(self, index):
+        """Test offsets delimit each path's vertices."""
+        assert index.circumference_offsets[0] == 0
+        assert index.circumference_offsets[-1] == len(index.circumference_vertices)
+        for name, path in CIRCUMFERENCE_PATHS.items():
+            np.testing.assert_array_equal(index.circumference_path(name), path.vertex_indices)
+        lengths = index.circumference_lengths()
+        assert lengths.tolist() == [
+            len(CIRCUMFERENCE_PATHS[name].vertex_indices) for name in index.circumference_names
+        ]
+        assert index.circumference_path("missing") is None
+
+    def test_arrays_are_read_only(self, index):
+        """Test compiled arrays cannot be modified."""
+        with pytest.raises(ValueError):
+            index.landmark_vertices[0] = 0
+        with pytest.raises(ValueError):
+            index.circumference_path(index.circumference_names[0])[0] = 0
+        with pytest.raises(ValueError):
+            index.landmark_rows_in_region(BodyRegion.HEAD)[0] = 0
+
+    def test_region_rows(self, index):
+        """Test region rows list the region's landmarks in name order."""
+        rows = index.landmark_rows_in_region(BodyRegion.HEAD)
+        names = [index.landmark_names[row] for row in rows]
+        expected = sorted(n for n, lm in LANDMARKS.items() if lm.region == BodyRegion.HEAD)
+        assert names == expected
+
+    def test_shared_index(self):
+        """Test the process-wide index is compiled once."""
+        assert get_landmark_index() is get_landmark_index()
+
+    def test_fingerprint_tracks_definitions(self, index):
+        """Test changed definitions give a different fingerprint."""
+        paths = dict(CIRCUMFERENCE_PATHS)
+        paths["extra_circumference"] = CircumferencePath(
+            name="extra_circumference",
+            measurement_type=MeasurementType.CIRCUMFERENCE,
+            vertex_indices=[412, 282],
+            region=BodyRegion.HEAD,
+            description="Test path",
+        )
+        assert build_landmark_index(LANDMARKS, paths).fingerprint != index.fingerprint
+        assert build_landmark_index().fingerprint == index.fingerprint
+
+
+class TestIndexCache:
+    """Test saving and loading compiled indexes."""
+
+    def test_save_and_load(self, index, tmp_path):
+        """Test an index round-trips through .npz."""
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+        loaded = LandmarkIndex.load(path)
+
+        assert loaded.fingerprint == index.fingerprint
+        assert loaded.landmark_names == index.landmark_names
+        assert loaded.circumference_names == index.circumference_names
+        np.testing.assert_array_equal(loaded.circumference_vertices, index.circumference_vertices)
+        assert loaded.landmark_rows == index.landmark_rows
+
+    def test_get_landmark_index_uses_cache(self, tmp_path, monkeypatch):
+        """Test the shared index is written to and read from the cache path."""
+        path = str(tmp_path / "cache" / "index.npz")
+        monkeypatch.setattr(landmarks, "_landmark_index", None)
+        first = get_landmark_index(cache_path=path)
+
+        monkeypatch.setattr(landmarks, "_landmark_index", None)
+        monkeypatch.setattr(landmarks, "build_landmark_index", pytest.fail)
+        second = get_landmark_index(cache_path=path)
+
+        assert second is not first
+        assert second.fingerprint == first.fingerprint
+
+    def test_stale_cache_rebuilt(self, tmp_path, monkeypatch):
+        """Test a cache compiled from other definitions is replaced."""
+        path = str(tmp_path / "index.npz")
+        stale = build_landmark_index(LANDMARKS, {})
+        stale.save(path)
+
+        monkeypatch.setattr(landmarks, "_landmark_index", None)
+        index = get_landmark_index(cache_path=path)
+
+        assert len(index.circumference_names) == len(CIRCUMFERENCE_PATHS)
+        assert LandmarkIndex.load(path).fingerprint == index.fingerprint
+
+
+class TestLookups:
+    """Test lookup functions backed by the index."""
+
+    def test_names_and_vertices(self):
+        """Test name and vertex listings are sorted."""
+        assert get_all_landmark_names() == sorted(LANDMARKS)
+        assert get_all_circumference_names() == sorted(CIRCUMFERENCE_PATHS)
+        assert get_all_landmark_vertices() == sorted({lm.vertex_idx for lm in LANDMARKS.values()})
+
+    def test_by_region(self):
+        """Test region lookups return definitions sorted by name."""
+        for region in BodyRegion:
+            expected = sorted(
+                (lm for lm in LANDMARKS.values() if lm.region == region), key=lambda lm: lm.name
+            )
+            assert get_landmarks_by_region(region) == expected
+            expected_paths = sorted(
+                (cp for cp in CIRCUMFERENCE_PATHS.values() if cp.region == region),
+                key=lambda cp: cp.name
+            )
+            assert get_circumference_paths_by_region(region) == expected_paths
+
+    def test_stats(self):
+        """Test statistics count landmarks per region."""
+        stats = get_landmarks_stats()
+        assert stats["total_landmarks"] == len(LANDMARKS)
+        assert sum(stats["landmarks_by_region"].values()) == len(LANDMARKS)
+
+
+class TestValidation:
+    """Test explicit validation."""
+
+    def test_definitions_valid(self):
+        """Test the shipped definitions validate."""
+        assert validate_landmarks() == (True, [])
+
+    def test_reports_undefined_path_vertex(self, monkeypatch):
+        """Test paths through vertices that are not landmarks are reported."""
+        bad_path = CircumferencePath(
+            name="bad_circumference",
+            measurement_type=MeasurementType.CIRCUMFERENCE,
+            vertex_indices=[412, 9999],
+            region=BodyRegion.HEAD,
+            description="Test path",
+        )
+        monkeypatch.setitem(CIRCUMFERENCE_PATHS, "bad_circumference", bad_path)
+        assert "bad_circumference" in get_all_circumference_names()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            is_valid, errors = validate_landmarks(warn=True)
+
+        assert not is_valid
+        assert errors == ["Circumference path 'bad_circumference' references undefined vertex 9999"]
+        assert len(caught) == 1
+
+    def test_reports_path_edited_in_place(self, monkeypatch):
+        """Test validation sees definitions changed after the index was built."""
+        assert validate_landmarks() == (True, [])
+        path = next(iter(CIRCUMFERENCE_PATHS.values()))
+        monkeypatch.setattr(path, "vertex_indices", path.vertex_indices + [9999])
+
+        is_valid, errors = validate_landmarks()
+
+        assert not is_valid
+        assert errors == [f"Circumference path '{path.name}' references undefined vertex 9999"]
+        monkeypatch.undo()
+        assert validate_landmarks() == (True, [])
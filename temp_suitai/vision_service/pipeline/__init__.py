@@ -0,0 +1,45 @@
+"""
+Pipeline module for running the per-frame vision stages concurrently.
+
+Provides:
+- FramePipeline with bounded queues, backpressure and frame-drop policies
+- Per-stage latency histograms
+- Standard scan pipeline builder wiring SAM, HMR, SHAPY, filters and locks
+- Shared person ROI crop for SAM and HMR
+"""
+
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "vision_service.pipeline.frame_pipeline": [
+        "DropPolicy",
+        "FrameContext",
+        "FramePipeline",
+        "FramePipelineConfig",
+        "PipelineStage",
+        "StageStats",
+        "build_measurement_pipeline",
+    ],
+    "vision_service.latency": ["LatencyHistogram"],
+    "vision_service.pipeline.roi": [
+        "ROIConfig",
+        "ROISelector",
+        "ROIStats",
+        "RegionOfInterest",
+    ],
+})
+
+__all__ = [
+    "DropPolicy",
+    "FrameContext",
+    "FramePipeline",
+    "FramePipelineConfig",
+    "LatencyHistogram",
+    "PipelineStage",
+    "StageStats",
+    "build_measurement_pipeline",
+    "ROIConfig",
+    "ROISelector",
+    "ROIStats",
+    "RegionOfInterest",
+]
@@ -0,0 +1,598 @@
+"""
+Pipelined per-frame processing engine.
+
+Runs the per-frame vision stages (segmentation/quality, HMR pose, SHAPY shape,
+Kalman filtering, warm-up, measurement lock) as a chain of worker threads
+connected by bounded queues, so GPU inference for frame N overlaps with CPU
+filtering of frame N-1 and I/O of frame N+1 instead of serializing.
+
+- Each stage owns one thread and processes frames in arrival order, so
+  stateful stages (filters, locks) see a consistent stream
+- Queues are bounded; when a stage falls behind, the configured DropPolicy
+  either blocks upstream (backpressure) or drops frames
+- Every stage records a latency histogram, plus end-to-end latency
+
+Threads are used rather than processes: models keep GPU state that cannot be
+shared across processes, and NumPy, OpenCV and PyTorch release the GIL in
+their heavy kernels.
+"""
+
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import queue
+import threading
+import numpy as np
+
+from vision_service.latency import DEFAULT_LATENCY_BUCKETS_MS, LatencyHistogram
+from vision_service.timing import Timestamp, monotonic, to_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class DropPolicy(Enum):
+    """What to do with a frame when the next stage's queue is full."""
+    BLOCK = "block"  # Wait for space (backpressure to the producer)
+    DROP_NEWEST = "drop_newest"  # Discard the incoming frame
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued frame (favours latency)
+
+
+@dataclass
+class FrameContext:
+    """A frame travelling through the pipeline, with every stage's output."""
+
+    frame_id: int
+    image: Optional[np.ndarray]
+    timestamp: float
+    """Monotonic capture time (seconds)."""
+
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    """Extra per-frame inputs supplied by the caller (e.g. mesh vertices)."""
+
+    results: Dict[str, Any] = field(default_factory=dict)
+    """Output of each stage, keyed by stage name."""
+
+    measurement: Optional[np.ndarray] = None
+    """Current measurement vector, refined by successive stages."""
+
+    skip: bool = False
+    """Set by a stage to make later stages pass the frame through untouched."""
+
+    errors: Dict[str, str] = field(default_factory=dict)
+    """Error message per failed stage."""
+
+    stage_latency_ms: Dict[str, float] = field(default_factory=dict)
+    """Processing time per stage in milliseconds."""
+
+    submitted_at: float = field(default_factory=monotonic)
+    """Monotonic time the frame entered the pipeline."""
+
+
+StageFunction = Callable[[FrameContext], Any]
+
+
+@dataclass
+class PipelineStage:
+    """A named processing step of the pipeline."""
+
+    name: str
+    function: StageFunction
+    """Called with the FrameContext; a non-None return value is stored in
+    context.results[name]."""
+
+    queue_size: Optional[int] = None
+    """Capacity of the stage's input queue (None uses the pipeline default)."""
+
+    drop_policy: Optional[DropPolicy] = None
+    """Policy when the input queue is full (None uses the pipeline default)."""
+
+    run_on_skipped: bool = False
+    """Whether to run the stage on frames marked skip."""
+
+
+@dataclass
+class FramePipelineConfig:
+    """Configuration for FramePipeline."""
+
+    queue_size: int = 4
+    """Default capacity of each stage's input queue."""
+
+    output_queue_size: int = 64
+    """Capacity of the queue of processed frames awaiting get_result()."""
+
+    drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    """Default policy when a queue is full."""
+
+    latency_buckets_ms: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS
+    """Bucket edges for the latency histograms."""
+
+    poll_interval: float = 0.05
+    """Seconds between stop-flag checks while a worker waits on a queue."""
+
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.queue_size <= 0 or self.output_queue_size <= 0:
+            raise ValueError("queue sizes must be positive")
+        if self.poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+
+
+class StageStats:
+    """Counters and latency histogram of one stage."""
+
+    def __init__(self, name: str, bucket_edges_ms: Sequence[float]):
+        self.name = name
+        self.latency = LatencyHistogram(bucket_edges_ms)
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.skipped = 0
+        self._queue: Optional[queue.Queue] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames currently waiting in the stage's input queue."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary (for serialization)."""
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "queue_depth": self.queue_depth,
+            "latency": self.latency.to_dict(),
+        }
+
+
+_STOP = object()
+"""Sentinel pushed through the queues to shut workers down in order."""
+
+
+class FramePipeline:
+    """
+    Multi-threaded frame processing pipeline with bounded queues.
+
+    Frames submitted with submit() flow through the stages in order and come
+    out of get_result() as FrameContext objects.
+
+    Example:
+        >>> pipeline = FramePipeline([PipelineStage("double", lambda ctx: ctx.image * 2)])
+        >>> with pipeline:
+        ...     pipeline.submit(np.ones(3))
+        ...     ctx = pipeline.get_result(timeout=1.0)
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[PipelineStage],
+        config: Optional[FramePipelineConfig] = None,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: Stages in processing order.
+            config: Configuration object. Uses defaults if None.
+
+        Raises:
+            ValueError: If there are no stages or stage names repeat.
+        """
+        if not stages:
+            raise ValueError("FramePipeline requires at least one stage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Stage names must be unique, got {names}")
+
+        self.config = config or FramePipelineConfig()
+        self.stages = list(stages)
+
+        self._queues = [
+            queue.Queue(maxsize=stage.queue_size or self.config.queue_size)
+            for stage in self.stages
+        ]
+        self._output: queue.Queue = queue.Queue(maxsize=self.config.output_queue_size)
+
+        buckets = self.config.latency_buckets_ms
+        self._stats = {stage.name: StageStats(stage.name, buckets) for stage in self.stages}
+        for stage, stage_queue in zip(self.stages, self._queues):
+            self._stats[stage.name]._queue = stage_queue
+        self.end_to_end_latency = LatencyHistogram(buckets)
+        self.output_dropped = 0
+
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._next_frame_id = 0
+        self._submit_lock = threading.Lock()
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start one worker thread per stage."""
+        if self._running:
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(index,),
+                name=f"FramePipeline-{stage.name}",
+                daemon=True,
+            )
+            for index, stage in enumerate(self.stages)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._running = True
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the pipeline.
+
+        With DropPolicy.BLOCK, draining waits for room in the output queue, so
+        the consumer must keep calling get_result() or pass a timeout.
+
+        Args:
+            drain: Finish frames already queued before stopping. If False,
+                workers exit after their current frame.
+            timeout: Maximum seconds to wait for the drain; workers are then
+                stopped without finishing queued frames.
+        """
+        if not self._running:
+            return
+        if drain:
+            self._put_blocking(self._queues[0], _STOP)
+            deadline = None if timeout is None else monotonic() + timeout
+            for thread in self._threads:
+                thread.join(None if deadline is None else max(0.0, deadline - monotonic()))
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker threads are running."""
+        return self._running
+
+    def __enter__(self) -> "FramePipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop(drain=exc_type is None)
+
+    # ------------------------------------------------------------------
+    # Frame I/O
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        image: Optional[np.ndarray],
+        timestamp: Optional[Timestamp] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Submit a frame for processing.
+
+        With DropPolicy.BLOCK this waits until the first stage has room.
+
+        Args:
+            image: Frame image (H x W x 3), or None for stages that do not need one.
+            timestamp: Capture time, as monotonic seconds or a datetime.
+                Defaults to the current monotonic time.
+            inputs: Extra per-frame inputs made available to stages.
+
+        Returns:
+            True if the frame was queued, False if it was dropped.
+
+        Raises:
+            RuntimeError: If the pipeline is not running.
+        """
+        if not self._running:
+            raise RuntimeError("FramePipeline is not running; call start() first")
+
+        with self._submit_lock:
+            frame_id = self._next_frame_id
+            self._next_frame_id += 1
+
+        context = FrameContext(
+            frame_id=frame_id,
+            image=image,
+            timestamp=monotonic() if timestamp is None else to_seconds(timestamp),
+            inputs=dict(inputs or {}),
+        )
+        return self._enqueue(0, context)
+
+    def get_result(self, timeout: Optional[float] = None) -> Optional[FrameContext]:
+        """
+        Get the next fully processed frame.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Returns:
+            FrameContext, or None if nothing arrived in time.
+        """
+        try:
+            return self._output.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain_results(self) -> List[FrameContext]:
+        """Return all processed frames currently available without waiting."""
+        results = []
+        while True:
+            try:
+                results.append(self._output.get_nowait())
+            except queue.Empty:
+                return results
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def get_stage_stats(self, name: str) -> StageStats:
+        """Get counters and latency histogram of a stage."""
+        return self._stats[name]
+
+    def get_stats(self) -> dict:
+        """Get statistics of all stages and end-to-end latency."""
+        return {
+            "stages": {name: stats.to_dict() for name, stats in self._stats.items()},
+            "end_to_end_latency": self.end_to_end_latency.to_dict(),
+            "output_dropped": self.output_dropped,
+            "frames_submitted": self._next_frame_id,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _policy(self, index: int) -> DropPolicy:
+        if index < len(self.stages) and self.stages[index].drop_policy is not None:
+            return self.stages[index].drop_policy
+        return self.config.drop_policy
+
+    def _enqueue(self, index: int, context: FrameContext) -> bool:
+        """Put a frame on the input queue of stage index (or the output queue)."""
+        target = self._queues[index] if index < len(self.stages) else self._output
+        policy = self._policy(index)
+
+        if policy == DropPolicy.BLOCK:
+            return self._put_blocking(target, context)
+
+        while True:
+            try:
+                target.put_nowait(context)
+                return True
+            except queue.Full:
+                pass
+
+            if policy == DropPolicy.DROP_NEWEST:
+                self._count_drop(index)
+                return False
+
+            # DROP_OLDEST: evict the head of the queue and retry
+            try:
+                evicted = target.get_nowait()
+            except queue.Empty:
+                continue
+            if evicted is _STOP:
+                # Never lose the shutdown sentinel
+                self._put_blocking(target, evicted)
+                self._count_drop(index)
+                return False
+            self._count_drop(index)
+
+    def _count_drop(self, index: int) -> None:
+        if index < len(self.stages):
+            self._stats[self.stages[index].name].dropped += 1
+        else:
+            self.output_dropped += 1
+
+    def _put_blocking(self, target: queue.Queue, item: Any) -> bool:
+        """Put item, waiting for space unless the pipeline is stopping."""
+        while not self._stop_event.is_set():
+            try:
+                target.put(item, timeout=self.config.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self, index: int) -> None:
+        """Worker loop of stage index."""
+        stage = self.stages[index]
+        stats = self._stats[stage.name]
+        source = self._queues[index]
+
+        while not self._stop_event.is_set():
+            try:
+                context = source.get(timeout=self.config.poll_interval)
+            except queue.Empty:
+                continue
+
+            if context is _STOP:
+                if index + 1 < len(self.stages):
+                    self._put_blocking(self._queues[index + 1], _STOP)
+                return
+
+            if context.skip and not stage.run_on_skipped:
+                stats.skipped += 1
+            else:
+                self._run_stage(stage, stats, context)
+
+            if index + 1 == len(self.stages):
+                self.end_to_end_latency.record(monotonic() - context.submitted_at)
+            self._enqueue(index + 1, context)
+
+    def _run_stage(self, stage: PipelineStage, stats: StageStats, context: FrameContext) -> None:
+        start = monotonic()
+        try:
+            output = stage.function(context)
+            if output is not None:
+                context.results[stage.name] = output
+        except Exception as e:
+            stats.errors += 1
+            context.errors[stage.name] = str(e)
+            logger.error(f"Pipeline stage '{stage.name}' failed on frame {context.frame_id}: {e}")
+        elapsed = monotonic() - start
+        stats.latency.record(elapsed)
+        stats.processed += 1
+        context.stage_latency_ms[stage.name] = elapsed * 1000.0
+
+
+# ============================================================================
+# Standard measurement pipeline
+# ============================================================================
+
+def build_measurement_pipeline(
+    quality_detector=None,
+    sam_segmenter=None,
+    pose_estimator=None,
+    shape_extractor=None,
+    kalman_filter=None,
+    warmup=None,
+    measurement_lock=None,
+    skip_invalid_frames: bool = True,
+    config: Optional[FramePipelineConfig] = None,
+    roi_selector=None,
+) -> FramePipeline:
+    """
+    Build the standard scan pipeline from existing stage objects.
+
+    Stages are added in this order for each component that is provided:
+
+    - "roi": ROISelector.select; the frame image is replaced by the crop
+      (full image kept in inputs["full_image"]) so SAM and HMR both run on
+      the person region, and the quality stage reports the person's box
+      back to the selector. The quality result's person_box is mapped back
+      to full-frame pixels. HMR pose parameters are joint rotations and do
+      not depend on the crop; image-space model outputs map back with
+      results["roi"].to_full_coordinates(coords, scale_factors)
+    - "quality": FrameQualityDetector.analyze_frame (drives SAM segmentation;
+      a bare SAMSegmenter is wrapped in a FrameQualityDetector)
+    - "pose": HMRPoseEstimator.estimate_pose
+    - "shape": ShapyShape.extract_shape on inputs["vertices"]; its beta becomes
+      the frame measurement (a caller may instead pass inputs["measurement"])
+    - "kalman": KalmanFilter.update on the measurement
+    - "warmup": Warmup.update on the measurement
+    - "lock": MeasurementLock.add_measurement once warm-up is complete
+
+    The warmup and lock results are per-frame snapshots of the shared
+    state, so reading an earlier frame's result is safe while later frames
+    are processed.
+
+    Args:
+        quality_detector: Optional FrameQualityDetector.
+        sam_segmenter: Optional SAMSegmenter, used if quality_detector is None.
+        pose_estimator: Optional HMRPoseEstimator.
+        shape_extractor: Optional ShapyShape.
+        kalman_filter: Optional KalmanFilter.
+        warmup: Optional Warmup.
+        measurement_lock: Optional MeasurementLock.
+        skip_invalid_frames: Skip later stages when the quality stage reports
+            an invalid frame.
+        config: Pipeline configuration.
+        roi_selector: Optional ROISelector shared by the SAM and HMR stages.
+
+    Returns:
+        FramePipeline (not started).
+
+    Raises:
+        ValueError: If no components are provided.
+    """
+    stages: List[PipelineStage] = []
+
+    if quality_detector is None and sam_segmenter is not None:
+        from vision_service.frame_quality_detector import FrameQualityDetector
+        quality_detector = FrameQualityDetector(sam_segmenter=sam_segmenter)
+
+    if roi_selector is not None:
+        def run_roi(ctx: FrameContext):
+            roi = roi_selector.select(ctx.image.shape[:2])
+            ctx.inputs["full_image"] = ctx.image
+            ctx.image = roi.crop(ctx.image)
+            return roi
+        stages.append(PipelineStage("roi", run_roi))
+
+    if quality_detector is not None:
+        def run_quality(ctx: FrameContext):
+            roi = ctx.results.get("roi")
+            segmenter = quality_detector.sam_segmenter
+            if roi is not None and roi.changed and hasattr(segmenter, "person_tracker"):
+                # The segmenter tracks in ROI pixels, which just moved
+                segmenter.person_tracker.reset()
+            quality = quality_detector.analyze_frame(ctx.image)
+            if roi is not None:
+                if quality.person_box is not None:
+                    quality = replace(quality, person_box=roi.to_full_pixel_box(quality.person_box))
+                roi_selector.update(quality.person_box)
+            if skip_invalid_frames and not quality.is_valid:
+                ctx.skip = True
+            return quality
+        stages.append(PipelineStage("quality", run_quality))
+
+    if pose_estimator is not None:
+        def run_pose(ctx: FrameContext):
+            return pose_estimator.estimate_pose(ctx.image)
+        stages.append(PipelineStage("pose", run_pose))
+
+    def take_measurement(ctx: FrameContext) -> Optional[np.ndarray]:
+        if ctx.measurement is None and "measurement" in ctx.inputs:
+            ctx.measurement = np.asarray(ctx.inputs["measurement"])
+        return ctx.measurement
+
+    if shape_extractor is not None:
+        def run_shape(ctx: FrameContext):
+            vertices = ctx.inputs.get("vertices")
+            if vertices is None:
+                return None
+            shape = shape_extractor.extract_shape(
+                vertices, height_prior=ctx.inputs.get("height_prior")
+            )
+            ctx.measurement = shape.beta
+            return shape
+        stages.append(PipelineStage("shape", run_shape))
+
+    if kalman_filter is not None:
+        def run_kalman(ctx: FrameContext):
+            measurement = take_measurement(ctx)
+            if measurement is None:
+                return None
+            state = kalman_filter.update(measurement, timestamp=ctx.timestamp)
+            ctx.measurement = state.state_vector
+            return state
+        stages.append(PipelineStage("kalman", run_kalman))
+
+    if warmup is not None:
+        def run_warmup(ctx: FrameContext):
+            measurement = take_measurement(ctx)
+            if measurement is None:
+                return None
+            # Snapshot: the shared state keeps changing with later frames
+            return warmup.update(measurement, timestamp=ctx.timestamp).snapshot()
+        stages.append(PipelineStage("warmup", run_warmup))
+
+    if measurement_lock is not None:
+        def run_lock(ctx: FrameContext):
+            measurement = take_measurement(ctx)
+            if measurement is None:
+                return None
+            warmup_state = ctx.results.get("warmup")
+            if warmup is not None and (warmup_state is None or not warmup_state.beta_is_stable):
+                return None
+            return measurement_lock.add_measurement(measurement, timestamp=ctx.timestamp).snapshot()
+        stages.append(PipelineStage("lock", run_lock))
+
+    if not stages:
+        raise ValueError("build_measurement_pipeline requires at least one component")
+
+    return FramePipeline(stages, config)
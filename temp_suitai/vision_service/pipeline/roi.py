@@ -0,0 +1,330 @@
+"""
+Shared region-of-interest stage for SAM and HMR.
+
+On 4K capture rigs the person covers a fraction of the frame, yet SAM and
+HMR would each process every pixel. ROISelector picks a crop around the
+person, from the previous frame's mask or from ArUco/PnP geometry, and
+optionally downscales it. Both models then run on the same small image, and
+masks and coordinates are mapped back to the full frame through
+RegionOfInterest (coordinates go through hmr_pose.postprocess_coordinates).
+
+The crop is sticky: it only moves when the person gets close to its edge,
+so the segmenter's own tracker keeps working in stable ROI coordinates.
+
+Example:
+    selector = ROISelector(ROIConfig(max_side=1024))
+    roi = selector.select(frame.shape[:2])
+    crop = roi.crop(frame)
+    ...  # run SAM / HMR on crop
+    selector.update(roi.to_full_box(person_box_in_crop))
+    keypoints = roi.to_full_coordinates(model_keypoints, model_scale_factors)
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import threading
+
+import numpy as np
+
+
+Box = Tuple[float, float, float, float]
+
+
+@dataclass
+class ROIConfig:
+    """Configuration for ROISelector."""
+    margin: float = 0.15  # Padding around the person, as a fraction of box size
+    max_side: Optional[int] = None  # Downscale crops whose longer side exceeds this
+    min_side: int = 64  # Smallest crop side in full-frame pixels
+
+    def __post_init__(self):
+        if self.margin < 0:
+            raise ValueError(f"margin must be non-negative, got {self.margin}")
+        if self.max_side is not None and self.max_side < 1:
+            raise ValueError(f"max_side must be positive, got {self.max_side}")
+        if self.min_side < 1:
+            raise ValueError(f"min_side must be positive, got {self.min_side}")
+
+
+@dataclass(frozen=True)
+class RegionOfInterest:
+    """
+    A crop of a frame, optionally downscaled, with mappings back to the frame.
+
+    Attributes:
+        image_shape: (H, W) of the full frame
+        box: (x_min, y_min, x_max, y_max) crop in full-frame pixels, max exclusive
+        size: (h, w) of the image produced by crop()
+        changed: Whether the crop moved since the previous frame
+    """
+    image_shape: Tuple[int, int]
+    box: Tuple[int, int, int, int]
+    size: Tuple[int, int]
+    changed: bool = False
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """(x, y) of the crop's top-left corner in the full frame."""
+        return (self.box[0], self.box[1])
+
+    @property
+    def scale_factors(self) -> Tuple[float, float]:
+        """(height_scale, width_scale) from ROI pixels to full-frame pixels."""
+        return ((self.box[3] - self.box[1]) / self.size[0],
+                (self.box[2] - self.box[0]) / self.size[1])
+
+    @property
+    def is_full_frame(self) -> bool:
+        return self.box == (0, 0, self.image_shape[1], self.image_shape[0])
+
+    @property
+    def pixel_fraction(self) -> float:
+        """Pixels processed relative to the full frame."""
+        return (self.size[0] * self.size[1]) / (self.image_shape[0] * self.image_shape[1])
+
+    def crop(self, image: np.ndarray) -> np.ndarray:
+        """
+        Cut (and downscale) the region from a full frame.
+
+        Without downscaling the result is a view of the frame.
+
+        Raises:
+            ValueError: If the image does not match image_shape
+        """
+        if tuple(image.shape[:2]) != tuple(self.image_shape):
+            raise ValueError(f"Expected image of shape {self.image_shape}, got {image.shape[:2]}")
+        x_min, y_min, x_max, y_max = self.box
+        region = image[y_min:y_max, x_min:x_max]
+        if tuple(region.shape[:2]) == tuple(self.size):
+            return region
+        import cv2
+        return cv2.resize(region, (self.size[1], self.size[0]), interpolation=cv2.INTER_AREA)
+
+    def to_full_coordinates(
+        self,
+        coordinates: np.ndarray,
+        scale_factors: Tuple[float, float] = (1.0, 1.0),
+    ) -> np.ndarray:
+        """
+        Map (x, y[, ...]) coordinates back to the full frame.
+
+        Args:
+            coordinates: Point (D,) or points (N, D) in ROI pixels, or in
+                model space when scale_factors is given
+            scale_factors: Model-to-ROI (height_scale, width_scale) from
+                preprocess_image() when the ROI image was resized for a model
+
+        Returns:
+            Coordinates in full-frame pixels.
+        """
+        from vision_service.reconstruction.hmr_pose import postprocess_coordinates
+
+        combined = (scale_factors[0] * self.scale_factors[0],
+                    scale_factors[1] * self.scale_factors[1])
+        transformed = postprocess_coordinates(np.asarray(coordinates, dtype=float), combined)
+        transformed[..., 0] += self.box[0]
+        transformed[..., 1] += self.box[1]
+        return transformed
+
+    def to_roi_coordinates(self, coordinates: np.ndarray) -> np.ndarray:
+        """Map full-frame (x, y[, ...]) coordinates into ROI pixels."""
+        transformed = np.array(coordinates, dtype=float)
+        scale_h, scale_w = self.scale_factors
+        transformed[..., 0] = (transformed[..., 0] - self.box[0]) / scale_w
+        transformed[..., 1] = (transformed[..., 1] - self.box[1]) / scale_h
+        return transformed
+
+    def to_full_box(self, box: Box) -> Box:
+        """Map an (x_min, y_min, x_max, y_max) ROI box to the full frame."""
+        corners = self.to_full_coordinates(np.array([box[:2], box[2:]], dtype=float))
+        return (float(corners[0, 0]), float(corners[0, 1]),
+                float(corners[1, 0]), float(corners[1, 1]))
+
+    def to_full_pixel_box(self, box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """Map an integer ROI pixel box (max exclusive) to the full frame, rounding outwards."""
+        x_min, y_min, x_max, y_max = self.to_full_box(box)
+        return (int(np.floor(x_min)), int(np.floor(y_min)),
+                int(np.ceil(x_max)), int(np.ceil(y_max)))
+
+    def to_roi_box(self, box: Box) -> Box:
+        """Map a full-frame box into the ROI, clipped to its bounds."""
+        corners = self.to_roi_coordinates(np.array([box[:2], box[2:]], dtype=float))
+        h, w = self.size
+        corners[:, 0] = np.clip(corners[:, 0], 0, w)
+        corners[:, 1] = np.clip(corners[:, 1], 0, h)
+        return (float(corners[0, 0]), float(corners[0, 1]),
+                float(corners[1, 0]), float(corners[1, 1]))
+
+    def to_full_mask(self, mask) -> np.ndarray:
+        """
+        Upsample an ROI mask (dense or CompactMask) into a full-frame mask.
+
+        Nearest-neighbour sampling at full-frame pixel centres; pixels outside
+        the crop are False.
+        """
+        roi_mask = np.asarray(mask, dtype=bool)
+        if tuple(roi_mask.shape) != tuple(self.size):
+            raise ValueError(f"Expected mask of shape {self.size}, got {roi_mask.shape}")
+        x_min, y_min, x_max, y_max = self.box
+        scale_h, scale_w = self.scale_factors
+        rows = np.minimum(((np.arange(y_max - y_min) + 0.5) / scale_h).astype(np.intp),
+                          self.size[0] - 1)
+        cols = np.minimum(((np.arange(x_max - x_min) + 0.5) / scale_w).astype(np.intp),
+                          self.size[1] - 1)
+
+        full = np.zeros(self.image_shape, dtype=bool)
+        full[y_min:y_max, x_min:x_max] = roi_mask[rows[:, None], cols[None, :]]
+        return full
+
+
+@dataclass
+class ROIStats:
+    """Counters for ROI selection."""
+    frames: int = 0
+    full_frames: int = 0
+    roi_changes: int = 0
+    pixel_fraction_sum: float = 0.0
+
+    @property
+    def mean_pixel_fraction(self) -> float:
+        """Average pixels processed relative to full frames."""
+        return self.pixel_fraction_sum / self.frames if self.frames else 1.0
+
+
+class ROISelector:
+    """
+    Chooses the region of each frame to run SAM and HMR on.
+
+    Thread-safe: in a FramePipeline, select() for a new frame and update()
+    from an earlier frame's segmentation run on different stage threads.
+    """
+
+    def __init__(self, config: Optional[ROIConfig] = None):
+        """
+        Initialize selector.
+
+        Args:
+            config: ROI configuration. Uses defaults if None.
+        """
+        self.config = config or ROIConfig()
+        self.stats = ROIStats()
+        self._lock = threading.Lock()
+        self._person_box: Optional[Box] = None
+        self._current: Optional[RegionOfInterest] = None
+
+    def update(self, person_box: Optional[Box]) -> None:
+        """
+        Record where the person is, in full-frame pixels.
+
+        Args:
+            person_box: (x_min, y_min, x_max, y_max) from the previous mask or
+                from ArUco/PnP geometry. None (person lost) makes the next
+                frame use the full image.
+        """
+        with self._lock:
+            self._person_box = None if person_box is None else tuple(map(float, person_box))
+
+    def reset(self) -> None:
+        """Forget the person and the current crop."""
+        with self._lock:
+            self._person_box = None
+            self._current = None
+
+    def select(self, image_shape: Tuple[int, int]) -> RegionOfInterest:
+        """
+        Choose the region for a frame.
+
+        The previous crop is kept while it still contains the person with
+        half the configured margin to spare and is at most twice the size
+        a fresh crop would be; otherwise a new crop is built
+        around the person (or the whole frame when no person is known).
+
+        Args:
+            image_shape: (H, W) of the frame
+
+        Returns:
+            RegionOfInterest for the frame.
+        """
+        image_shape = (int(image_shape[0]), int(image_shape[1]))
+        with self._lock:
+            previous = self._current
+            box = self._choose_box(image_shape, previous)
+            changed = previous is None or previous.box != box or previous.image_shape != image_shape
+            roi = RegionOfInterest(
+                image_shape=image_shape,
+                box=box,
+                size=self._output_size(box),
+                changed=changed,
+            )
+            self._current = roi
+
+            self.stats.frames += 1
+            self.stats.full_frames += roi.is_full_frame
+            self.stats.roi_changes += changed and previous is not None
+            self.stats.pixel_fraction_sum += roi.pixel_fraction
+            return roi
+
+    def _choose_box(
+        self,
+        image_shape: Tuple[int, int],
+        previous: Optional[RegionOfInterest],
+    ) -> Tuple[int, int, int, int]:
+        """Pick the crop box (called with the lock held)."""
+        h, w = image_shape
+        person = self._person_box
+        if person is None:
+            return (0, 0, w, h)
+
+        padded = self._padded_box(person, image_shape)
+        if previous is not None and previous.image_shape == image_shape:
+            # Keep the crop unless the person nears its edge or it is far
+            # larger than needed (e.g. the full frame before detection)
+            if (self._contains(previous.box, person, self.config.margin / 2, image_shape)
+                    and self._area(previous.box) <= 2 * self._area(padded)):
+                return previous.box
+
+        return padded
+
+    def _padded_box(self, person: Box, image_shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Person box plus margin, grown to min_side and clipped to the frame."""
+        h, w = image_shape
+        x_min, y_min, x_max, y_max = person
+        pad_x = (x_max - x_min) * self.config.margin
+        pad_y = (y_max - y_min) * self.config.margin
+        bounds = []
+        for low, high, limit in ((x_min - pad_x, x_max + pad_x, w), (y_min - pad_y, y_max + pad_y, h)):
+            side = min(max(high - low, self.config.min_side), limit)
+            centre = (low + high) / 2
+            start = int(np.clip(np.floor(centre - side / 2), 0, limit - side))
+            bounds.append((start, int(min(limit, np.ceil(start + side)))))
+        (x0, x1), (y0, y1) = bounds
+        return (x0, y0, x1, y1)
+
+    @staticmethod
+    def _area(box: Tuple[int, int, int, int]) -> int:
+        return (box[2] - box[0]) * (box[3] - box[1])
+
+    def _contains(
+        self,
+        box: Tuple[int, int, int, int],
+        person: Box,
+        margin: float,
+        image_shape: Tuple[int, int],
+    ) -> bool:
+        """Whether box holds person with the given fractional margin to spare."""
+        h, w = image_shape
+        pad_x = (person[2] - person[0]) * margin
+        pad_y = (person[3] - person[1]) * margin
+        return (box[0] <= max(person[0] - pad_x, 0)
+                and box[1] <= max(person[1] - pad_y, 0)
+                and box[2] >= min(person[2] + pad_x, w)
+                and box[3] >= min(person[3] + pad_y, h))
+
+    def _output_size(self, box: Tuple[int, int, int, int]) -> Tuple[int, int]:
+        """Size of the (possibly downscaled) ROI image."""
+        height, width = box[3] - box[1], box[2] - box[0]
+        max_side = self.config.max_side
+        if max_side is None or max(height, width) <= max_side:
+            return (height, width)
+        scale = max_side / max(height, width)
+        return (max(1, round(height * scale)), max(1, round(width * scale)))
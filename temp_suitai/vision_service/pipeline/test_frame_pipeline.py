@@ -0,0 +1,229 @@
+"""
+Unit tests for the pipelined frame processing engine.
+
+Tests verify:
+- In-order processing through all stages
+- Backpressure and frame-drop policies
+- Error isolation and skip propagation
+- Standard measurement pipeline wiring
+"""
+
+import threading
+import numpy as np
+import pytest
+from vision_service.filtering.kalman_filter import KalmanFilter
+from vision_service.filtering.measurement_lock import MeasurementLock, MeasurementLockConfig
+from vision_service.filtering.warmup import Warmup, WarmupConfig
+from vision_service.pipeline.frame_pipeline import (
+    DropPolicy,
+    FramePipeline,
+    FramePipelineConfig,
+    PipelineStage,
+    build_measurement_pipeline,
+)
+from vision_service.reconstruction.hmr_pose import HMRPoseEstimator
+
+
+def _collect(pipeline, count, timeout=5.0):
+    results = []
+    while len(results) < count:
+        ctx = pipeline.get_result(timeout=timeout)
+        assert ctx is not None, "timed out waiting for pipeline output"
+        results.append(ctx)
+    return results
+
+
+class TestFramePipeline:
+    """Test FramePipeline scheduling."""
+
+    def test_requires_stages(self):
+        """Test that an empty or duplicate stage list raises error."""
+        with pytest.raises(ValueError):
+            FramePipeline([])
+        stage = PipelineStage("a", lambda ctx: None)
+        with pytest.raises(ValueError, match="unique"):
+            FramePipeline([stage, stage])
+
+    def test_submit_requires_start(self):
+        """Test that submitting before start raises error."""
+        pipeline = FramePipeline([PipelineStage("a", lambda ctx: None)])
+        with pytest.raises(RuntimeError):
+            pipeline.submit(np.zeros(3))
+
+    def test_frames_flow_in_order(self):
+        """Test that every stage sees frames in submission order."""
+        config = FramePipelineConfig(drop_policy=DropPolicy.BLOCK)
+        stages = [
+            PipelineStage("double", lambda ctx: ctx.image * 2),
+            PipelineStage("add", lambda ctx: ctx.results["double"] + 1),
+        ]
+
+        with FramePipeline(stages, config) as pipeline:
+            for i in range(20):
+                assert pipeline.submit(np.array([float(i)]))
+            results = _collect(pipeline, 20)
+
+        assert [ctx.frame_id for ctx in results] == list(range(20))
+        for i, ctx in enumerate(results):
+            assert ctx.results["add"][0] == 2 * i + 1
+            assert set(ctx.stage_latency_ms) == {"double", "add"}
+
+        stats = pipeline.get_stats()
+        assert stats["stages"]["double"]["processed"] == 20
+        assert stats["stages"]["add"]["latency"]["count"] == 20
+        assert stats["end_to_end_latency"]["count"] == 20
+
+    def test_block_policy_applies_backpressure(self):
+        """Test that BLOCK never drops frames with a slow stage."""
+        gate = threading.Event()
+        config = FramePipelineConfig(queue_size=1, drop_policy=DropPolicy.BLOCK)
+        stages = [PipelineStage("slow", lambda ctx: gate.wait(5.0))]
+
+        with FramePipeline(stages, config) as pipeline:
+            producer = threading.Thread(
+                target=lambda: [pipeline.submit(None) for _ in range(5)]
+            )
+            producer.start()
+            producer.join(0.2)
+            assert producer.is_alive()  # blocked on the full queue
+
+            gate.set()
+            producer.join(5.0)
+            results = _collect(pipeline, 5)
+
+        assert len(results) == 5
+        assert pipeline.get_stage_stats("slow").dropped == 0
+
+    def test_drop_newest_rejects_incoming(self):
+        """Test that DROP_NEWEST rejects frames while the stage is busy."""
+        gate = threading.Event()
+        started = threading.Event()
+
+        def slow(ctx):
+            started.set()
+            gate.wait(5.0)
+
+        config = FramePipelineConfig(queue_size=1, drop_policy=DropPolicy.DROP_NEWEST)
+        with FramePipeline([PipelineStage("slow", slow)], config) as pipeline:
+            assert pipeline.submit(None)
+            started.wait(5.0)
+            assert pipeline.submit(None)  # fills the queue
+            assert not pipeline.submit(None)
+            assert not pipeline.submit(None)
+            gate.set()
+            results = _collect(pipeline, 2)
+
+        assert [ctx.frame_id for ctx in results] == [0, 1]
+        assert pipeline.get_stage_stats("slow").dropped == 2
+
+    def test_drop_oldest_keeps_latest(self):
+        """Test that DROP_OLDEST evicts queued frames in favour of new ones."""
+        gate = threading.Event()
+        started = threading.Event()
+
+        def slow(ctx):
+            started.set()
+            gate.wait(5.0)
+
+        config = FramePipelineConfig(queue_size=1, drop_policy=DropPolicy.DROP_OLDEST)
+        with FramePipeline([PipelineStage("slow", slow)], config) as pipeline:
+            pipeline.submit(None)
+            started.wait(5.0)
+            for _ in range(4):
+                assert pipeline.submit(None)
+            gate.set()
+            results = _collect(pipeline, 2)
+
+        assert [ctx.frame_id for ctx in results] == [0, 4]
+        assert pipeline.get_stage_stats("slow").dropped == 3
+
+    def test_stage_errors_are_isolated(self):
+        """Test that a failing stage records the error and frames continue."""
+        def fail(ctx):
+            raise RuntimeError("boom")
+
+        stages = [PipelineStage("fail", fail), PipelineStage("after", lambda ctx: "ok")]
+        with FramePipeline(stages) as pipeline:
+            pipeline.submit(None)
+            ctx = _collect(pipeline, 1)[0]
+
+        assert ctx.errors == {"fail": "boom"}
+        assert ctx.results["after"] == "ok"
+        assert pipeline.get_stage_stats("fail").errors == 1
+
+    def test_skip_bypasses_later_stages(self):
+        """Test that skipped frames pass through without running stages."""
+        def gate(ctx):
+            ctx.skip = ctx.frame_id % 2 == 1
+
+        stages = [
+            PipelineStage("gate", gate),
+            PipelineStage("work", lambda ctx: "done"),
+            PipelineStage("always", lambda ctx: "seen", run_on_skipped=True),
+        ]
+        config = FramePipelineConfig(drop_policy=DropPolicy.BLOCK)
+        with FramePipeline(stages, config) as pipeline:
+            for _ in range(4):
+                pipeline.submit(None)
+            results = _collect(pipeline, 4)
+
+        assert ["work" in ctx.results for ctx in results] == [True, False, True, False]
+        assert all(ctx.results["always"] == "seen" for ctx in results)
+        assert pipeline.get_stage_stats("work").skipped == 2
+
+    def test_stop_drains_queued_frames(self):
+        """Test that stop(drain=True) processes frames already queued."""
+        config = FramePipelineConfig(queue_size=8, drop_policy=DropPolicy.BLOCK)
+        pipeline = FramePipeline([PipelineStage("a", lambda ctx: 1)], config)
+        pipeline.start()
+        for _ in range(5):
+            pipeline.submit(None)
+        pipeline.stop(drain=True)
+
+        assert not pipeline.is_running
+        assert len(pipeline.drain_results()) == 5
+
+
+class TestMeasurementPipeline:
+    """Test the standard measurement pipeline builder."""
+
+    def test_requires_component(self):
+        """Test that building without components raises error."""
+        with pytest.raises(ValueError):
+            build_measurement_pipeline()
+
+    def test_filters_and_lock(self):
+        """Test measurement flow through Kalman, warm-up and lock stages."""
+        warmup = Warmup(WarmupConfig(warmup_frame_threshold=5))
+        lock = MeasurementLock(MeasurementLockConfig(lock_frame_threshold=10))
+        pipeline = build_measurement_pipeline(
+            pose_estimator=HMRPoseEstimator(),
+            kalman_filter=KalmanFilter(),
+            warmup=warmup,
+            measurement_lock=lock,
+            config=FramePipelineConfig(drop_policy=DropPolicy.BLOCK),
+        )
+        assert [stage.name for stage in pipeline.stages] == ["pose", "kalman", "warmup", "lock"]
+
+        rng = np.random.default_rng(0)
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        beta = np.linspace(0.5, 1.5, 10)
+        with pipeline:
+            for i in range(20):
+                pipeline.submit(
+                    image,
+                    timestamp=i / 30.0,
+                    inputs={"measurement": beta + rng.normal(scale=0.001, size=10)},
+                )
+            results = _collect(pipeline, 20)
+
+        assert all(not ctx.errors for ctx in results)
+        assert results[0].results["pose"].pose_params.pose_theta.shape == (72,)
+        assert "lock" not in results[3].results
+        assert "lock" in results[10].results
+        # Each frame keeps its own snapshot of the shared warm-up and lock state
+        assert [ctx.results["warmup"].frame_count for ctx in results] == list(range(1, 21))
+        assert results[10].results["lock"] is not results[11].results["lock"]
+        assert results[10].results["lock"].frame_count + 1 == results[11].results["lock"].frame_count
+        assert lock.state.is_locked
+        assert np.allclose(lock.get_geometric_median(), beta, atol=0.05)
@@ -0,0 +1,199 @@
+"""
+Unit tests for the shared ROI stage.
+
+Tests verify:
+- Crop selection, stickiness and full-frame fallback
+- Downscaling and mapping of coordinates, boxes and masks back to the frame
+- Wiring into the measurement pipeline
+"""
+
+import numpy as np
+import pytest
+
+from vision_service.frame_quality_detector import FrameQuality
+from vision_service.pipeline.frame_pipeline import (
+    DropPolicy,
+    FramePipelineConfig,
+    build_measurement_pipeline,
+)
+from vision_service.pipeline.roi import ROIConfig, ROISelector, RegionOfInterest
+from vision_service.reconstruction.hmr_pose import HMRPoseEstimator, preprocess_image
+from vision_service.segmentation.compact_mask import CompactMask
+
+FRAME_SHAPE = (2160, 3840)
+PERSON = (1700.0, 300.0, 2100.0, 1900.0)
+
+
+class TestROISelector:
+    """Test choosing the region for each frame."""
+
+    def test_full_frame_without_person(self):
+        """Test the whole frame is used until a person is known."""
+        roi = ROISelector().select(FRAME_SHAPE)
+        assert roi.is_full_frame
+        assert roi.size == FRAME_SHAPE
+        assert roi.pixel_fraction == 1.0
+
+    def test_crop_around_person(self):
+        """Test the crop pads the person box by the margin."""
+        selector = ROISelector(ROIConfig(margin=0.1))
+        selector.update(PERSON)
+        roi = selector.select(FRAME_SHAPE)
+
+        assert roi.box == (1660, 140, 2140, 2060)
+        assert roi.changed
+        assert roi.pixel_fraction == pytest.approx(1 / 9)
+
+    def test_sticky_until_person_nears_edge(self):
+        """Test small moves keep the crop and large moves replace it."""
+        selector = ROISelector(ROIConfig(margin=0.2))
+        selector.update(PERSON)
+        first = selector.select(FRAME_SHAPE)
+
+        selector.update((1720.0, 300.0, 2120.0, 1900.0))
+        assert selector.select(FRAME_SHAPE).box == first.box
+        assert not selector.select(FRAME_SHAPE).changed
+
+        selector.update((1900.0, 300.0, 2300.0, 1900.0))
+        moved = selector.select(FRAME_SHAPE)
+        assert moved.changed and moved.box != first.box
+        assert selector.stats.roi_changes == 1
+
+    def test_shrinking_person_tightens_crop(self):
+        """Test a crop much larger than needed is replaced."""
+        selector = ROISelector()
+        selector.select(FRAME_SHAPE)
+        selector.update(PERSON)
+        assert not selector.select(FRAME_SHAPE).is_full_frame
+
+    def test_lost_person_returns_to_full_frame(self):
+        """Test losing the person falls back to the whole frame."""
+        selector = ROISelector()
+        selector.update(PERSON)
+        selector.select(FRAME_SHAPE)
+        selector.update(None)
+        assert selector.select(FRAME_SHAPE).is_full_frame
+
+    def test_clipped_to_frame(self):
+        """Test crops near the border stay inside the frame."""
+        selector = ROISelector(ROIConfig(min_side=128))
+        selector.update((0.0, 0.0, 10.0, 10.0))
+        roi = selector.select((100, 200))
+        assert roi.box == (0, 0, 128, 100)
+
+    def test_invalid_config(self):
+        """Test invalid settings are rejected."""
+        with pytest.raises(ValueError):
+            ROIConfig(margin=-0.1)
+        with pytest.raises(ValueError):
+            ROIConfig(max_side=0)
+
+
+class TestRegionOfInterest:
+    """Test mapping between ROI and frame pixels."""
+
+    @pytest.fixture
+    def roi(self):
+        selector = ROISelector(ROIConfig(margin=0.1, max_side=480))
+        selector.update(PERSON)
+        return selector.select(FRAME_SHAPE)
+
+    def test_downscaled_crop(self, roi):
+        """Test the crop is resized to fit max_side."""
+        frame = np.zeros(FRAME_SHAPE + (3,), dtype=np.uint8)
+        crop = roi.crop(frame)
+        assert crop.shape == (480, 120, 3)
+        assert roi.scale_factors == (4.0, 4.0)
+
+    def test_crop_is_view_without_downscaling(self):
+        """Test crops that fit are views of the frame."""
+        roi = RegionOfInterest(image_shape=(100, 100), box=(10, 20, 60, 80), size=(60, 50))
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        assert np.shares_memory(roi.crop(frame), frame)
+        with pytest.raises(ValueError):
+            roi.crop(np.zeros((50, 50, 3), dtype=np.uint8))
+
+    def test_coordinates_round_trip(self, roi):
+        """Test points map to the frame and back."""
+        points = np.array([[10.0, 20.0, 1.0], [100.0, 400.0, 2.0]])
+        full = roi.to_full_coordinates(points)
+
+        np.testing.assert_allclose(full[0], [1660 + 40, 140 + 80, 1.0])
+        np.testing.assert_allclose(roi.to_roi_coordinates(full), points)
+
+    def test_model_coordinates(self, roi):
+        """Test model-space keypoints map through the HMR preprocessing scale."""
+        crop = roi.crop(np.zeros(FRAME_SHAPE + (3,), dtype=np.uint8))
+        _, model_scales = preprocess_image(crop, target_size=224)
+
+        full = roi.to_full_coordinates(np.array([112.0, 112.0]), model_scales)
+        np.testing.assert_allclose(full, [1660 + 240, 140 + 960])
+
+    def test_boxes(self, roi):
+        """Test boxes map both ways."""
+        box = roi.to_roi_box(PERSON)
+        np.testing.assert_allclose(roi.to_full_box(box), PERSON)
+        assert roi.to_full_pixel_box((10, 20, 30, 41)) == (1700, 220, 1780, 304)
+
+    def test_mask_upsampling(self, roi):
+        """Test ROI masks upsample into full-frame masks."""
+        mask = np.zeros(roi.size, dtype=bool)
+        mask[40:440, 10:110] = True
+        full = roi.to_full_mask(CompactMask.from_dense(mask))
+
+        assert full.shape == FRAME_SHAPE
+        assert full.sum() == mask.sum() * 16
+        ys, xs = np.nonzero(full)
+        assert (xs.min(), ys.min()) == (1660 + 40, 140 + 160)
+
+
+class _FakeQualityDetector:
+    """Reports a person box in the analysed image's pixels."""
+
+    def __init__(self):
+        self.sam_segmenter = None
+        self.shapes = []
+
+    def analyze_frame(self, image):
+        self.shapes.append(image.shape[:2])
+        h, w = image.shape[:2]
+        box = (3 * w // 8, h // 4, 5 * w // 8, 3 * h // 4)
+        return FrameQuality(user_in_frame=True, confidence=0.9, stability_score=1.0,
+                            is_valid=True, person_box=box)
+
+
+class TestROIPipeline:
+    """Test the ROI stage in the measurement pipeline."""
+
+    def test_sam_and_hmr_share_crop(self):
+        """Test quality and pose stages run on the crop the ROI stage chose."""
+        detector = _FakeQualityDetector()
+        selector = ROISelector(ROIConfig(max_side=256))
+        pipeline = build_measurement_pipeline(
+            quality_detector=detector,
+            pose_estimator=HMRPoseEstimator(),
+            roi_selector=selector,
+            config=FramePipelineConfig(drop_policy=DropPolicy.BLOCK),
+        )
+        assert [stage.name for stage in pipeline.stages] == ["roi", "quality", "pose"]
+
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        with pipeline:
+            pipeline.submit(frame, timestamp=0.0)
+            first = pipeline.get_result(timeout=5.0)
+            pipeline.submit(frame, timestamp=1 / 30)
+            second = pipeline.get_result(timeout=5.0)
+
+        assert first.results["roi"].is_full_frame
+        assert first.inputs["full_image"] is frame
+        assert not second.results["roi"].is_full_frame
+        assert detector.shapes[1] == second.results["roi"].size
+        assert max(detector.shapes[1]) <= 256
+        assert not second.errors
+
+        # Person boxes are reported in full-frame pixels
+        assert first.results["quality"].person_box == (720, 270, 1200, 810)
+        roi = second.results["roi"]
+        h, w = roi.size
+        crop_box = (3 * w // 8, h // 4, 5 * w // 8, 3 * h // 4)
+        assert second.results["quality"].person_box == roi.to_full_pixel_box(crop_box)
@@ -13,7 +13,8 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Tuple
 from collections import deque
 import numpy as np
-from datetime import datetime
+
+from vision_service.timing import monotonic, to_isoformat
 
 
 # ============================================================================
@@ -44,7 +45,7 @@ class ShapeParameters:
     confidence: float  # Confidence score (0-1)
 
     # Metadata
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=monotonic)  # Monotonic seconds
     source: str = "mhr"  # Data source identifier
 
     def to_dict(self) -> dict:
@@ -58,7 +59,7 @@ class ShapeParameters:
             "leg_ratio": self.leg_ratio,
             "vertex_count": self.vertex_count,
             "confidence": self.confidence,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": to_isoformat(self.timestamp),
             "source": self.source,
         }
 
@@ -84,7 +85,7 @@ class MHRMesh:
 
     # Metadata
     frame_id: int = 0  # Frame number in sequence
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=monotonic)  # Monotonic seconds
     confidence: float = 1.0  # Mesh confidence (0-1)
 
     def to_dict(self) -> dict:
@@ -96,7 +97,7 @@ class MHRMesh:
             "position": self.position.tolist(),
             "rotation": self.rotation.tolist(),
             "frame_id": self.frame_id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": to_isoformat(self.timestamp),
             "confidence": self.confidence,
         }
 
@@ -126,8 +127,8 @@ class AveragedShapeParameters:
     # Metadata
     num_samples: int  # Number of frames used in averaging
     confidence_mean: float  # Average confidence across frames
-    timestamp_start: datetime  # Start time of averaging window
-    timestamp_end: datetime  # End time of averaging window
+    timestamp_start: float  # Start time of averaging window (monotonic seconds)
+    timestamp_end: float  # End time of averaging window (monotonic seconds)
 
     def to_dict(self) -> dict:
         """Convert averaged parameters to dictionary."""
@@ -143,8 +144,8 @@ class AveragedShapeParameters:
             "leg_ratio_mean": self.leg_ratio_mean,
             "num_samples": self.num_samples,
             "confidence_mean": self.confidence_mean,
-            "timestamp_start": self.timestamp_start.isoformat(),
-            "timestamp_end": self.timestamp_end.isoformat(),
+            "timestamp_start": to_isoformat(self.timestamp_start),
+            "timestamp_end": to_isoformat(self.timestamp_end),
         }
 
 
@@ -282,21 +283,18 @@ class Body4D:
         """Check if temporal buffer has reached capacity."""
         return len(self.temporal_buffer) == self.buffer_size
 
-    def get_temporal_span(self) -> Tuple[datetime, datetime]:
+    def get_temporal_span(self) -> Tuple[Optional[float], Optional[float]]:
         """
         Get the temporal span of buffered meshes.
 
         Returns:
-            Tuple of (earliest_timestamp, latest_timestamp).
+            Tuple of (earliest_timestamp, latest_timestamp) in monotonic seconds.
             Returns (None, None) if buffer is empty.
         """
         if not self.temporal_buffer:
             return (None, None)
 
-        first_mesh = list(self.temporal_buffer)[0]
-        last_mesh = list(self.temporal_buffer)[-1]
-
-        return (first_mesh.timestamp, last_mesh.timestamp)
+        return (self.temporal_buffer[0].timestamp, self.temporal_buffer[-1].timestamp)
 
     def calculate_temporal_variance(self) -> Optional[float]:
         """
@@ -459,8 +457,8 @@ class Body4D:
             "buffer_capacity": self.buffer_size,
             "is_full": self.is_buffer_full(),
             "temporal_span": {
-                "start": list(self.temporal_buffer)[0].timestamp.isoformat(),
-                "end": list(self.temporal_buffer)[-1].timestamp.isoformat(),
+                "start": to_isoformat(self.temporal_buffer[0].timestamp),
+                "end": to_isoformat(self.temporal_buffer[-1].timestamp),
             },
             "temporal_variance": self.calculate_temporal_variance(),
             "average_confidence": float(np.mean([m.confidence for m in self.temporal_buffer])),
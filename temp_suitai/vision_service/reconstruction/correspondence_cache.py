@@ -0,0 +1,141 @@
+"""
+Persistent cache of MHR <-> SMPL-X vertex correspondences.
+
+All scans produced by the same MHR model share one mesh topology, so the
+nearest-neighbour correspondence against the SMPL-X template only has to be
+computed once per (MHR topology, SMPL-X template) pair. Entries are keyed by a
+fingerprint of the vertex count, the face array and the template vertices,
+and stored as plain .npy files that are opened memory-mapped, so many worker
+processes share one copy through the OS page cache.
+
+Writes go to a temporary file in the cache directory followed by an atomic
+rename, so concurrent processes never observe a partially written entry.
+"""
+
+from typing import Dict, Optional
+import hashlib
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def topology_fingerprint(
+    num_vertices: int,
+    faces: np.ndarray,
+    template_vertices: Optional[np.ndarray] = None,
+) -> str:
+    """
+    Compute a fingerprint identifying a mesh topology and SMPL-X template.
+
+    Args:
+        num_vertices: Number of MHR vertices.
+        faces: MHR face indices [F, 3].
+        template_vertices: SMPL-X template vertices the correspondence was
+            computed against (optional).
+
+    Returns:
+        Hex digest usable as a file name.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"mhr:{int(num_vertices)}".encode())
+
+    faces = np.ascontiguousarray(faces, dtype=np.int64)
+    digest.update(f"faces:{faces.shape}".encode())
+    digest.update(faces.tobytes())
+
+    if template_vertices is not None:
+        template = np.ascontiguousarray(template_vertices, dtype=np.float32)
+        digest.update(f"template:{template.shape}".encode())
+        digest.update(template.tobytes())
+
+    return digest.hexdigest()[:32]
+
+
+class CorrespondenceCache:
+    """
+    Directory of memory-mapped correspondence arrays keyed by fingerprint.
+
+    Loaded entries are also memoized in-process.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache directory (created if missing).
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._entries: Dict[str, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> str:
+        """Path of the .npy file holding an entry."""
+        return os.path.join(self.directory, f"correspondence_{key}.npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Fingerprint from topology_fingerprint().
+
+        Returns:
+            Read-only memory-mapped int64 array, or None if not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self.misses += 1
+                return None
+            try:
+                entry = np.load(path, mmap_mode='r')
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable correspondence cache entry {path}: {e}")
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, correspondence: np.ndarray) -> np.ndarray:
+        """
+        Store an entry atomically.
+
+        Args:
+            key: Fingerprint from topology_fingerprint().
+            correspondence: SMPL-X vertex index per MHR vertex [N_mhr].
+
+        Returns:
+            The stored entry, memory-mapped from disk.
+        """
+        correspondence = np.ascontiguousarray(correspondence, dtype=np.int64)
+        path = self.path_for(key)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, correspondence)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        entry = np.load(path, mmap_mode='r')
+        self._entries[key] = entry
+        return entry
+
+    def clear(self) -> None:
+        """Remove all entries from disk and memory."""
+        self._entries.clear()
+        for name in os.listdir(self.directory):
+            if name.startswith("correspondence_") and name.endswith(".npy"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,254 @@
+"""
+Micro-batching scheduler for HMR pose estimation.
+
+Collects frames submitted by many concurrent sessions and runs them through
+HMRPoseEstimator.estimate_pose_batch in groups, so preprocessing and model
+inference run once per batch instead of once per frame.
+
+A batch is dispatched as soon as it reaches max_batch_size, or when the oldest
+waiting frame has waited max_delay_ms, which bounds the latency added by
+batching. Each submit() returns a Future that resolves to that frame's
+HMRPoseResult.
+"""
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+import logging
+import queue
+import threading
+import numpy as np
+
+from vision_service.latency import LatencyHistogram
+from vision_service.reconstruction.hmr_pose import HMRPoseEstimator, HMRPoseResult
+from vision_service.timing import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MicroBatchConfig:
+    """Configuration for HMRBatchScheduler."""
+
+    max_batch_size: int = 16
+    """Largest number of frames run in one inference call."""
+
+    max_delay_ms: float = 5.0
+    """Longest time the first frame of a batch waits for more frames."""
+
+    max_queue_size: int = 256
+    """Frames that may wait for a batch before submit() blocks."""
+
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        if self.max_delay_ms < 0:
+            raise ValueError("max_delay_ms must be non-negative")
+        if self.max_queue_size <= 0:
+            raise ValueError("max_queue_size must be positive")
+
+
+_Request = Tuple[np.ndarray, Future, float, Any]
+
+_STOP = object()
+"""Sentinel telling the batching thread to exit."""
+
+
+class HMRBatchScheduler:
+    """
+    Dynamic batching front end for an HMRPoseEstimator.
+
+    The estimator must only be used through the scheduler while it is
+    running, since batches execute on the scheduler's worker thread.
+
+    Example:
+        >>> with HMRBatchScheduler(HMRPoseEstimator()) as scheduler:
+        ...     future = scheduler.submit(image, session_id="scan-1")
+        ...     result = future.result(timeout=1.0)
+    """
+
+    def __init__(
+        self,
+        estimator: HMRPoseEstimator,
+        config: Optional[MicroBatchConfig] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            estimator: Pose estimator that runs the batches.
+            config: Configuration object. Uses defaults if None.
+        """
+        self.estimator = estimator
+        self.config = config or MicroBatchConfig()
+
+        self._requests: queue.Queue = queue.Queue(maxsize=self.config.max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.queue_latency = LatencyHistogram()
+        """Time from submit() until the frame's batch starts running."""
+        self.batch_latency = LatencyHistogram()
+        """Time to preprocess and run inference on one batch."""
+        self.batches_processed = 0
+        self.frames_processed = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the batching thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._worker, name="HMRBatchScheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Run all frames already submitted, then stop the batching thread."""
+        if self._thread is None:
+            return
+        self._requests.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the batching thread is running."""
+        return self._thread is not None
+
+    def __enter__(self) -> "HMRBatchScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def submit(self, image: np.ndarray, session_id: Any = None) -> "Future[HMRPoseResult]":
+        """
+        Queue a frame for batched pose estimation.
+
+        Blocks while max_queue_size frames are already waiting.
+
+        Args:
+            image: Input image as numpy array (RGB, BGR, or grayscale).
+            session_id: Optional identifier of the submitting session, kept
+                for logging.
+
+        Returns:
+            Future resolving to the frame's HMRPoseResult, or raising the
+            error that failed its batch.
+
+        Raises:
+            RuntimeError: If the scheduler is not running.
+        """
+        if self._thread is None:
+            raise RuntimeError("HMRBatchScheduler is not running; call start() first")
+
+        future: Future = Future()
+        self._requests.put((image, future, monotonic(), session_id))
+        return future
+
+    def estimate_pose(
+        self,
+        image: np.ndarray,
+        session_id: Any = None,
+        timeout: Optional[float] = None,
+    ) -> HMRPoseResult:
+        """Submit a frame and wait for its result (blocking convenience wrapper)."""
+        return self.submit(image, session_id).result(timeout=timeout)
+
+    @property
+    def average_batch_size(self) -> float:
+        """Mean number of frames per executed batch."""
+        if self.batches_processed == 0:
+            return 0.0
+        return self.frames_processed / self.batches_processed
+
+    def get_statistics(self) -> dict:
+        """Get batching statistics."""
+        return {
+            "batches_processed": self.batches_processed,
+            "frames_processed": self.frames_processed,
+            "average_batch_size": self.average_batch_size,
+            "pending_frames": self._requests.qsize(),
+            "queue_latency": self.queue_latency.to_dict(),
+            "batch_latency": self.batch_latency.to_dict(),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _collect_batch(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Gather requests until the batch is full or the deadline passes."""
+        batch = [first]
+        deadline = first[2] + self.config.max_delay_ms / 1000.0
+
+        while len(batch) < self.config.max_batch_size:
+            remaining = deadline - monotonic()
+            try:
+                if remaining <= 0:
+                    request = self._requests.get_nowait()
+                else:
+                    request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+
+        return batch, False
+
+    def _worker(self) -> None:
+        """Batching loop."""
+        while True:
+            first = self._requests.get()
+            if first is _STOP:
+                return
+
+            batch, stopping = self._collect_batch(first)
+            self._run_batch(batch)
+            if stopping:
+                # Finish whatever was submitted before stop()
+                while True:
+                    try:
+                        request = self._requests.get_nowait()
+                    except queue.Empty:
+                        return
+                    if request is not _STOP:
+                        self._run_batch([request])
+
+    def _run_batch(self, batch: List[_Request]) -> None:
+        """Run one batch and resolve its futures."""
+        # Skip frames whose caller already gave up
+        batch = [request for request in batch if request[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        start = monotonic()
+        for _, _, submitted_at, _ in batch:
+            self.queue_latency.record(start - submitted_at)
+
+        try:
+            results = self.estimator.estimate_pose_batch([request[0] for request in batch])
+        except Exception as e:
+            sessions = [request[3] for request in batch]
+            logger.error(f"HMR batch of {len(batch)} frames failed (sessions {sessions}): {e}")
+            for _, future, _, _ in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self.batch_latency.record(monotonic() - start)
+
+        self.batches_processed += 1
+        self.frames_processed += len(batch)
+        for (_, future, _, _), result in zip(batch, results):
+            future.set_result(result)
@@ -10,7 +10,7 @@ providing temporal pose tracking and mesh recovery.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 import numpy as np
 from datetime import datetime
 import cv2
@@ -103,6 +103,48 @@ def preprocess_image(
         TypeError: If image is not numpy array.
         ValueError: If image shape is invalid.
     """
+    resized, scale_factors = _resize_for_model(image, target_size)
+    return _normalize(resized, normalize), scale_factors
+
+
+def preprocess_images(
+    images: Sequence[np.ndarray],
+    target_size: int = 224,
+    normalize: bool = True,
+) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Preprocess a batch of images for HMR model input.
+
+    Each image is converted to RGB and resized individually (images may have
+    different sizes); the float conversion and normalization then run once
+    over the stacked batch.
+
+    Args:
+        images: Sequence of input images (RGB, BGR, BGRA or grayscale).
+        target_size: Target resolution for model (typically 224 or 256).
+        normalize: Whether to normalize to [-1, 1] range.
+
+    Returns:
+        Tuple of (batch, scale_factors) where batch has shape
+        [B, target_size, target_size, 3] and scale_factors holds one
+        (height_scale, width_scale) per image.
+
+    Raises:
+        TypeError: If an image is not numpy array.
+        ValueError: If an image shape is invalid.
+    """
+    if len(images) == 0:
+        return np.empty((0, target_size, target_size, 3), dtype=np.float32), []
+
+    resized, scale_factors = zip(*(_resize_for_model(image, target_size) for image in images))
+    return _normalize(np.stack(resized), normalize), list(scale_factors)
+
+
+def _resize_for_model(
+    image: np.ndarray,
+    target_size: int,
+) -> Tuple[np.ndarray, Tuple[float, float]]:
+    """Convert image to RGB and resize it, returning it with its scale factors."""
     if not isinstance(image, np.ndarray):
         raise TypeError(f"Expected ndarray, got {type(image)}")
 
@@ -125,6 +167,11 @@ def preprocess_image(
     # Resize to target size
     resized = cv2.resize(image, (target_size, target_size), interpolation=cv2.INTER_LINEAR)
 
+    return resized, (scale_h, scale_w)
+
+
+def _normalize(resized: np.ndarray, normalize: bool) -> np.ndarray:
+    """Convert resized image(s) to float32 in [-1, 1] (or [0, 1])."""
     # Convert to float32
     resized = resized.astype(np.float32)
 
@@ -138,7 +185,7 @@ def preprocess_image(
     # Ensure channel-first format if needed (C x H x W for PyTorch)
     # Note: This returns H x W x C format; caller should transpose if needed
 
-    return resized, (scale_h, scale_w)
+    return resized
 
 
 def postprocess_coordinates(
@@ -178,6 +225,219 @@ def postprocess_coordinates(
 # Rotation Matrix Utilities
 # ============================================================================
 
+_SMALL_ANGLE = 1e-4
+"""Angles (radians) below which Taylor expansions replace sin/cos ratios."""
+
+_NEAR_PI = 1e-3
+"""Distance from pi below which the axis is recovered from the symmetric part."""
+
+
+def axis_angles_to_rotation_matrices(axis_angles: np.ndarray) -> np.ndarray:
+    """
+    Convert axis-angle vectors to rotation matrices (vectorized Rodrigues).
+
+    Uses R = I + A(t) K + B(t) K^2 with K the skew matrix of the unnormalized
+    vector, A = sin(t)/t and B = (1 - cos(t))/t^2, switching to Taylor series
+    for small angles so there is no division by zero.
+
+    Args:
+        axis_angles: Array of shape (..., 3).
+
+    Returns:
+        Array of shape (..., 3, 3).
+
+    Raises:
+        ValueError: If the last dimension is not 3.
+    """
+    axis_angles = np.asarray(axis_angles, dtype=np.float64)
+    if axis_angles.ndim == 0 or axis_angles.shape[-1] != 3:
+        raise ValueError(f"Expected shape (..., 3), got {axis_angles.shape}")
+
+    theta2 = np.sum(axis_angles ** 2, axis=-1)
+    theta = np.sqrt(theta2)
+    small = theta < _SMALL_ANGLE
+    safe_theta = np.where(small, 1.0, theta)
+
+    a = np.where(small, 1.0 - theta2 / 6.0, np.sin(safe_theta) / safe_theta)
+    b = np.where(small, 0.5 - theta2 / 24.0, (1.0 - np.cos(safe_theta)) / safe_theta ** 2)
+
+    K = _skew(axis_angles)
+    return (
+        np.eye(3)
+        + a[..., None, None] * K
+        + b[..., None, None] * (K @ K)
+    )
+
+
+def rotation_matrices_to_axis_angles(rotation_matrices: np.ndarray) -> np.ndarray:
+    """
+    Convert rotation matrices to axis-angle vectors (vectorized log map).
+
+    The angle is atan2(sin, cos) of the skew and trace parts, which stays
+    accurate over the whole range. Near zero the skew part is used directly;
+    near pi, where the skew part vanishes, the axis is taken from the
+    symmetric part (R + R^T) / 2 - cos(t) I = (1 - cos(t)) a a^T.
+
+    Args:
+        rotation_matrices: Array of shape (..., 3, 3).
+
+    Returns:
+        Array of shape (..., 3) with angles in [0, pi].
+
+    Raises:
+        ValueError: If the trailing dimensions are not (3, 3).
+    """
+    R = np.asarray(rotation_matrices, dtype=np.float64)
+    if R.ndim < 2 or R.shape[-2:] != (3, 3):
+        raise ValueError(f"Expected shape (..., 3, 3), got {R.shape}")
+
+    # sin(t) * axis from the skew-symmetric part
+    w = 0.5 * np.stack([
+        R[..., 2, 1] - R[..., 1, 2],
+        R[..., 0, 2] - R[..., 2, 0],
+        R[..., 1, 0] - R[..., 0, 1],
+    ], axis=-1)
+    sin_theta = np.linalg.norm(w, axis=-1)
+    cos_theta = 0.5 * (np.trace(R, axis1=-2, axis2=-1) - 1.0)
+    theta = np.arctan2(sin_theta, cos_theta)
+
+    small = theta < _SMALL_ANGLE
+    safe_sin = np.where(small, 1.0, sin_theta)
+    scale = np.where(small, 1.0 + theta ** 2 / 6.0, theta / safe_sin)
+    result = scale[..., None] * w
+
+    near_pi = theta > np.pi - _NEAR_PI
+    if np.any(near_pi):
+        result[near_pi] = _axis_angle_near_pi(
+            R[near_pi], w[near_pi], theta[near_pi], cos_theta[near_pi]
+        )
+
+    return result
+
+
+def _skew(v: np.ndarray) -> np.ndarray:
+    """Skew-symmetric cross-product matrices of shape (..., 3, 3)."""
+    K = np.zeros(v.shape[:-1] + (3, 3), dtype=v.dtype)
+    K[..., 0, 1] = -v[..., 2]
+    K[..., 0, 2] = v[..., 1]
+    K[..., 1, 0] = v[..., 2]
+    K[..., 1, 2] = -v[..., 0]
+    K[..., 2, 0] = -v[..., 1]
+    K[..., 2, 1] = v[..., 0]
+    return K
+
+
+def _axis_angle_near_pi(
+    R: np.ndarray, w: np.ndarray, theta: np.ndarray, cos_theta: np.ndarray
+) -> np.ndarray:
+    """Recover axis-angle vectors (N, 3) for rotations close to pi."""
+    outer = 0.5 * (R + np.swapaxes(R, -1, -2)) - cos_theta[:, None, None] * np.eye(3)
+    outer /= (1.0 - cos_theta)[:, None, None]
+
+    # Column with the largest diagonal entry is best conditioned
+    k = np.argmax(np.diagonal(outer, axis1=-2, axis2=-1), axis=-1)
+    rows = np.arange(len(k))
+    axis = outer[rows, :, k] / np.sqrt(np.maximum(outer[rows, k, k], 1e-12))[:, None]
+    axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+
+    # Resolve the sign from the (small) skew part where it is informative
+    sign = np.where(np.sum(axis * w, axis=-1) < 0, -1.0, 1.0)
+    return (sign * theta)[:, None] * axis
+
+
+def axis_angles_to_rotation_matrices_torch(axis_angles: "torch.Tensor") -> "torch.Tensor":
+    """
+    Differentiable torch version of axis_angles_to_rotation_matrices.
+
+    Gradients are finite at zero rotation. Works on any device and floating
+    dtype.
+
+    Args:
+        axis_angles: Tensor of shape (..., 3).
+
+    Returns:
+        Tensor of shape (..., 3, 3).
+    """
+    import torch
+
+    if axis_angles.ndim == 0 or axis_angles.shape[-1] != 3:
+        raise ValueError(f"Expected shape (..., 3), got {tuple(axis_angles.shape)}")
+
+    theta2 = (axis_angles ** 2).sum(dim=-1)
+    small = theta2 < _SMALL_ANGLE ** 2
+    safe_theta = torch.sqrt(torch.where(small, torch.ones_like(theta2), theta2))
+
+    a = torch.where(small, 1.0 - theta2 / 6.0, torch.sin(safe_theta) / safe_theta)
+    b = torch.where(small, 0.5 - theta2 / 24.0, (1.0 - torch.cos(safe_theta)) / safe_theta ** 2)
+
+    x, y, z = axis_angles.unbind(dim=-1)
+    zero = torch.zeros_like(x)
+    K = torch.stack([
+        zero, -z, y,
+        z, zero, -x,
+        -y, x, zero,
+    ], dim=-1).reshape(axis_angles.shape[:-1] + (3, 3))
+
+    eye = torch.eye(3, dtype=axis_angles.dtype, device=axis_angles.device)
+    return eye + a[..., None, None] * K + b[..., None, None] * (K @ K)
+
+
+def rotation_matrices_to_axis_angles_torch(rotation_matrices: "torch.Tensor") -> "torch.Tensor":
+    """
+    Differentiable torch version of rotation_matrices_to_axis_angles.
+
+    Args:
+        rotation_matrices: Tensor of shape (..., 3, 3).
+
+    Returns:
+        Tensor of shape (..., 3).
+    """
+    import torch
+
+    R = rotation_matrices
+    if R.ndim < 2 or tuple(R.shape[-2:]) != (3, 3):
+        raise ValueError(f"Expected shape (..., 3, 3), got {tuple(R.shape)}")
+
+    w = 0.5 * torch.stack([
+        R[..., 2, 1] - R[..., 1, 2],
+        R[..., 0, 2] - R[..., 2, 0],
+        R[..., 1, 0] - R[..., 0, 1],
+    ], dim=-1)
+    sin2 = (w ** 2).sum(dim=-1)
+    small_sin = sin2 < 1e-24
+    sin_theta = torch.sqrt(torch.where(small_sin, torch.ones_like(sin2), sin2))
+    sin_theta = torch.where(small_sin, torch.zeros_like(sin2), sin_theta)
+    cos_theta = 0.5 * (R.diagonal(dim1=-2, dim2=-1).sum(dim=-1) - 1.0)
+    theta = torch.atan2(sin_theta, cos_theta)
+
+    small = theta < _SMALL_ANGLE
+    near_pi = theta > torch.pi - _NEAR_PI
+    # Both ends divide by sin(theta) ~ 0; keep the unused branch finite so
+    # torch.where does not pass NaN gradients through it
+    safe_sin = torch.where(small | near_pi, torch.ones_like(sin_theta), sin_theta)
+    scale = torch.where(small, 1.0 + theta ** 2 / 6.0, theta / safe_sin)
+    result = scale[..., None] * w
+
+    if bool(near_pi.any()):
+        # Axis from the symmetric part, as in the NumPy version
+        eye = torch.eye(3, dtype=R.dtype, device=R.device)
+        outer = 0.5 * (R + R.transpose(-1, -2)) - cos_theta[..., None, None] * eye
+        outer = outer / (1.0 - cos_theta).clamp_min(1e-12)[..., None, None]
+        diag = outer.diagonal(dim1=-2, dim2=-1)
+        k = diag.argmax(dim=-1, keepdim=True)
+        column = torch.gather(
+            outer, -1, k[..., None, :].expand(outer.shape[:-1] + (1,))
+        ).squeeze(-1)
+        pivot = torch.gather(diag, -1, k).clamp_min(1e-12)
+        axis = column / torch.sqrt(pivot)
+        axis = axis / axis.norm(dim=-1, keepdim=True).clamp_min(1e-12)
+        sign = torch.where((axis * w).sum(dim=-1) < 0, -1.0, 1.0).to(R.dtype)
+        pi_result = (sign * theta)[..., None] * axis
+        result = torch.where(near_pi[..., None], pi_result, result)
+
+    return result
+
+
 def axis_angle_to_rotation_matrix(axis_angle: np.ndarray) -> np.ndarray:
     """
     Convert axis-angle representation to 3x3 rotation matrix.
@@ -194,26 +454,7 @@ def axis_angle_to_rotation_matrix(axis_angle: np.ndarray) -> np.ndarray:
     if axis_angle.shape != (3,):
         raise ValueError(f"Expected shape (3,), got {axis_angle.shape}")
 
-    # Compute angle (norm of axis-angle)
-    angle = np.linalg.norm(axis_angle)
-
-    # Handle small angles
-    if angle < 1e-6:
-        return np.eye(3)
-
-    # Normalized axis
-    axis = axis_angle / angle
-
-    # Rodrigues' rotation formula
-    K = np.array([
-        [0, -axis[2], axis[1]],
-        [axis[2], 0, -axis[0]],
-        [-axis[1], axis[0], 0]
-    ])
-
-    R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * (K @ K)
-
-    return R
+    return axis_angles_to_rotation_matrices(axis_angle)
 
 
 def rotation_matrix_to_axis_angle(R: np.ndarray) -> np.ndarray:
@@ -232,33 +473,7 @@ def rotation_matrix_to_axis_angle(R: np.ndarray) -> np.ndarray:
     if R.shape != (3, 3):
         raise ValueError(f"Expected shape (3, 3), got {R.shape}")
 
-    # Angle from trace
-    trace = np.trace(R)
-    angle = np.arccos(np.clip((trace - 1) / 2, -1.0, 1.0))
-
-    # Handle small angles
-    if angle < 1e-6:
-        return np.zeros(3)
-
-    # Handle angle near pi
-    if np.abs(angle - np.pi) < 1e-6:
-        # Find the axis from diagonal elements
-        diag = np.diag(R)
-        k = np.argmax(diag)
-        axis = np.zeros(3)
-        axis[k] = 1.0
-    else:
-        # Extract axis from skew-symmetric part
-        axis = np.array([
-            R[2, 1] - R[1, 2],
-            R[0, 2] - R[2, 0],
-            R[1, 0] - R[0, 1]
-        ]) / (2 * np.sin(angle))
-
-    # Normalize
-    axis = axis / (np.linalg.norm(axis) + 1e-8)
-
-    return angle * axis
+    return rotation_matrices_to_axis_angles(R)
 
 
 def batch_axis_angle_to_rotation_matrices(batch_axis_angles: np.ndarray) -> np.ndarray:
@@ -271,16 +486,10 @@ def batch_axis_angle_to_rotation_matrices(batch_axis_angles: np.ndarray) -> np.n
     Returns:
         Array of shape [N, 3, 3] with rotation matrices.
     """
-    if batch_axis_angles.shape[1] != 3:
+    if batch_axis_angles.ndim != 2 or batch_axis_angles.shape[1] != 3:
         raise ValueError(f"Expected shape [N, 3], got {batch_axis_angles.shape}")
 
-    N = batch_axis_angles.shape[0]
-    rotation_matrices = np.zeros((N, 3, 3))
-
-    for i in range(N):
-        rotation_matrices[i] = axis_angle_to_rotation_matrix(batch_axis_angles[i])
-
-    return rotation_matrices
+    return axis_angles_to_rotation_matrices(batch_axis_angles)
 
 
 # ============================================================================
@@ -402,6 +611,76 @@ class HMRPoseEstimator:
             processing_time_ms=processing_time,
         )
 
+    def estimate_pose_batch(
+        self,
+        images: Sequence[np.ndarray],
+    ) -> List[HMRPoseResult]:
+        """
+        Estimate poses for a batch of images in one inference call.
+
+        Preprocessing and inference run once over the whole batch; results
+        are returned in input order with consecutive frame ids. Each result
+        reports the processing time of the whole batch.
+
+        Args:
+            images: Sequence of input images (RGB, BGR, or grayscale).
+
+        Returns:
+            List of HMRPoseResult, one per image.
+
+        Raises:
+            TypeError: If an image is not numpy array.
+            ValueError: If an image is invalid.
+            RuntimeError: If model is not loaded (non-mock mode).
+        """
+        import time
+
+        if len(images) == 0:
+            return []
+
+        start_time = time.time()
+
+        # Preprocess batch
+        preprocessed, _ = preprocess_images(
+            images,
+            target_size=self.input_size,
+            normalize=True,
+        )
+
+        # Run inference once for the whole batch
+        if self.use_mock:
+            pose_thetas, rotation_matrices, confidences = self._mock_batch_inference(len(images))
+        else:
+            pose_thetas, rotation_matrices, confidences = self._run_batch_inference(preprocessed)
+
+        joint_confidences = self._extract_joint_confidences(confidences)
+        timestamp = datetime.now()
+
+        processing_time = (time.time() - start_time) * 1000  # ms
+
+        results = []
+        for i in range(len(images)):
+            pose_params = PoseParameters(
+                pose_theta=pose_thetas[i],
+                rotation_matrices=rotation_matrices[i],
+                global_rotation=rotation_matrices[i, 0],  # Root rotation
+                global_translation=np.array([0.0, 0.0, 0.0]),  # Estimated from image
+                confidence=float(confidences[i]),
+                joint_confidences=joint_confidences[i],
+                frame_id=self._frame_counter,
+                timestamp=timestamp,
+            )
+            self._processing_times.append(processing_time)
+            self._frame_counter += 1
+
+            results.append(HMRPoseResult(
+                pose_params=pose_params,
+                image_preprocessed=preprocessed[i],
+                processing_time_ms=processing_time,
+            ))
+
+        return results
+
     def _run_inference(
         self,
         preprocessed_image: np.ndarray,
@@ -441,16 +720,67 @@ class HMRPoseEstimator:
 
         return pose_theta, rotation_matrices, confidence
 
-    def _extract_joint_confidences(self, overall_confidence: float) -> np.ndarray:
+    def _run_batch_inference(
+        self,
+        preprocessed_batch: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run HMR 2.0 model inference on a batch.
+
+        Until the model forward pass is implemented in _run_inference, each
+        image goes through it in turn, so batching callers share a single
+        inference path with estimate_pose().
+
+        Returns:
+            Tuple of (pose_thetas [B, 72], rotation_matrices [B, 24, 3, 3],
+            confidences [B]).
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded. Use mock mode by passing model_path=None")
+
+        outputs = [self._run_inference(image) for image in preprocessed_batch]
+        pose_thetas, rotation_matrices, confidences = zip(*outputs)
+        return (
+            np.stack(pose_thetas),
+            np.stack(rotation_matrices),
+            np.asarray(confidences, dtype=np.float64),
+        )
+
+    def _mock_batch_inference(
+        self,
+        batch_size: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Generate a batch of mock poses for testing and development."""
+        pose_thetas = np.random.randn(batch_size, 72) * 0.1
+
+        axis_angles = pose_thetas.reshape(batch_size * 24, 3)
+        rotation_matrices = batch_axis_angle_to_rotation_matrices(axis_angles)
+        rotation_matrices = rotation_matrices.reshape(batch_size, 24, 3, 3)
+
+        confidences = 0.85 + np.random.rand(batch_size) * 0.1
+
+        return pose_thetas, rotation_matrices, confidences
+
+    def _extract_joint_confidences(
+        self,
+        overall_confidence: Union[float, np.ndarray],
+    ) -> np.ndarray:
         """
         Extract per-joint confidence scores.
 
         In production, model would output per-joint confidences.
         For now, derive from overall confidence with small variation.
+
+        Args:
+            overall_confidence: Scalar, or array of shape [B] for a batch.
+
+        Returns:
+            Array of shape [24], or [B, 24] for a batch.
         """
-        joint_confidences = np.ones(24) * overall_confidence
+        overall_confidence = np.asarray(overall_confidence, dtype=np.float64)
+        joint_confidences = overall_confidence[..., None] * np.ones(24)
         # Add small random variation
-        joint_confidences *= (1.0 + np.random.randn(24) * 0.05)
+        joint_confidences *= (1.0 + np.random.randn(*joint_confidences.shape) * 0.05)
         joint_confidences = np.clip(joint_confidences, 0.0, 1.0)
         return joint_confidences
 
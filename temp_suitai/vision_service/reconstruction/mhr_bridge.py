@@ -10,12 +10,40 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-from typing import Tuple, Dict, Optional, Union
+from typing import Callable, Tuple, Dict, List, Optional, Sequence, Union
 from dataclasses import dataclass
 import logging
+import time
+
+from vision_service.reconstruction.correspondence_cache import (
+    CorrespondenceCache,
+    topology_fingerprint,
+)
+from vision_service.reconstruction.result_store import (
+    RESULT_STORE_SUFFIX,
+    ConversionResultStore,
+    arrays_to_result,
+    result_to_arrays,
+)
 
 logger = logging.getLogger(__name__)
 
+CORRESPONDENCE_METHODS = ("dense", "chunked", "kdtree")
+"""Nearest-neighbour backends for VertexMatcher.
+
+- dense: one broadcast [N_mhr, N_smplx] distance matrix (highest memory)
+- chunked: exact distances for blocks of MHR vertices, bounded memory
+- kdtree: scipy cKDTree over SMPL-X vertices, queried on all CPU cores
+"""
+
+OPTIMIZERS = ("adam", "lbfgs")
+"""Optimizers available to MHRBridge.
+
+- adam: one gradient step per iteration
+- lbfgs: quasi-Newton step with strong Wolfe line search per iteration
+  (several SMPL-X evaluations each, typically far fewer iterations)
+"""
+
 
 @dataclass
 class BridgeConfig:
@@ -38,9 +66,39 @@ class BridgeConfig:
     # Pose regularization
     pose_std: float = 0.2  # Standard deviation for pose prior
 
+    # Optimizer
+    optimizer: str = "adam"  # One of OPTIMIZERS
+    lbfgs_max_iter: int = 20  # Loss evaluations per L-BFGS step
+    compile_loss: bool = False  # torch.compile the fused SMPL-X forward + loss
+    compile_backend: str = "inductor"  # Backend passed to torch.compile
+
     # Convergence
     convergence_threshold: float = 1e-6
     patience: int = 50
+    convergence_check_interval: int = 10  # Iterations between host syncs for early stopping
+
+    # Vertex correspondence
+    correspondence_method: str = "chunked"  # One of CORRESPONDENCE_METHODS
+    correspondence_chunk_size: int = 1024  # MHR vertices per block (chunked)
+    correspondence_cache_dir: Optional[str] = None  # Reuse correspondences per MHR topology
+
+    def __post_init__(self):
+        """Validate configuration parameters."""
+        if self.correspondence_method not in CORRESPONDENCE_METHODS:
+            raise ValueError(
+                f"correspondence_method must be one of {CORRESPONDENCE_METHODS}, "
+                f"got '{self.correspondence_method}'"
+            )
+        if self.correspondence_chunk_size <= 0:
+            raise ValueError("correspondence_chunk_size must be positive")
+        if self.optimizer not in OPTIMIZERS:
+            raise ValueError(
+                f"optimizer must be one of {OPTIMIZERS}, got '{self.optimizer}'"
+            )
+        if self.lbfgs_max_iter <= 0:
+            raise ValueError("lbfgs_max_iter must be positive")
+        if self.convergence_check_interval <= 0:
+            raise ValueError("convergence_check_interval must be positive")
 
 
 @dataclass
@@ -62,24 +120,46 @@ class ConversionResult:
     original_vertices: torch.Tensor  # Original MHR vertices [N, 3]
     reconstructed_vertices: torch.Tensor  # SMPL-X reconstructed vertices [M, 3]
     vertex_correspondence: Optional[np.ndarray] = None  # Mapping between meshes
+    iterations: int = 0  # Optimization iterations run before stopping
+    iterations_per_second: float = 0.0  # Optimizer throughput of the whole batch
 
 
 class VertexMatcher(nn.Module):
     """Handles vertex correspondence between MHR and SMPL-X meshes."""
 
-    def __init__(self, mhr_vertices: torch.Tensor, smplx_vertices: torch.Tensor):
+    def __init__(
+        self,
+        mhr_vertices: torch.Tensor,
+        smplx_vertices: torch.Tensor,
+        method: str = "dense",
+        chunk_size: int = 1024
+    ):
         """
         Initialize vertex matcher.
 
         Args:
             mhr_vertices: MHR mesh vertices [N_mhr, 3]
             smplx_vertices: SMPL-X mesh vertices [N_smplx, 3]
+            method: Nearest-neighbour backend, one of CORRESPONDENCE_METHODS
+            chunk_size: MHR vertices per distance block for the chunked backend
+
+        Raises:
+            ValueError: If method or chunk_size is invalid
         """
         super().__init__()
+        if method not in CORRESPONDENCE_METHODS:
+            raise ValueError(
+                f"method must be one of {CORRESPONDENCE_METHODS}, got '{method}'"
+            )
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
         self.register_buffer('mhr_vertices', mhr_vertices)
         self.register_buffer('smplx_vertices', smplx_vertices)
         self.n_mhr = mhr_vertices.shape[0]
         self.n_smplx = smplx_vertices.shape[0]
+        self.method = method
+        self.chunk_size = chunk_size
 
     def compute_correspondence(self) -> np.ndarray:
         """
@@ -89,6 +169,11 @@ class VertexMatcher(nn.Module):
             Correspondence array where correspondence[i] = j means
             MHR vertex i corresponds to SMPL-X vertex j
         """
+        if self.method == "chunked":
+            return self._chunked_correspondence()
+        if self.method == "kdtree":
+            return self._kdtree_correspondence()
+
         # Use nearest neighbor matching
         # For each MHR vertex, find closest SMPL-X vertex
         mhr_expanded = self.mhr_vertices.unsqueeze(1)  # [N_mhr, 1, 3]
@@ -102,6 +187,36 @@ class VertexMatcher(nn.Module):
 
         return correspondence
 
+    def _chunked_correspondence(self) -> np.ndarray:
+        """Exact nearest neighbours with at most [chunk_size, N_smplx] distances live."""
+        correspondence = torch.empty(self.n_mhr, dtype=torch.long, device=self.mhr_vertices.device)
+
+        for start in range(0, self.n_mhr, self.chunk_size):
+            block = self.mhr_vertices[start:start + self.chunk_size]
+            # Explicit differences (not the matmul expansion) keep distances exact
+            distances = torch.cdist(
+                block, self.smplx_vertices,
+                compute_mode='donot_use_mm_for_euclid_dist'
+            )
+            correspondence[start:start + block.shape[0]] = torch.argmin(distances, dim=1)
+
+        return correspondence.cpu().numpy()
+
+    def _kdtree_correspondence(self) -> np.ndarray:
+        """Nearest neighbours from a KD-tree over the SMPL-X vertices."""
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError as e:
+            raise RuntimeError(
+                f"KD-tree correspondence requires scipy. Install it or use 'chunked': {e}"
+            )
+
+        tree = cKDTree(self.smplx_vertices.detach().cpu().numpy())
+        _, correspondence = tree.query(
+            self.mhr_vertices.detach().cpu().numpy(), k=1, workers=-1
+        )
+        return correspondence.astype(np.int64)
+
 
 class MHRBridge(nn.Module):
     """
@@ -130,8 +245,78 @@ class MHRBridge(nn.Module):
         self.config = config or BridgeConfig()
         self.device = torch.device(device)
 
+        # Zero-parameter SMPL-X vertices, computed on first use
+        self._template_vertices: Optional[torch.Tensor] = None
+        self.correspondence_cache = (
+            CorrespondenceCache(self.config.correspondence_cache_dir)
+            if self.config.correspondence_cache_dir else None
+        )
+
         logger.info(f"Initialized MHR Bridge on device: {self.device}")
 
+    def _get_template_vertices(self) -> torch.Tensor:
+        """
+        Get SMPL-X vertices for zero shape and pose [N_smplx, 3].
+
+        The template only depends on the SMPL-X model, so it is computed once
+        per bridge.
+
+        Raises:
+            RuntimeError: If SMPL-X model forward pass fails
+        """
+        if self._template_vertices is None:
+            with torch.no_grad():
+                try:
+                    smplx_output = self.smplx_model(
+                        betas=torch.zeros(1, self.config.max_shape_params, device=self.device),
+                        body_pose=torch.zeros(1, 63, device=self.device),
+                        global_orient=torch.zeros(1, 3, device=self.device)
+                    )
+                    self._template_vertices = smplx_output.vertices[0]
+                except Exception as e:
+                    raise RuntimeError(f"Failed to get initial SMPL-X vertices: {e}")
+        return self._template_vertices
+
+    def _get_correspondence(
+        self,
+        mhr_vertices: torch.Tensor,
+        mhr_faces: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Get the MHR-to-SMPL-X vertex correspondence for one mesh.
+
+        With a correspondence cache configured and faces given, meshes sharing
+        a topology reuse the correspondence of the first such mesh.
+
+        Args:
+            mhr_vertices: MHR mesh vertices [N_mhr, 3]
+            mhr_faces: MHR mesh faces (needed to identify the topology)
+
+        Returns:
+            SMPL-X vertex index per MHR vertex [N_mhr]
+        """
+        template = self._get_template_vertices()
+
+        key = None
+        if self.correspondence_cache is not None and mhr_faces is not None:
+            key = topology_fingerprint(
+                mhr_vertices.shape[0], mhr_faces, template.detach().cpu().numpy()
+            )
+            cached = self.correspondence_cache.get(key)
+            if cached is not None and cached.shape[0] == mhr_vertices.shape[0]:
+                return cached
+
+        correspondence = VertexMatcher(
+            mhr_vertices,
+            template,
+            method=self.config.correspondence_method,
+            chunk_size=self.config.correspondence_chunk_size
+        ).compute_correspondence()
+
+        if key is not None:
+            correspondence = self.correspondence_cache.put(key, correspondence)
+        return correspondence
+
     def _create_learnable_parameters(
         self,
         batch_size: int = 1
@@ -154,7 +339,8 @@ class MHRBridge(nn.Module):
     def _compute_shape_regularization(
         self,
         betas: torch.Tensor,
-        shape_std: float
+        shape_std: float,
+        per_sample: bool = False
     ) -> torch.Tensor:
         """
         Compute shape regularization loss (L2 penalty on shape parameters).
@@ -164,11 +350,14 @@ class MHRBridge(nn.Module):
         Args:
             betas: Shape parameters [batch_size, num_shape_params]
             shape_std: Standard deviation for prior
+            per_sample: Return one loss per batch element instead of the sum
 
         Returns:
-            Regularization loss (scalar)
+            Regularization loss (scalar, or [batch_size] if per_sample)
         """
         # L2 regularization on shape parameters
+        if per_sample:
+            return torch.sum(betas ** 2, dim=1) / (2 * shape_std ** 2)
         shape_reg = torch.sum(betas ** 2) / (2 * shape_std ** 2)
         return shape_reg
 
@@ -176,7 +365,8 @@ class MHRBridge(nn.Module):
         self,
         body_pose: torch.Tensor,
         global_orient: torch.Tensor,
-        pose_std: float
+        pose_std: float,
+        per_sample: bool = False
     ) -> torch.Tensor:
         """
         Compute pose regularization loss.
@@ -187,11 +377,16 @@ class MHRBridge(nn.Module):
             body_pose: Body pose parameters [batch_size, 63]
             global_orient: Global orientation [batch_size, 3]
             pose_std: Standard deviation for prior
+            per_sample: Return one loss per batch element instead of the sum
 
         Returns:
-            Regularization loss (scalar)
+            Regularization loss (scalar, or [batch_size] if per_sample)
         """
         # L2 regularization on pose parameters
+        if per_sample:
+            return (
+                torch.sum(body_pose ** 2, dim=1) + torch.sum(global_orient ** 2, dim=1)
+            ) / (2 * pose_std ** 2)
         pose_reg = (torch.sum(body_pose ** 2) + torch.sum(global_orient ** 2)) / (2 * pose_std ** 2)
         return pose_reg
 
@@ -199,7 +394,7 @@ class MHRBridge(nn.Module):
         self,
         predicted_vertices: torch.Tensor,
         target_vertices: torch.Tensor,
-        correspondence: np.ndarray
+        correspondence: Union[np.ndarray, torch.Tensor]
     ) -> torch.Tensor:
         """
         Compute vertex reconstruction loss.
@@ -210,14 +405,15 @@ class MHRBridge(nn.Module):
         Args:
             predicted_vertices: SMPL-X vertices [1, N_smplx, 3]
             target_vertices: MHR vertices [N_mhr, 3]
-            correspondence: Vertex correspondence mapping
+            correspondence: Vertex correspondence mapping (array, or a long
+                tensor already on the device to avoid a copy per call)
 
         Returns:
             Vertex loss (scalar)
         """
         # Map MHR vertices to SMPL-X using correspondence
         device = predicted_vertices.device
-        correspondence_tensor = torch.from_numpy(correspondence).to(device)
+        correspondence_tensor = torch.as_tensor(correspondence, device=device)
 
         # Get predicted vertices at corresponding indices
         # correspondence[i] = j means MHR vertex i should match SMPL-X vertex j
@@ -229,6 +425,97 @@ class MHRBridge(nn.Module):
 
         return vertex_loss
 
+    def _compute_batch_vertex_loss(
+        self,
+        predicted_vertices: torch.Tensor,
+        target_vertices: torch.Tensor,
+        correspondence: torch.Tensor,
+        vertex_mask: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Compute per-sample vertex reconstruction loss for a padded batch.
+
+        Args:
+            predicted_vertices: SMPL-X vertices [B, N_smplx, 3]
+            target_vertices: Padded MHR vertices [B, N_max, 3]
+            correspondence: Padded SMPL-X indices [B, N_max] (long)
+            vertex_mask: Valid (non-padding) vertices [B, N_max] (float)
+
+        Returns:
+            Mean L2 distance per sample [B]
+        """
+        index = correspondence.unsqueeze(-1).expand(-1, -1, 3)
+        predicted_selected = torch.gather(predicted_vertices, 1, index)  # [B, N_max, 3]
+
+        distances = torch.norm(predicted_selected - target_vertices, dim=2)  # [B, N_max]
+        return (distances * vertex_mask).sum(dim=1) / vertex_mask.sum(dim=1)
+
+    def _build_loss_function(
+        self,
+        target_vertices: torch.Tensor,
+        correspondence: torch.Tensor,
+        vertex_mask: torch.Tensor
+    ) -> Callable[..., Tuple[torch.Tensor, torch.Tensor]]:
+        """
+        Build the fused SMPL-X forward pass and loss for one padded batch.
+
+        Targets, correspondence indices and mask are bound once, so an
+        optimizer step only runs this function. With `compile_loss` the
+        function is compiled with torch.compile.
+
+        Args:
+            target_vertices: Padded MHR vertices [B, N_max, 3]
+            correspondence: Padded SMPL-X indices [B, N_max] (long)
+            vertex_mask: Valid (non-padding) vertices [B, N_max] (float)
+
+        Returns:
+            Function (betas, body_pose, global_orient) -> (total loss [B],
+            loss terms [B, 3] as vertex, shape and pose terms)
+        """
+        config = self.config
+
+        def loss_function(betas, body_pose, global_orient):
+            predicted_vertices = self.smplx_model(
+                betas=betas,
+                body_pose=body_pose,
+                global_orient=global_orient
+            ).vertices
+
+            vertex_loss = self._compute_batch_vertex_loss(
+                predicted_vertices, target_vertices, correspondence, vertex_mask
+            )
+            shape_reg = self._compute_shape_regularization(
+                betas, config.shape_std, per_sample=True
+            )
+            pose_reg = self._compute_pose_regularization(
+                body_pose, global_orient, config.pose_std, per_sample=True
+            )
+
+            total_loss = (
+                config.vertex_loss_weight * vertex_loss +
+                config.shape_regularization_weight * shape_reg +
+                config.pose_regularization_weight * pose_reg
+            )
+            return total_loss, torch.stack([vertex_loss, shape_reg, pose_reg], dim=1)
+
+        if config.compile_loss:
+            if not hasattr(torch, "compile"):
+                logger.warning("torch.compile is not available; running the loss eagerly")
+            else:
+                return torch.compile(loss_function, backend=config.compile_backend)
+        return loss_function
+
+    def _create_optimizer(self, parameters: List[torch.Tensor]) -> optim.Optimizer:
+        """Create the configured optimizer over the SMPL-X parameters."""
+        if self.config.optimizer == "lbfgs":
+            return optim.LBFGS(
+                parameters,
+                lr=self.config.learning_rate,
+                max_iter=self.config.lbfgs_max_iter,
+                line_search_fn="strong_wolfe"
+            )
+        return optim.Adam(parameters, lr=self.config.learning_rate)
+
     def convert(
         self,
         mhr_vertices: np.ndarray,
@@ -241,7 +528,7 @@ class MHRBridge(nn.Module):
 
         Args:
             mhr_vertices: MHR mesh vertices [N_mhr, 3] in numpy array
-            mhr_faces: MHR mesh faces (optional, for reference)
+            mhr_faces: MHR mesh faces (optional, keys the correspondence cache)
             initial_betas: Initial shape parameters (optional)
             verbose: Print optimization progress
 
@@ -251,146 +538,244 @@ class MHRBridge(nn.Module):
         Raises:
             RuntimeError: If SMPL-X model forward pass fails
         """
-        # Convert to tensors
-        mhr_vertices_tensor = torch.from_numpy(mhr_vertices).float().to(self.device)
+        return self.convert_batch(
+            [mhr_vertices],
+            mhr_faces=None if mhr_faces is None else [mhr_faces],
+            initial_betas=None if initial_betas is None else [initial_betas],
+            verbose=verbose
+        )[0]
+
+    def convert_batch(
+        self,
+        mhr_vertices: Sequence[np.ndarray],
+        mhr_faces: Optional[Sequence[Optional[np.ndarray]]] = None,
+        initial_betas: Optional[Sequence[Optional[np.ndarray]]] = None,
+        verbose: bool = False
+    ) -> List[ConversionResult]:
+        """
+        Convert several MHR meshes to SMPL-X parameters in one joint optimization.
 
-        logger.info(f"Starting MHR-to-SMPL-X conversion with {mhr_vertices.shape[0]} vertices")
+        All meshes share each SMPL-X forward pass and optimizer step, while
+        losses are kept per sample, so every mesh gets the same solution it
+        would get from convert(). Each sample stops independently: once its
+        loss has not improved for `patience` iterations it is masked out of
+        the loss and its parameters are frozen. Meshes may have different
+        vertex counts.
 
-        # Get initial SMPL-X vertices for correspondence
-        with torch.no_grad():
-            try:
-                smplx_output = self.smplx_model(
-                    betas=torch.zeros(1, self.config.max_shape_params, device=self.device),
-                    body_pose=torch.zeros(1, 63, device=self.device),
-                    global_orient=torch.zeros(1, 3, device=self.device)
-                )
-                initial_smplx_vertices = smplx_output.vertices
-            except Exception as e:
-                raise RuntimeError(f"Failed to get initial SMPL-X vertices: {e}")
+        With the L-BFGS optimizer the line search and curvature history are
+        shared by the whole batch, so batched results are close to, but not
+        identical with, single-mesh conversions.
+
+        Args:
+            mhr_vertices: Sequence of B MHR vertex arrays [N_i, 3]
+            mhr_faces: Optional per-mesh face arrays, used to reuse cached
+                correspondences for meshes with the same topology
+            initial_betas: Optional per-mesh initial shape parameters
+                (None entries start from zero)
+            verbose: Print optimization progress
+
+        Returns:
+            List of B ConversionResults, in input order
+
+        Raises:
+            ValueError: If mhr_faces or initial_betas does not match the number of meshes
+            RuntimeError: If SMPL-X model forward pass fails
+        """
+        batch_size = len(mhr_vertices)
+        if batch_size == 0:
+            return []
+        if mhr_faces is not None and len(mhr_faces) != batch_size:
+            raise ValueError(f"Expected {batch_size} mhr_faces entries, got {len(mhr_faces)}")
+        if initial_betas is not None and len(initial_betas) != batch_size:
+            raise ValueError(
+                f"Expected {batch_size} initial_betas entries, got {len(initial_betas)}"
+            )
 
-        # Compute vertex correspondence
-        vertex_matcher = VertexMatcher(mhr_vertices_tensor, initial_smplx_vertices[0])
-        correspondence = vertex_matcher.compute_correspondence()
+        # Convert to tensors
+        vertex_tensors = [
+            torch.from_numpy(np.asarray(v)).float().to(self.device) for v in mhr_vertices
+        ]
+        counts = [v.shape[0] for v in vertex_tensors]
+
+        logger.info(
+            f"Starting MHR-to-SMPL-X conversion of {batch_size} mesh(es) "
+            f"with {min(counts)}-{max(counts)} vertices"
+        )
+
+        # Compute (or look up) vertex correspondence per mesh
+        faces = mhr_faces if mhr_faces is not None else [None] * batch_size
+        correspondences = [
+            self._get_correspondence(v, f) for v, f in zip(vertex_tensors, faces)
+        ]
 
-        logger.info(f"SMPL-X model has {initial_smplx_vertices.shape[1]} vertices")
+        logger.info(f"SMPL-X model has {self._get_template_vertices().shape[0]} vertices")
         logger.info(f"Computed vertex correspondence between meshes")
 
+        # Pad targets and correspondences to a common vertex count
+        max_count = max(counts)
+        targets = torch.zeros(batch_size, max_count, 3, device=self.device)
+        correspondence_tensor = torch.zeros(batch_size, max_count, dtype=torch.long, device=self.device)
+        vertex_mask = torch.zeros(batch_size, max_count, device=self.device)
+        for b, (vertices, correspondence) in enumerate(zip(vertex_tensors, correspondences)):
+            targets[b, :counts[b]] = vertices
+            correspondence_tensor[b, :counts[b]] = torch.tensor(correspondence, device=self.device)
+            vertex_mask[b, :counts[b]] = 1.0
+
         # Create learnable parameters
-        betas, body_pose, global_orient = self._create_learnable_parameters()
+        betas, body_pose, global_orient = self._create_learnable_parameters(batch_size)
 
         # Initialize with provided betas if available
         if initial_betas is not None:
             with torch.no_grad():
-                initial_betas_tensor = torch.from_numpy(initial_betas).float().to(self.device)
-                n_init = min(initial_betas_tensor.shape[0], betas.shape[1])
-                betas[:, :n_init] = initial_betas_tensor[:n_init]
-
-        # Create optimizer
-        optimizer = optim.Adam(
-            [betas, body_pose, global_orient],
-            lr=self.config.learning_rate
-        )
-
-        # Optimization loop
-        best_loss = float('inf')
-        patience_counter = 0
-        losses = []
-
-        for iteration in range(self.config.num_iterations):
-            optimizer.zero_grad()
-
+                for b, init in enumerate(initial_betas):
+                    if init is None:
+                        continue
+                    initial_betas_tensor = torch.from_numpy(np.asarray(init)).float().to(self.device)
+                    n_init = min(initial_betas_tensor.shape[0], betas.shape[1])
+                    betas[b, :n_init] = initial_betas_tensor[:n_init]
+
+        loss_function = self._build_loss_function(targets, correspondence_tensor, vertex_mask)
+        optimizer = self._create_optimizer([betas, body_pose, global_orient])
+        use_lbfgs = self.config.optimizer == "lbfgs"
+
+        def evaluate(iteration: int) -> Tuple[torch.Tensor, torch.Tensor]:
             try:
-                # Forward pass through SMPL-X
-                smplx_output = self.smplx_model(
-                    betas=betas,
-                    body_pose=body_pose,
-                    global_orient=global_orient
-                )
-                predicted_vertices = smplx_output.vertices
+                return loss_function(betas, body_pose, global_orient)
             except Exception as e:
                 logger.error(f"SMPL-X forward pass failed at iteration {iteration}: {e}")
                 raise RuntimeError(f"SMPL-X model forward pass failed: {e}")
 
-            # Compute losses
-            vertex_loss = self._compute_vertex_loss(
-                predicted_vertices,
-                mhr_vertices_tensor,
-                correspondence
-            )
-
-            shape_reg = self._compute_shape_regularization(
-                betas,
-                self.config.shape_std
-            )
-
-            pose_reg = self._compute_pose_regularization(
-                body_pose,
-                global_orient,
-                self.config.pose_std
-            )
+        # Per-sample convergence tracking, kept on the device so iterations
+        # only synchronize with the host every convergence_check_interval steps
+        active = torch.ones(batch_size, dtype=torch.bool, device=self.device)
+        best_loss = torch.full((batch_size,), float('inf'), device=self.device)
+        patience_counter = torch.zeros(batch_size, dtype=torch.long, device=self.device)
+        final_betas = betas.detach().clone()
+        final_body_pose = body_pose.detach().clone()
+        final_global_orient = global_orient.detach().clone()
+        final_losses = torch.zeros(batch_size, 3, device=self.device)
+        final_iterations = torch.zeros(batch_size, dtype=torch.long, device=self.device)
+
+        last_iteration = self.config.num_iterations - 1
+        check_interval = self.config.convergence_check_interval
+        iterations_run = 0
+        start_time = time.perf_counter()
 
-            # Total loss with weights
-            total_loss = (
-                self.config.vertex_loss_weight * vertex_loss +
-                self.config.shape_regularization_weight * shape_reg +
-                self.config.pose_regularization_weight * pose_reg
-            )
-
-            # Backward pass
-            total_loss.backward()
-            optimizer.step()
-
-            # Track loss
-            current_loss = total_loss.item()
-            losses.append(current_loss)
-
-            # Check for convergence
-            if current_loss < best_loss - self.config.convergence_threshold:
-                best_loss = current_loss
-                patience_counter = 0
+        for iteration in range(self.config.num_iterations):
+            if use_lbfgs:
+                # L-BFGS re-evaluates the loss during its line search; track
+                # the evaluation at the start of the step, as for Adam
+                evaluations = []
+
+                def closure():
+                    optimizer.zero_grad()
+                    total, terms = evaluate(iteration)
+                    if not evaluations:
+                        evaluations.append((total.detach(), terms.detach()))
+                    masked_loss = (total * active).sum()
+                    masked_loss.backward()
+                    return masked_loss
+
+                optimizer.step(closure)
+                total_loss, loss_terms = evaluations[0]
             else:
-                patience_counter += 1
+                optimizer.zero_grad()
+                total_loss, loss_terms = evaluate(iteration)
+                # Stopped samples contribute no gradient
+                (total_loss * active).sum().backward()
+                optimizer.step()
+                total_loss, loss_terms = total_loss.detach(), loss_terms.detach()
+            iterations_run += 1
 
-            # Early stopping
-            if patience_counter >= self.config.patience:
-                logger.info(f"Early stopping at iteration {iteration}")
-                break
+            with torch.no_grad():
+                # The optimizer keeps moving stopped samples (momentum, shared
+                # L-BFGS history), so pin them to their final values
+                frozen = ~active
+                betas.copy_(torch.where(frozen[:, None], final_betas, betas))
+                body_pose.copy_(torch.where(frozen[:, None], final_body_pose, body_pose))
+                global_orient.copy_(torch.where(frozen[:, None], final_global_orient, global_orient))
+
+                # Check for convergence
+                improved = total_loss < best_loss - self.config.convergence_threshold
+                best_loss = torch.where(improved & active, total_loss, best_loss)
+                patience_counter = torch.where(
+                    improved, torch.zeros_like(patience_counter), patience_counter + 1
+                )
+
+                # Early stopping
+                if iteration == last_iteration:
+                    stopping = active
+                else:
+                    stopping = active & (patience_counter >= self.config.patience)
+                final_betas = torch.where(stopping[:, None], betas, final_betas)
+                final_body_pose = torch.where(stopping[:, None], body_pose, final_body_pose)
+                final_global_orient = torch.where(
+                    stopping[:, None], global_orient, final_global_orient
+                )
+                final_losses = torch.where(stopping[:, None], loss_terms, final_losses)
+                final_iterations = torch.where(
+                    stopping, torch.full_like(final_iterations, iteration + 1), final_iterations
+                )
+                still_active = active
+                active = active & ~stopping
 
             if verbose and (iteration + 1) % 50 == 0:
+                mask = still_active.cpu().numpy()
+                current_loss = total_loss.cpu().numpy()
+                terms = loss_terms.cpu().numpy()
                 logger.info(
-                    f"Iteration {iteration + 1}: "
-                    f"Total Loss={current_loss:.6f}, "
-                    f"Vertex Loss={vertex_loss.item():.6f}, "
-                    f"Shape Reg={shape_reg.item():.6f}, "
-                    f"Pose Reg={pose_reg.item():.6f}"
+                    f"Iteration {iteration + 1} ({int(mask.sum())} active): "
+                    f"Total Loss={current_loss[mask].mean():.6f}, "
+                    f"Vertex Loss={terms[mask, 0].mean():.6f}, "
+                    f"Shape Reg={terms[mask, 1].mean():.6f}, "
+                    f"Pose Reg={terms[mask, 2].mean():.6f}"
                 )
 
+            if (iteration + 1) % check_interval == 0 and not bool(active.any()):
+                break
+
+        elapsed = time.perf_counter() - start_time
+        iterations_per_second = iterations_run / elapsed if elapsed > 0 else 0.0
+
         # Final forward pass with optimized parameters
         with torch.no_grad():
             final_output = self.smplx_model(
-                betas=betas,
-                body_pose=body_pose,
-                global_orient=global_orient
+                betas=final_betas,
+                body_pose=final_body_pose,
+                global_orient=final_global_orient
             )
-            reconstructed_vertices = final_output.vertices[0]
-
-        logger.info(f"Optimization complete. Final loss: {best_loss:.6f}")
-
-        # Prepare result
-        result = ConversionResult(
-            betas=betas.detach(),
-            body_pose=body_pose.detach(),
-            global_orient=global_orient.detach(),
-            reconstruction_loss=float(vertex_loss.item()),
-            shape_reg_loss=float(shape_reg.item()),
-            pose_reg_loss=float(pose_reg.item()),
-            total_loss=float(best_loss),
-            original_vertices=mhr_vertices_tensor,
-            reconstructed_vertices=reconstructed_vertices,
-            vertex_correspondence=correspondence
+            reconstructed_vertices = final_output.vertices
+
+        best_loss = best_loss.cpu().numpy()
+        final_losses = final_losses.cpu().numpy()
+        final_iterations = final_iterations.cpu().numpy()
+        for b in np.flatnonzero(final_iterations < self.config.num_iterations):
+            logger.info(f"Early stopping sample {b} at iteration {final_iterations[b] - 1}")
+        logger.info(
+            f"Optimization complete after {iterations_run} iterations "
+            f"({iterations_per_second:.1f} it/s). Final losses: {best_loss}"
         )
 
-        return result
+        # Prepare results
+        results = []
+        for b in range(batch_size):
+            reconstruction_loss, shape_reg_loss, pose_reg_loss = (float(x) for x in final_losses[b])
+            results.append(ConversionResult(
+                betas=final_betas[b:b + 1].clone(),
+                body_pose=final_body_pose[b:b + 1].clone(),
+                global_orient=final_global_orient[b:b + 1].clone(),
+                reconstruction_loss=reconstruction_loss,
+                shape_reg_loss=shape_reg_loss,
+                pose_reg_loss=pose_reg_loss,
+                total_loss=float(best_loss[b]),
+                original_vertices=vertex_tensors[b],
+                reconstructed_vertices=reconstructed_vertices[b].clone(),
+                vertex_correspondence=correspondences[b],
+                iterations=int(final_iterations[b]),
+                iterations_per_second=iterations_per_second
+            ))
+
+        return results
 
     def save_result(self, result: ConversionResult, path: str) -> None:
         """
@@ -398,9 +783,15 @@ class MHRBridge(nn.Module):
 
         Args:
             result: ConversionResult to save
-            path: Output file path (supports .pt, .npz, .json)
+            path: Output path. .pt and .npz write a single-result file; a path
+                ending in RESULT_STORE_SUFFIX (.results) appends the result
+                to a ConversionResultStore directory.
         """
-        if path.endswith('.pt'):
+        if path.endswith(RESULT_STORE_SUFFIX):
+            ConversionResultStore(path).append([result])
+            logger.info(f"Appended result to {path}")
+
+        elif path.endswith('.pt'):
             torch.save({
                 'betas': result.betas.cpu(),
                 'body_pose': result.body_pose.cpu(),
@@ -410,36 +801,34 @@ class MHRBridge(nn.Module):
                     'shape_reg_loss': result.shape_reg_loss,
                     'pose_reg_loss': result.pose_reg_loss,
                     'total_loss': result.total_loss,
+                    'iterations': result.iterations,
+                    'iterations_per_second': result.iterations_per_second,
                 }
             }, path)
             logger.info(f"Saved result to {path}")
 
         elif path.endswith('.npz'):
-            np.savez(
-                path,
-                betas=result.betas.cpu().numpy(),
-                body_pose=result.body_pose.cpu().numpy(),
-                global_orient=result.global_orient.cpu().numpy(),
-                original_vertices=result.original_vertices.cpu().numpy(),
-                reconstructed_vertices=result.reconstructed_vertices.cpu().numpy(),
-                correspondence=result.vertex_correspondence
-            )
+            np.savez(path, **result_to_arrays(result))
             logger.info(f"Saved result to {path}")
 
         else:
             raise ValueError(f"Unsupported file format: {path}")
 
-    def load_result(self, path: str) -> ConversionResult:
+    def load_result(self, path: str, index: int = -1) -> ConversionResult:
         """
         Load conversion result from file.
 
         Args:
-            path: Input file path
+            path: Input file path (.pt, .npz or a .results store)
+            index: Result to read from a store (default: the last appended)
 
         Returns:
             ConversionResult loaded from file
         """
-        if path.endswith('.pt'):
+        if path.endswith(RESULT_STORE_SUFFIX):
+            return ConversionResultStore(path).read(index, device=self.device)
+
+        elif path.endswith('.pt'):
             data = torch.load(path, map_location=self.device)
             return ConversionResult(
                 betas=data['betas'].to(self.device),
@@ -451,22 +840,13 @@ class MHRBridge(nn.Module):
                 total_loss=data['metrics']['total_loss'],
                 original_vertices=torch.zeros(1, 3),  # Placeholder
                 reconstructed_vertices=torch.zeros(1, 3),  # Placeholder
+                iterations=data['metrics'].get('iterations', 0),
+                iterations_per_second=data['metrics'].get('iterations_per_second', 0.0),
             )
 
         elif path.endswith('.npz'):
-            data = np.load(path)
-            return ConversionResult(
-                betas=torch.from_numpy(data['betas']).to(self.device),
-                body_pose=torch.from_numpy(data['body_pose']).to(self.device),
-                global_orient=torch.from_numpy(data['global_orient']).to(self.device),
-                reconstruction_loss=float(data.get('reconstruction_loss', 0.0)),
-                shape_reg_loss=float(data.get('shape_reg_loss', 0.0)),
-                pose_reg_loss=float(data.get('pose_reg_loss', 0.0)),
-                total_loss=float(data.get('total_loss', 0.0)),
-                original_vertices=torch.from_numpy(data['original_vertices']).to(self.device),
-                reconstructed_vertices=torch.from_numpy(data['reconstructed_vertices']).to(self.device),
-                vertex_correspondence=data.get('correspondence')
-            )
+            with np.load(path) as data:
+                return arrays_to_result(data, device=self.device)
 
         else:
             raise ValueError(f"Unsupported file format: {path}")
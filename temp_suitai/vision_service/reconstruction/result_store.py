@@ -0,0 +1,407 @@
+"""
+Columnar, memory-mapped store of MHR-to-SMPL-X conversion results.
+
+A store is a directory holding many ConversionResults. Every field is kept
+as its own .npy array so columns can be memory-mapped and read
+independently: loading betas and poses for thousands of scans never touches
+the vertex data.
+
+Layout::
+
+    scans.results/
+        segment_00000000/
+            betas.npy                          [R, S]
+            body_pose.npy                      [R, 63]
+            global_orient.npy                  [R, 3]
+            reconstruction_loss.npy ...        [R] (one file per metric)
+            original_vertices.npy              [sum N_i, 3]
+            original_vertices_offsets.npy      [R + 1]
+            ...
+        segment_00000001/
+            ...
+
+Variable-length fields (vertices, correspondence) are concatenated per
+segment with CSR-style offsets. Each append writes one new segment into a
+temporary directory and renames it into place, so appends are atomic and
+concurrent writers never see each other's partial data. Segments are
+immutable; compact() merges them when many small appends accumulate.
+"""
+
+from typing import Dict, List, Sequence, Union
+import logging
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_SUFFIX = ".results"
+"""Path suffix MHRBridge.save_result()/load_result() treat as a result store."""
+
+PARAMETER_FIELDS = ("betas", "body_pose", "global_orient")
+"""Fixed-size SMPL-X parameter columns, one row per result."""
+
+METRIC_FIELDS = {
+    "reconstruction_loss": np.float64,
+    "shape_reg_loss": np.float64,
+    "pose_reg_loss": np.float64,
+    "total_loss": np.float64,
+    "iterations": np.int64,
+    "iterations_per_second": np.float64,
+}
+"""Scalar metric columns and their dtypes."""
+
+VERTEX_FIELDS = ("original_vertices", "reconstructed_vertices", "vertex_correspondence")
+"""Variable-length columns, stored concatenated with offsets."""
+
+_SEGMENT_PATTERN = re.compile(r"^segment_(\d{8})$")
+
+
+def result_to_arrays(result) -> Dict[str, np.ndarray]:
+    """
+    Flatten a ConversionResult into named NumPy arrays.
+
+    Args:
+        result: ConversionResult to flatten.
+
+    Returns:
+        Mapping of field name to array. Parameters keep their [1, D] shape,
+        metrics are 0-d arrays, and a missing correspondence is an empty
+        array with `has_correspondence` False.
+    """
+    arrays = {
+        name: getattr(result, name).detach().cpu().numpy().astype(np.float32)
+        for name in PARAMETER_FIELDS
+    }
+    for name, dtype in METRIC_FIELDS.items():
+        arrays[name] = np.asarray(getattr(result, name), dtype=dtype)
+
+    arrays["original_vertices"] = result.original_vertices.detach().cpu().numpy().astype(np.float32)
+    arrays["reconstructed_vertices"] = (
+        result.reconstructed_vertices.detach().cpu().numpy().astype(np.float32)
+    )
+    has_correspondence = result.vertex_correspondence is not None
+    arrays["vertex_correspondence"] = (
+        np.asarray(result.vertex_correspondence, dtype=np.int64)
+        if has_correspondence else np.zeros(0, dtype=np.int64)
+    )
+    arrays["has_correspondence"] = np.asarray(has_correspondence)
+    return arrays
+
+
+def arrays_to_result(arrays, device: Union[str, torch.device] = 'cpu'):
+    """
+    Rebuild a ConversionResult from result_to_arrays() output.
+
+    Missing metric fields default to zero and missing vertex fields to
+    empty placeholders, so files written before metrics were stored still
+    load.
+
+    Args:
+        arrays: Mapping (or NpzFile) of field name to array.
+        device: Device for the returned tensors.
+
+    Returns:
+        ConversionResult
+    """
+    # Imported here: mhr_bridge imports this module for save/load
+    from vision_service.reconstruction.mhr_bridge import ConversionResult
+
+    def tensor(name: str, shape=(0, 3)) -> torch.Tensor:
+        if name not in arrays:
+            return torch.zeros(shape, device=device)
+        return torch.from_numpy(np.array(arrays[name], dtype=np.float32)).to(device)
+
+    metrics = {
+        name: (int if dtype is np.int64 else float)(arrays[name]) if name in arrays else 0
+        for name, dtype in METRIC_FIELDS.items()
+    }
+
+    correspondence = None
+    if "correspondence" in arrays:
+        # Layout of .npz files written by earlier versions; a missing
+        # correspondence was saved as a pickled None, which is not loaded
+        try:
+            correspondence = np.asarray(arrays["correspondence"], dtype=np.int64)
+        except (ValueError, TypeError):
+            correspondence = None
+    elif "vertex_correspondence" in arrays and bool(arrays.get("has_correspondence", True)):
+        correspondence = np.array(arrays["vertex_correspondence"], dtype=np.int64)
+
+    return ConversionResult(
+        betas=tensor("betas"),
+        body_pose=tensor("body_pose"),
+        global_orient=tensor("global_orient"),
+        reconstruction_loss=float(metrics["reconstruction_loss"]),
+        shape_reg_loss=float(metrics["shape_reg_loss"]),
+        pose_reg_loss=float(metrics["pose_reg_loss"]),
+        total_loss=float(metrics["total_loss"]),
+        original_vertices=tensor("original_vertices"),
+        reconstructed_vertices=tensor("reconstructed_vertices"),
+        vertex_correspondence=correspondence,
+        iterations=int(metrics["iterations"]),
+        iterations_per_second=float(metrics["iterations_per_second"]),
+    )
+
+
+class ConversionResultStore:
+    """
+    Directory of conversion results with memory-mapped, per-field columns.
+
+    Example:
+        >>> store = ConversionResultStore("scans.results")
+        >>> store.append(bridge.convert_batch(meshes))
+        >>> betas = store.column("betas")            # [R, 300], no vertex I/O
+        >>> result = store.read(0)                    # full result, vertices included
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) a store.
+
+        Args:
+            directory: Store directory (created if missing).
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # Segments are immutable, so opened columns can be memoized
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, results: Sequence) -> int:
+        """
+        Atomically append results as one new segment.
+
+        Args:
+            results: ConversionResults to store.
+
+        Returns:
+            Number of results in the store after the append (as seen by
+            this process).
+
+        Raises:
+            ValueError: If parameter widths differ from the stored results
+        """
+        if len(results) == 0:
+            return len(self)
+        records = [result_to_arrays(result) for result in results]
+        self._write_segment(self._stack(records))
+        return len(self)
+
+    def compact(self) -> None:
+        """
+        Merge all segments into one.
+
+        Readers in other processes may briefly see both the merged and the
+        original segments, so only compact while no other process uses the
+        store.
+        """
+        segments = self._segment_names()
+        if len(segments) <= 1:
+            return
+
+        columns = {}
+        for name in PARAMETER_FIELDS + tuple(METRIC_FIELDS) + ("has_correspondence",):
+            columns[name] = self.column(name)
+        for name in VERTEX_FIELDS:
+            data, offsets = self._concatenate_ragged(name, segments)
+            columns[name] = data
+            columns[f"{name}_offsets"] = offsets
+        self._write_segment(columns)
+
+        for segment in segments:
+            shutil.rmtree(os.path.join(self.directory, segment), ignore_errors=True)
+            self._columns.pop(segment, None)
+        logger.info(f"Compacted {len(segments)} segments in {self.directory}")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return sum(self._segment_length(segment) for segment in self._segment_names())
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Read one fixed-size column for all results.
+
+        With a single segment the memory-mapped array is returned without
+        copying; otherwise the segments are concatenated.
+
+        Args:
+            name: A PARAMETER_FIELDS or METRIC_FIELDS name, or
+                "has_correspondence".
+
+        Returns:
+            Array with one row per result, in append order.
+
+        Raises:
+            KeyError: If name is not a fixed-size column
+        """
+        if name not in PARAMETER_FIELDS and name not in METRIC_FIELDS and name != "has_correspondence":
+            raise KeyError(f"Unknown fixed-size column '{name}'")
+
+        parts = [self._open(segment, name) for segment in self._segment_names()]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            dtype = METRIC_FIELDS.get(name, bool if name == "has_correspondence" else np.float32)
+            return np.zeros(0, dtype=dtype)
+        return np.concatenate(parts)
+
+    def vertices(self, name: str, index: int) -> np.ndarray:
+        """
+        Read one variable-length field of one result (memory-mapped view).
+
+        Args:
+            name: One of VERTEX_FIELDS.
+            index: Result index (negative indices count from the end).
+
+        Returns:
+            Read-only view of the stored rows.
+        """
+        if name not in VERTEX_FIELDS:
+            raise KeyError(f"Unknown vertex column '{name}'")
+        segment, row = self._locate(index)
+        offsets = self._open(segment, f"{name}_offsets")
+        return self._open(segment, name)[offsets[row]:offsets[row + 1]]
+
+    def read(
+        self,
+        index: int,
+        load_vertices: bool = True,
+        device: Union[str, torch.device] = 'cpu'
+    ):
+        """
+        Read one result.
+
+        Args:
+            index: Result index (negative indices count from the end).
+            load_vertices: Also read vertices and correspondence; if False
+                they are empty placeholders and the vertex files are not
+                touched.
+            device: Device for the returned tensors.
+
+        Returns:
+            ConversionResult
+        """
+        segment, row = self._locate(index)
+        arrays = {}
+        for name in PARAMETER_FIELDS + tuple(METRIC_FIELDS) + ("has_correspondence",):
+            arrays[name] = self._open(segment, name)[row]
+        for name in PARAMETER_FIELDS:
+            arrays[name] = arrays[name][None]
+
+        if load_vertices:
+            for name in VERTEX_FIELDS:
+                offsets = self._open(segment, f"{name}_offsets")
+                arrays[name] = self._open(segment, name)[offsets[row]:offsets[row + 1]]
+        else:
+            arrays["has_correspondence"] = False
+        return arrays_to_result(arrays, device=device)
+
+    def read_all(self, load_vertices: bool = False, device: Union[str, torch.device] = 'cpu') -> List:
+        """Read every result (without vertices by default)."""
+        return [self.read(i, load_vertices, device) for i in range(len(self))]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _segment_names(self) -> List[str]:
+        """Committed segments, in append order."""
+        return sorted(
+            name for name in os.listdir(self.directory) if _SEGMENT_PATTERN.match(name)
+        )
+
+    def _open(self, segment: str, name: str) -> np.ndarray:
+        """Memory-map one column file of a segment."""
+        columns = self._columns.setdefault(segment, {})
+        if name not in columns:
+            columns[name] = np.load(
+                os.path.join(self.directory, segment, f"{name}.npy"), mmap_mode='r'
+            )
+        return columns[name]
+
+    def _segment_length(self, segment: str) -> int:
+        return self._open(segment, "total_loss").shape[0]
+
+    def _locate(self, index: int):
+        """Map a global result index to (segment, row)."""
+        segments = self._segment_names()
+        lengths = [self._segment_length(segment) for segment in segments]
+        total = sum(lengths)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError(f"Result index out of range for store of {total} results")
+        for segment, length in zip(segments, lengths):
+            if index < length:
+                return segment, index
+            index -= length
+
+    def _concatenate_ragged(self, name: str, segments: Sequence[str]):
+        """Concatenate a variable-length column and its offsets across segments."""
+        data, offsets, base = [], [np.zeros(1, dtype=np.int64)], 0
+        for segment in segments:
+            segment_offsets = self._open(segment, f"{name}_offsets")
+            data.append(self._open(segment, name))
+            offsets.append(segment_offsets[1:] + base)
+            base += int(segment_offsets[-1])
+        return np.concatenate(data), np.concatenate(offsets)
+
+    def _stack(self, records: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Turn per-result arrays into segment columns."""
+        columns = {}
+        existing = self._segment_names()
+        for name in PARAMETER_FIELDS:
+            rows = [record[name].reshape(-1) for record in records]
+            widths = {row.shape[0] for row in rows}
+            if existing:
+                widths.add(self._open(existing[0], name).shape[1])
+            if len(widths) > 1:
+                raise ValueError(f"All results in a store need the same {name} width, got {sorted(widths)}")
+            columns[name] = np.stack(rows)
+        for name, dtype in METRIC_FIELDS.items():
+            columns[name] = np.array([record[name] for record in records], dtype=dtype)
+        columns["has_correspondence"] = np.array(
+            [bool(record["has_correspondence"]) for record in records]
+        )
+        for name in VERTEX_FIELDS:
+            parts = [record[name] for record in records]
+            columns[name] = np.concatenate(parts)
+            columns[f"{name}_offsets"] = np.concatenate(
+                [[0], np.cumsum([part.shape[0] for part in parts])]
+            ).astype(np.int64)
+        return columns
+
+    def _write_segment(self, columns: Dict[str, np.ndarray]) -> str:
+        """Write columns to a temporary directory and rename it into place."""
+        tmp_dir = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-segment-")
+        try:
+            for name, array in columns.items():
+                with open(os.path.join(tmp_dir, f"{name}.npy"), "wb") as f:
+                    np.save(f, np.ascontiguousarray(array))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            while True:
+                existing = self._segment_names()
+                number = int(_SEGMENT_PATTERN.match(existing[-1]).group(1)) + 1 if existing else 0
+                segment = f"segment_{number:08d}"
+                try:
+                    # Fails if another writer claimed this number first
+                    os.rename(tmp_dir, os.path.join(self.directory, segment))
+                    return segment
+                except OSError:
+                    if not os.path.exists(os.path.join(self.directory, segment)):
+                        raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
@@ -21,6 +21,7 @@ from body4d import (
     create_mock_shape_parameters,
     create_mock_mhr_mesh,
 )
+from vision_service.timing import to_seconds
 
 
 # ============================================================================
@@ -187,6 +188,15 @@ class TestShapeParameters:
         assert "torso_ratio" in d
         assert "timestamp" in d
 
+    def test_timestamp_serialized_as_iso(self):
+        """Test that monotonic timestamps are converted only in to_dict()."""
+        capture_time = datetime(2024, 1, 1, 12, 0, 0)
+        mesh = create_mock_mhr_mesh()
+        mesh.timestamp = to_seconds(capture_time)
+
+        assert isinstance(create_mock_shape_parameters().timestamp, float)
+        assert mesh.to_dict()["timestamp"] == capture_time.isoformat()
+
     def test_averaged_shape_parameters_single_mesh(self, body4d, mock_mesh):
         """Test averaging with single mesh."""
         body4d.add_mesh(mock_mesh)
@@ -0,0 +1,84 @@
+"""
+Tests for the persistent MHR <-> SMPL-X correspondence cache.
+"""
+
+import os
+import numpy as np
+import pytest
+from vision_service.reconstruction.correspondence_cache import (
+    CorrespondenceCache,
+    topology_fingerprint,
+)
+
+
+@pytest.fixture
+def faces():
+    """Create a small face array."""
+    return np.array([[0, 1, 2], [1, 2, 3], [2, 3, 4]])
+
+
+class TestTopologyFingerprint:
+    """Test fingerprint stability and sensitivity."""
+
+    def test_stable(self, faces):
+        """Test identical inputs give identical fingerprints."""
+        assert topology_fingerprint(5, faces) == topology_fingerprint(5, faces.astype(np.int32))
+
+    def test_sensitive_to_inputs(self, faces):
+        """Test vertex count, faces and template all change the key."""
+        base = topology_fingerprint(5, faces)
+        assert topology_fingerprint(6, faces) != base
+        assert topology_fingerprint(5, faces[::-1]) != base
+        assert topology_fingerprint(5, faces, np.zeros((10, 3))) != base
+        assert topology_fingerprint(5, faces, np.zeros((10, 3))) != topology_fingerprint(5, faces, np.ones((10, 3)))
+
+
+class TestCorrespondenceCache:
+    """Test CorrespondenceCache storage."""
+
+    def test_miss_then_hit(self, tmp_path, faces):
+        """Test entries round-trip through disk as memory-mapped arrays."""
+        cache = CorrespondenceCache(str(tmp_path))
+        key = topology_fingerprint(5, faces)
+
+        assert cache.get(key) is None
+        stored = cache.put(key, np.array([4, 3, 2, 1, 0]))
+
+        assert isinstance(stored, np.memmap)
+        assert not stored.flags.writeable
+        np.testing.assert_array_equal(cache.get(key), [4, 3, 2, 1, 0])
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_shared_between_instances(self, tmp_path, faces):
+        """Test a second cache on the same directory (another process) sees entries."""
+        key = topology_fingerprint(5, faces)
+        CorrespondenceCache(str(tmp_path)).put(key, np.arange(5))
+
+        other = CorrespondenceCache(str(tmp_path))
+        entry = other.get(key)
+        assert entry.dtype == np.int64
+        np.testing.assert_array_equal(entry, np.arange(5))
+
+    def test_no_temporary_files_left(self, tmp_path):
+        """Test atomic writes leave only the final entry."""
+        cache = CorrespondenceCache(str(tmp_path))
+        cache.put("abc", np.arange(3))
+
+        assert os.listdir(tmp_path) == ["correspondence_abc.npy"]
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test unreadable files are ignored."""
+        cache = CorrespondenceCache(str(tmp_path))
+        with open(cache.path_for("bad"), "wb") as f:
+            f.write(b"not an npy file")
+
+        assert cache.get("bad") is None
+
+    def test_clear(self, tmp_path):
+        """Test clear removes entries."""
+        cache = CorrespondenceCache(str(tmp_path))
+        cache.put("abc", np.arange(3))
+        cache.clear()
+
+        assert cache.get("abc") is None
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,127 @@
+"""
+Tests for the HMR micro-batching scheduler.
+
+Tests verify:
+- Futures resolve with per-frame results
+- Batches are formed up to max_batch_size
+- The deadline flushes partial batches
+- Errors propagate to every future of a failed batch
+"""
+
+import threading
+import numpy as np
+import pytest
+from vision_service.reconstruction.hmr_batching import HMRBatchScheduler, MicroBatchConfig
+from vision_service.reconstruction.hmr_pose import HMRPoseEstimator, HMRPoseResult
+
+
+@pytest.fixture
+def image():
+    """Create a small RGB image."""
+    return np.random.randint(0, 256, (96, 64, 3), dtype=np.uint8)
+
+
+class TestMicroBatchConfig:
+    """Test configuration validation."""
+
+    def test_defaults(self):
+        """Test default configuration values."""
+        config = MicroBatchConfig()
+        assert config.max_batch_size == 16
+        assert config.max_delay_ms == 5.0
+
+    def test_invalid_values(self):
+        """Test that invalid values raise error."""
+        with pytest.raises(ValueError):
+            MicroBatchConfig(max_batch_size=0)
+        with pytest.raises(ValueError):
+            MicroBatchConfig(max_delay_ms=-1.0)
+        with pytest.raises(ValueError):
+            MicroBatchConfig(max_queue_size=0)
+
+
+class TestHMRBatchScheduler:
+    """Test HMRBatchScheduler behaviour in mock mode."""
+
+    def test_submit_requires_start(self, image):
+        """Test that submitting before start raises error."""
+        scheduler = HMRBatchScheduler(HMRPoseEstimator())
+        with pytest.raises(RuntimeError):
+            scheduler.submit(image)
+
+    def test_single_frame(self, image):
+        """Test a lone frame is flushed by the deadline."""
+        with HMRBatchScheduler(HMRPoseEstimator(), MicroBatchConfig(max_delay_ms=1.0)) as scheduler:
+            result = scheduler.estimate_pose(image, session_id="a", timeout=5.0)
+
+        assert isinstance(result, HMRPoseResult)
+        assert result.pose_params.pose_theta.shape == (72,)
+        assert scheduler.batches_processed == 1
+
+    def test_frames_are_batched(self, image):
+        """Test frames submitted together share inference calls."""
+        estimator = HMRPoseEstimator()
+        batch_sizes = []
+        original = estimator.estimate_pose_batch
+
+        def recording(images):
+            batch_sizes.append(len(images))
+            return original(images)
+
+        estimator.estimate_pose_batch = recording
+        config = MicroBatchConfig(max_batch_size=4, max_delay_ms=200.0)
+
+        with HMRBatchScheduler(estimator, config) as scheduler:
+            futures = [scheduler.submit(image, session_id=i) for i in range(8)]
+            results = [f.result(timeout=5.0) for f in futures]
+
+        assert batch_sizes == [4, 4]
+        assert [r.pose_params.frame_id for r in results] == list(range(8))
+        assert scheduler.average_batch_size == 4.0
+        assert scheduler.get_statistics()["queue_latency"]["count"] == 8
+
+    def test_concurrent_sessions(self, image):
+        """Test frames from many threads all resolve."""
+        results = {}
+
+        with HMRBatchScheduler(HMRPoseEstimator(), MicroBatchConfig(max_batch_size=8)) as scheduler:
+            def session(sid):
+                results[sid] = [scheduler.estimate_pose(image, sid, timeout=5.0) for _ in range(5)]
+
+            threads = [threading.Thread(target=session, args=(i,)) for i in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(10.0)
+
+        assert all(len(r) == 5 for r in results.values())
+        assert len(results) == 6
+        assert scheduler.frames_processed == 30
+        frame_ids = sorted(r.pose_params.frame_id for rs in results.values() for r in rs)
+        assert frame_ids == list(range(30))
+
+    def test_batch_errors_propagate(self, image):
+        """Test every future of a failed batch raises the error."""
+        estimator = HMRPoseEstimator()
+
+        def failing(images):
+            raise RuntimeError("inference failed")
+
+        estimator.estimate_pose_batch = failing
+        with HMRBatchScheduler(estimator, MicroBatchConfig(max_delay_ms=50.0)) as scheduler:
+            futures = [scheduler.submit(image) for _ in range(3)]
+            for future in futures:
+                with pytest.raises(RuntimeError, match="inference failed"):
+                    future.result(timeout=5.0)
+
+        assert scheduler.batches_processed == 0
+
+    def test_stop_flushes_pending(self, image):
+        """Test stop() runs frames submitted before it."""
+        scheduler = HMRBatchScheduler(HMRPoseEstimator(), MicroBatchConfig(max_delay_ms=1000.0))
+        scheduler.start()
+        futures = [scheduler.submit(image) for _ in range(3)]
+        scheduler.stop()
+
+        assert not scheduler.is_running
+        assert all(f.done() for f in futures)
@@ -19,10 +19,15 @@ from .hmr_pose import (
     HMRPoseResult,
     HMRPoseEstimator,
     preprocess_image,
+    preprocess_images,
     postprocess_coordinates,
     axis_angle_to_rotation_matrix,
     rotation_matrix_to_axis_angle,
     batch_axis_angle_to_rotation_matrices,
+    axis_angles_to_rotation_matrices,
+    rotation_matrices_to_axis_angles,
+    axis_angles_to_rotation_matrices_torch,
+    rotation_matrices_to_axis_angles_torch,
     create_mock_pose_parameters,
     create_mock_hmr_pose_estimator,
 )
@@ -200,6 +205,26 @@ class TestImagePreprocessing:
             preprocessed, scales = preprocess_image(image, target_size=target_size)
             assert preprocessed.shape == (target_size, target_size, 3)
 
+    def test_preprocess_batch_matches_single(self, sample_image_rgb, sample_image_gray):
+        """Test batch preprocessing of mixed images matches per-image results."""
+        small = np.random.randint(0, 256, (120, 90, 3), dtype=np.uint8)
+        images = [sample_image_rgb, sample_image_gray, small]
+
+        batch, scales = preprocess_images(images, target_size=224)
+
+        assert batch.shape == (3, 224, 224, 3)
+        assert batch.dtype == np.float32
+        for i, image in enumerate(images):
+            expected, expected_scales = preprocess_image(image, target_size=224)
+            np.testing.assert_allclose(batch[i], expected)
+            assert scales[i] == expected_scales
+
+    def test_preprocess_empty_batch(self):
+        """Test batch preprocessing of no images."""
+        batch, scales = preprocess_images([], target_size=64)
+        assert batch.shape == (0, 64, 64, 3)
+        assert scales == []
+
 
 # ============================================================================
 # Tests: Postprocessing Coordinates
@@ -320,6 +345,124 @@ class TestRotationConversions:
             rotation_matrix_to_axis_angle(np.eye(4))
 
 
+class TestVectorizedRotationConversions:
+    """Tests for the vectorized (..., 3) <-> (..., 3, 3) conversions."""
+
+    @staticmethod
+    def _random_axis_angles(shape, max_angle=np.pi - 0.01, seed=0):
+        rng = np.random.default_rng(seed)
+        axes = rng.normal(size=shape + (3,))
+        axes /= np.linalg.norm(axes, axis=-1, keepdims=True)
+        angles = rng.uniform(0.0, max_angle, size=shape)
+        return axes * angles[..., None]
+
+    def test_matches_cv2_rodrigues(self):
+        """Test matrices agree with OpenCV's Rodrigues."""
+        axis_angles = self._random_axis_angles((50,))
+        matrices = axis_angles_to_rotation_matrices(axis_angles)
+
+        for v, R in zip(axis_angles, matrices):
+            expected, _ = cv2.Rodrigues(v)
+            np.testing.assert_allclose(R, expected, atol=1e-10)
+
+    def test_arbitrary_leading_dimensions(self):
+        """Test (T, 24, 3) poses convert in one call and round-trip."""
+        axis_angles = self._random_axis_angles((7, 24))
+        matrices = axis_angles_to_rotation_matrices(axis_angles)
+
+        assert matrices.shape == (7, 24, 3, 3)
+        np.testing.assert_allclose(
+            matrices @ np.swapaxes(matrices, -1, -2), np.broadcast_to(np.eye(3), matrices.shape), atol=1e-10
+        )
+        np.testing.assert_allclose(rotation_matrices_to_axis_angles(matrices), axis_angles, atol=1e-8)
+
+    def test_small_angles(self):
+        """Test tiny rotations round-trip without losing precision."""
+        axis_angles = np.array([[1e-9, 0.0, 0.0], [0.0, 3e-7, -2e-7], [0.0, 0.0, 0.0]])
+        matrices = axis_angles_to_rotation_matrices(axis_angles)
+
+        np.testing.assert_allclose(rotation_matrices_to_axis_angles(matrices), axis_angles, atol=1e-15)
+
+    def test_near_pi(self):
+        """Test rotations at and near pi recover the correct axis."""
+        axis = np.array([1.0, 1.0, 0.0]) / np.sqrt(2.0)
+        for angle in (np.pi, np.pi - 1e-5, np.pi - 5e-4):
+            R = axis_angles_to_rotation_matrices(axis * angle)
+            recovered = rotation_matrices_to_axis_angles(R)
+            # At exactly pi, v and -v describe the same rotation
+            np.testing.assert_allclose(axis_angles_to_rotation_matrices(recovered), R, atol=1e-9)
+            assert np.linalg.norm(recovered) == pytest.approx(angle, abs=1e-6)
+            if angle < np.pi:
+                np.testing.assert_allclose(recovered, axis * angle, atol=1e-6)
+
+    def test_per_joint_helpers_match(self):
+        """Test scalar and [N, 3] helpers agree with the vectorized versions."""
+        axis_angles = self._random_axis_angles((24,))
+        batch = batch_axis_angle_to_rotation_matrices(axis_angles)
+
+        np.testing.assert_array_equal(batch, axis_angles_to_rotation_matrices(axis_angles))
+        np.testing.assert_array_equal(axis_angle_to_rotation_matrix(axis_angles[3]), batch[3])
+        np.testing.assert_allclose(rotation_matrix_to_axis_angle(batch[3]), axis_angles[3], atol=1e-8)
+
+    def test_invalid_shapes(self):
+        """Test vectorized conversions validate trailing dimensions."""
+        with pytest.raises(ValueError):
+            axis_angles_to_rotation_matrices(np.zeros((4, 2)))
+        with pytest.raises(ValueError):
+            rotation_matrices_to_axis_angles(np.zeros((4, 3, 2)))
+        with pytest.raises(ValueError):
+            batch_axis_angle_to_rotation_matrices(np.zeros(3))
+
+    def test_torch_matches_numpy(self):
+        """Test torch conversions agree with NumPy ones."""
+        torch = pytest.importorskip("torch")
+        axis_angles = self._random_axis_angles((5, 24))
+        axis_angles[0, 0] = 0.0
+        axis_angles[0, 1] = np.array([0.0, 0.0, np.pi - 1e-5])
+
+        matrices = axis_angles_to_rotation_matrices_torch(torch.from_numpy(axis_angles))
+        np.testing.assert_allclose(matrices.numpy(), axis_angles_to_rotation_matrices(axis_angles), atol=1e-10)
+
+        recovered = rotation_matrices_to_axis_angles_torch(matrices)
+        np.testing.assert_allclose(recovered.numpy(), axis_angles, atol=1e-6)
+
+    def test_torch_gradients_finite_at_zero(self):
+        """Test gradients flow through zero and small rotations."""
+        torch = pytest.importorskip("torch")
+        axis_angles = torch.tensor(
+            [[0.0, 0.0, 0.0], [1e-6, 0.0, 0.0], [0.3, -0.2, 0.1]],
+            dtype=torch.float64, requires_grad=True,
+        )
+
+        matrices = axis_angles_to_rotation_matrices_torch(axis_angles)
+        loss = matrices.sum() + rotation_matrices_to_axis_angles_torch(matrices).pow(2).sum()
+        loss.backward()
+
+        assert torch.isfinite(axis_angles.grad).all()
+
+    def test_torch_gradients_finite_at_pi(self):
+        """Test gradients stay finite for half-turn rotations."""
+        torch = pytest.importorskip("torch")
+        # Exact half turns about the x and z axes, and one just below pi
+        matrices = torch.tensor(
+            [[[1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, -1.0]],
+             [[-1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, 1.0]]],
+            dtype=torch.float64,
+        )
+        matrices = torch.cat([
+            matrices,
+            axis_angles_to_rotation_matrices_torch(
+                torch.tensor([[0.0, np.pi - 1e-7, 0.0]], dtype=torch.float64)
+            ),
+        ]).requires_grad_(True)
+
+        recovered = rotation_matrices_to_axis_angles_torch(matrices)
+        np.testing.assert_allclose(recovered.detach().norm(dim=-1).numpy(), np.pi, atol=1e-6)
+        recovered.pow(2).sum().backward()
+
+        assert torch.isfinite(matrices.grad).all()
+
+
 # ============================================================================
 # Tests: HMR Pose Estimator
 # ============================================================================
@@ -412,6 +555,56 @@ class TestHMRPoseEstimator:
         with pytest.raises(TypeError):
             mock_estimator.estimate_pose([1, 2, 3])
 
+    def test_estimate_pose_batch(self, mock_estimator, sample_image_rgb, sample_image_gray):
+        """Test batched pose estimation returns one valid result per image."""
+        results = mock_estimator.estimate_pose_batch(
+            [sample_image_rgb, sample_image_gray, sample_image_rgb]
+        )
+
+        assert len(results) == 3
+        assert [r.pose_params.frame_id for r in results] == [0, 1, 2]
+        for result in results:
+            assert isinstance(result, HMRPoseResult)
+            assert result.image_preprocessed.shape == (224, 224, 3)
+            assert result.pose_params.pose_theta.shape == (72,)
+            assert result.pose_params.rotation_matrices.shape == (24, 3, 3)
+            assert result.pose_params.joint_confidences.shape == (24,)
+            np.testing.assert_array_equal(
+                result.pose_params.global_rotation, result.pose_params.rotation_matrices[0]
+            )
+        assert mock_estimator.get_average_processing_time() > 0
+
+    def test_estimate_pose_batch_empty(self, mock_estimator):
+        """Test batched estimation of no images."""
+        assert mock_estimator.estimate_pose_batch([]) == []
+
+    def test_batch_inference_requires_model(self):
+        """Test batched inference raises without a loaded model."""
+        estimator = HMRPoseEstimator(model_path="missing.ckpt")
+        with pytest.raises(RuntimeError):
+            estimator.estimate_pose_batch([np.zeros((32, 32, 3), dtype=np.uint8)])
+
+    def test_batch_inference_uses_model_inference(self, sample_image_rgb, sample_image_gray):
+        """Test batched inference runs the per-image model path for each image."""
+        estimator = HMRPoseEstimator(model_path="model.ckpt")
+        estimator.model = object()
+        calls = []
+
+        def run_inference(preprocessed):
+            calls.append(preprocessed)
+            pose_theta = np.full(72, 0.01 * len(calls))
+            rotations = batch_axis_angle_to_rotation_matrices(pose_theta.reshape(24, 3))
+            return pose_theta, rotations, 0.5 + 0.1 * len(calls)
+
+        estimator._run_inference = run_inference
+        results = estimator.estimate_pose_batch([sample_image_rgb, sample_image_gray])
+
+        assert len(calls) == 2
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result.image_preprocessed, calls[i])
+            np.testing.assert_allclose(result.pose_params.pose_theta, 0.01 * (i + 1))
+            assert result.pose_params.confidence == pytest.approx(0.5 + 0.1 * (i + 1))
+
 
 # ============================================================================
 # Tests: Mock Functions
@@ -10,6 +10,8 @@ import tempfile
 import os
 
 from mhr_bridge import (
+    CORRESPONDENCE_METHODS,
+    OPTIMIZERS,
     MHRBridge,
     BridgeConfig,
     ConversionResult,
@@ -41,6 +43,22 @@ class MockSMPLXModel(torch.nn.Module):
         return MockSMPLXOutput(vertices)
 
 
+class LinearSMPLXModel(torch.nn.Module):
+    """Deterministic SMPL-X stand-in: template plus linear shape/pose offsets."""
+
+    def __init__(self, num_vertices=300, seed=0):
+        super().__init__()
+        generator = torch.Generator().manual_seed(seed)
+        self.template = torch.randn(num_vertices, 3, generator=generator)
+        self.shapedirs = torch.randn(300, num_vertices * 3, generator=generator) * 0.01
+        self.posedirs = torch.randn(66, num_vertices * 3, generator=generator) * 0.001
+
+    def forward(self, betas, body_pose, global_orient):
+        pose = torch.cat([global_orient, body_pose], dim=1)
+        offsets = betas @ self.shapedirs + pose @ self.posedirs
+        return MockSMPLXOutput(self.template + offsets.view(betas.shape[0], -1, 3))
+
+
 class TestVertexMatcher(unittest.TestCase):
     """Test suite for VertexMatcher class."""
 
@@ -84,6 +102,25 @@ class TestVertexMatcher(unittest.TestCase):
         self.assertEqual(correspondence[0], 0)
         self.assertEqual(correspondence[1], 1)
 
+    def test_backends_agree(self):
+        """Test chunked and KD-tree backends match the dense result."""
+        expected = VertexMatcher(self.mhr_vertices, self.smplx_vertices).compute_correspondence()
+
+        for method in CORRESPONDENCE_METHODS:
+            matcher = VertexMatcher(
+                self.mhr_vertices, self.smplx_vertices, method=method, chunk_size=777
+            )
+            correspondence = matcher.compute_correspondence()
+            self.assertEqual(correspondence.dtype, np.int64)
+            np.testing.assert_array_equal(correspondence, expected)
+
+    def test_invalid_backend(self):
+        """Test invalid method or chunk size raises error."""
+        with self.assertRaises(ValueError):
+            VertexMatcher(self.mhr_vertices, self.smplx_vertices, method="octree")
+        with self.assertRaises(ValueError):
+            VertexMatcher(self.mhr_vertices, self.smplx_vertices, method="chunked", chunk_size=0)
+
 
 class TestBridgeConfig(unittest.TestCase):
     """Test suite for BridgeConfig."""
@@ -107,6 +144,23 @@ class TestBridgeConfig(unittest.TestCase):
         self.assertEqual(config.num_iterations, 1000)
         self.assertEqual(config.shape_regularization_weight, 0.01)
 
+    def test_invalid_correspondence_method(self):
+        """Test unknown correspondence backend raises error."""
+        with self.assertRaises(ValueError):
+            BridgeConfig(correspondence_method="octree")
+        with self.assertRaises(ValueError):
+            BridgeConfig(correspondence_chunk_size=0)
+
+    def test_invalid_optimizer_settings(self):
+        """Test unknown optimizer and non-positive intervals raise errors."""
+        self.assertIn("lbfgs", OPTIMIZERS)
+        with self.assertRaises(ValueError):
+            BridgeConfig(optimizer="sgd")
+        with self.assertRaises(ValueError):
+            BridgeConfig(lbfgs_max_iter=0)
+        with self.assertRaises(ValueError):
+            BridgeConfig(convergence_check_interval=0)
+
 
 class TestMHRBridge(unittest.TestCase):
     """Test suite for MHRBridge class."""
@@ -265,6 +319,167 @@ class TestMHRBridge(unittest.TestCase):
         self.assertIsInstance(result, ConversionResult)
 
 
+class TestBatchConversion(unittest.TestCase):
+    """Test suite for MHRBridge.convert_batch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.model = LinearSMPLXModel()
+        self.config = BridgeConfig(num_iterations=60, patience=10, learning_rate=0.05)
+        self.bridge = MHRBridge(self.model, self.config)
+
+    def _target(self, seed, count=300):
+        generator = torch.Generator().manual_seed(seed)
+        betas = torch.randn(1, 300, generator=generator) * 0.5
+        with torch.no_grad():
+            vertices = self.model(betas, torch.zeros(1, 63), torch.zeros(1, 3)).vertices[0]
+        return vertices[:count].numpy()
+
+    def test_correspondence_method_from_config(self):
+        """Test every configured backend yields the same conversion."""
+        mesh = self._target(5)
+        results = []
+        for method in CORRESPONDENCE_METHODS:
+            config = BridgeConfig(num_iterations=5, correspondence_method=method)
+            results.append(MHRBridge(self.model, config).convert(mesh))
+
+        for result in results[1:]:
+            np.testing.assert_array_equal(result.vertex_correspondence, results[0].vertex_correspondence)
+            np.testing.assert_allclose(result.betas.numpy(), results[0].betas.numpy(), atol=1e-6)
+
+    def test_correspondence_cache_reused(self):
+        """Test meshes with the same topology reuse the cached correspondence."""
+        mesh = self._target(6)
+        faces = np.array([[0, 1, 2], [2, 3, 4]])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = BridgeConfig(num_iterations=3, correspondence_cache_dir=tmpdir)
+            bridge = MHRBridge(self.model, config)
+            first = bridge.convert(mesh, mhr_faces=faces)
+
+            with patch.object(VertexMatcher, 'compute_correspondence') as compute:
+                second = MHRBridge(self.model, config).convert(mesh + 0.01, mhr_faces=faces)
+                compute.assert_not_called()
+
+            np.testing.assert_array_equal(second.vertex_correspondence, first.vertex_correspondence)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+
+            # Without faces the topology is unknown, so nothing is reused
+            with patch.object(VertexMatcher, 'compute_correspondence',
+                              return_value=first.vertex_correspondence.copy()) as compute:
+                bridge.convert(mesh)
+                compute.assert_called_once()
+
+    def test_faces_length_mismatch(self):
+        """Test mismatched mhr_faces raises error."""
+        with self.assertRaises(ValueError):
+            self.bridge.convert_batch([self._target(0)], mhr_faces=[None, None])
+
+    def test_empty_batch(self):
+        """Test converting no meshes."""
+        self.assertEqual(self.bridge.convert_batch([]), [])
+
+    def test_initial_betas_length_mismatch(self):
+        """Test mismatched initial_betas raises error."""
+        with self.assertRaises(ValueError):
+            self.bridge.convert_batch([self._target(0)], initial_betas=[None, None])
+
+    def test_batch_matches_individual_conversions(self):
+        """Test joint optimization gives the same per-mesh results as convert()."""
+        meshes = [self._target(1), self._target(2, count=200), self._target(3, count=250)]
+        initial = [None, np.full(10, 0.1, dtype=np.float32), None]
+
+        batched = self.bridge.convert_batch(meshes, initial_betas=initial)
+
+        self.assertEqual(len(batched), 3)
+        for mesh, init, result in zip(meshes, initial, batched):
+            single = self.bridge.convert(mesh, initial_betas=init)
+            self.assertEqual(result.betas.shape, (1, 300))
+            self.assertEqual(result.original_vertices.shape[0], mesh.shape[0])
+            self.assertEqual(result.iterations, single.iterations)
+            np.testing.assert_allclose(result.betas.numpy(), single.betas.numpy(), atol=1e-4)
+            self.assertAlmostEqual(result.total_loss, single.total_loss, places=4)
+            self.assertAlmostEqual(result.reconstruction_loss, single.reconstruction_loss, places=4)
+
+    def test_per_sample_early_stopping(self):
+        """Test samples stop independently and stay frozen afterwards."""
+        config = BridgeConfig(num_iterations=200, patience=5, convergence_threshold=1e-3)
+        bridge = MHRBridge(self.model, config)
+        with torch.no_grad():
+            template = self.model(torch.zeros(1, 300), torch.zeros(1, 63), torch.zeros(1, 3)).vertices[0]
+        converged = template.numpy()
+        far = self._target(4) * 1.5
+
+        results = bridge.convert_batch([converged, far])
+
+        self.assertLess(results[0].iterations, results[1].iterations)
+        single = bridge.convert(converged)
+        self.assertEqual(results[0].iterations, single.iterations)
+        np.testing.assert_allclose(results[0].betas.numpy(), single.betas.numpy(), atol=1e-5)
+
+        # Reconstructed vertices come from the frozen parameters
+        with torch.no_grad():
+            expected = self.model(results[0].betas, results[0].body_pose, results[0].global_orient).vertices[0]
+        np.testing.assert_allclose(results[0].reconstructed_vertices.numpy(), expected.numpy(), atol=1e-5)
+
+    def test_convergence_check_interval_does_not_change_results(self):
+        """Test early stopping is decided per step even when syncing every k steps."""
+        meshes = [self._target(1), self._target(7) * 1.5]
+        results = {}
+        for interval in (1, 7):
+            config = BridgeConfig(num_iterations=200, patience=5, convergence_threshold=1e-3,
+                                  convergence_check_interval=interval)
+            results[interval] = MHRBridge(self.model, config).convert_batch(meshes)
+
+        for every_step, every_k in zip(results[1], results[7]):
+            self.assertEqual(every_k.iterations, every_step.iterations)
+            np.testing.assert_array_equal(every_k.betas.numpy(), every_step.betas.numpy())
+            self.assertEqual(every_k.total_loss, every_step.total_loss)
+
+    def test_iterations_per_second_reported(self):
+        """Test batch throughput is reported on every result."""
+        results = self.bridge.convert_batch([self._target(1), self._target(2)])
+        self.assertGreater(results[0].iterations_per_second, 0.0)
+        self.assertEqual(results[0].iterations_per_second, results[1].iterations_per_second)
+
+    def test_lbfgs_optimizer(self):
+        """Test L-BFGS reaches a lower loss than Adam in far fewer iterations."""
+        mesh = self._target(8)
+        adam = MHRBridge(self.model, BridgeConfig(num_iterations=20, learning_rate=0.05)).convert(mesh)
+        config = BridgeConfig(optimizer="lbfgs", num_iterations=20, learning_rate=1.0, patience=3)
+        lbfgs = MHRBridge(self.model, config).convert(mesh)
+
+        self.assertLess(lbfgs.total_loss, adam.total_loss)
+        self.assertLessEqual(lbfgs.iterations, 20)
+        self.assertTrue(torch.isfinite(lbfgs.betas).all())
+
+    def test_compiled_loss_matches_eager(self):
+        """Test the compiled loss function gives the same conversion."""
+        if not hasattr(torch, "compile"):
+            self.skipTest("torch.compile not available")
+        mesh = self._target(9)
+        eager = MHRBridge(self.model, BridgeConfig(num_iterations=5)).convert(mesh)
+        config = BridgeConfig(num_iterations=5, compile_loss=True, compile_backend="eager")
+        compiled = MHRBridge(self.model, config).convert(mesh)
+
+        np.testing.assert_allclose(compiled.betas.numpy(), eager.betas.numpy(), atol=1e-6)
+        self.assertAlmostEqual(compiled.total_loss, eager.total_loss, places=6)
+
+    def test_batch_vertex_loss_masks_padding(self):
+        """Test padded vertices do not contribute to the per-sample loss."""
+        predicted = torch.zeros(2, 4, 3)
+        targets = torch.zeros(2, 3, 3)
+        targets[0, 2] = 100.0  # padding for sample 0
+        targets[1] = 1.0
+        correspondence = torch.tensor([[0, 1, 0], [1, 2, 3]])
+        mask = torch.tensor([[1.0, 1.0, 0.0], [1.0, 1.0, 1.0]])
+
+        loss = self.bridge._compute_batch_vertex_loss(predicted, targets, correspondence, mask)
+
+        self.assertAlmostEqual(loss[0].item(), 0.0, places=6)
+        self.assertAlmostEqual(loss[1].item(), np.sqrt(3.0), places=5)
+
+
 class TestConversionResult(unittest.TestCase):
     """Test suite for ConversionResult."""
 
@@ -360,6 +575,33 @@ class TestFileSaving(unittest.TestCase):
                 decimal=5
             )
 
+    def test_npz_keeps_metrics(self):
+        """Test .npz files store the loss metrics and correspondence."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'result.npz')
+            self.bridge.save_result(self.result, path)
+            loaded_result = self.bridge.load_result(path)
+
+            self.assertAlmostEqual(loaded_result.reconstruction_loss, 0.5, places=6)
+            self.assertAlmostEqual(loaded_result.total_loss, 0.511, places=6)
+            np.testing.assert_array_equal(loaded_result.vertex_correspondence, np.arange(1000))
+
+    def test_save_and_load_result_store(self):
+        """Test .results paths append to a result store."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'scans.results')
+            self.bridge.save_result(self.result, path)
+            self.bridge.save_result(self.result, path)
+
+            self.assertTrue(os.path.isdir(path))
+            loaded_result = self.bridge.load_result(path)
+            self.assertEqual(loaded_result.betas.shape, (1, 300))
+            self.assertAlmostEqual(loaded_result.total_loss, 0.511, places=6)
+            np.testing.assert_array_almost_equal(
+                self.bridge.load_result(path, index=0).reconstructed_vertices.numpy(),
+                self.result.reconstructed_vertices.numpy()
+            )
+
     def test_save_invalid_format(self):
         """Test saving with invalid format raises error."""
         with tempfile.TemporaryDirectory() as tmpdir:
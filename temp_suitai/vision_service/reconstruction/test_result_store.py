@@ -0,0 +1,183 @@
+"""
+Tests for the columnar MHR-to-SMPL-X result store.
+"""
+
+import os
+import numpy as np
+import pytest
+import torch
+from unittest.mock import patch
+from vision_service.reconstruction.mhr_bridge import ConversionResult
+from vision_service.reconstruction.result_store import (
+    ConversionResultStore,
+    arrays_to_result,
+    result_to_arrays,
+)
+
+
+def make_result(seed, num_vertices=50, correspondence=True):
+    """Create a ConversionResult with distinct values per seed."""
+    generator = torch.Generator().manual_seed(seed)
+    return ConversionResult(
+        betas=torch.randn(1, 300, generator=generator),
+        body_pose=torch.randn(1, 63, generator=generator),
+        global_orient=torch.randn(1, 3, generator=generator),
+        reconstruction_loss=0.1 * seed,
+        shape_reg_loss=0.01 * seed,
+        pose_reg_loss=0.001 * seed,
+        total_loss=0.2 * seed,
+        original_vertices=torch.randn(num_vertices, 3, generator=generator),
+        reconstructed_vertices=torch.randn(80, 3, generator=generator),
+        vertex_correspondence=np.arange(num_vertices) if correspondence else None,
+        iterations=10 + seed,
+        iterations_per_second=100.0 + seed,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty store."""
+    return ConversionResultStore(str(tmp_path / "scans.results"))
+
+
+class TestArrays:
+    """Test flattening results to arrays and back."""
+
+    def test_round_trip(self):
+        """Test every field survives result_to_arrays/arrays_to_result."""
+        result = make_result(3)
+        loaded = arrays_to_result(result_to_arrays(result))
+
+        np.testing.assert_array_equal(loaded.betas.numpy(), result.betas.numpy())
+        np.testing.assert_array_equal(loaded.original_vertices.numpy(), result.original_vertices.numpy())
+        np.testing.assert_array_equal(loaded.vertex_correspondence, result.vertex_correspondence)
+        assert loaded.total_loss == pytest.approx(result.total_loss)
+        assert loaded.iterations == result.iterations
+
+    def test_missing_correspondence(self):
+        """Test a None correspondence stays None."""
+        loaded = arrays_to_result(result_to_arrays(make_result(1, correspondence=False)))
+        assert loaded.vertex_correspondence is None
+
+
+class TestConversionResultStore:
+    """Test appending and reading results."""
+
+    def test_empty(self, store):
+        """Test a new store has no results."""
+        assert len(store) == 0
+        assert store.column("total_loss").shape == (0,)
+        with pytest.raises(IndexError):
+            store.read(0)
+
+    def test_append_and_read(self, store):
+        """Test results come back in append order with all fields."""
+        results = [make_result(1, num_vertices=40), make_result(2, num_vertices=60)]
+        assert store.append(results) == 2
+        assert store.append([make_result(3, correspondence=False)]) == 3
+
+        for index, expected in enumerate(results):
+            loaded = store.read(index)
+            np.testing.assert_array_equal(loaded.betas.numpy(), expected.betas.numpy())
+            np.testing.assert_array_equal(
+                loaded.original_vertices.numpy(), expected.original_vertices.numpy()
+            )
+            np.testing.assert_array_equal(loaded.vertex_correspondence, expected.vertex_correspondence)
+            assert loaded.reconstruction_loss == pytest.approx(expected.reconstruction_loss)
+            assert loaded.iterations_per_second == pytest.approx(expected.iterations_per_second)
+
+        assert store.read(-1).vertex_correspondence is None
+        assert store.read(-1).iterations == 13
+
+    def test_columns(self, store):
+        """Test columns span segments in append order."""
+        results = [make_result(seed) for seed in range(1, 5)]
+        store.append(results[:3])
+        store.append(results[3:])
+
+        betas = store.column("betas")
+        assert betas.shape == (4, 300)
+        np.testing.assert_array_equal(betas[3], results[3].betas.numpy()[0])
+        np.testing.assert_allclose(store.column("total_loss"), [0.2, 0.4, 0.6, 0.8])
+        with pytest.raises(KeyError):
+            store.column("original_vertices")
+
+    def test_single_segment_column_is_memory_mapped(self, store):
+        """Test a one-segment column is returned without copying."""
+        store.append([make_result(1), make_result(2)])
+        assert isinstance(store.column("body_pose"), np.memmap)
+
+    def test_parameter_reads_do_not_touch_vertices(self, store):
+        """Test reading parameters never opens vertex files."""
+        store.append([make_result(1), make_result(2)])
+        reader = ConversionResultStore(store.directory)
+
+        opened = []
+        original_load = np.load
+
+        def tracking_load(path, *args, **kwargs):
+            opened.append(os.path.basename(path))
+            return original_load(path, *args, **kwargs)
+
+        with patch.object(np, "load", side_effect=tracking_load):
+            reader.column("betas")
+            reader.column("body_pose")
+            result = reader.read(1, load_vertices=False)
+
+        vertex_files = {"original_vertices", "reconstructed_vertices", "vertex_correspondence"}
+        assert not any(name.split(".")[0].replace("_offsets", "") in vertex_files for name in opened)
+        assert result.original_vertices.shape == (0, 3)
+        assert result.total_loss == pytest.approx(0.4)
+
+    def test_vertices_view(self, store):
+        """Test one variable-length field can be read on its own."""
+        result = make_result(5, num_vertices=33)
+        store.append([make_result(1), result])
+        vertices = store.vertices("original_vertices", 1)
+        assert vertices.shape == (33, 3)
+        np.testing.assert_array_equal(vertices, result.original_vertices.numpy())
+
+    def test_width_mismatch(self, store):
+        """Test results with a different parameter width are rejected."""
+        store.append([make_result(1)])
+        other = make_result(2)
+        other.betas = torch.zeros(1, 10)
+        with pytest.raises(ValueError):
+            store.append([other])
+
+    def test_append_is_atomic(self, store):
+        """Test a failed append leaves no partial segment behind."""
+        store.append([make_result(1)])
+        with patch.object(np, "save", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                store.append([make_result(2)])
+
+        assert len(store) == 1
+        assert sorted(os.listdir(store.directory)) == ["segment_00000000"]
+
+    def test_concurrent_writers_get_distinct_segments(self, store):
+        """Test a second writer with a stale view does not overwrite a segment."""
+        other = ConversionResultStore(store.directory)
+        store.append([make_result(1)])
+        other.append([make_result(2)])
+        store.append([make_result(3)])
+
+        assert len(ConversionResultStore(store.directory)) == 3
+        np.testing.assert_allclose(store.column("total_loss"), [0.2, 0.4, 0.6])
+
+    def test_compact(self, store):
+        """Test compaction merges segments and keeps every result."""
+        results = [make_result(seed, num_vertices=20 + seed) for seed in range(1, 6)]
+        for result in results:
+            store.append([result])
+
+        store.compact()
+
+        assert len([n for n in os.listdir(store.directory) if n.startswith("segment_")]) == 1
+        assert len(store) == 5
+        for index, expected in enumerate(results):
+            loaded = store.read(index)
+            np.testing.assert_array_equal(
+                loaded.original_vertices.numpy(), expected.original_vertices.numpy()
+            )
+            np.testing.assert_array_equal(loaded.betas.numpy(), expected.betas.numpy())
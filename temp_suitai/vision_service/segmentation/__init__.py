@@ -1,15 +1,51 @@
 """Segmentation module for person segmentation using SAM 3."""
 
-from .sam_segment import (
-    SAMSegmenter,
-    SegmentationResult,
-    PromptType,
-    create_segmenter,
-)
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    ".sam_segment": [
+        "SAMSegmenter",
+        "SegmentationResult",
+        "SegmentationPrompt",
+        "PromptType",
+        "create_segmenter",
+    ],
+    ".model_registry": [
+        "SAMModelRegistry",
+        "ModelLoadStats",
+        "get_model_registry",
+    ],
+    ".embedding_cache": [
+        "EmbeddingCache",
+        "EmbeddingCacheConfig",
+        "EmbeddingCacheStats",
+        "frame_signature",
+    ],
+    ".compact_mask": [
+        "CompactMask",
+    ],
+    ".person_tracker": [
+        "PersonTracker",
+        "TrackingConfig",
+        "TrackingStats",
+    ],
+})
 
 __all__ = [
     "SAMSegmenter",
     "SegmentationResult",
+    "SegmentationPrompt",
     "PromptType",
     "create_segmenter",
+    "SAMModelRegistry",
+    "ModelLoadStats",
+    "get_model_registry",
+    "EmbeddingCache",
+    "EmbeddingCacheConfig",
+    "EmbeddingCacheStats",
+    "frame_signature",
+    "CompactMask",
+    "PersonTracker",
+    "TrackingConfig",
+    "TrackingStats",
 ]
@@ -0,0 +1,259 @@
+"""
+Image-embedding cache for SAM3 segmentation.
+
+The ViT image encoder is by far the most expensive part of segmenting a
+frame, yet during static phases of a scan (the customer standing still for
+calibration) consecutive frames are nearly identical. The cache keeps the
+predictor's embedding state for recent frames and reuses it when:
+
+- the new frame is close to the frame the last embedding was computed from
+  (mean absolute difference of small grayscale thumbnails below
+  ``change_threshold``), or
+- the new frame's perceptual hash (dHash) matches a cached frame whose
+  thumbnail also passes the change detector. The 64-bit hash only picks the
+  candidate: brightness changes and different poses can share a hash.
+
+Keys describe frames only, not the model, so a cache must not be shared by
+segmenters running different model types or checkpoints.
+
+Entries are evicted least-recently-used first to stay within a memory budget.
+
+Example:
+    cache = EmbeddingCache(EmbeddingCacheConfig(memory_budget_mb=256))
+    segmenter = SAMSegmenter(embedding_cache=cache)
+    ...
+    print(cache.get_stats().hit_rate)
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import torch
+
+
+# Predictor attributes that together hold the image embedding
+EMBEDDING_ATTRIBUTES = ("features", "original_size", "input_size", "is_image_set")
+
+
+@dataclass
+class EmbeddingCacheConfig:
+    """Configuration for EmbeddingCache."""
+    hash_size: int = 8  # dHash grid side; the hash has hash_size ** 2 bits
+    thumbnail_size: int = 32  # Side of the thumbnail used by the change detector
+    change_threshold: float = 2.0  # Mean abs thumbnail difference (0-255) to reuse
+    memory_budget_mb: float = 256.0
+
+    def __post_init__(self):
+        if self.hash_size < 2:
+            raise ValueError(f"hash_size must be at least 2, got {self.hash_size}")
+        if self.thumbnail_size < 1:
+            raise ValueError(f"thumbnail_size must be positive, got {self.thumbnail_size}")
+        if self.change_threshold < 0:
+            raise ValueError(f"change_threshold must be non-negative, got {self.change_threshold}")
+        if self.memory_budget_mb <= 0:
+            raise ValueError(f"memory_budget_mb must be positive, got {self.memory_budget_mb}")
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for an EmbeddingCache."""
+    hits: int = 0  # Perceptual hash matches
+    temporal_hits: int = 0  # Reuses of the last embedding by the change detector
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that avoided the image encoder."""
+        lookups = self.hits + self.temporal_hits + self.misses
+        return (self.hits + self.temporal_hits) / lookups if lookups else 0.0
+
+
+@dataclass
+class FrameSignature:
+    """Cheap summary of a frame used as the cache key."""
+    shape: Tuple[int, int]
+    hash: int
+    thumbnail: np.ndarray  # float32 (thumbnail_size x thumbnail_size) grayscale
+
+    @property
+    def key(self) -> Tuple[Tuple[int, int], int]:
+        return (self.shape, self.hash)
+
+
+def _block_means(gray: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Downscale a 2D array by averaging (near-)equal blocks."""
+    h, w = gray.shape
+    row_edges = np.linspace(0, h, rows + 1).astype(np.intp)[:-1]
+    col_edges = np.linspace(0, w, cols + 1).astype(np.intp)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, row_edges, axis=0), col_edges, axis=1)
+    counts = np.outer(np.diff(np.append(row_edges, h)), np.diff(np.append(col_edges, w)))
+    return (sums / counts).astype(np.float32)
+
+
+def frame_signature(image: np.ndarray, hash_size: int = 8,
+                    thumbnail_size: int = 32) -> FrameSignature:
+    """
+    Compute the perceptual hash and thumbnail of an RGB frame.
+
+    Args:
+        image: RGB image (H x W x 3), dtype=uint8
+        hash_size: dHash grid side
+        thumbnail_size: Thumbnail side for the change detector
+
+    Returns:
+        FrameSignature of the frame.
+    """
+    h, w = image.shape[:2]
+    # Subsample before converting so large frames stay cheap
+    step = max(1, min(h, w) // (4 * max(hash_size + 1, thumbnail_size)))
+    gray = image[::step, ::step].astype(np.float32).mean(axis=2)
+
+    thumbnail = _block_means(gray, min(thumbnail_size, gray.shape[0]),
+                             min(thumbnail_size, gray.shape[1]))
+    grid = _block_means(gray, min(hash_size, gray.shape[0]),
+                        min(hash_size + 1, gray.shape[1]))
+    bits = (grid[:, 1:] > grid[:, :-1]).ravel()
+    frame_hash = int.from_bytes(np.packbits(bits).tobytes(), "big")
+    return FrameSignature(shape=(h, w), hash=frame_hash, thumbnail=thumbnail)
+
+
+def _state_nbytes(state: Dict[str, Any]) -> int:
+    """Memory held by the tensors/arrays of an embedding state."""
+    total = 0
+    for value in state.values():
+        if isinstance(value, torch.Tensor):
+            total += value.element_size() * value.numel()
+        elif isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, (list, tuple)):
+            total += sum(v.element_size() * v.numel() for v in value
+                         if isinstance(v, torch.Tensor))
+    return total
+
+
+class EmbeddingCache:
+    """
+    LRU cache of predictor embedding states keyed by frame signature.
+
+    Stored states hold references to the predictor's tensors. SAM predictors
+    replace (rather than modify) these on every set_image, so no copy is made.
+    Use one cache per model: embeddings of different models are not
+    interchangeable and the cache cannot tell them apart.
+    """
+
+    def __init__(self, config: Optional[EmbeddingCacheConfig] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            config: Cache configuration. Uses defaults if None.
+        """
+        self.config = config or EmbeddingCacheConfig()
+        # signature key -> (signature, embedding state, bytes), oldest first
+        self._entries: OrderedDict = OrderedDict()
+        self._anchor: Optional[FrameSignature] = None  # Frame of the last embedding used
+        self._memory_bytes = 0
+        self._stats = EmbeddingCacheStats()
+
+    def signature(self, image: np.ndarray) -> FrameSignature:
+        """Compute a frame's signature with this cache's settings."""
+        return frame_signature(image, self.config.hash_size, self.config.thumbnail_size)
+
+    def lookup(self, signature: FrameSignature) -> Optional[Dict[str, Any]]:
+        """
+        Find a reusable embedding state for a frame.
+
+        Args:
+            signature: Signature of the new frame
+
+        Returns:
+            The cached embedding state, or None on a miss.
+        """
+        anchor = self._anchor
+        if (anchor is not None and anchor.key in self._entries
+                and self._is_unchanged(anchor, signature)):
+            self._entries.move_to_end(anchor.key)
+            self._stats.temporal_hits += 1
+            return self._entries[anchor.key][1]
+
+        entry = self._entries.get(signature.key)
+        if entry is not None and self._is_unchanged(entry[0], signature):
+            self._entries.move_to_end(signature.key)
+            self._anchor = entry[0]
+            self._stats.hits += 1
+            return entry[1]
+
+        self._stats.misses += 1
+        return None
+
+    def store(self, signature: FrameSignature, state: Dict[str, Any]) -> None:
+        """
+        Cache the embedding state computed for a frame.
+
+        States larger than the whole budget are not cached.
+
+        Args:
+            signature: Signature of the frame the state was computed from
+            state: Predictor embedding state
+        """
+        nbytes = _state_nbytes(state)
+        self._anchor = signature
+        if signature.key in self._entries:
+            self._memory_bytes -= self._entries.pop(signature.key)[2]
+        if nbytes > self.config.memory_budget_mb * 1024 * 1024:
+            return
+
+        self._entries[signature.key] = (signature, state, nbytes)
+        self._memory_bytes += nbytes
+        while self._memory_bytes > self.config.memory_budget_mb * 1024 * 1024:
+            _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted_bytes
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+        self._anchor = None
+        self._memory_bytes = 0
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters."""
+        self._stats = EmbeddingCacheStats()
+
+    def get_stats(self) -> EmbeddingCacheStats:
+        """Get a snapshot of the counters and current memory use."""
+        return EmbeddingCacheStats(
+            hits=self._stats.hits,
+            temporal_hits=self._stats.temporal_hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            entries=len(self._entries),
+            memory_bytes=self._memory_bytes,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_unchanged(self, anchor: FrameSignature, signature: FrameSignature) -> bool:
+        """Change detector: is the scene delta from the anchor frame small?"""
+        if anchor.shape != signature.shape or anchor.thumbnail.shape != signature.thumbnail.shape:
+            return False
+        delta = float(np.abs(anchor.thumbnail - signature.thumbnail).mean())
+        return delta <= self.config.change_threshold
+
+
+def snapshot_embedding(predictor: Any) -> Dict[str, Any]:
+    """Capture the embedding state of a predictor after set_image()."""
+    return {name: getattr(predictor, name) for name in EMBEDDING_ATTRIBUTES
+            if hasattr(predictor, name)}
+
+
+def restore_embedding(predictor: Any, state: Dict[str, Any]) -> None:
+    """Put a captured embedding state back into a predictor."""
+    for name, value in state.items():
+        setattr(predictor, name, value)
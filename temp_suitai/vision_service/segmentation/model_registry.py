@@ -0,0 +1,244 @@
+"""
+Process-wide SAM3 model registry.
+
+Building the SAM3 ViT and moving it to the device takes seconds and holds the
+full set of weights in memory. The registry loads each
+(model_type, checkpoint_path, device) combination once, freezes the weights
+and hands out lightweight per-session predictors that share them. A
+predictor only holds the embedding of the image last passed to it, so
+sessions never see each other's state.
+
+Example:
+    registry = get_model_registry()
+    registry.preload("vit_b", device="cuda:0")        # at service start-up
+    predictor = registry.create_predictor("vit_b", device="cuda:0")
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import threading
+import time
+
+import numpy as np
+import torch
+
+
+ModelKey = Tuple[str, Optional[str], str]
+
+
+@dataclass
+class ModelLoadStats:
+    """Load-time metrics for one registered model."""
+    model_type: str
+    checkpoint_path: Optional[str]
+    device: str
+    load_seconds: float  # Building the model and moving it to the device
+    warmup_seconds: float = 0.0  # Dummy-image pass, 0.0 if never warmed up
+    predictors_created: int = 0
+    parameter_count: int = 0
+
+
+class SAMModelRegistry:
+    """
+    Cache of loaded SAM3 models shared by all segmenters in a process.
+
+    Models are put in eval mode with gradients disabled, so sharing them
+    between sessions is safe as long as callers only run inference.
+    """
+
+    def __init__(self, warmup_image_size: int = 256):
+        """
+        Initialize an empty registry.
+
+        Args:
+            warmup_image_size: Side length of the dummy image used for warm-up.
+
+        Raises:
+            ValueError: If warmup_image_size is not positive
+        """
+        if warmup_image_size <= 0:
+            raise ValueError(f"warmup_image_size must be positive, got {warmup_image_size}")
+        self.warmup_image_size = warmup_image_size
+        self._models: Dict[ModelKey, Any] = {}
+        self._stats: Dict[ModelKey, ModelLoadStats] = {}
+        self._lock = threading.Lock()
+
+    def get_model(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+    ) -> Any:
+        """
+        Return the shared model, loading it on first use.
+
+        Args:
+            model_type: Model size - "vit_t", "vit_b", "vit_l", "vit_h"
+            checkpoint_path: Path to pretrained weights (None downloads them)
+            device: Device the model lives on
+
+        Returns:
+            The loaded SAM3 model in eval mode.
+
+        Raises:
+            ImportError: If the sam3 package is not installed
+        """
+        key = (model_type, checkpoint_path, device)
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = self._load(key)
+            return self._models[key]
+
+    def create_predictor(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+    ) -> Any:
+        """
+        Create a per-session predictor backed by the shared model.
+
+        Returns:
+            A new SamPredictor3 instance.
+
+        Raises:
+            ImportError: If the sam3 package is not installed
+        """
+        from sam3 import SamPredictor3
+
+        model = self.get_model(model_type, checkpoint_path, device)
+        with self._lock:
+            self._stats[(model_type, checkpoint_path, device)].predictors_created += 1
+        return SamPredictor3(model)
+
+    def preload(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+        warmup: bool = True,
+    ) -> ModelLoadStats:
+        """
+        Load a model ahead of the first session, optionally warming it up.
+
+        Warm-up runs one encoder and decoder pass on a blank image so lazy
+        CUDA initialisation and kernel selection happen at start-up rather
+        than on a customer's first frame.
+
+        Returns:
+            The model's load-time metrics.
+        """
+        self.get_model(model_type, checkpoint_path, device)
+        if warmup:
+            self.warmup(model_type, checkpoint_path, device)
+        return self.get_stats()[(model_type, checkpoint_path, device)]
+
+    def warmup(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+    ) -> float:
+        """
+        Run a dummy image through a loaded model.
+
+        Returns:
+            Seconds spent warming up.
+        """
+        from sam3 import SamPredictor3
+
+        key = (model_type, checkpoint_path, device)
+        predictor = SamPredictor3(self.get_model(*key))
+        size = self.warmup_image_size
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            predictor.set_image(np.zeros((size, size, 3), dtype=np.uint8))
+            predictor.predict(
+                point_coords=np.array([[size / 2, size / 2]]),
+                point_labels=np.array([1]),
+                multimask_output=True,
+            )
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats[key].warmup_seconds = elapsed
+        return elapsed
+
+    def is_loaded(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+    ) -> bool:
+        """Check whether a model is already in the registry."""
+        return (model_type, checkpoint_path, device) in self._models
+
+    def get_stats(self) -> Dict[ModelKey, ModelLoadStats]:
+        """Get load-time metrics keyed by (model_type, checkpoint_path, device)."""
+        with self._lock:
+            return dict(self._stats)
+
+    def release(
+        self,
+        model_type: str = "vit_b",
+        checkpoint_path: Optional[str] = None,
+        device: str = "cpu",
+    ) -> None:
+        """
+        Drop a model from the registry.
+
+        Predictors created earlier keep their reference, so the weights are
+        freed once those sessions end.
+        """
+        key = (model_type, checkpoint_path, device)
+        with self._lock:
+            self._models.pop(key, None)
+            self._stats.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every model from the registry."""
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def _load(self, key: ModelKey) -> Any:
+        """Build, move and freeze one model (called with the lock held)."""
+        from sam3 import build_sam3_vit
+
+        model_type, checkpoint_path, device = key
+        start = time.perf_counter()
+        model = build_sam3_vit(model_type=model_type, checkpoint=checkpoint_path)
+        model.to(device)
+        model.eval()
+        model.requires_grad_(False)
+        elapsed = time.perf_counter() - start
+
+        parameters = model.parameters() if isinstance(model, torch.nn.Module) else ()
+        self._stats[key] = ModelLoadStats(
+            model_type=model_type,
+            checkpoint_path=checkpoint_path,
+            device=device,
+            load_seconds=elapsed,
+            parameter_count=sum(p.numel() for p in parameters),
+        )
+        return model
+
+
+_model_registry: Optional[SAMModelRegistry] = None
+
+
+def get_model_registry() -> SAMModelRegistry:
+    """
+    Get the process-wide model registry, creating it on first use.
+
+    Returns:
+        The shared SAMModelRegistry.
+    """
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = SAMModelRegistry()
+    return _model_registry
@@ -0,0 +1,195 @@
+"""
+Tracker-driven auto-prompting for person segmentation.
+
+Detecting a person without a user prompt needs a keyframe search: a grid of
+point prompts over the central region of the frame, decoded as one batch,
+keeping the most confident mask. Between keyframes the person barely moves,
+so the previous mask's bounding box, advanced by a momentum-smoothed
+velocity and padded by a margin, is a good single box prompt.
+
+PersonTracker decides per frame whether to track or search:
+
+- a keyframe search runs every ``keyframe_interval`` frames, when there is
+  no track yet, or when tracking confidence drops (low SAM score, or low
+  IoU between consecutive masks)
+- otherwise one prompt is derived from the track
+
+Example:
+    tracker = PersonTracker(TrackingConfig(keyframe_interval=15))
+    keyframe = tracker.needs_keyframe(image_shape)
+    if keyframe:
+        points = tracker.keyframe_points(image_shape)  # decode all, keep the best
+    else:
+        box = tracker.predicted_box(image_shape)
+    ...
+    tracker.update(result.mask, result.confidence, result.is_valid, keyframe=keyframe)
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from vision_service.segmentation.compact_mask import CompactMask
+
+
+@dataclass
+class TrackingConfig:
+    """Configuration for PersonTracker."""
+    keyframe_interval: int = 10  # Frames between forced keyframe searches
+    min_tracking_confidence: float = 0.7  # SAM score below which the track is lost
+    min_mask_iou: float = 0.5  # IoU with the previous mask below which the track is lost
+    momentum: float = 0.5  # Weight of the previous velocity in the box motion model
+    box_margin: float = 0.1  # Padding added on each side, as a fraction of box size
+    keyframe_grid: int = 3  # Keyframe search uses keyframe_grid x keyframe_grid points
+    keyframe_region: float = 0.5  # Fraction of the frame (centred) covered by the grid
+
+    def __post_init__(self):
+        if self.keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval must be at least 1, got {self.keyframe_interval}")
+        if not 0.0 <= self.min_tracking_confidence <= 1.0:
+            raise ValueError(
+                f"min_tracking_confidence must be in [0, 1], got {self.min_tracking_confidence}"
+            )
+        if not 0.0 <= self.min_mask_iou <= 1.0:
+            raise ValueError(f"min_mask_iou must be in [0, 1], got {self.min_mask_iou}")
+        if not 0.0 <= self.momentum < 1.0:
+            raise ValueError(f"momentum must be in [0, 1), got {self.momentum}")
+        if self.box_margin < 0:
+            raise ValueError(f"box_margin must be non-negative, got {self.box_margin}")
+        if self.keyframe_grid < 1:
+            raise ValueError(f"keyframe_grid must be at least 1, got {self.keyframe_grid}")
+        if not 0.0 < self.keyframe_region <= 1.0:
+            raise ValueError(f"keyframe_region must be in (0, 1], got {self.keyframe_region}")
+
+
+@dataclass
+class TrackingStats:
+    """Counters for how frames were segmented."""
+    keyframes: int = 0
+    tracked_frames: int = 0
+    track_losses: int = 0
+
+    @property
+    def tracked_fraction(self) -> float:
+        """Fraction of frames segmented from a tracked prompt."""
+        total = self.keyframes + self.tracked_frames
+        return self.tracked_frames / total if total else 0.0
+
+
+class PersonTracker:
+    """Derives per-frame prompts from the previous frame's person mask."""
+
+    def __init__(self, config: Optional[TrackingConfig] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            config: Tracking configuration. Uses defaults if None.
+        """
+        self.config = config or TrackingConfig()
+        self.stats = TrackingStats()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the track so the next frame runs a keyframe search."""
+        self._box: Optional[np.ndarray] = None  # (x_min, y_min, x_max, y_max)
+        self._velocity = np.zeros(4)
+        self._mask: Optional[CompactMask] = None
+        self._frames_since_keyframe = 0
+
+    @property
+    def is_tracking(self) -> bool:
+        """Whether a track exists."""
+        return self._box is not None
+
+    def needs_keyframe(self, image_shape: Tuple[int, int]) -> bool:
+        """Check whether the next frame must run a keyframe search."""
+        return (
+            self._box is None
+            or self._mask is None
+            or tuple(self._mask.shape) != tuple(image_shape)
+            or self._frames_since_keyframe >= self.config.keyframe_interval
+        )
+
+    def predicted_box(self, image_shape: Tuple[int, int]) -> Tuple[float, float, float, float]:
+        """
+        Box prompt for the next frame: previous box plus velocity, padded.
+
+        Raises:
+            RuntimeError: If there is no track
+        """
+        if self._box is None:
+            raise RuntimeError("No track. Run a keyframe search first.")
+        h, w = image_shape
+        box = self._box + self._velocity
+        pad_x = (box[2] - box[0]) * self.config.box_margin
+        pad_y = (box[3] - box[1]) * self.config.box_margin
+        x_min = float(np.clip(box[0] - pad_x, 0, w - 1))
+        y_min = float(np.clip(box[1] - pad_y, 0, h - 1))
+        x_max = float(np.clip(box[2] + pad_x, x_min + 1, w))
+        y_max = float(np.clip(box[3] + pad_y, y_min + 1, h))
+        return (x_min, y_min, x_max, y_max)
+
+    def predicted_point(self, image_shape: Tuple[int, int]) -> Tuple[float, float]:
+        """Point prompt for the next frame: centre of the predicted box."""
+        x_min, y_min, x_max, y_max = self.predicted_box(image_shape)
+        h, w = image_shape
+        return (min((x_min + x_max) / 2, w - 1), min((y_min + y_max) / 2, h - 1))
+
+    def keyframe_points(self, image_shape: Tuple[int, int]) -> List[Tuple[float, float]]:
+        """Grid of candidate person points over the centre of the frame."""
+        h, w = image_shape
+        n = self.config.keyframe_grid
+        # Cell centres of an n x n grid over the central region
+        offsets = (np.arange(n) + 0.5) / n - 0.5
+        xs = w / 2 + offsets * w * self.config.keyframe_region
+        ys = h / 2 + offsets * h * self.config.keyframe_region
+        return [(float(x), float(y)) for y in ys for x in xs]
+
+    def update(self, mask, confidence: float, is_valid: bool, keyframe: bool) -> bool:
+        """
+        Update the track with a frame's segmentation.
+
+        Args:
+            mask: Dense mask or CompactMask of the frame
+            confidence: SAM score of the mask
+            is_valid: Whether the result passed its confidence threshold
+            keyframe: Whether the mask came from a keyframe search
+
+        Returns:
+            True if the track is still held after this frame. On False after a
+            tracked frame, re-run the frame as a keyframe search.
+        """
+        compact = mask if isinstance(mask, CompactMask) else CompactMask.from_dense(mask)
+        bbox = compact.bbox
+        lost = (
+            not is_valid
+            or bbox is None
+            or confidence < self.config.min_tracking_confidence
+            or (not keyframe and self._mask is not None
+                and compact.iou(self._mask) < self.config.min_mask_iou)
+        )
+
+        # A failed tracked attempt is not counted; the frame is counted
+        # when the caller re-runs it as a keyframe
+        if keyframe:
+            self.stats.keyframes += 1
+            self._frames_since_keyframe = 0
+        elif not lost:
+            self.stats.tracked_frames += 1
+        self._frames_since_keyframe += 1
+
+        if lost:
+            if self._box is not None:
+                self.stats.track_losses += 1
+            self.reset()
+            return False
+
+        box = np.asarray(bbox, dtype=float)
+        if self._box is not None:
+            self._velocity = (self.config.momentum * self._velocity
+                              + (1.0 - self.config.momentum) * (box - self._box))
+        self._box = box
+        self._mask = compact
+        return True
@@ -6,14 +6,26 @@ Implements Segment Anything Model v3 for person segmentation with support for:
 - Box-based prompts (bounding boxes)
 - GPU acceleration (CUDA)
 - Multi-mask output with automatic best mask selection
+- Batched prompts (one decoder pass) and batched images
+- Automatic person prompting tracked from frame to frame
 """
 
 import numpy as np
 import torch
-from typing import Optional, Tuple, List, Union, Dict
-from dataclasses import dataclass
+from typing import Optional, Tuple, List, Union, Dict, Sequence
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from vision_service.segmentation.compact_mask import CompactMask
+
+from vision_service.segmentation.embedding_cache import (
+    EmbeddingCache,
+    restore_embedding,
+    snapshot_embedding,
+)
+from vision_service.segmentation.model_registry import SAMModelRegistry, get_model_registry
+from vision_service.segmentation.person_tracker import PersonTracker, TrackingConfig
+
 
 class PromptType(Enum):
     """Enum for different prompt types."""
@@ -25,7 +37,7 @@ class PromptType(Enum):
 @dataclass
 class SegmentationResult:
     """Result of segmentation operation."""
-    mask: np.ndarray  # Binary mask (H x W), dtype=bool
+    mask: Union[np.ndarray, CompactMask]  # Binary mask (H x W), dtype=bool
     confidence: float  # Confidence score (0.0-1.0)
     prompt_type: PromptType
     is_valid: bool
@@ -33,6 +45,44 @@ class SegmentationResult:
     stability_score: Optional[float] = None
     warning: Optional[str] = None
 
+    def compact(self) -> "SegmentationResult":
+        """
+        Get a copy whose mask is a CompactMask.
+
+        Use this for masks kept across a lock window or sent to another
+        process; np.asarray(result.mask) still decodes to the dense mask.
+        """
+        if isinstance(self.mask, CompactMask):
+            return self
+        return replace(self, mask=CompactMask.from_dense(self.mask))
+
+    def dense_mask(self) -> np.ndarray:
+        """Get the mask as a dense (H x W) bool array."""
+        if isinstance(self.mask, CompactMask):
+            return self.mask.to_dense()
+        return self.mask
+
+
+@dataclass
+class SegmentationPrompt:
+    """A point and/or box prompt for batched segmentation."""
+    point: Optional[Tuple[float, float]] = None  # (x, y) in image space
+    box: Optional[Tuple[float, float, float, float]] = None  # (x_min, y_min, x_max, y_max)
+    positive: bool = True  # Whether the point marks foreground
+
+    def __post_init__(self):
+        if self.point is None and self.box is None:
+            raise ValueError("A prompt needs a point, a box or both")
+
+    @property
+    def prompt_type(self) -> PromptType:
+        """Prompt type reported on the result."""
+        if self.point is None:
+            return PromptType.BOX
+        if self.box is None:
+            return PromptType.POINT
+        return PromptType.COMBINED
+
 
 class SAMSegmenter:
     """
@@ -47,15 +97,28 @@ class SAMSegmenter:
         checkpoint_path: Optional[str] = None,
         device: Optional[str] = None,
         use_cuda: bool = True,
+        registry: Optional[SAMModelRegistry] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        compact_masks: bool = False,
+        tracking_config: Optional[TrackingConfig] = None,
     ):
         """
         Initialize SAM 3 segmenter.
 
+        The model weights come from a registry shared by all segmenters in the
+        process; only the predictor (which holds the current image embedding)
+        belongs to this instance.
+
         Args:
             model_type: Model size - "vit_t", "vit_b", "vit_l", "vit_h"
             checkpoint_path: Path to pretrained weights. If None, downloads automatically.
             device: Device to run model on. If None, auto-detects.
             use_cuda: Whether to use CUDA GPU if available.
+            registry: Model registry to load from. Defaults to the process-wide one.
+            embedding_cache: Cache for reusing image embeddings of unchanged
+                frames in set_image(). None always runs the image encoder.
+            compact_masks: Return masks as CompactMask instead of dense arrays.
+            tracking_config: Keyframe and tracking settings for segment_person().
 
         Raises:
             RuntimeError: If model initialization fails.
@@ -63,19 +126,22 @@ class SAMSegmenter:
         self.model_type = model_type
         self.use_cuda = use_cuda
         self.device = device or self._select_device()
+        self.checkpoint_path = checkpoint_path
+        self.registry = registry if registry is not None else get_model_registry()
+        self.embedding_cache = embedding_cache
+        self.compact_masks = compact_masks
+        self.person_tracker = PersonTracker(tracking_config)
         self.predictor = None
         self.model = None
 
         try:
-            from sam3 import build_sam3_vit, SamPredictor3
-
-            # Build model
-            self.model = build_sam3_vit(model_type=model_type, checkpoint=checkpoint_path)
-            self.model.to(self.device)
-            self.model.eval()
+            # Shared, already warm if the registry preloaded it
+            self.model = self.registry.get_model(model_type, checkpoint_path, self.device)
 
-            # Create predictor
-            self.predictor = SamPredictor3(self.model)
+            # Per-session predictor
+            self.predictor = self.registry.create_predictor(
+                model_type, checkpoint_path, self.device
+            )
 
         except ImportError as e:
             raise RuntimeError(
@@ -98,18 +164,29 @@ class SAMSegmenter:
         """
         Set the image for segmentation.
 
+        With an embedding cache, the image encoder is skipped when the frame
+        is nearly unchanged from the one the last embedding came from, or
+        matches a cached frame.
+
         Args:
             image: Input image (H x W x 3) in RGB format, dtype=uint8.
 
         Raises:
             ValueError: If image format is invalid.
         """
-        if image.ndim != 3 or image.shape[2] != 3:
-            raise ValueError(f"Expected RGB image (H x W x 3), got shape {image.shape}")
-        if image.dtype != np.uint8:
-            raise ValueError(f"Expected uint8 image, got {image.dtype}")
+        self._validate_image(image)
 
-        self.predictor.set_image(image)
+        cache = self.embedding_cache
+        if cache is None:
+            self.predictor.set_image(image)
+        else:
+            signature = cache.signature(image)
+            state = cache.lookup(signature)
+            if state is not None:
+                restore_embedding(self.predictor, state)
+            else:
+                self.predictor.set_image(image)
+                cache.store(signature, snapshot_embedding(self.predictor))
         self.current_image_shape = image.shape[:2]
 
     def segment_with_point(
@@ -155,32 +232,12 @@ class SAMSegmenter:
                     multimask_output=True,
                 )
 
-            # Select best mask
-            best_mask, best_score, iou, stability = self._select_best_mask(
-                masks, scores
-            )
-
-            confidence = float(best_score)
-            is_valid = confidence >= confidence_threshold
-
-            return SegmentationResult(
-                mask=best_mask.astype(bool),
-                confidence=confidence,
-                prompt_type=PromptType.POINT,
-                is_valid=is_valid,
-                iou=float(iou),
-                stability_score=float(stability),
-                warning="Low confidence" if not is_valid else None,
+            return self._result_from_prediction(
+                masks, scores, PromptType.POINT, confidence_threshold
             )
 
         except Exception as e:
-            return SegmentationResult(
-                mask=np.zeros(self.current_image_shape, dtype=bool),
-                confidence=0.0,
-                prompt_type=PromptType.POINT,
-                is_valid=False,
-                warning=f"Segmentation failed: {str(e)}",
-            )
+            return self._failed_result(PromptType.POINT, e)
 
     def segment_with_box(
         self,
@@ -219,32 +276,12 @@ class SAMSegmenter:
                     multimask_output=True,
                 )
 
-            # Select best mask
-            best_mask, best_score, iou, stability = self._select_best_mask(
-                masks, scores
-            )
-
-            confidence = float(best_score)
-            is_valid = confidence >= confidence_threshold
-
-            return SegmentationResult(
-                mask=best_mask.astype(bool),
-                confidence=confidence,
-                prompt_type=PromptType.BOX,
-                is_valid=is_valid,
-                iou=float(iou),
-                stability_score=float(stability),
-                warning="Low confidence" if not is_valid else None,
+            return self._result_from_prediction(
+                masks, scores, PromptType.BOX, confidence_threshold
             )
 
         except Exception as e:
-            return SegmentationResult(
-                mask=np.zeros(self.current_image_shape, dtype=bool),
-                confidence=0.0,
-                prompt_type=PromptType.BOX,
-                is_valid=False,
-                warning=f"Segmentation failed: {str(e)}",
-            )
+            return self._failed_result(PromptType.BOX, e)
 
     def segment_with_point_and_box(
         self,
@@ -290,32 +327,257 @@ class SAMSegmenter:
                     multimask_output=True,
                 )
 
-            # Select best mask
-            best_mask, best_score, iou, stability = self._select_best_mask(
-                masks, scores
+            return self._result_from_prediction(
+                masks, scores, PromptType.COMBINED, confidence_threshold
             )
 
-            confidence = float(best_score)
-            is_valid = confidence >= confidence_threshold
-
-            return SegmentationResult(
-                mask=best_mask.astype(bool),
-                confidence=confidence,
-                prompt_type=PromptType.COMBINED,
-                is_valid=is_valid,
-                iou=float(iou),
-                stability_score=float(stability),
-                warning="Low confidence" if not is_valid else None,
-            )
+        except Exception as e:
+            return self._failed_result(PromptType.COMBINED, e)
+
+    def segment_prompts(
+        self,
+        prompts: Sequence[SegmentationPrompt],
+        confidence_threshold: float = 0.5,
+    ) -> List[SegmentationResult]:
+        """
+        Segment many prompts against the current image in one decoder pass.
+
+        The image embedding from set_image() is reused for every prompt.
+        Prompts of the same type (point, box, combined) are decoded together
+        as one batch, so e.g. several people in one frame cost one pass.
+
+        Args:
+            prompts: Prompts to segment.
+            confidence_threshold: Minimum confidence to accept each mask.
+
+        Returns:
+            One SegmentationResult per prompt, in input order.
+
+        Raises:
+            RuntimeError: If no image is set.
+            ValueError: If a point or box is invalid or out of bounds.
+        """
+        if not hasattr(self, "current_image_shape"):
+            raise RuntimeError("No image set. Call set_image() first.")
+        for prompt in prompts:
+            self._validate_prompt(prompt, self.current_image_shape)
+
+        results: List[Optional[SegmentationResult]] = [None] * len(prompts)
+        for prompt_type in PromptType:
+            group = [i for i, prompt in enumerate(prompts) if prompt.prompt_type == prompt_type]
+            if not group:
+                continue
+            try:
+                masks, scores = self._predict_batch([prompts[i] for i in group])
+                for row, i in enumerate(group):
+                    results[i] = self._result_from_prediction(
+                        masks[row], scores[row], prompt_type, confidence_threshold
+                    )
+            except Exception as e:
+                for i in group:
+                    results[i] = self._failed_result(prompt_type, e)
+        return results
+
+    def segment_images(
+        self,
+        images: Sequence[np.ndarray],
+        prompts: Sequence[SegmentationPrompt],
+        confidence_threshold: float = 0.5,
+    ) -> List[SegmentationResult]:
+        """
+        Segment several images, one prompt each, with a batched encoder pass.
+
+        Intended for multi-camera captures. When the predictor supports batched
+        images (set_image_batch / predict_batch) all images are encoded and
+        decoded together; otherwise each image is set and segmented in turn.
+        Afterwards no single image is set, so call set_image() before using
+        the single-image methods again.
+
+        Args:
+            images: RGB images (H x W x 3), dtype=uint8.
+            prompts: One prompt per image.
+            confidence_threshold: Minimum confidence to accept each mask.
+
+        Returns:
+            One SegmentationResult per image, in input order.
 
+        Raises:
+            ValueError: If the counts differ or an image or prompt is invalid.
+        """
+        if len(images) != len(prompts):
+            raise ValueError(f"Got {len(images)} images but {len(prompts)} prompts")
+        for image, prompt in zip(images, prompts):
+            self._validate_image(image)
+            self._validate_prompt(prompt, image.shape[:2])
+
+        if not hasattr(self.predictor, "set_image_batch"):
+            results = []
+            for image, prompt in zip(images, prompts):
+                self.set_image(image)
+                results.append(self.segment_prompts([prompt], confidence_threshold)[0])
+            self._clear_image()
+            return results
+
+        self._clear_image()
+        try:
+            self.predictor.set_image_batch(list(images))
+            with torch.no_grad():
+                masks_batch, scores_batch, _ = self.predictor.predict_batch(
+                    point_coords_batch=[
+                        None if p.point is None else np.array([p.point]) for p in prompts
+                    ],
+                    point_labels_batch=[
+                        None if p.point is None else np.array([1 if p.positive else 0])
+                        for p in prompts
+                    ],
+                    box_batch=[None if p.box is None else np.array(p.box) for p in prompts],
+                    multimask_output=True,
+                )
         except Exception as e:
-            return SegmentationResult(
-                mask=np.zeros(self.current_image_shape, dtype=bool),
-                confidence=0.0,
-                prompt_type=PromptType.COMBINED,
-                is_valid=False,
-                warning=f"Segmentation failed: {str(e)}",
+            return [
+                self._failed_result(prompt.prompt_type, e, image.shape[:2])
+                for image, prompt in zip(images, prompts)
+            ]
+
+        return [
+            self._result_from_prediction(
+                np.asarray(masks), np.asarray(scores), prompt.prompt_type, confidence_threshold
             )
+            for masks, scores, prompt in zip(masks_batch, scores_batch, prompts)
+        ]
+
+    def segment_person(
+        self,
+        prompt_type: Optional[PromptType] = None,
+        auto_prompt: bool = True,
+        point: Optional[Tuple[float, float]] = None,
+        box: Optional[Tuple[float, float, float, float]] = None,
+        positive: bool = True,
+        confidence_threshold: float = 0.5,
+    ) -> SegmentationResult:
+        """
+        Segment the person in the current image.
+
+        With auto_prompt, prompts come from the person tracker. Most frames
+        decode one prompt derived from the previous frame's mask (its box,
+        advanced by a momentum-smoothed velocity). A keyframe search, a
+        batch of point prompts over the frame centre, runs every
+        keyframe_interval frames, when there is no track, or when tracking
+        confidence drops (in which case it replaces the tracked result for
+        this frame).
+
+        Args:
+            prompt_type: Prompt derived from the track: BOX (default), POINT
+                (box centre) or COMBINED.
+            auto_prompt: Derive prompts automatically. If False, point and/or
+                box must be given.
+            point: (x, y) prompt when auto_prompt is False.
+            box: (x_min, y_min, x_max, y_max) prompt when auto_prompt is False.
+            positive: If True, the point indicates foreground.
+            confidence_threshold: Minimum confidence to accept the mask.
+
+        Returns:
+            SegmentationResult for the person.
+
+        Raises:
+            RuntimeError: If no image is set.
+            ValueError: If auto_prompt is False and no point or box is given.
+        """
+        if not hasattr(self, "current_image_shape"):
+            raise RuntimeError("No image set. Call set_image() first.")
+
+        if not auto_prompt:
+            if point is None and box is None:
+                raise ValueError("A point or box is required when auto_prompt is False")
+            prompt = SegmentationPrompt(point=point, box=box, positive=positive)
+            return self.segment_prompts([prompt], confidence_threshold)[0]
+
+        tracker = self.person_tracker
+        image_shape = self.current_image_shape
+        if not tracker.needs_keyframe(image_shape):
+            prompt = self._tracked_prompt(prompt_type, image_shape)
+            result = self.segment_prompts([prompt], confidence_threshold)[0]
+            if tracker.update(result.mask, result.confidence, result.is_valid, keyframe=False):
+                return result
+
+        prompts = [SegmentationPrompt(point=p) for p in tracker.keyframe_points(image_shape)]
+        results = self.segment_prompts(prompts, confidence_threshold)
+        result = max(results, key=lambda r: r.confidence)
+        tracker.update(result.mask, result.confidence, result.is_valid, keyframe=True)
+        return result
+
+    def _tracked_prompt(
+        self, prompt_type: Optional[PromptType], image_shape: Tuple[int, int]
+    ) -> SegmentationPrompt:
+        """Build the prompt for a tracked frame."""
+        tracker = self.person_tracker
+        if prompt_type == PromptType.POINT:
+            return SegmentationPrompt(point=tracker.predicted_point(image_shape))
+        box = tracker.predicted_box(image_shape)
+        if prompt_type == PromptType.COMBINED:
+            return SegmentationPrompt(point=tracker.predicted_point(image_shape), box=box)
+        return SegmentationPrompt(box=box)
+
+    def _predict_batch(
+        self, prompts: Sequence[SegmentationPrompt]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decode prompts of one type in a single batched predictor call.
+
+        Returns:
+            Tuple of masks (B x 3 x H x W) and scores (B x 3).
+        """
+        original_size = tuple(self.current_image_shape)
+        point_coords = point_labels = boxes = None
+
+        if prompts[0].point is not None:
+            coords = torch.as_tensor(
+                [[p.point] for p in prompts], dtype=torch.float32, device=self.device
+            )
+            point_coords = self.predictor.transform.apply_coords_torch(coords, original_size)
+            point_labels = torch.as_tensor(
+                [[1 if p.positive else 0] for p in prompts], device=self.device
+            )
+        if prompts[0].box is not None:
+            box_tensor = torch.as_tensor(
+                [p.box for p in prompts], dtype=torch.float32, device=self.device
+            )
+            boxes = self.predictor.transform.apply_boxes_torch(box_tensor, original_size)
+
+        with torch.no_grad():
+            masks, scores, _ = self.predictor.predict_torch(
+                point_coords=point_coords,
+                point_labels=point_labels,
+                boxes=boxes,
+                multimask_output=True,
+            )
+        return masks.cpu().numpy(), scores.float().cpu().numpy()
+
+    def _validate_image(self, image: np.ndarray) -> None:
+        """Check an image is RGB uint8."""
+        if image.ndim != 3 or image.shape[2] != 3:
+            raise ValueError(f"Expected RGB image (H x W x 3), got shape {image.shape}")
+        if image.dtype != np.uint8:
+            raise ValueError(f"Expected uint8 image, got {image.dtype}")
+
+    def _validate_prompt(self, prompt: SegmentationPrompt, image_shape: Tuple[int, int]) -> None:
+        """Check a prompt's point and box lie inside an image."""
+        h, w = image_shape
+        if prompt.point is not None:
+            x, y = prompt.point
+            if not (0 <= x < w and 0 <= y < h):
+                raise ValueError(f"Point ({x}, {y}) out of image bounds ({w}x{h})")
+        if prompt.box is not None:
+            x_min, y_min, x_max, y_max = prompt.box
+            if not (x_min < x_max and y_min < y_max):
+                raise ValueError(f"Invalid box: {prompt.box}")
+            if not (0 <= x_min < w and 0 <= x_max <= w and 0 <= y_min < h and 0 <= y_max <= h):
+                raise ValueError(f"Box {prompt.box} out of image bounds ({w}x{h})")
+
+    def _clear_image(self) -> None:
+        """Forget the current single image."""
+        if hasattr(self, "current_image_shape"):
+            del self.current_image_shape
 
     def _select_best_mask(
         self, masks: np.ndarray, scores: np.ndarray
@@ -351,6 +613,55 @@ class SAMSegmenter:
 
         return best_mask, best_score, iou_prediction, stability_score
 
+    def _result_from_prediction(
+        self,
+        masks: np.ndarray,
+        scores: np.ndarray,
+        prompt_type: PromptType,
+        confidence_threshold: float,
+    ) -> SegmentationResult:
+        """Build a result from one prompt's candidate masks and scores."""
+        best_mask, best_score, iou, stability = self._select_best_mask(masks, scores)
+
+        confidence = float(best_score)
+        is_valid = confidence >= confidence_threshold
+
+        if self.compact_masks:
+            mask = CompactMask.from_dense(best_mask)
+        else:
+            mask = best_mask.astype(bool)
+
+        return SegmentationResult(
+            mask=mask,
+            confidence=confidence,
+            prompt_type=prompt_type,
+            is_valid=is_valid,
+            iou=float(iou),
+            stability_score=float(stability),
+            warning="Low confidence" if not is_valid else None,
+        )
+
+    def _failed_result(
+        self,
+        prompt_type: PromptType,
+        error: Exception,
+        image_shape: Optional[Tuple[int, int]] = None,
+    ) -> SegmentationResult:
+        """Build the empty result returned when prediction raises."""
+        shape = image_shape or self.current_image_shape
+        if self.compact_masks:
+            mask = CompactMask.empty(shape)
+        else:
+            mask = np.zeros(shape, dtype=bool)
+
+        return SegmentationResult(
+            mask=mask,
+            confidence=0.0,
+            prompt_type=prompt_type,
+            is_valid=False,
+            warning=f"Segmentation failed: {str(error)}",
+        )
+
     def get_device_info(self) -> Dict[str, str]:
         """Get information about the device being used."""
         return {
@@ -364,15 +675,37 @@ class SAMSegmenter:
 def create_segmenter(
     model_type: str = "vit_b",
     use_cuda: bool = True,
+    checkpoint_path: Optional[str] = None,
+    registry: Optional[SAMModelRegistry] = None,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    compact_masks: bool = False,
+    tracking_config: Optional[TrackingConfig] = None,
 ) -> SAMSegmenter:
     """
     Factory function to create a SAM3 segmenter.
 
+    Segmenters created for the same model, checkpoint and device share one
+    copy of the weights, so calling this per session is cheap after the
+    first load.
+
     Args:
         model_type: Model size - "vit_t", "vit_b", "vit_l", "vit_h"
         use_cuda: Whether to use CUDA if available.
+        checkpoint_path: Path to pretrained weights. If None, downloads automatically.
+        registry: Model registry to load from. Defaults to the process-wide one.
+        embedding_cache: Cache for reusing image embeddings in set_image().
+        compact_masks: Return masks as CompactMask instead of dense arrays.
+        tracking_config: Keyframe and tracking settings for segment_person().
 
     Returns:
         SAMSegmenter instance ready for segmentation.
     """
-    return SAMSegmenter(model_type=model_type, use_cuda=use_cuda)
+    return SAMSegmenter(
+        model_type=model_type,
+        checkpoint_path=checkpoint_path,
+        use_cuda=use_cuda,
+        registry=registry,
+        embedding_cache=embedding_cache,
+        compact_masks=compact_masks,
+        tracking_config=tracking_config,
+    )
@@ -0,0 +1,143 @@
+"""
+Tests for the compact mask representation.
+"""
+
+import pickle
+import unittest
+import numpy as np
+from unittest.mock import MagicMock
+
+from vision_service.segmentation.compact_mask import CompactMask
+from vision_service.segmentation.sam_segment import (
+    PromptType,
+    SAMSegmenter,
+    SegmentationResult,
+)
+
+
+def _person_mask(shape=(120, 161), x=(37, 90), y=(10, 111)):
+    """Create an elliptical mask inside the given box."""
+    rows, cols = np.mgrid[:shape[0], :shape[1]]
+    cy, cx = (y[0] + y[1] - 1) / 2, (x[0] + x[1] - 1) / 2
+    ry, rx = (y[1] - y[0]) / 2, (x[1] - x[0]) / 2
+    return ((rows - cy) / ry) ** 2 + ((cols - cx) / rx) ** 2 <= 1.0
+
+
+class TestCompactMask(unittest.TestCase):
+    """Test compression, decoding and metrics."""
+
+    def setUp(self):
+        self.mask = _person_mask()
+        self.compact = CompactMask.from_dense(self.mask)
+
+    def test_round_trip(self):
+        """Test decoding restores the exact mask."""
+        np.testing.assert_array_equal(self.compact.to_dense(), self.mask)
+        np.testing.assert_array_equal(np.asarray(self.compact), self.mask)
+        self.assertEqual(self.compact.to_dense().dtype, bool)
+
+    def test_smaller_than_dense(self):
+        """Test the packed form is much smaller than the bool array."""
+        self.assertLess(self.compact.nbytes * 8, self.mask.nbytes)
+
+    def test_area_and_bbox(self):
+        """Test area and box match the dense mask."""
+        ys, xs = np.nonzero(self.mask)
+        self.assertEqual(self.compact.area, int(self.mask.sum()))
+        self.assertEqual(self.compact.bbox,
+                         (xs.min(), ys.min(), xs.max() + 1, ys.max() + 1))
+
+    def test_iou_matches_dense(self):
+        """Test IoU on packed bytes equals the dense computation."""
+        other_mask = _person_mask(x=(50, 140), y=(30, 120))
+        other = CompactMask.from_dense(other_mask)
+
+        intersection = np.logical_and(self.mask, other_mask).sum()
+        union = np.logical_or(self.mask, other_mask).sum()
+        self.assertEqual(self.compact.intersection_area(other), intersection)
+        self.assertAlmostEqual(self.compact.iou(other), intersection / union)
+        self.assertEqual(self.compact.iou(self.compact), 1.0)
+
+    def test_disjoint_and_empty(self):
+        """Test disjoint and empty masks."""
+        far = CompactMask.from_dense(_person_mask(x=(120, 160), y=(0, 5)))
+        empty = CompactMask.empty(self.mask.shape)
+
+        self.assertEqual(self.compact.iou(far), 0.0)
+        self.assertEqual(empty.area, 0)
+        self.assertIsNone(empty.bbox)
+        self.assertEqual(empty.iou(empty), 0.0)
+        self.assertFalse(empty.to_dense().any())
+        self.assertEqual(CompactMask.from_dense(np.zeros((4, 4), dtype=bool)).nbytes, 0)
+
+    def test_shape_mismatch(self):
+        """Test comparing masks of different images is rejected."""
+        with self.assertRaises(ValueError):
+            self.compact.iou(CompactMask.empty((10, 10)))
+
+    def test_read_only(self):
+        """Test the packed bits cannot be modified."""
+        with self.assertRaises(ValueError):
+            self.compact.packed[0, 0] = 0
+
+    def test_bytes_round_trip(self):
+        """Test serialized masks decode as zero-copy views."""
+        buffer = bytearray(self.compact.to_bytes())
+        restored = CompactMask.from_bytes(buffer)
+
+        np.testing.assert_array_equal(restored.to_dense(), self.mask)
+        self.assertTrue(np.shares_memory(restored.packed, np.frombuffer(buffer, dtype=np.uint8)))
+
+    def test_pickle(self):
+        """Test masks pickle for process boundaries."""
+        restored = pickle.loads(pickle.dumps(self.compact))
+        np.testing.assert_array_equal(restored.to_dense(), self.mask)
+
+    def test_edge_touching_mask(self):
+        """Test masks reaching the last partial byte column decode."""
+        mask = np.zeros((5, 13), dtype=bool)
+        mask[1:4, 9:13] = True
+        compact = CompactMask.from_dense(mask)
+
+        np.testing.assert_array_equal(compact.to_dense(), mask)
+        self.assertEqual(compact.bbox, (9, 1, 13, 4))
+
+
+class TestCompactResults(unittest.TestCase):
+    """Test segmentation results with compact masks."""
+
+    def test_result_compact(self):
+        """Test converting a result keeps its fields."""
+        mask = _person_mask()
+        result = SegmentationResult(mask=mask, confidence=0.9, prompt_type=PromptType.BOX,
+                                    is_valid=True)
+        compact = result.compact()
+
+        self.assertIsInstance(compact.mask, CompactMask)
+        self.assertEqual(compact.confidence, 0.9)
+        np.testing.assert_array_equal(compact.dense_mask(), mask)
+        self.assertIs(compact.compact(), compact)
+
+    def test_segmenter_compact_masks(self):
+        """Test segmenters can return compact masks, including failures."""
+        segmenter = SAMSegmenter.__new__(SAMSegmenter)
+        segmenter.embedding_cache = None
+        segmenter.compact_masks = True
+        segmenter.predictor = MagicMock()
+        segmenter.set_image(np.zeros((120, 161, 3), dtype=np.uint8))
+
+        masks = np.stack([_person_mask()] * 3)
+        segmenter.predictor.predict.return_value = (masks, np.array([0.5, 0.9, 0.7]), None)
+        result = segmenter.segment_with_point((60, 60))
+        self.assertIsInstance(result.mask, CompactMask)
+        np.testing.assert_array_equal(result.dense_mask(), masks[1])
+
+        segmenter.predictor.predict.side_effect = RuntimeError("decoder failed")
+        failed = segmenter.segment_with_point((60, 60))
+        self.assertIsInstance(failed.mask, CompactMask)
+        self.assertEqual(failed.mask.nbytes, 0)
+        self.assertEqual(failed.mask.shape, (120, 161))
+
+
+if __name__ == "__main__":
+    unittest.main()
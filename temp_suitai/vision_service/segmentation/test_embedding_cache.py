@@ -0,0 +1,191 @@
+"""
+Tests for the SAM image-embedding cache.
+"""
+
+import unittest
+import numpy as np
+import torch
+from unittest.mock import MagicMock
+
+from vision_service.segmentation.embedding_cache import (
+    EmbeddingCache,
+    EmbeddingCacheConfig,
+    frame_signature,
+    restore_embedding,
+    snapshot_embedding,
+)
+from vision_service.segmentation.sam_segment import SAMSegmenter
+
+
+def _frame(seed, shape=(120, 160)):
+    """Create a smooth random RGB frame."""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, (shape[0] // 20, shape[1] // 20, 3))
+    return np.kron(coarse, np.ones((20, 20, 1))).astype(np.uint8)
+
+
+def _state(megabytes=1.0):
+    """Create an embedding state of roughly the given size."""
+    return {
+        "features": torch.zeros(int(megabytes * 1024 * 1024 / 4)),
+        "original_size": (120, 160),
+        "is_image_set": True,
+    }
+
+
+class TestFrameSignature(unittest.TestCase):
+    """Test perceptual hashing."""
+
+    def test_identical_frames(self):
+        """Test identical frames share hash and thumbnail."""
+        first = frame_signature(_frame(0))
+        second = frame_signature(_frame(0))
+
+        self.assertEqual(first.key, second.key)
+        np.testing.assert_array_equal(first.thumbnail, second.thumbnail)
+        self.assertEqual(first.thumbnail.shape, (32, 32))
+
+    def test_different_frames(self):
+        """Test different scenes hash differently."""
+        self.assertNotEqual(frame_signature(_frame(0)).hash, frame_signature(_frame(1)).hash)
+
+    def test_small_frames(self):
+        """Test frames smaller than the thumbnail still hash."""
+        signature = frame_signature(np.zeros((4, 6, 3), dtype=np.uint8))
+        self.assertEqual(signature.thumbnail.shape, (4, 6))
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test lookups, change detection and eviction."""
+
+    def setUp(self):
+        self.cache = EmbeddingCache(EmbeddingCacheConfig(memory_budget_mb=2.5))
+
+    def test_miss_then_hit(self):
+        """Test a stored frame is found again."""
+        signature = self.cache.signature(_frame(0))
+        self.assertIsNone(self.cache.lookup(signature))
+
+        state = _state()
+        self.cache.store(signature, state)
+        self.assertIs(self.cache.lookup(self.cache.signature(_frame(0))), state)
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.temporal_hits, 1)
+        self.assertEqual(stats.hit_rate, 0.5)
+
+    def test_small_change_reuses_embedding(self):
+        """Test sensor noise below the threshold reuses the last embedding."""
+        frame = _frame(0)
+        state = _state()
+        self.cache.store(self.cache.signature(frame), state)
+
+        noisy = np.clip(frame.astype(int) + np.random.default_rng(1).integers(-3, 4, frame.shape),
+                        0, 255).astype(np.uint8)
+        self.assertIs(self.cache.lookup(self.cache.signature(noisy)), state)
+        self.assertEqual(self.cache.get_stats().temporal_hits, 1)
+
+    def test_scene_change_misses(self):
+        """Test a different scene runs the encoder."""
+        self.cache.store(self.cache.signature(_frame(0)), _state())
+        self.assertIsNone(self.cache.lookup(self.cache.signature(_frame(1))))
+
+    def test_hash_hit_after_scene_change(self):
+        """Test returning to an earlier scene hits by hash."""
+        first, second = _state(), _state()
+        self.cache.store(self.cache.signature(_frame(0)), first)
+        self.cache.store(self.cache.signature(_frame(1)), second)
+
+        self.assertIs(self.cache.lookup(self.cache.signature(_frame(0))), first)
+        self.assertEqual(self.cache.get_stats().hits, 1)
+
+    def test_hash_collision_with_different_content_misses(self):
+        """Test a frame sharing a hash but not the content is not reused."""
+        ramp = np.broadcast_to(np.linspace(0, 255, 160)[None, :, None], (120, 160, 3))
+        bright, dark = ramp.astype(np.uint8), (ramp * 0.3).astype(np.uint8)
+        self.assertEqual(self.cache.signature(bright).key, self.cache.signature(dark).key)
+
+        self.cache.store(self.cache.signature(bright), _state())
+        self.cache.store(self.cache.signature(_frame(1)), _state())
+
+        self.assertIsNone(self.cache.lookup(self.cache.signature(dark)))
+        self.assertEqual(self.cache.get_stats().hits, 0)
+
+    def test_lru_eviction_by_memory(self):
+        """Test the least recently used entry is evicted over budget."""
+        signatures = [self.cache.signature(_frame(seed)) for seed in range(3)]
+        self.cache.store(signatures[0], _state())
+        self.cache.store(signatures[1], _state())
+        self.cache.lookup(signatures[0])
+        self.cache.store(signatures[2], _state())
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats.entries, 2)
+        self.assertEqual(stats.evictions, 1)
+        self.assertLessEqual(stats.memory_bytes, 2.5 * 1024 * 1024)
+        self.assertIsNotNone(self.cache.lookup(signatures[0]))
+        self.assertIsNone(self.cache.lookup(signatures[1]))
+
+    def test_oversized_state_not_cached(self):
+        """Test states larger than the budget are skipped."""
+        self.cache.store(self.cache.signature(_frame(0)), _state(megabytes=3.0))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalid_config(self):
+        """Test invalid settings are rejected."""
+        with self.assertRaises(ValueError):
+            EmbeddingCacheConfig(memory_budget_mb=0)
+        with self.assertRaises(ValueError):
+            EmbeddingCacheConfig(change_threshold=-1.0)
+
+
+class TestSegmenterCaching(unittest.TestCase):
+    """Test set_image skips the encoder on cache hits."""
+
+    def setUp(self):
+        self.segmenter = SAMSegmenter.__new__(SAMSegmenter)
+        self.segmenter.embedding_cache = EmbeddingCache()
+        self.segmenter.compact_masks = False
+        predictor = MagicMock(spec=["set_image", "features", "original_size", "is_image_set"])
+
+        def set_image(image):
+            predictor.features = torch.full((4,), float(image.mean()))
+            predictor.original_size = image.shape[:2]
+            predictor.is_image_set = True
+
+        predictor.set_image.side_effect = set_image
+        self.segmenter.predictor = predictor
+
+    def test_static_frames_encoded_once(self):
+        """Test a still scene runs the image encoder once."""
+        for _ in range(5):
+            self.segmenter.set_image(_frame(0))
+
+        self.assertEqual(self.segmenter.predictor.set_image.call_count, 1)
+        self.assertEqual(self.segmenter.embedding_cache.get_stats().temporal_hits, 4)
+
+    def test_restores_cached_embedding(self):
+        """Test switching back restores the earlier scene's embedding."""
+        self.segmenter.set_image(_frame(0))
+        first = self.segmenter.predictor.features
+        self.segmenter.set_image(_frame(1))
+        self.segmenter.set_image(_frame(0))
+
+        self.assertEqual(self.segmenter.predictor.set_image.call_count, 2)
+        self.assertIs(self.segmenter.predictor.features, first)
+        self.assertEqual(self.segmenter.current_image_shape, (120, 160))
+
+    def test_snapshot_round_trip(self):
+        """Test snapshots hold only embedding attributes."""
+        self.segmenter.set_image(_frame(0))
+        state = snapshot_embedding(self.segmenter.predictor)
+        self.assertEqual(set(state), {"features", "original_size", "is_image_set"})
+
+        other = MagicMock()
+        restore_embedding(other, state)
+        self.assertIs(other.features, state["features"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for the process-wide SAM3 model registry.
+
+The sam3 package is replaced by a fake module whose model is a small
+torch module, so loading, sharing and warm-up can be checked without
+pretrained weights.
+"""
+
+import sys
+import types
+import unittest
+import numpy as np
+import torch
+from unittest.mock import MagicMock, patch
+
+from vision_service.segmentation import model_registry
+from vision_service.segmentation.model_registry import (
+    ModelLoadStats,
+    SAMModelRegistry,
+    get_model_registry,
+)
+from vision_service.segmentation.sam_segment import SAMSegmenter, create_segmenter
+
+
+def _fake_sam3():
+    """Create a fake sam3 module with a build counter."""
+    module = types.ModuleType("sam3")
+    module.build_sam3_vit = MagicMock(side_effect=lambda **kwargs: torch.nn.Linear(4, 2))
+
+    def make_predictor(model):
+        predictor = MagicMock()
+        predictor.model = model
+        masks = np.zeros((3, 8, 8), dtype=bool)
+        predictor.predict.return_value = (masks, np.array([0.5, 0.9, 0.7]), None)
+        return predictor
+
+    module.SamPredictor3 = MagicMock(side_effect=make_predictor)
+    return module
+
+
+class RegistryTestCase(unittest.TestCase):
+    """Install the fake sam3 module for each test."""
+
+    def setUp(self):
+        self.sam3 = _fake_sam3()
+        patcher = patch.dict(sys.modules, {"sam3": self.sam3})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = SAMModelRegistry(warmup_image_size=16)
+
+
+class TestModelSharing(RegistryTestCase):
+    """Test models are loaded once and shared."""
+
+    def test_model_loaded_once(self):
+        """Test repeated lookups return the same model."""
+        first = self.registry.get_model("vit_b", None, "cpu")
+        second = self.registry.get_model("vit_b", None, "cpu")
+
+        self.assertIs(first, second)
+        self.sam3.build_sam3_vit.assert_called_once_with(model_type="vit_b", checkpoint=None)
+        self.assertEqual(len(self.registry), 1)
+
+    def test_keys_are_distinct(self):
+        """Test model type and checkpoint select different models."""
+        base = self.registry.get_model("vit_b", None, "cpu")
+        large = self.registry.get_model("vit_l", None, "cpu")
+        tuned = self.registry.get_model("vit_b", "tuned.pt", "cpu")
+
+        self.assertIsNot(base, large)
+        self.assertIsNot(base, tuned)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_weights_frozen(self):
+        """Test shared weights are in eval mode without gradients."""
+        model = self.registry.get_model()
+
+        self.assertFalse(model.training)
+        self.assertTrue(all(not p.requires_grad for p in model.parameters()))
+
+    def test_predictors_are_per_session(self):
+        """Test each predictor is new but wraps the shared model."""
+        first = self.registry.create_predictor()
+        second = self.registry.create_predictor()
+
+        self.assertIsNot(first, second)
+        self.assertIs(first.model, second.model)
+        self.assertEqual(self.registry.get_stats()[("vit_b", None, "cpu")].predictors_created, 2)
+
+    def test_release(self):
+        """Test released models are rebuilt on next use."""
+        self.registry.get_model()
+        self.registry.release()
+
+        self.assertFalse(self.registry.is_loaded())
+        self.registry.get_model()
+        self.assertEqual(self.sam3.build_sam3_vit.call_count, 2)
+
+    def test_missing_sam3(self):
+        """Test loading without sam3 raises ImportError."""
+        with patch.dict(sys.modules, {"sam3": None}):
+            with self.assertRaises(ImportError):
+                self.registry.get_model()
+
+
+class TestPreload(RegistryTestCase):
+    """Test preloading, warm-up and metrics."""
+
+    def test_preload_with_warmup(self):
+        """Test preloading records load and warm-up metrics."""
+        stats = self.registry.preload("vit_b", device="cpu")
+
+        self.assertIsInstance(stats, ModelLoadStats)
+        self.assertEqual(stats.parameter_count, 4 * 2 + 2)
+        self.assertGreaterEqual(stats.load_seconds, 0.0)
+        self.assertGreater(stats.warmup_seconds, 0.0)
+        self.assertIs(self.registry.get_stats()[("vit_b", None, "cpu")], stats)
+
+    def test_warmup_uses_dummy_image(self):
+        """Test warm-up runs set_image and predict once on a blank image."""
+        predictors = []
+        self.sam3.SamPredictor3.side_effect = lambda model: predictors.append(MagicMock()) or predictors[-1]
+
+        self.registry.preload()
+
+        image = predictors[0].set_image.call_args[0][0]
+        self.assertEqual(image.shape, (16, 16, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        predictors[0].predict.assert_called_once()
+
+    def test_preload_without_warmup(self):
+        """Test warm-up can be skipped."""
+        stats = self.registry.preload(warmup=False)
+
+        self.assertEqual(stats.warmup_seconds, 0.0)
+        self.sam3.SamPredictor3.assert_not_called()
+
+    def test_invalid_warmup_size(self):
+        """Test non-positive warm-up sizes are rejected."""
+        with self.assertRaises(ValueError):
+            SAMModelRegistry(warmup_image_size=0)
+
+
+class TestSegmenterIntegration(RegistryTestCase):
+    """Test segmenters draw weights from the registry."""
+
+    def test_segmenters_share_model(self):
+        """Test two segmenters share weights but not predictors."""
+        first = SAMSegmenter(device="cpu", registry=self.registry)
+        second = create_segmenter(use_cuda=False, registry=self.registry)
+
+        self.assertIs(first.registry, self.registry)
+        self.assertIs(second.registry, self.registry)
+        self.assertIs(first.model, second.model)
+        self.assertIsNot(first.predictor, second.predictor)
+        self.sam3.build_sam3_vit.assert_called_once()
+        self.assertEqual(len(self.registry), 1)
+
+    def test_default_registry_is_process_wide(self):
+        """Test segmenters use the shared registry by default."""
+        with patch.object(model_registry, "_model_registry", self.registry):
+            segmenter = SAMSegmenter(device="cpu")
+
+        self.assertIs(segmenter.registry, self.registry)
+        self.assertIs(get_model_registry(), get_model_registry())
+
+    def test_missing_sam3_in_segmenter(self):
+        """Test segmenters report a missing sam3 package."""
+        with patch.dict(sys.modules, {"sam3": None}):
+            with self.assertRaises(RuntimeError) as context:
+                SAMSegmenter(device="cpu", registry=self.registry)
+
+        self.assertIn("Failed to import SAM3", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for tracker-driven automatic person prompting.
+
+A fake batched predictor returns the simulated person's mask for prompts
+that hit the person and an empty low-score mask otherwise, so keyframe
+searches and tracked frames can be told apart by the decoder calls.
+"""
+
+import unittest
+import numpy as np
+import torch
+from unittest.mock import MagicMock
+
+from vision_service.segmentation.compact_mask import CompactMask
+from vision_service.segmentation.person_tracker import PersonTracker, TrackingConfig
+from vision_service.segmentation.sam_segment import PromptType, SAMSegmenter
+
+HEIGHT, WIDTH = 120, 160
+
+
+def _person_mask(x_offset):
+    """Person-shaped box standing at a horizontal offset."""
+    mask = np.zeros((HEIGHT, WIDTH), dtype=bool)
+    mask[20:110, 60 + x_offset:100 + x_offset] = True
+    return mask
+
+
+class _Scene:
+    """Fake predictor driven by the current person position."""
+
+    def __init__(self):
+        self.x_offset = 0
+        self.score = 0.95
+        self.batch_sizes = []
+        self.predictor = MagicMock()
+        self.predictor.transform.apply_coords_torch.side_effect = lambda c, size: c
+        self.predictor.transform.apply_boxes_torch.side_effect = lambda b, size: b
+        self.predictor.predict_torch.side_effect = self.predict_torch
+
+    def predict_torch(self, point_coords=None, point_labels=None, boxes=None,
+                      multimask_output=True):
+        person = _person_mask(self.x_offset)
+        prompts = point_coords if point_coords is not None else boxes
+        self.batch_sizes.append(len(prompts))
+        masks = torch.zeros(len(prompts), 3, HEIGHT, WIDTH, dtype=torch.bool)
+        scores = torch.full((len(prompts), 3), 0.1)
+        for i in range(len(prompts)):
+            if boxes is not None:
+                x0, y0, x1, y1 = boxes[i].tolist()
+                hit = person[int(y0):int(y1), int(x0):int(x1)].any()
+            else:
+                x, y = point_coords[i, 0].tolist()
+                hit = person[int(y), int(x)]
+            if hit:
+                masks[i, 1] = torch.from_numpy(person)
+                scores[i, 1] = self.score
+        return masks, scores, None
+
+
+class TrackerTestCase(unittest.TestCase):
+    """Set up a segmenter over a simulated scene."""
+
+    def setUp(self):
+        self.scene = _Scene()
+        self.segmenter = SAMSegmenter.__new__(SAMSegmenter)
+        self.segmenter.device = "cpu"
+        self.segmenter.predictor = self.scene.predictor
+        self.segmenter.embedding_cache = None
+        self.segmenter.compact_masks = False
+        self.segmenter.person_tracker = PersonTracker(TrackingConfig(keyframe_interval=5))
+        self.segmenter.set_image(np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8))
+        self.grid = self.segmenter.person_tracker.config.keyframe_grid ** 2
+
+
+class TestAutoPrompting(TrackerTestCase):
+    """Test keyframe scheduling and tracked prompts."""
+
+    def test_first_frame_is_keyframe(self):
+        """Test the first frame searches with a batched grid of points."""
+        result = self.segmenter.segment_person(prompt_type=None, auto_prompt=True)
+
+        self.assertTrue(result.is_valid)
+        self.assertEqual(self.scene.batch_sizes, [self.grid])
+        np.testing.assert_array_equal(result.mask, _person_mask(0))
+        self.assertTrue(self.segmenter.person_tracker.is_tracking)
+
+    def test_keyframe_interval(self):
+        """Test only every k-th frame runs a keyframe search."""
+        for frame in range(10):
+            self.scene.x_offset = frame
+            result = self.segmenter.segment_person()
+            self.assertTrue(result.is_valid)
+
+        self.assertEqual(self.scene.batch_sizes, [self.grid] + [1] * 4 + [self.grid] + [1] * 4)
+        stats = self.segmenter.person_tracker.stats
+        self.assertEqual((stats.keyframes, stats.tracked_frames), (2, 8))
+        self.assertEqual(stats.tracked_fraction, 0.8)
+
+    def test_tracked_box_follows_motion(self):
+        """Test the box prompt moves with the person."""
+        for frame in range(4):
+            self.scene.x_offset = 3 * frame
+            self.segmenter.segment_person()
+
+        box = self.segmenter.person_tracker.predicted_box((HEIGHT, WIDTH))
+        margin = 40 * 0.1
+        self.assertGreater(box[0], 60 + 9 - margin)
+        self.assertLessEqual(box[0], 60 + 12)
+
+    def test_lost_track_triggers_keyframe(self):
+        """Test a low-confidence tracked frame re-runs the search."""
+        self.segmenter.segment_person()
+        self.scene.score = 0.6  # Valid, but below min_tracking_confidence
+        result = self.segmenter.segment_person()
+
+        self.assertEqual(self.scene.batch_sizes, [self.grid, 1, self.grid])
+        self.assertAlmostEqual(result.confidence, 0.6, places=6)
+        stats = self.segmenter.person_tracker.stats
+        self.assertEqual(stats.track_losses, 1)
+        # The lost frame counts once, as the keyframe that replaced it
+        self.assertEqual((stats.keyframes, stats.tracked_frames), (2, 0))
+
+    def test_point_prompt_type(self):
+        """Test tracked frames can use the box centre as a point."""
+        self.segmenter.segment_person()
+        result = self.segmenter.segment_person(prompt_type=PromptType.POINT)
+
+        self.assertEqual(result.prompt_type, PromptType.POINT)
+        self.assertEqual(self.scene.batch_sizes, [self.grid, 1])
+
+    def test_explicit_prompt(self):
+        """Test auto_prompt=False uses the given prompt."""
+        result = self.segmenter.segment_person(auto_prompt=False, box=(50, 10, 110, 115))
+        self.assertEqual(result.prompt_type, PromptType.BOX)
+
+        with self.assertRaises(ValueError):
+            self.segmenter.segment_person(auto_prompt=False)
+
+
+class TestPersonTracker(unittest.TestCase):
+    """Test tracker state without a segmenter."""
+
+    def test_iou_drop_loses_track(self):
+        """Test a mask jump between tracked frames drops the track."""
+        tracker = PersonTracker()
+        self.assertTrue(tracker.update(_person_mask(0), 0.9, True, keyframe=True))
+        self.assertFalse(tracker.update(_person_mask(50), 0.9, True, keyframe=False))
+        self.assertTrue(tracker.needs_keyframe((HEIGHT, WIDTH)))
+
+    def test_compact_masks_accepted(self):
+        """Test compact masks update the track."""
+        tracker = PersonTracker()
+        tracker.update(CompactMask.from_dense(_person_mask(0)), 0.9, True, keyframe=True)
+        self.assertEqual(tracker.predicted_box((HEIGHT, WIDTH)), (56.0, 11.0, 104.0, 119.0))
+
+    def test_shape_change_forces_keyframe(self):
+        """Test a new image size invalidates the track."""
+        tracker = PersonTracker()
+        tracker.update(_person_mask(0), 0.9, True, keyframe=True)
+        self.assertFalse(tracker.needs_keyframe((HEIGHT, WIDTH)))
+        self.assertTrue(tracker.needs_keyframe((HEIGHT * 2, WIDTH * 2)))
+
+    def test_keyframe_points_inside_frame(self):
+        """Test the search grid covers the frame centre."""
+        points = PersonTracker(TrackingConfig(keyframe_grid=2)).keyframe_points((100, 200))
+        self.assertEqual(points, [(75.0, 37.5), (125.0, 37.5), (75.0, 62.5), (125.0, 62.5)])
+
+    def test_invalid_config(self):
+        """Test invalid settings are rejected."""
+        with self.assertRaises(ValueError):
+            TrackingConfig(keyframe_interval=0)
+        with self.assertRaises(ValueError):
+            TrackingConfig(momentum=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ Tests cover:
 - Combined prompts
 - GPU/CUDA support
 - Best mask selection
+- Batched prompts and images
 - Error handling and validation
 """
 
@@ -18,6 +19,7 @@ from unittest.mock import Mock, MagicMock, patch
 from sam_segment import (
     SAMSegmenter,
     SegmentationResult,
+    SegmentationPrompt,
     PromptType,
     create_segmenter,
 )
@@ -412,5 +414,129 @@ class TestDeviceInfo(unittest.TestCase):
         self.assertEqual(device_info["cuda_device_count"], 0)
 
 
+def _batched_predictor(height=48, width=64):
+    """Mock predictor whose batched decoder echoes the batch size."""
+    predictor = MagicMock()
+    predictor.transform.apply_coords_torch.side_effect = lambda coords, size: coords
+    predictor.transform.apply_boxes_torch.side_effect = lambda boxes, size: boxes
+
+    def predict_torch(point_coords=None, point_labels=None, boxes=None, multimask_output=True):
+        batch = len(point_coords if point_coords is not None else boxes)
+        masks = torch.zeros(batch, 3, height, width, dtype=torch.bool)
+        masks[:, 1, :height // 2] = True
+        scores = torch.tensor([[0.6, 0.9, 0.7]]).repeat(batch, 1)
+        return masks, scores, None
+
+    predictor.predict_torch.side_effect = predict_torch
+    return predictor
+
+
+class TestBatchedPrompts(unittest.TestCase):
+    """Test segmenting many prompts on one image."""
+
+    def setUp(self):
+        """Set up a segmenter with a mocked batched predictor."""
+        self.segmenter = SAMSegmenter.__new__(SAMSegmenter)
+        self.segmenter.device = "cpu"
+        self.segmenter.predictor = _batched_predictor()
+        self.segmenter.embedding_cache = None
+        self.segmenter.compact_masks = False
+        self.segmenter.set_image(np.zeros((48, 64, 3), dtype=np.uint8))
+
+    def test_one_decoder_pass_per_prompt_type(self):
+        """Test prompts of one type share a single decoder call."""
+        prompts = [SegmentationPrompt(point=(10, 10)), SegmentationPrompt(point=(20, 30))]
+        results = self.segmenter.segment_prompts(prompts)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.segmenter.predictor.predict_torch.call_count, 1)
+        for result in results:
+            self.assertEqual(result.prompt_type, PromptType.POINT)
+            self.assertTrue(result.is_valid)
+            self.assertAlmostEqual(result.confidence, 0.9, places=6)
+            self.assertEqual(result.mask.shape, (48, 64))
+
+    def test_mixed_prompts_keep_order(self):
+        """Test mixed prompt types are grouped but returned in input order."""
+        prompts = [
+            SegmentationPrompt(box=(0, 0, 30, 30)),
+            SegmentationPrompt(point=(5, 5), positive=False),
+            SegmentationPrompt(point=(5, 5), box=(0, 0, 30, 30)),
+            SegmentationPrompt(box=(10, 10, 40, 40)),
+        ]
+        results = self.segmenter.segment_prompts(prompts)
+
+        self.assertEqual(
+            [r.prompt_type for r in results],
+            [PromptType.BOX, PromptType.POINT, PromptType.COMBINED, PromptType.BOX],
+        )
+        self.assertEqual(self.segmenter.predictor.predict_torch.call_count, 3)
+        labels = self.segmenter.predictor.predict_torch.call_args_list[0].kwargs["point_labels"]
+        self.assertEqual(labels.tolist(), [[0]])
+
+    def test_invalid_prompt_rejected(self):
+        """Test out-of-bounds prompts raise before decoding."""
+        with self.assertRaises(ValueError):
+            self.segmenter.segment_prompts([SegmentationPrompt(box=(0, 0, 100, 100))])
+        with self.assertRaises(ValueError):
+            SegmentationPrompt()
+        self.segmenter.predictor.predict_torch.assert_not_called()
+
+    def test_decoder_failure(self):
+        """Test a failing decoder yields invalid results for its group."""
+        self.segmenter.predictor.predict_torch.side_effect = RuntimeError("out of memory")
+        results = self.segmenter.segment_prompts([SegmentationPrompt(point=(1, 1))] * 2)
+
+        for result in results:
+            self.assertFalse(result.is_valid)
+            self.assertIn("out of memory", result.warning)
+            self.assertEqual(result.mask.shape, (48, 64))
+
+
+class TestBatchedImages(unittest.TestCase):
+    """Test segmenting several images with one prompt each."""
+
+    def setUp(self):
+        """Set up a segmenter and images."""
+        self.segmenter = SAMSegmenter.__new__(SAMSegmenter)
+        self.segmenter.device = "cpu"
+        self.segmenter.embedding_cache = None
+        self.segmenter.compact_masks = False
+        self.images = [np.zeros((48, 64, 3), dtype=np.uint8) for _ in range(3)]
+        self.prompts = [SegmentationPrompt(point=(10, 10)) for _ in range(3)]
+
+    def test_batched_encoder(self):
+        """Test predictors with batch support encode all images at once."""
+        predictor = MagicMock()
+        masks = [np.zeros((3, 48, 64), dtype=bool)] * 3
+        scores = [np.array([0.2, 0.3, 0.8])] * 3
+        predictor.predict_batch.return_value = (masks, scores, None)
+        self.segmenter.predictor = predictor
+
+        results = self.segmenter.segment_images(self.images, self.prompts)
+
+        predictor.set_image_batch.assert_called_once()
+        predictor.predict_batch.assert_called_once()
+        self.assertEqual([r.confidence for r in results], [0.8] * 3)
+        self.assertFalse(hasattr(self.segmenter, "current_image_shape"))
+
+    def test_fallback_per_image(self):
+        """Test predictors without batch support segment image by image."""
+        predictor = _batched_predictor()
+        del predictor.set_image_batch
+        self.segmenter.predictor = predictor
+
+        results = self.segmenter.segment_images(self.images, self.prompts)
+
+        self.assertEqual(predictor.set_image.call_count, 3)
+        self.assertTrue(all(r.is_valid for r in results))
+
+    def test_count_mismatch(self):
+        """Test images and prompts must pair up."""
+        self.segmenter.predictor = MagicMock()
+        with self.assertRaises(ValueError):
+            self.segmenter.segment_images(self.images, self.prompts[:2])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+"""
+Unit tests for latency histograms.
+"""
+
+import pytest
+from vision_service.latency import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram behaviour."""
+
+    def test_invalid_edges(self):
+        """Test that non-increasing edges raise error."""
+        with pytest.raises(ValueError):
+            LatencyHistogram([5.0, 1.0])
+        with pytest.raises(ValueError):
+            LatencyHistogram([])
+
+    def test_bucketing(self):
+        """Test samples land in the right buckets."""
+        histogram = LatencyHistogram([1.0, 10.0])
+        for seconds in (0.0005, 0.005, 0.005, 0.5):
+            histogram.record(seconds)
+
+        assert histogram.counts == [1, 2, 1]
+        assert histogram.count == 4
+        assert histogram.max_ms == pytest.approx(500.0)
+
+    def test_percentiles(self):
+        """Test percentile estimates from buckets."""
+        histogram = LatencyHistogram([1.0, 10.0, 100.0])
+        for _ in range(90):
+            histogram.record(0.0005)
+        for _ in range(10):
+            histogram.record(0.05)
+
+        assert histogram.percentile(50) == pytest.approx(1.0)
+        assert histogram.percentile(99) == pytest.approx(50.0)
+        with pytest.raises(ValueError):
+            histogram.percentile(101)
+
+    def test_empty_and_reset(self):
+        """Test empty statistics and reset."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+        assert histogram.mean_ms == 0.0
+
+        histogram.record(0.01)
+        histogram.reset()
+        assert histogram.count == 0
+        assert sum(histogram.counts) == 0
@@ -0,0 +1,47 @@
+"""
+Monotonic timestamps for per-frame processing.
+
+Filtering and reconstruction state stores timestamps as float seconds on the
+monotonic clock, which is cheap to create, cheap to subtract and immune to
+wall-clock jumps (e.g. NTP adjustments). Conversion to ``datetime`` / ISO 8601
+happens only when state is serialized.
+
+``datetime`` values are still accepted anywhere a timestamp is expected; they
+are mapped onto the monotonic timeline using the wall-clock offset captured at
+import time, so both kinds of timestamp can be mixed and round-trip through
+``to_datetime``.
+"""
+
+import time
+from datetime import datetime
+from typing import Union
+
+Timestamp = Union[float, int, datetime]
+"""Float seconds on the monotonic clock, or a datetime."""
+
+# Wall-clock seconds at monotonic time zero
+_WALL_CLOCK_OFFSET = time.time() - time.monotonic_ns() * 1e-9
+
+
+def monotonic() -> float:
+    """Current monotonic time in float seconds."""
+    return time.monotonic_ns() * 1e-9
+
+
+def to_seconds(timestamp: Timestamp) -> float:
+    """Convert a timestamp to float seconds on the monotonic clock."""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp() - _WALL_CLOCK_OFFSET
+    return float(timestamp)
+
+
+def to_datetime(timestamp: Timestamp) -> datetime:
+    """Convert a timestamp to a local wall-clock datetime."""
+    if isinstance(timestamp, datetime):
+        return timestamp
+    return datetime.fromtimestamp(float(timestamp) + _WALL_CLOCK_OFFSET)
+
+
+def to_isoformat(timestamp: Timestamp) -> str:
+    """Convert a timestamp to an ISO 8601 string for serialization."""
+    return to_datetime(timestamp).isoformat()
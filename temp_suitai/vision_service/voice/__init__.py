@@ -5,8 +5,16 @@ settings for clarity and low-latency performance. All processing is done locally
 with no API costs.
 """
 
-from vision_service.voice.tts_config import TTSConfig
-from vision_service.voice.voice_service import VoiceService
+from vision_service._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "vision_service.voice.tts_config": [
+        "TTSConfig",
+    ],
+    "vision_service.voice.voice_service": [
+        "VoiceService",
+    ],
+})
 
 __all__ = [
     "TTSConfig",